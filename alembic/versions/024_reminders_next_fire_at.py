@@ -0,0 +1,32 @@
+"""reminders next_fire_at — precomputed fire instant and weekday bitmask.
+
+Revision ID: 024_reminders_next_fire_at
+Revises: 023_alphapy_discord_links
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "024_reminders_next_fire_at"
+down_revision: Union[str, None] = "023_alphapy_discord_links"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # days_mask IS NULL marks rows the bot has not scheduled yet; it backfills
+    # next_fire_at for them on startup.
+    op.execute("ALTER TABLE reminders ADD COLUMN IF NOT EXISTS next_fire_at TIMESTAMPTZ;")
+    op.execute("ALTER TABLE reminders ADD COLUMN IF NOT EXISTS days_mask SMALLINT;")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_next_fire_at "
+        "ON reminders(next_fire_at) WHERE next_fire_at IS NOT NULL;"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_reminders_next_fire_at;")
+    op.execute("ALTER TABLE reminders DROP COLUMN IF EXISTS days_mask;")
+    op.execute("ALTER TABLE reminders DROP COLUMN IF EXISTS next_fire_at;")
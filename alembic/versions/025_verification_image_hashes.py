@@ -0,0 +1,46 @@
+"""verification_image_hashes — perceptual hashes of verification screenshots.
+
+Revision ID: 025_verification_image_hashes
+Revises: 024_reminders_next_fire_at
+Create Date: 2026-10-16
+
+Lets VerificationCog answer re-uploaded or shared screenshots from an earlier
+verdict (or send them to manual review) without another vision call.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "025_verification_image_hashes"
+down_revision: Union[str, None] = "024_reminders_next_fire_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS verification_image_hashes (
+            id           SERIAL PRIMARY KEY,
+            guild_id     BIGINT      NOT NULL,
+            user_id      BIGINT      NOT NULL,
+            channel_id   BIGINT      NOT NULL,
+            phash        TEXT        NOT NULL,
+            status       TEXT        NOT NULL,
+            reason       TEXT,
+            payment_date DATE,
+            created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_verification_image_hashes_guild_created "
+        "ON verification_image_hashes (guild_id, created_at)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_verification_image_hashes_channel "
+        "ON verification_image_hashes (channel_id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS verification_image_hashes")
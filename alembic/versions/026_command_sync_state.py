@@ -0,0 +1,35 @@
+"""command_sync_state — hash of the last successful slash command sync.
+
+Revision ID: 026_command_sync_state
+Revises: 025_verification_image_hashes
+Create Date: 2026-10-16
+
+utils.command_sync skips bot.tree.sync() for a scope (global or a guild) when
+the canonical command payload hash matches the stored one.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "026_command_sync_state"
+down_revision: Union[str, None] = "025_verification_image_hashes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS command_sync_state (
+            application_id BIGINT      NOT NULL,
+            scope          TEXT        NOT NULL,
+            payload_hash   TEXT        NOT NULL,
+            command_count  INTEGER     NOT NULL,
+            synced_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (application_id, scope)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS command_sync_state")
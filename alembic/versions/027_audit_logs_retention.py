@@ -0,0 +1,41 @@
+"""audit_logs retention — created_at indexes for batched deletes.
+
+Revision ID: 027_audit_logs_retention
+Revises: 026_command_sync_state
+Create Date: 2026-10-16
+
+cogs.retention_cleanup deletes expired rows in batches picked by created_at;
+the existing (guild_id, created_at) / (command_name, created_at) indexes cannot
+serve that range scan, so plain created_at indexes are added. Monthly
+partitioning of audit_logs is revision 028.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "027_audit_logs_retention"
+down_revision: Union[str, None] = "026_command_sync_state"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at)")
+    # faq_search_logs was created with searched_at by 001 and created_at by the FAQ cog
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = 'faq_search_logs' AND column_name = 'created_at'
+            ) THEN
+                CREATE INDEX IF NOT EXISTS idx_faq_search_logs_created_at ON faq_search_logs(created_at);
+            END IF;
+        END $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_faq_search_logs_created_at")
+    op.execute("DROP INDEX IF EXISTS idx_audit_logs_created_at")
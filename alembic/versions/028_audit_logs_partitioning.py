@@ -0,0 +1,112 @@
+"""audit_logs monthly range partitioning.
+
+Revision ID: 028_audit_logs_partitioning
+Revises: 027_audit_logs_retention
+Create Date: 2026-10-16
+
+Rebuilds audit_logs as a table range-partitioned by month (plus a default
+partition) so cogs.retention_cleanup expires whole months with a partition drop.
+Column names and the id sequence are unchanged, so COPY writers and readers keep
+working; the primary key becomes (id, created_at) because it must include the
+partition key. The rebuild copies the whole table once, inside the migration
+transaction. To keep a plain audit_logs, upgrade to 027_audit_logs_retention
+instead of head.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "028_audit_logs_partitioning"
+down_revision: Union[str, None] = "027_audit_logs_retention"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = "id, guild_id, user_id, command_name, command_type, success, error_message, created_at"
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute("ALTER INDEX IF EXISTS audit_logs_pkey RENAME TO audit_logs_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS idx_audit_logs_guild_created")
+    op.execute("DROP INDEX IF EXISTS idx_audit_logs_command")
+    op.execute("DROP INDEX IF EXISTS idx_audit_logs_created_at")
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            guild_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            command_name TEXT NOT NULL,
+            command_type TEXT NOT NULL,
+            success BOOLEAN DEFAULT TRUE,
+            error_message TEXT,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    # Monthly partitions (UTC bounds) from the oldest row through three months ahead;
+    # names match utils.retention.partition_name.
+    op.execute("""
+        DO $$
+        DECLARE
+            part_month date := date_trunc(
+                'month',
+                LEAST(COALESCE((SELECT MIN(created_at) FROM audit_logs_unpartitioned), NOW()), NOW())
+                    AT TIME ZONE 'UTC'
+            )::date;
+            last_month date := (date_trunc('month', NOW() AT TIME ZONE 'UTC') + interval '3 months')::date;
+        BEGIN
+            WHILE part_month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_y' || to_char(part_month, 'YYYY') || 'm' || to_char(part_month, 'MM'),
+                    part_month::text || ' 00:00:00+00',
+                    (part_month + interval '1 month')::date::text || ' 00:00:00+00'
+                );
+                part_month := (part_month + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"""
+        INSERT INTO audit_logs ({_COLUMNS})
+        SELECT id, guild_id, user_id, command_name, command_type, success, error_message,
+               COALESCE(created_at, NOW())
+        FROM audit_logs_unpartitioned
+    """)
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_audit_logs_guild_created ON audit_logs(guild_id, created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_audit_logs_command ON audit_logs(command_name, created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at ON audit_logs(created_at)")
+
+
+def downgrade() -> None:
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')) THEN
+                ALTER TABLE audit_logs RENAME TO audit_logs_partitioned;
+                ALTER INDEX audit_logs_pkey RENAME TO audit_logs_partitioned_pkey;
+                DROP INDEX IF EXISTS idx_audit_logs_guild_created;
+                DROP INDEX IF EXISTS idx_audit_logs_command;
+                DROP INDEX IF EXISTS idx_audit_logs_created_at;
+                CREATE TABLE audit_logs (
+                    id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq') PRIMARY KEY,
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    command_name TEXT NOT NULL,
+                    command_type TEXT NOT NULL,
+                    success BOOLEAN DEFAULT TRUE,
+                    error_message TEXT,
+                    created_at TIMESTAMPTZ DEFAULT NOW()
+                );
+                ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id;
+                INSERT INTO audit_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM audit_logs_partitioned;
+                DROP TABLE audit_logs_partitioned;
+                CREATE INDEX idx_audit_logs_guild_created ON audit_logs(guild_id, created_at);
+                CREATE INDEX idx_audit_logs_command ON audit_logs(command_name, created_at);
+                CREATE INDEX idx_audit_logs_created_at ON audit_logs(created_at);
+            END IF;
+        END $$
+    """)
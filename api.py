@@ -9,7 +9,6 @@ from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal, cast
 
-import asyncpg
 from asyncpg import exceptions as pg_exceptions
 from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -27,8 +26,10 @@ from cogs.reminders import (
 )
 from utils import core_ingress as core_ingress_module
 from utils.logger import get_gpt_status_logs, logger
-from utils.operational_logs import EventType, get_operational_events, log_operational_event
+from utils.operational_logs import EventType, log_operational_event, query_operational_events
+from utils.pool_registry import SubsystemPool, close_loop_pool, get_pool_stats, get_subsystem_pool
 from utils.runtime_metrics import get_bot_snapshot, serialize_snapshot
+from utils.settings_service import publish_setting_change
 from utils.supabase_auth import verify_supabase_token
 from utils.supabase_client import SupabaseConfigurationError, _supabase_post
 from utils.timezone import BRUSSELS_TZ
@@ -136,7 +137,7 @@ async def _require_discord_id_for_linked_innersync(innersync_sub: str) -> int:
 # FastAPI app bootstrap
 # ---------------------------------------------------------------------------
 
-db_pool: asyncpg.Pool | None = None
+db_pool: SubsystemPool | None = None
 router = APIRouter(prefix="/api", dependencies=[Depends(verify_api_key)])
 
 # Telemetry retry queue
@@ -209,7 +210,8 @@ COMMAND_STATS_CACHE_TTL = 30  # seconds
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     global db_pool
-    db_pool = await asyncpg.create_pool(config.DATABASE_URL)
+    # The API thread's loop gets its own shared physical pool; see utils.pool_registry
+    db_pool = await get_subsystem_pool("api")
     app.state.db_pool = db_pool
     logger.info("✅ DB pool created")
     
@@ -302,10 +304,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if db_pool:
             try:
                 await db_pool.close()
+                await close_loop_pool()
                 logger.info("🔌 DB pool closed")
             except Exception as exc:
                 logger.debug(f"Error closing DB pool (expected during shutdown): {exc.__class__.__name__}")
 
+        # Shared HTTP clients created on this loop (telemetry ingest, webhooks)
+        try:
+            from utils.http_clients import close_http_clients
+
+            await close_http_clients()
+        except Exception as exc:
+            logger.debug(f"Error closing HTTP clients (expected during shutdown): {exc.__class__.__name__}")
+
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(supabase_webhook_router)
@@ -799,11 +810,17 @@ class InfrastructureMetrics(BaseModel):
     database_up: bool
     pool_size: int | None
     checked_at: str
+    # Per-subsystem acquisitions, wait/hold times (ms) and saturation on the shared pools
+    pool_subsystems: dict[str, dict[str, float]] = {}
 
 
 class CacheMetrics(BaseModel):
     """Cache size metrics for monitoring."""
     command_tracker_queue_size: int
+    command_tracker_dropped: int = 0
+    command_tracker_flush_failures: int = 0
+    command_tracker_last_flush_ms: float = 0.0
+    command_tracker_max_flush_ms: float = 0.0
     command_stats_cache_size: int
     ip_rate_limits_size: int
     sync_cooldowns_size: int
@@ -812,12 +829,30 @@ class CacheMetrics(BaseModel):
     automod_rules_list_cache_size: int = 0
     automod_rules_cache_hits: int = 0
     automod_rules_cache_misses: int = 0
+    automod_spam_guilds: int = 0
+    automod_spam_users: int = 0
+    automod_spam_evictions: int = 0
+    automod_spam_bytes: int = 0
+    automod_ai_cache_size: int = 0
+    automod_ai_cache_hits: int = 0
+    automod_ai_cache_misses: int = 0
+    automod_ai_llm_calls: int = 0
     engagement_feature_flag_cache_size: int = 0
     engagement_food_channels_cache_size: int = 0
     engagement_feature_flag_cache_hits: int = 0
     engagement_feature_flag_cache_misses: int = 0
     engagement_food_channels_cache_hits: int = 0
     engagement_food_channels_cache_misses: int = 0
+    engagement_buffer_pending: int = 0
+    engagement_buffer_dropped: int = 0
+    engagement_buffer_flush_failures: int = 0
+    engagement_buffer_rows_written: int = 0
+    http_client_requests: int = 0
+    http_client_connections_opened: int = 0
+    http_client_connections_reused: int = 0
+    reflection_context_cache_size: int = 0
+    reflection_context_cache_hits: int = 0
+    reflection_context_cache_misses: int = 0
 
 
 class PremiumMetrics(BaseModel):
@@ -1170,6 +1205,7 @@ async def _collect_infrastructure_metrics() -> InfrastructureMetrics:
         database_up=database_up,
         pool_size=pool_size,
         checked_at=checked_at,
+        pool_subsystems=get_pool_stats(),
     )
 
 
@@ -1695,10 +1731,11 @@ def _collect_cache_metrics() -> CacheMetrics:
     """Collect cache size metrics for monitoring."""
     # Command tracker queue size
     try:
-        from utils.command_tracker import _command_queue
-        command_tracker_size = len(_command_queue)
+        from utils.command_tracker import get_command_tracker_stats
+        command_tracker_stats = get_command_tracker_stats()
     except Exception:
-        command_tracker_size = 0
+        command_tracker_stats = {}
+    command_tracker_size = int(command_tracker_stats.get("queue_size", 0))
     
     # Command stats cache size
     command_stats_size = len(_command_stats_cache)
@@ -1718,6 +1755,7 @@ def _collect_cache_metrics() -> CacheMetrics:
     ticket_cooldowns_size = 0  # TODO: Add global tracking if needed
 
     automod_cache_stats: dict[str, int] = {}
+    automod_cog_stats: dict[str, int] = {}
     try:
         from gpt.helpers import bot_instance
     except Exception:
@@ -1731,6 +1769,12 @@ def _collect_cache_metrics() -> CacheMetrics:
                 automod_cache_stats = rule_processor.get_cache_stats()
         except Exception:
             automod_cache_stats = {}
+        try:
+            automod_cog = bot.get_cog("AutoModeration")
+            if automod_cog and hasattr(automod_cog, "get_cache_stats"):
+                automod_cog_stats = automod_cog.get_cache_stats()
+        except Exception:
+            automod_cog_stats = {}
 
     try:
         from cogs.engagement import get_engagement_cache_stats
@@ -1738,9 +1782,27 @@ def _collect_cache_metrics() -> CacheMetrics:
         engagement_cache_stats = get_engagement_cache_stats()
     except Exception:
         engagement_cache_stats = {}
+
+    try:
+        from utils.http_clients import get_http_client_stats
+
+        http_client_stats = get_http_client_stats()
+    except Exception:
+        http_client_stats = {}
+
+    try:
+        from gpt.context_loader import get_reflection_context_cache_stats
+
+        reflection_cache_stats = get_reflection_context_cache_stats()
+    except Exception:
+        reflection_cache_stats = {}
     
     return CacheMetrics(
         command_tracker_queue_size=command_tracker_size,
+        command_tracker_dropped=int(command_tracker_stats.get("dropped", 0)),
+        command_tracker_flush_failures=int(command_tracker_stats.get("flush_failures", 0)),
+        command_tracker_last_flush_ms=command_tracker_stats.get("last_flush_ms", 0.0),
+        command_tracker_max_flush_ms=command_tracker_stats.get("max_flush_ms", 0.0),
         command_stats_cache_size=command_stats_size,
         ip_rate_limits_size=ip_rate_limits_size,
         sync_cooldowns_size=sync_cooldowns_size,
@@ -1749,12 +1811,30 @@ def _collect_cache_metrics() -> CacheMetrics:
         automod_rules_list_cache_size=automod_cache_stats.get("automod_rules_list_cache_size", 0),
         automod_rules_cache_hits=automod_cache_stats.get("automod_rules_cache_hits", 0),
         automod_rules_cache_misses=automod_cache_stats.get("automod_rules_cache_misses", 0),
+        automod_spam_guilds=automod_cog_stats.get("automod_spam_guilds", 0),
+        automod_spam_users=automod_cog_stats.get("automod_spam_users", 0),
+        automod_spam_evictions=automod_cog_stats.get("automod_spam_evictions", 0),
+        automod_spam_bytes=automod_cog_stats.get("automod_spam_bytes", 0),
+        automod_ai_cache_size=automod_cog_stats.get("automod_ai_cache_size", 0),
+        automod_ai_cache_hits=automod_cog_stats.get("automod_ai_cache_hits", 0),
+        automod_ai_cache_misses=automod_cog_stats.get("automod_ai_cache_misses", 0),
+        automod_ai_llm_calls=automod_cog_stats.get("automod_ai_llm_calls", 0),
         engagement_feature_flag_cache_size=engagement_cache_stats.get("engagement_feature_flag_cache_size", 0),
         engagement_food_channels_cache_size=engagement_cache_stats.get("engagement_food_channels_cache_size", 0),
         engagement_feature_flag_cache_hits=engagement_cache_stats.get("engagement_feature_flag_cache_hits", 0),
         engagement_feature_flag_cache_misses=engagement_cache_stats.get("engagement_feature_flag_cache_misses", 0),
         engagement_food_channels_cache_hits=engagement_cache_stats.get("engagement_food_channels_cache_hits", 0),
         engagement_food_channels_cache_misses=engagement_cache_stats.get("engagement_food_channels_cache_misses", 0),
+        engagement_buffer_pending=engagement_cache_stats.get("engagement_buffer_pending", 0),
+        engagement_buffer_dropped=engagement_cache_stats.get("engagement_buffer_dropped", 0),
+        engagement_buffer_flush_failures=engagement_cache_stats.get("engagement_buffer_flush_failures", 0),
+        engagement_buffer_rows_written=engagement_cache_stats.get("engagement_buffer_rows_written", 0),
+        http_client_requests=http_client_stats.get("http_client_requests", 0),
+        http_client_connections_opened=http_client_stats.get("http_client_connections_opened", 0),
+        http_client_connections_reused=http_client_stats.get("http_client_connections_reused", 0),
+        reflection_context_cache_size=reflection_cache_stats.get("reflection_context_cache_size", 0),
+        reflection_context_cache_hits=reflection_cache_stats.get("reflection_context_cache_hits", 0),
+        reflection_context_cache_misses=reflection_cache_stats.get("reflection_context_cache_misses", 0),
     )
 
 
@@ -2198,6 +2278,7 @@ async def update_guild_settings(
                             """,
                             guild_id, request.category, key, str(value)
                         )
+                await publish_setting_change(conn, guild_id, request.category)
 
             # Log to operational events
             log_operational_event(
@@ -2683,6 +2764,7 @@ async def rollback_setting_change(
                 guild_id, scope, key, history_row["old_value"], old_value,
                 history_row["value_type"], int(auth_user_id)
             )
+            await publish_setting_change(conn, guild_id, scope, key)
 
             # Log to operational events
             log_operational_event(
@@ -2710,6 +2792,7 @@ async def rollback_setting_change(
 
 class OperationalLogsResponse(BaseModel):
     logs: list[dict[str, Any]]
+    next_cursor: int | None = None
 
 
 # Auto-Moderation Management Endpoints (Web Configuration Interface)
@@ -2787,17 +2870,21 @@ async def get_dashboard_logs(
     guild_id: int,
     limit: int = 50,
     event_types: str | None = None,
+    before: int | None = None,
     auth_user_id: str = Depends(get_authenticated_user_id),
 ):
     """Get operational logs (reconnect, disconnect, etc.) for the Mind dashboard.
-    Requires guild admin access. Global events (no guild_id) are included for any guild request."""
+    Requires guild admin access. Global events (no guild_id) are included for any guild request.
+    Pass the returned ``next_cursor`` as ``before`` to page to older events."""
     await verify_guild_admin_access(guild_id, auth_user_id)
     limit = min(limit, 100)
     types_list: list[str] | None = None
     if event_types:
         types_list = [t.strip() for t in event_types.split(",") if t.strip()]
-    logs = get_operational_events(guild_id=guild_id, limit=limit, event_types=types_list)
-    return OperationalLogsResponse(logs=logs)
+    logs, next_cursor = query_operational_events(
+        guild_id=guild_id, limit=limit, event_types=types_list, before=before
+    )
+    return OperationalLogsResponse(logs=logs, next_cursor=next_cursor)
 
 
 # Auto-Moderation Management Endpoints
@@ -3291,6 +3378,7 @@ async def update_automod_settings(
                     ON CONFLICT (guild_id, scope, key) 
                     DO UPDATE SET value = EXCLUDED.value
                 """, guild_id, key, str_value)
+            await publish_setting_change(conn, guild_id, "automod")
             
             return {"success": True}
             
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Auto-moderation benchmark and replay harness for Alphapy.
+
+Replays a synthetic or recorded message corpus against N rules per guild
+through RuleProcessor and AutoModeration._process_message, using stub Discord
+objects (no network, no database). Reports messages/sec, per-rule-type latency
+histograms and allocations, and can fail on regression against a stored
+baseline.
+
+Run with:
+    python automod_benchmark.py --messages 5000 --rules 20
+    python automod_benchmark.py --corpus recorded.jsonl --rules 40 --ai
+    python automod_benchmark.py --save-baseline automod_baseline.json
+    python automod_benchmark.py --baseline automod_baseline.json --tolerance 0.2
+
+Recorded corpora are JSONL with one message per line:
+    {"content": "...", "author_id": 123, "mentions": 0}
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cogs.automod import AutoModeration  # noqa: E402
+from utils.automod_ai import AIVerdict  # noqa: E402
+from utils.automod_rules import RuleType  # noqa: E402
+from utils.automod_spam import GuildSpamTracker  # noqa: E402
+
+GUILD_ID = 1
+
+_VOCABULARY = (
+    "the market is moving fast today and everyone wants to know what happens next with "
+    "risk management position sizing entries exits mindset patience discipline journal "
+    "trade setup breakout support resistance volume candle trend pullback scalping swing "
+    "hello thanks morning evening great nice question answer anyone help please check"
+).split()
+
+_DOMAINS = ("tradingview.com", "discord.gg", "youtube.com", "free-nitro.example", "evil.example")
+
+
+class _StubSettings:
+    """Minimal SettingsService stand-in: auto-mod enabled, no database pool."""
+
+    _pool = None
+
+    def get(self, scope: str, key: str, guild_id: int = 0, fallback: Any = None) -> Any:
+        if (scope, key) == ("automod", "enabled"):
+            return True
+        return fallback
+
+    def add_listener(self, scope: str, key: str, listener) -> None:
+        return None
+
+    def add_global_listener(self, listener) -> None:
+        return None
+
+
+class _StubBot:
+    def __init__(self) -> None:
+        self.settings = _StubSettings()
+
+    def get_channel(self, channel_id: int):
+        return None
+
+    def get_cog(self, name: str):
+        return None
+
+
+class StubMessage:
+    """Just enough of discord.Message for rule evaluation."""
+
+    __slots__ = ("id", "content", "author", "guild", "channel", "mentions")
+
+    def __init__(self, message_id: int, content: str, author_id: int, mentions: int = 0):
+        self.id = message_id
+        self.content = content
+        self.author = SimpleNamespace(id=author_id, bot=False)
+        self.guild = SimpleNamespace(id=GUILD_ID)
+        self.channel = SimpleNamespace(id=10)
+        self.mentions = [object()] * mentions
+
+
+def build_rules(count: int, seed: int = 0, include_ai: bool = False) -> list[dict]:
+    """Build a realistic mix of ``count`` enabled rules for one guild."""
+    rng = random.Random(seed)
+    templates: list[tuple[str, dict]] = [
+        (RuleType.SPAM.value, {"spam_type": "frequency", "max_messages": 8, "time_window": 10}),
+        (RuleType.SPAM.value, {"spam_type": "duplicate", "max_duplicates": 4}),
+        (RuleType.SPAM.value, {"spam_type": "caps", "min_length": 12, "max_caps_ratio": 0.8}),
+        (RuleType.CONTENT.value, {"content_type": "links", "blacklist": ["free-nitro", "evil.example"]}),
+        (RuleType.CONTENT.value, {"content_type": "mentions", "max_mentions": 5}),
+        (RuleType.REGEX.value, {"patterns": [r"free\s+nitro", r"\b(?:dm|message)\s+me\s+for\b", r"\d{16}"]}),
+    ]
+    rules: list[dict] = []
+    for index in range(count):
+        if index % 3 == 0:
+            # Bad-word lists dominate real configurations
+            words = [f"{rng.choice(_VOCABULARY)[:3]}{rng.randrange(10_000)}x" for _ in range(50)]
+            rule_type, config = RuleType.CONTENT.value, {"content_type": "bad_words", "words": words}
+        else:
+            rule_type, config = templates[index % len(templates)]
+        rules.append({
+            "id": index + 1,
+            "guild_id": GUILD_ID,
+            "rule_type": rule_type,
+            "name": f"bench-{index + 1}",
+            "config": dict(config),
+            "action_type": "warn",
+            "action_config": {},
+        })
+    if include_ai:
+        rules.append({
+            "id": count + 1,
+            "guild_id": GUILD_ID,
+            "rule_type": RuleType.AI.value,
+            "name": "bench-ai",
+            "config": {"policy": "Detect scams", "threshold": 0.7},
+            "action_type": "warn",
+            "action_config": {},
+        })
+    return rules
+
+
+def synthetic_corpus(count: int, users: int = 200, seed: int = 0) -> list[StubMessage]:
+    """Generate chat-like traffic with a sprinkling of links, caps, mentions and repeats."""
+    rng = random.Random(seed)
+    corpus: list[StubMessage] = []
+    for index in range(count):
+        author_id = rng.randrange(users) + 1000
+        roll = rng.random()
+        if roll < 0.03 and corpus:
+            content = corpus[-1].content  # copy-paste spam
+        else:
+            content = " ".join(rng.choice(_VOCABULARY) for _ in range(rng.randint(3, 40)))
+            if roll < 0.08:
+                content += f" https://{rng.choice(_DOMAINS)}/{rng.randrange(1000)}"
+            elif roll < 0.11:
+                content = content.upper()
+        mentions = rng.randint(1, 8) if rng.random() < 0.02 else 0
+        corpus.append(StubMessage(index + 1, content, author_id, mentions))
+    return corpus
+
+
+def load_corpus(path: str) -> list[StubMessage]:
+    """Load a recorded JSONL corpus."""
+    corpus: list[StubMessage] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            data = json.loads(line)
+            corpus.append(StubMessage(
+                len(corpus) + 1,
+                str(data.get("content", "")),
+                int(data.get("author_id", 0)),
+                int(data.get("mentions", 0)),
+            ))
+    return corpus
+
+
+@dataclass
+class LatencyHistogram:
+    """Latency samples (ns) with percentile and log2-bucket rendering."""
+
+    samples: list[int] = field(default_factory=list)
+
+    def record(self, elapsed_ns: int) -> None:
+        self.samples.append(elapsed_ns)
+
+    def percentile(self, pct: float) -> float:
+        """Percentile in microseconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index] / 1000
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """(upper bound µs, count) per power-of-two bucket."""
+        counts: dict[int, int] = {}
+        for sample in self.samples:
+            bound = 1
+            while bound * 1000 < sample:
+                bound *= 2
+            counts[bound] = counts.get(bound, 0) + 1
+        return sorted(counts.items())
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": len(self.samples),
+            "p50_us": round(self.percentile(50), 2),
+            "p95_us": round(self.percentile(95), 2),
+            "p99_us": round(self.percentile(99), 2),
+        }
+
+
+def _make_cog(rules: list[dict], ai_latency: float) -> tuple[AutoModeration, list[tuple[dict, Any]]]:
+    """AutoModeration cog with rules preloaded and side effects stubbed out."""
+    cog = AutoModeration(_StubBot())  # type: ignore[arg-type]
+    processor = cog.rule_processor
+    processor._rules_cache[GUILD_ID] = rules
+    processor._cache_updated[GUILD_ID] = float("inf")  # never refresh from the database
+    processor.ai_moderator.batch_window = 0.0
+
+    async def _stub_llm(guild_id, policy, contents):
+        if ai_latency:
+            await asyncio.sleep(ai_latency)
+        return {i: AIVerdict(False, 0.1, "ok", "none") for i in range(len(contents))}
+
+    processor.ai_moderator._call_llm = _stub_llm  # type: ignore[method-assign]
+
+    violations: list[tuple[dict, Any]] = []
+
+    async def _record_violation(message, rule, result):
+        violations.append((rule, result))
+
+    cog._handle_violation = _record_violation  # type: ignore[method-assign]
+    return cog, violations
+
+
+async def run_rule_pass(rules: list[dict], corpus: list[StubMessage], ai_latency: float) -> dict[str, LatencyHistogram]:
+    """Evaluate every rule against every message, timing each evaluation by rule type."""
+    cog, _ = _make_cog(rules, ai_latency)
+    processor = cog.rule_processor
+    tracker = GuildSpamTracker()
+    histograms: dict[str, LatencyHistogram] = {}
+    perf = time.perf_counter_ns
+    for message in corpus:
+        now = time.time()
+        activity = tracker.record(message.author.id, now)
+        context = {
+            "last_message": activity.last_preview,
+            "last_message_hash": activity.last_hash,
+            "message_timestamps": activity.timestamps,
+            "now": now,
+        }
+        scan = processor.scan_message(GUILD_ID, message)  # type: ignore[arg-type]
+        for rule in rules:
+            start = perf()
+            await processor.evaluate_rule(rule, message, context, scan)  # type: ignore[arg-type]
+            histograms.setdefault(rule["rule_type"], LatencyHistogram()).record(perf() - start)
+        tracker.remember_message(message.author.id, message.content)
+    return histograms
+
+
+async def run_pipeline_pass(rules: list[dict], corpus: list[StubMessage], ai_latency: float) -> dict[str, float]:
+    """Replay the corpus through AutoModeration._process_message."""
+    cog, violations = _make_cog(rules, ai_latency)
+    start = time.perf_counter()
+    for message in corpus:
+        await cog._process_message(message)  # type: ignore[arg-type]
+    elapsed = time.perf_counter() - start
+    return {
+        "messages": len(corpus),
+        "seconds": round(elapsed, 4),
+        "messages_per_sec": round(len(corpus) / elapsed, 1) if elapsed else 0.0,
+        "violations": len(violations),
+    }
+
+
+async def run_allocation_pass(rules: list[dict], corpus: list[StubMessage], ai_latency: float) -> dict[str, float]:
+    """Replay the corpus under tracemalloc and report peak and retained memory."""
+    cog, _ = _make_cog(rules, ai_latency)
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for message in corpus:
+            await cog._process_message(message)  # type: ignore[arg-type]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib": round((peak - baseline) / 1024, 1),
+        "retained_kib": round((current - baseline) / 1024, 1),
+        "retained_bytes_per_message": round((current - baseline) / max(1, len(corpus)), 1),
+    }
+
+
+async def run_benchmark(
+    corpus: list[StubMessage],
+    rules: list[dict],
+    *,
+    ai_latency: float = 0.0,
+    allocations: bool = True,
+) -> dict[str, Any]:
+    """Run warmup, pipeline, per-rule and allocation passes and return a report."""
+    await run_pipeline_pass(rules, corpus[:200], ai_latency)  # warmup
+    pipeline = await run_pipeline_pass(rules, corpus, ai_latency)
+    histograms = await run_rule_pass(rules, corpus, ai_latency)
+    report: dict[str, Any] = {
+        "rules": len(rules),
+        "pipeline": pipeline,
+        "rule_types": {rule_type: hist.summary() for rule_type, hist in sorted(histograms.items())},
+        "_histograms": histograms,
+    }
+    if allocations:
+        report["allocations"] = await run_allocation_pass(rules, corpus, ai_latency)
+    return report
+
+
+def check_regression(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    latency_tolerance: float = 0.5,
+) -> list[str]:
+    """Return regressions of the report against a stored baseline.
+
+    Throughput is the primary gate; per-type p95 latencies are noisier at
+    microsecond scale and get their own, looser tolerance.
+    """
+    failures: list[str] = []
+    base_rate = baseline.get("pipeline", {}).get("messages_per_sec", 0)
+    rate = report["pipeline"]["messages_per_sec"]
+    if base_rate and rate < base_rate * (1 - tolerance):
+        failures.append(f"messages/sec {rate} < baseline {base_rate} (-{tolerance:.0%} allowed)")
+    for rule_type, stats in baseline.get("rule_types", {}).items():
+        current = report["rule_types"].get(rule_type)
+        base_p95 = stats.get("p95_us", 0)
+        if current and base_p95 and current["p95_us"] > base_p95 * (1 + latency_tolerance):
+            failures.append(
+                f"{rule_type} p95 {current['p95_us']}µs > baseline {base_p95}µs (+{latency_tolerance:.0%} allowed)"
+            )
+    return failures
+
+
+def print_report(report: dict[str, Any]) -> None:
+    pipeline = report["pipeline"]
+    print(f"📨 Messages: {pipeline['messages']}  |  Rules: {report['rules']}")
+    print(f"⚡ Throughput: {pipeline['messages_per_sec']} msg/s ({pipeline['seconds']}s, {pipeline['violations']} violations)")
+    print("\n⏱️  Per-rule-type latency:")
+    for rule_type, stats in report["rule_types"].items():
+        print(f"  {rule_type:<8} n={stats['count']:<7} p50={stats['p50_us']}µs  p95={stats['p95_us']}µs  p99={stats['p99_us']}µs")
+        hist: LatencyHistogram = report["_histograms"][rule_type]
+        total = max(1, len(hist.samples))
+        for bound, count in hist.buckets():
+            bar = "█" * max(1, round(40 * count / total))
+            print(f"      ≤{bound:>6}µs {count:>7} {bar}")
+    if "allocations" in report:
+        alloc = report["allocations"]
+        print(f"\n🧠 Allocations: peak {alloc['peak_kib']} KiB, retained {alloc['retained_kib']} KiB "
+              f"({alloc['retained_bytes_per_message']} B/message)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark auto-mod rule evaluation")
+    parser.add_argument("--messages", type=int, default=5000, help="synthetic corpus size")
+    parser.add_argument("--users", type=int, default=200, help="distinct synthetic authors")
+    parser.add_argument("--rules", type=int, default=20, help="rules per guild")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="replay a recorded JSONL corpus instead of synthetic traffic")
+    parser.add_argument("--ai", action="store_true", help="add an AI rule (stubbed, no network)")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="simulated AI latency in seconds")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", help="fail when slower than this stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed throughput regression ratio")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5, help="allowed per-type p95 regression ratio")
+    parser.add_argument("--save-baseline", help="write results to this baseline file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.messages, args.users, args.seed)
+    rules = build_rules(args.rules, args.seed, args.ai)
+
+    print("🚀 Alphapy Auto-Mod Benchmark")
+    print("=" * 50)
+    report = asyncio.run(run_benchmark(corpus, rules, ai_latency=args.ai_latency,
+                                       allocations=not args.no_allocations))
+    print_report(report)
+    results = {key: value for key, value in report.items() if not key.startswith("_")}
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = check_regression(results, baseline, args.tolerance, args.latency_tolerance)
+        print("\n" + "=" * 50)
+        if failures:
+            for failure in failures:
+                print(f"❌ Regression: {failure}")
+            return 1
+        print("✅ No regression against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
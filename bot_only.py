@@ -94,6 +94,24 @@ settings_service.register(
         max_value=4320,
     )
 )
+settings_service.register(
+    SettingDefinition(
+        scope="embedwatcher",
+        key="non_embed_enabled",
+        description="Enable parsing of non-embed messages (plain text messages) for reminders.",
+        value_type="bool",
+        default=False,
+    )
+)
+settings_service.register(
+    SettingDefinition(
+        scope="embedwatcher",
+        key="process_bot_messages",
+        description="Enable processing of embeds/messages sent by the bot itself (e.g., from /embed command).",
+        value_type="bool",
+        default=False,
+    )
+)
 settings_service.register(
     SettingDefinition(
         scope="ticketbot",
@@ -15,6 +15,7 @@ from discord.ext import commands
 
 from utils.automod_logging import AutoModLogger
 from utils.automod_rules import ActionType, RuleProcessor
+from utils.automod_spam import RECENT_WINDOW, GuildSpamTracker
 from utils.cog_base import AlphaCog
 from utils.db_helpers import acquire_safe
 from utils.logger import logger
@@ -39,8 +40,19 @@ class AutoModeration(AlphaCog):
         super().__init__(bot)
         self.rule_processor = RuleProcessor(bot)
         self.mod_logger = AutoModLogger(bot)
-        self._spam_tracker: dict[int, dict[int, list[float]]] = {}  # guild_id -> user_id -> timestamps
-        self._message_cache: dict[int, dict[int, str]] = {}  # guild_id -> user_id -> last_message
+        self._spam_tracker: dict[int, GuildSpamTracker] = {}  # guild_id -> bounded per-user activity
+        self._spam_sweep_interval = 60.0
+        self._last_spam_sweep = 0.0
+
+    def get_cache_stats(self) -> dict[str, int]:
+        """Expose spam tracker and AI verdict cache metrics for API health dashboards."""
+        return {
+            **self.rule_processor.ai_moderator.get_stats(),
+            "automod_spam_guilds": len(self._spam_tracker),
+            "automod_spam_users": sum(len(tracker) for tracker in self._spam_tracker.values()),
+            "automod_spam_evictions": sum(tracker.evictions for tracker in self._spam_tracker.values()),
+            "automod_spam_bytes": sum(tracker.approx_bytes() for tracker in self._spam_tracker.values()),
+        }
         
     async def cog_load(self):
         """Initialize the auto-mod system."""
@@ -71,8 +83,7 @@ class AutoModeration(AlphaCog):
         guild_id = message.guild.id
             
         # Check if auto-mod is enabled for this guild
-        automod_enabled = self.settings.get("automod", "enabled", guild_id=guild_id)
-        if not automod_enabled:
+        if not self.settings.snapshot(guild_id).automod.enabled:
             return
             
         # Skip if user has administrator permissions
@@ -98,45 +109,45 @@ class AutoModeration(AlphaCog):
             return
             
         # Update spam tracking
-        self._update_spam_tracker(guild_id, user_id, time.time())
+        user_context = self._update_spam_tracker(guild_id, user_id, time.time())
 
-        # Process each rule
-        for rule in rules:
-            try:
-                result = await self.rule_processor.evaluate_rule(rule, message, self._get_user_context(guild_id, user_id))
-                if result.triggered:
-                    await self._handle_violation(message, rule, result)
-                    break  # Stop after first violation to avoid multiple actions
-            except Exception as e:
-                logger.error(f"Error evaluating rule {rule.get('id', 'unknown')}: {e}")
+        # Extract URLs, mentions and bad-word hits once for all rules
+        scan = self.rule_processor.scan_message(guild_id, message)
+
+        # Cheap rules first; AI rules only for messages that pass them
+        try:
+            violation = await self.rule_processor.find_violation(rules, message, user_context, scan)
+            if violation:
+                rule, result = violation
+                await self._handle_violation(message, rule, result)  # one action per message
+        except Exception as e:
+            logger.error(f"Error evaluating rules for message {message.id}: {e}")
 
-        # Update message cache for duplicate detection after evaluation,
+        # Update last-message hash for duplicate detection after evaluation,
         # so user context reflects the previous message when rules run.
-        if guild_id not in self._message_cache:
-            self._message_cache[guild_id] = {}
-        self._message_cache[guild_id][user_id] = message.content
+        self._spam_tracker[guild_id].remember_message(user_id, message.content)
                 
-    def _update_spam_tracker(self, guild_id: int, user_id: int, timestamp: float):
-        """Update spam tracking data for a user."""
-        if guild_id not in self._spam_tracker:
-            self._spam_tracker[guild_id] = {}
-            
-        if user_id not in self._spam_tracker[guild_id]:
-            self._spam_tracker[guild_id][user_id] = []
-            
-        # Add current timestamp and clean old ones (older than 5 minutes)
-        self._spam_tracker[guild_id][user_id].append(timestamp)
-        self._spam_tracker[guild_id][user_id] = [
-            ts for ts in self._spam_tracker[guild_id][user_id] 
-            if timestamp - ts < 300  # 5 minutes
-        ]
-        
-    def _get_user_context(self, guild_id: int, user_id: int) -> dict[str, Any]:
-        """Get context data for a user in a guild."""
+    def _update_spam_tracker(self, guild_id: int, user_id: int, timestamp: float) -> dict[str, Any]:
+        """Record a message for spam tracking and return the user's context."""
+        tracker = self._spam_tracker.get(guild_id)
+        if tracker is None:
+            tracker = self._spam_tracker[guild_id] = GuildSpamTracker()
+        activity = tracker.record(user_id, timestamp)
+
+        # Periodically evict idle users in guilds that went quiet
+        if timestamp - self._last_spam_sweep >= self._spam_sweep_interval:
+            self._last_spam_sweep = timestamp
+            for gid, other in list(self._spam_tracker.items()):
+                other.evict(timestamp)
+                if not other and gid != guild_id:
+                    del self._spam_tracker[gid]
+
         return {
-            'spam_count': len(self._spam_tracker.get(guild_id, {}).get(user_id, [])),
-            'last_message': self._message_cache.get(guild_id, {}).get(user_id, ''),
-            'message_timestamps': self._spam_tracker.get(guild_id, {}).get(user_id, [])
+            'spam_count': activity.count_since(timestamp - RECENT_WINDOW),
+            'last_message': activity.last_preview,
+            'last_message_hash': activity.last_hash,
+            'message_timestamps': activity.timestamps,
+            'now': timestamp,
         }
         
     async def _handle_violation(self, message: discord.Message, rule: dict[str, Any], result):
@@ -13,8 +13,9 @@ import time
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
+from utils.aho_corasick import WordAutomaton
 from utils.db_helpers import acquire_safe, get_bot_db_pool
 from utils.embed_builder import EmbedBuilder
 from utils.sanitizer import safe_embed_text
@@ -25,6 +26,9 @@ logger = logging.getLogger(__name__)
 # Cache TTL in seconds
 CACHE_TTL = 60.0
 
+# Seconds between batched writes of pending use-count deltas
+USES_FLUSH_INTERVAL = 30.0
+
 # Per-guild command limit
 MAX_COMMANDS_PER_GUILD = 50
 
@@ -102,24 +106,99 @@ def _paginate_list_lines(lines: list[str], max_chars: int = _CC_LIST_PAGE_DESC_M
     return pages
 
 
-def _trigger_matches(trigger_type: str, trigger_value: str, content: str, case_sensitive: bool) -> bool:
-    """Return True if the message content matches the trigger."""
-    compare = content if case_sensitive else content.lower()
-    pattern = trigger_value if case_sensitive else trigger_value.lower()
-
-    if trigger_type == "exact":
-        return compare == pattern
-    elif trigger_type == "starts_with":
-        return compare.startswith(pattern)
-    elif trigger_type == "contains":
-        return pattern in compare
-    elif trigger_type == "regex":
-        flags = 0 if case_sensitive else re.IGNORECASE
-        try:
-            return bool(re.search(trigger_value, content, flags))
-        except re.error:
-            return False
-    return False
+class _CaseIndex:
+    """Trigger lookups for one case mode; values are command positions (lower = higher priority)."""
+
+    __slots__ = ("exact", "prefixes", "max_prefix", "contains")
+
+    def __init__(self, triggers: list[tuple[str, str, int]]):
+        self.exact: dict[str, int] = {}
+        # Prefix trie: char -> child node; key None holds the position ending there
+        self.prefixes: dict = {}
+        self.max_prefix = 0
+        keywords: list[tuple[str, int]] = []
+        for trigger_type, value, pos in triggers:
+            if trigger_type == "exact":
+                self.exact.setdefault(value, pos)
+            elif trigger_type == "starts_with":
+                node = self.prefixes
+                for ch in value:
+                    node = node.setdefault(ch, {})
+                node.setdefault(None, pos)
+                self.max_prefix = max(self.max_prefix, len(value))
+            elif trigger_type == "contains":
+                keywords.append((value, pos))
+        self.contains = WordAutomaton(keywords) if keywords else None
+
+    def best(self, text: str) -> int | None:
+        best = self.exact.get(text)
+        node = self.prefixes
+        if None in node:
+            best = node[None] if best is None else min(best, node[None])
+        for ch in text[:self.max_prefix]:
+            node = node.get(ch)
+            if node is None:
+                break
+            pos = node.get(None)
+            if pos is not None and (best is None or pos < best):
+                best = pos
+        if self.contains is not None:
+            hits = self.contains.search(text)
+            if hits:
+                first = min(hits)
+                if best is None or first < best:
+                    best = first
+        return best
+
+
+class CompiledTriggers:
+    """Precompiled matcher over a guild's enabled commands.
+
+    Exact triggers are a dict lookup, ``starts_with`` triggers a prefix trie
+    and ``contains`` triggers one ``WordAutomaton``, each built separately for
+    case-sensitive and case-insensitive commands so the message is lowercased
+    at most once. Regex triggers are compiled up front; invalid patterns never
+    match. ``match`` returns the first command (in list order) that matches.
+    """
+
+    __slots__ = ("commands", "sensitive", "insensitive", "regexes")
+
+    def __init__(self, commands_list: list[dict]):
+        self.commands = commands_list
+        sensitive: list[tuple[str, str, int]] = []
+        insensitive: list[tuple[str, str, int]] = []
+        self.regexes: list[tuple[int, re.Pattern[str]]] = []
+        for pos, cmd in enumerate(commands_list):
+            trigger_type = cmd["trigger_type"]
+            value = cmd["trigger_value"]
+            if trigger_type == "regex":
+                try:
+                    flags = 0 if cmd["case_sensitive"] else re.IGNORECASE
+                    self.regexes.append((pos, re.compile(value, flags)))
+                except re.error:
+                    continue
+            elif cmd["case_sensitive"]:
+                sensitive.append((trigger_type, value, pos))
+            else:
+                insensitive.append((trigger_type, value.lower(), pos))
+        self.sensitive = _CaseIndex(sensitive) if sensitive else None
+        self.insensitive = _CaseIndex(insensitive) if insensitive else None
+
+    def match(self, content: str) -> dict | None:
+        best: int | None = None
+        if self.sensitive is not None:
+            best = self.sensitive.best(content)
+        if self.insensitive is not None:
+            pos = self.insensitive.best(content.lower())
+            if pos is not None and (best is None or pos < best):
+                best = pos
+        for pos, pattern in self.regexes:
+            if best is not None and pos >= best:
+                break
+            if pattern.search(content):
+                best = pos
+                break
+        return self.commands[best] if best is not None else None
 
 
 class EditCommandModal(discord.ui.Modal, title="Edit Custom Command"):
@@ -237,13 +316,20 @@ class CustomCommandsCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # guild_id -> (timestamp, list[dict])
-        self._cache: dict[int, tuple[float, list[dict]]] = {}
+        # guild_id -> (timestamp, compiled triggers over the enabled commands)
+        self._cache: dict[int, tuple[float, CompiledTriggers]] = {}
+        # (guild_id, command_id) -> uses not yet written to custom_commands.uses
+        self._pending_uses: dict[tuple[int, int], int] = {}
+        # Deltas of the flush in progress: written but not yet folded into the cache
+        self._inflight_uses: dict[tuple[int, int], int] = {}
 
     async def cog_load(self):
         logger.info("Loading CustomCommands cog...")
+        self.flush_uses.start()
 
     async def cog_unload(self):
+        self.flush_uses.cancel()
+        await self._flush_uses()
         self._cache.clear()
         logger.info("CustomCommands cog unloaded.")
 
@@ -252,15 +338,15 @@ class CustomCommandsCog(commands.Cog):
     def _invalidate_cache(self, guild_id: int) -> None:
         self._cache.pop(guild_id, None)
 
-    async def _get_commands(self, guild_id: int) -> list[dict]:
-        """Return guild's enabled custom commands, using cache when fresh."""
+    async def _get_triggers(self, guild_id: int) -> CompiledTriggers | None:
+        """Return the guild's compiled triggers, using cache when fresh."""
         cached = self._cache.get(guild_id)
         if cached and (time.monotonic() - cached[0]) < CACHE_TTL:
             return cached[1]
 
         pool = get_bot_db_pool(self.bot)
         if not pool:
-            return []
+            return None
 
         async with acquire_safe(pool) as conn:
             rows = await conn.fetch(
@@ -274,9 +360,9 @@ class CustomCommandsCog(commands.Cog):
                 guild_id,
             )
 
-        result = [dict(r) for r in rows]
-        self._cache[guild_id] = (time.monotonic(), result)
-        return result
+        triggers = CompiledTriggers([dict(r) for r in rows])
+        self._cache[guild_id] = (time.monotonic(), triggers)
+        return triggers
 
     # ---------------------------------------------------------- message listener
 
@@ -291,58 +377,94 @@ class CustomCommandsCog(commands.Cog):
         if not content:
             return
 
-        commands_list = await self._get_commands(message.guild.id)
-        if not commands_list:
+        triggers = await self._get_triggers(message.guild.id)
+        if triggers is None:
             return
 
-        for cmd in commands_list:
-            if not _trigger_matches(
-                cmd["trigger_type"],
-                cmd["trigger_value"],
-                content,
-                cmd["case_sensitive"],
-            ):
-                continue
+        # Only the first matching command fires
+        cmd = triggers.match(content)
+        if cmd is None:
+            return
 
-            # Resolve response
-            resolved = _resolve_response(cmd["response"], message, cmd["uses"])
+        # Resolve response ({uses} = cached count plus uses not yet folded into it)
+        use_key = (message.guild.id, cmd["id"])
+        uses = cmd["uses"] + self._pending_uses.get(use_key, 0) + self._inflight_uses.get(use_key, 0)
+        resolved = _resolve_response(cmd["response"], message, uses)
 
-            # Send response
-            try:
-                if cmd["reply_to_user"]:
-                    await message.reply(resolved, mention_author=False)
-                else:
-                    await message.channel.send(resolved)
-            except discord.HTTPException as e:
-                logger.warning(f"CustomCommands: failed to send response for '{cmd['name']}': {e}")
-                break
+        # Send response
+        try:
+            if cmd["reply_to_user"]:
+                await message.reply(resolved, mention_author=False)
+            else:
+                await message.channel.send(resolved)
+        except discord.HTTPException as e:
+            logger.warning(f"CustomCommands: failed to send response for '{cmd['name']}': {e}")
+            return
 
-            # Delete trigger message if configured
-            if cmd["delete_trigger"]:
-                try:
-                    await message.delete()
-                except (discord.Forbidden, discord.HTTPException):
-                    pass
+        # Delete trigger message if configured
+        if cmd["delete_trigger"]:
+            try:
+                await message.delete()
+            except (discord.Forbidden, discord.HTTPException):
+                pass
 
-            # Increment use counter (fire-and-forget, don't block)
-            self.bot.loop.create_task(self._increment_uses(cmd["id"], message.guild.id))
+        # Count the use in memory; flush_uses writes the deltas in batches
+        self._pending_uses[use_key] = self._pending_uses.get(use_key, 0) + 1
 
-            break  # Only fire first matching command
+    @tasks.loop(seconds=USES_FLUSH_INTERVAL)
+    async def flush_uses(self) -> None:
+        """Write pending use-count deltas to custom_commands.uses."""
+        await self._flush_uses()
 
-    async def _increment_uses(self, command_id: int, guild_id: int) -> None:
+    async def _flush_uses(self) -> None:
+        if not self._pending_uses or self._inflight_uses:
+            return  # nothing to write, or a flush is already running
         pool = get_bot_db_pool(self.bot)
         if not pool:
             return
+        pending, self._pending_uses = self._pending_uses, {}
+        self._inflight_uses = pending
+        # Load time of each cache entry before the UPDATE: an entry reloaded
+        # while it runs may or may not have read the new counts.
+        loaded_at = {
+            guild_id: cached[0]
+            for guild_id, _ in pending
+            if (cached := self._cache.get(guild_id)) is not None
+        }
         try:
             async with acquire_safe(pool) as conn:
                 await conn.execute(
-                    "UPDATE custom_commands SET uses = uses + 1 WHERE id = $1",
-                    command_id,
+                    """
+                    UPDATE custom_commands AS c
+                    SET uses = c.uses + d.delta
+                    FROM unnest($1::int[], $2::int[]) AS d(id, delta)
+                    WHERE c.id = d.id
+                    """,
+                    [command_id for _, command_id in pending],
+                    list(pending.values()),
                 )
-            # Invalidate cache so the next fetch reflects updated use count
-            self._invalidate_cache(guild_id)
         except Exception as e:
-            logger.debug(f"CustomCommands: failed to increment uses for id={command_id}: {e}")
+            logger.debug(f"CustomCommands: failed to flush {len(pending)} use counts: {e}")
+            self._inflight_uses = {}
+            for key, delta in pending.items():
+                self._pending_uses[key] = self._pending_uses.get(key, 0) + delta
+            return
+
+        # Fold the written deltas into the cached rows so {uses} stays correct
+        # without reloading the guild's commands. An entry reloaded during the
+        # UPDATE is dropped instead; the next read loads the committed counts.
+        for (guild_id, command_id), delta in pending.items():
+            cached = self._cache.get(guild_id)
+            if not cached:
+                continue
+            if cached[0] != loaded_at.get(guild_id):
+                self._invalidate_cache(guild_id)
+                continue
+            for cmd in cached[1].commands:
+                if cmd["id"] == command_id:
+                    cmd["uses"] += delta
+                    break
+        self._inflight_uses = {}
 
     # ---------------------------------------------------------- slash commands
 
@@ -568,6 +690,7 @@ class CustomCommandsCog(commands.Cog):
             return
 
         await interaction.response.defer(ephemeral=True)
+        await self._flush_uses()  # show up-to-date use counts
 
         pool = get_bot_db_pool(self.bot)
         if not pool:
@@ -639,6 +762,7 @@ class CustomCommandsCog(commands.Cog):
             return
 
         await interaction.response.defer(ephemeral=True)
+        await self._flush_uses()  # show up-to-date use counts
 
         pool = get_bot_db_pool(self.bot)
         if not pool:
@@ -15,6 +15,7 @@ from discord.ext import commands
 import config
 from utils.db_helpers import acquire_safe, is_pool_healthy
 from utils.logger import logger
+from utils.premium_guard import forget_gpt_usage
 
 
 class ConfirmDeleteView(discord.ui.View):
@@ -45,6 +46,8 @@ class ConfirmDeleteView(discord.ui.View):
             )
             return
 
+        # Before the purge, so a GPT quota flush cannot re-create gpt_usage rows
+        await forget_gpt_usage(interaction.user.id)
         try:
             await _purge_user_data(self.cog.db, interaction.user.id)
         except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
@@ -62,6 +65,9 @@ class ConfirmDeleteView(discord.ui.View):
             )
             return
 
+        verification = self.cog.bot.get_cog("VerificationCog")
+        if verification is not None:
+            verification.forget_user_submissions(interaction.user.id)
         logger.info("delete_my_data: Data purge complete for user_id=%s", interaction.user.id)
         await interaction.edit_original_response(
             content=(
@@ -102,6 +108,7 @@ async def _purge_user_data(pool: asyncpg.Pool, user_id: int) -> None:
         ("automod_logs", "user_id"),
         ("automod_user_history", "user_id"),
         ("app_reflections", "user_id"),
+        ("verification_image_hashes", "user_id"),
     ]
     tables_to_anonymize = [
         ("reminders", "created_by"),
@@ -69,15 +69,16 @@ class EmbedReminderWatcher(AlphaCog):
         if not message.guild:
             return  # Skip messages not in a guild
         
-        announcements_channel_id = self._get_announcements_channel_id(message.guild.id)
-        if message.channel.id != announcements_channel_id:
+        # One snapshot lookup per message instead of a settings read per key
+        watcher_settings = self.settings.snapshot(message.guild.id).embedwatcher
+        if message.channel.id != (watcher_settings.announcements_channel_id or 0):
             return
         
         is_bot_message = message.author.id == getattr(self.bot.user, 'id', None)
         
         # Skip messages from the bot itself unless processing bot messages is enabled
         if is_bot_message:
-            if not self._is_process_bot_messages_enabled(message.guild.id):
+            if not watcher_settings.process_bot_messages:
                 return
         
         # Loop protection: Check if we already processed this message (for both bot and user messages)
@@ -141,7 +142,7 @@ class EmbedReminderWatcher(AlphaCog):
                 await self._log_failed_parse(embed, message.guild.id, message, "embed")
                 return
         # Check for non-embed messages if enabled
-        elif self._is_non_embed_enabled(message.guild.id) and message.content:
+        elif watcher_settings.non_embed_enabled and message.content:
             message_type = "text"
             # Convert message to a mock embed for parsing
             title_text = message.content[:256] if len(message.content) > 100 else message.content[:100] if message.content else "Message"
@@ -661,9 +662,6 @@ class EmbedReminderWatcher(AlphaCog):
         await interaction.followup.send("⚠️ No embed found in the last 10 messages.")
 
 
-    def _get_announcements_channel_id(self, guild_id: int) -> int:
-        return self.settings_helper.get_int("embedwatcher", "announcements_channel_id", guild_id, fallback=0)
-
     def _get_log_channel_id(self, guild_id: int) -> int:
         return self.settings_helper.get_int("system", "log_channel_id", guild_id, fallback=0)
 
@@ -680,14 +678,6 @@ class EmbedReminderWatcher(AlphaCog):
         # Fallback to system log channel
         return self.settings_helper.get_int("system", "log_channel_id", guild_id, fallback=0)
 
-    def _is_non_embed_enabled(self, guild_id: int) -> bool:
-        """Check if non-embed message parsing is enabled."""
-        return self.settings_helper.get_bool("embedwatcher", "non_embed_enabled", guild_id, fallback=False)
-
-    def _is_process_bot_messages_enabled(self, guild_id: int) -> bool:
-        """Check if processing bot's own messages is enabled."""
-        return self.settings_helper.get_bool("embedwatcher", "process_bot_messages", guild_id, fallback=False)
-
     async def _check_existing_reminder_for_message(self, guild_id: int, channel_id: int, message_id: int) -> int | None:
         """Check if a reminder already exists for this message to prevent duplicate processing."""
         if not is_pool_healthy(self.db):
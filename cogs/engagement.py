@@ -16,10 +16,12 @@ Each feature is independently toggled per guild via:
 
 on_message: indexes messages for weekly awards, tracks challenge counts, updates streaks.
 on_raw_reaction_add: increments reaction counts for weekly awards and handles OG claims.
+Per-message writes go through utils.engagement_buffer and are flushed in bulk.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import time
 from datetime import UTC, datetime
@@ -27,10 +29,11 @@ from typing import Any
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from utils.db_helpers import get_bot_db_pool
 from utils.embed_builder import EmbedBuilder
+from utils.engagement_buffer import FLUSH_INTERVAL, engagement_buffer
 from utils.engagement_service import (
     _active_challenges,
     _challenge_lock,
@@ -65,10 +68,6 @@ from utils.engagement_service import (
     rehydrate_challenges,
     reschedule_challenge,
     schedule_challenge,
-    set_streak,
-    weekly_increment_reaction,
-    # Weekly
-    weekly_index_message,
 )
 from utils.logger import logger
 
@@ -109,6 +108,7 @@ def get_engagement_cache_stats() -> dict[str, int]:
         "engagement_feature_flag_cache_misses": int(_cache_stats["feature_flag_misses"]),
         "engagement_food_channels_cache_hits": int(_cache_stats["food_channels_hits"]),
         "engagement_food_channels_cache_misses": int(_cache_stats["food_channels_misses"]),
+        **engagement_buffer.get_stats(),
     }
 
 
@@ -817,6 +817,10 @@ class EngagementCog(commands.Cog):
         settings = getattr(bot, "settings", None)
         if settings:
             settings.add_global_listener(self._settings_listener)
+        self._early_flush: asyncio.Task | None = None
+
+    async def cog_load(self) -> None:
+        self.flush_buffer.start()
 
     async def _on_setting_changed(self, scope: str, key: str, guild_id: int, _value: Any) -> None:
         _invalidate_engagement_cache(scope, key, guild_id)
@@ -826,6 +830,18 @@ class EngagementCog(commands.Cog):
         self.bot.tree.remove_command("badge")
         self.bot.tree.remove_command("og")
         self.bot.tree.remove_command("weekly")
+        self.flush_buffer.cancel()
+        await engagement_buffer.flush(get_bot_db_pool(self.bot))
+
+    @tasks.loop(seconds=FLUSH_INTERVAL)
+    async def flush_buffer(self) -> None:
+        """Write buffered message indexes, reactions, challenge counts and streaks."""
+        await engagement_buffer.flush(get_bot_db_pool(self.bot))
+
+    def _flush_if_full(self) -> None:
+        """Flush early when a burst fills the buffer before the next interval."""
+        if engagement_buffer.should_flush() and (self._early_flush is None or self._early_flush.done()):
+            self._early_flush = asyncio.create_task(engagement_buffer.flush(get_bot_db_pool(self.bot)))
 
     # -----------------------------------------------------------------------
     # Startup
@@ -869,19 +885,14 @@ class EngagementCog(commands.Cog):
                     continue
                 mode = rt.get("mode", "leaderboard")
                 counts = rt.setdefault("message_counts", {})
-                try:
-                    if mode == "leaderboard":
-                        await challenge_add_participant(pool, chal_id, user_id, increment=True)
-                        counts[user_id] = counts.get(user_id, 0) + 1
-                    else:
-                        await challenge_add_participant(pool, chal_id, user_id, increment=False)
-                        counts.setdefault(user_id, 1)
-                except Exception as exc:
-                    logger.warning(f"[engagement] challenge count error: {exc}")
-                    if mode == "leaderboard":
-                        counts[user_id] = counts.get(user_id, 0) + 1
-                    else:
-                        counts.setdefault(user_id, 1)
+                if mode == "leaderboard":
+                    if pool:
+                        engagement_buffer.count_challenge_message(chal_id, user_id, increment=True)
+                    counts[user_id] = counts.get(user_id, 0) + 1
+                else:
+                    if pool:
+                        engagement_buffer.count_challenge_message(chal_id, user_id, increment=False)
+                    counts.setdefault(user_id, 1)
 
         # --- Weekly: index message ---
         if await _is_enabled(self.bot, guild_id, "weekly") and pool:
@@ -897,26 +908,31 @@ class EngagementCog(commands.Cog):
                     message.channel.id in food_channel_ids
                     or any(hint in ch_name for hint in food_hints)
                 )
-                await weekly_index_message(
-                    pool,
+                engagement_buffer.index_message(
                     guild_id,
                     message.id,
                     message.channel.id,
                     user_id,
-                    int(message.created_at.timestamp()),
+                    message.created_at,
                     has_image,
                     is_food,
                 )
             except Exception as exc:
                 logger.warning(f"[engagement] weekly index error: {exc}")
 
+        self._flush_if_full()
+
         # --- Streaks ---
         if await _is_enabled(self.bot, guild_id, "streaks") and pool:
             try:
                 if not isinstance(message.author, discord.Member):
                     return
                 today = datetime.now(UTC).date()
-                row = await get_streak(pool, guild_id, user_id)
+                row = engagement_buffer.get_streak(guild_id, user_id)
+                if row is None:
+                    row = await get_streak(pool, guild_id, user_id)
+                    if row:
+                        engagement_buffer.remember_streak(guild_id, user_id, row)
                 stored_base: str | None = None
                 update_db = False
 
@@ -949,7 +965,7 @@ class EngagementCog(commands.Cog):
                         update_db = True
 
                 if update_db:
-                    await set_streak(pool, guild_id, user_id, today, new_days, base_for_db)
+                    engagement_buffer.set_streak(guild_id, user_id, today, new_days, base_for_db)
             except Exception as exc:
                 logger.warning(f"[engagement] streak update error: {exc}")
 
@@ -967,10 +983,8 @@ class EngagementCog(commands.Cog):
 
         # --- Weekly: increment reaction count ---
         if await _is_enabled(self.bot, guild_id, "weekly") and pool:
-            try:
-                await weekly_increment_reaction(pool, guild_id, payload.message_id)
-            except Exception as exc:
-                logger.warning(f"[engagement] weekly reaction increment error: {exc}")
+            engagement_buffer.add_reaction(guild_id, payload.message_id)
+            self._flush_if_full()
 
         # --- OG Claims ---
         if not await _is_enabled(self.bot, guild_id, "og"):
@@ -10,12 +10,30 @@ try:
 except ImportError:
     import config  # type: ignore
 
-from utils.csv_helpers import create_csv_buffer, create_discord_file_from_buffer
+from utils.csv_helpers import StreamingCsvExport, send_export_files, stream_query_to_csv
 from utils.db_helpers import acquire_safe, is_pool_healthy
 from utils.logger import logger
 from utils.validators import validate_admin
 
 
+def _export_target(interaction: discord.Interaction, filename: str, fieldnames: list[str]) -> StreamingCsvExport:
+    """Streaming CSV export sized to the guild's upload limit."""
+    guild = interaction.guild
+    if guild is None:
+        return StreamingCsvExport(filename, fieldnames)
+    return StreamingCsvExport(filename, fieldnames, max_part_bytes=guild.filesize_limit)
+
+
+def _faq_values(record) -> list:
+    return [
+        record["id"],
+        record["title"],
+        record["summary"],
+        ";".join(record["keywords"] or []),
+        record["created_at"],
+    ]
+
+
 class Exports(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -58,9 +76,13 @@ class Exports(commands.Cog):
                 where = "WHERE created_at >= NOW() - INTERVAL '7 days'"
             elif scope == "30d":
                 where = "WHERE created_at >= NOW() - INTERVAL '30 days'"
+            fieldnames = ["id", "user_id", "username", "status", "created_at", "updated_at", "claimed_by", "channel_id"]
+            export = _export_target(interaction, f"tickets_{scope or 'all'}.csv", fieldnames)
             async with acquire_safe(self.db) as conn:
-                rows = await conn.fetch(
-                    f"SELECT id, user_id, username, status, created_at, updated_at, claimed_by, channel_id FROM support_tickets {where} ORDER BY id DESC"
+                await stream_query_to_csv(
+                    conn,
+                    f"SELECT id, user_id, username, status, created_at, updated_at, claimed_by, channel_id FROM support_tickets {where} ORDER BY id DESC",
+                    export=export,
                 )
         except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
             logger.warning(f"Database connection error in export_tickets: {conn_err}")
@@ -70,11 +92,9 @@ class Exports(commands.Cog):
             logger.error(f"Database error in export_tickets: {e}")
             await interaction.followup.send("❌ Database error. Please try again later.", ephemeral=True)
             return
-        csv_rows = [dict(r) for r in rows]
-        fieldnames = ["id", "user_id", "username", "status", "created_at", "updated_at", "claimed_by", "channel_id"]
-        buf = create_csv_buffer(csv_rows, fieldnames=fieldnames)
-        data = create_discord_file_from_buffer(buf, f"tickets_{scope or 'all'}.csv")
-        await interaction.followup.send(content=f"✅ Exported {len(rows)} tickets (scope={scope}).", file=data, ephemeral=True)
+        await send_export_files(
+            interaction, f"✅ Exported {export.rows} tickets (scope={scope}).", export.files()
+        )
 
     @app_commands.command(name="export_faq", description="Export FAQ entries as CSV (admin)")
     async def export_faq(self, interaction: discord.Interaction):
@@ -87,8 +107,14 @@ class Exports(commands.Cog):
             await interaction.followup.send("❌ Database not connected.", ephemeral=True)
             return
         try:
+            export = _export_target(interaction, "faq.csv", ["id", "title", "summary", "keywords", "created_at"])
             async with acquire_safe(self.db) as conn:
-                rows = await conn.fetch("SELECT id, title, summary, keywords, created_at FROM faq_entries ORDER BY id DESC")
+                await stream_query_to_csv(
+                    conn,
+                    "SELECT id, title, summary, keywords, created_at FROM faq_entries ORDER BY id DESC",
+                    export=export,
+                    transform=_faq_values,
+                )
         except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
             logger.warning(f"Database connection error in export_faq: {conn_err}")
             await interaction.followup.send("❌ Database connection error. Please try again later.", ephemeral=True)
@@ -97,19 +123,7 @@ class Exports(commands.Cog):
             logger.error(f"Database error in export_faq: {e}")
             await interaction.followup.send("❌ Database error. Please try again later.", ephemeral=True)
             return
-        csv_rows = []
-        for r in rows:
-            csv_rows.append({
-                "id": r.get("id"),
-                "title": r.get("title"),
-                "summary": r.get("summary"),
-                "keywords": ";".join(r.get("keywords") or []),
-                "created_at": r.get("created_at"),
-            })
-        fieldnames = ["id", "title", "summary", "keywords", "created_at"]
-        buf = create_csv_buffer(csv_rows, fieldnames=fieldnames)
-        data = create_discord_file_from_buffer(buf, "faq.csv")
-        await interaction.followup.send(content=f"✅ Exported {len(rows)} FAQ entries.", file=data, ephemeral=True)
+        await send_export_files(interaction, f"✅ Exported {export.rows} FAQ entries.", export.files())
 
 
 async def setup(bot: commands.Bot):
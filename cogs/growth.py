@@ -8,6 +8,7 @@ from discord import app_commands
 from discord.app_commands import checks as app_checks
 from discord.ext import commands
 
+from gpt.context_loader import invalidate_reflection_context
 from gpt.helpers import ask_gpt, log_gpt_error
 from utils.db_helpers import acquire_safe, get_bot_db_pool
 from utils.sanitizer import safe_embed_text
@@ -241,6 +242,7 @@ Keep your response under 250 words. End with a complete sentence.
                         future_message=reply,
                         date=datetime.now(UTC),
                     )
+                    invalidate_reflection_context(discord_id=interaction.user.id)
                     if not success:
                         logger.debug(
                             "Skipping Supabase reflection sync: no profile linked to discord_id=%s",
@@ -320,6 +322,7 @@ class GrowthDeleteConfirmView(discord.ui.View):
                 "reflections",
                 {"id": f"eq.{row_id}", "user_id": f"eq.{self.supabase_user_id}"},
             )
+            invalidate_reflection_context(discord_id=interaction.user.id, supabase_user_id=self.supabase_user_id)
             # Remove from in-memory list and adjust page if needed
             reflections = self.back_view.reflections
             self.back_view.reflections = [r for r in reflections if r.get("id") != row_id]
@@ -1,4 +1,6 @@
 import asyncio
+import time
+from collections import Counter, deque
 
 import asyncpg
 import discord
@@ -12,11 +14,34 @@ from utils.db_helpers import acquire_safe, is_pool_healthy
 from utils.embed_builder import EmbedBuilder
 from utils.logger import logger
 
+# Seconds to wait after a join for Discord to update invite uses; joins in the
+# same guild during this window share one guild.invites() fetch.
+JOIN_BATCH_DELAY = 1.0
+# Single-use invites are deleted by Discord right after the join; a deletion
+# this recent is still attributed to a join that finds no other used invite.
+EXHAUSTED_INVITE_WINDOW = 10.0
+
+
+def _used_invites(old: dict[str, discord.Invite], new: list[discord.Invite]) -> list[discord.Invite]:
+    """One entry per use since the previous snapshot, diffed by invite code."""
+    used: list[discord.Invite] = []
+    for invite in new:
+        previous = old.get(invite.code)
+        delta = (invite.uses or 0) - ((previous.uses or 0) if previous else 0)
+        if delta > 0:
+            used.extend([invite] * delta)
+    return used
+
 
 class InviteTracker(AlphaCog):
     def __init__(self, bot: commands.Bot):
         super().__init__(bot)
-        self.invites_cache = {}
+        # guild_id -> {invite code: invite}, kept current by invite create/delete events
+        self.invites_cache: dict[int, dict[str, discord.Invite]] = {}
+        # guild_id -> members waiting for the current batch's invite fetch
+        self._pending_joins: dict[int, list[discord.Member]] = {}
+        # guild_id -> (deleted_at, invite) for invites deleted at their last use
+        self._exhausted: dict[int, deque[tuple[float, discord.Invite]]] = {}
         self.db: asyncpg.Pool | None = None
         from utils.database_helpers import DatabaseManager
         self._db_manager = DatabaseManager("inviteboard", {"DATABASE_URL": getattr(config, "DATABASE_URL", "")})
@@ -27,11 +52,24 @@ class InviteTracker(AlphaCog):
         await self.bot.wait_until_ready()  # Wait until the bot is ready
         for guild in self.bot.guilds:
             try:
-                self.invites_cache[guild.id] = await guild.invites()
+                self.invites_cache[guild.id] = {invite.code: invite for invite in await guild.invites()}
             except Exception as exc:
                 logger.warning(f"InviteTracker: could not load invites for guild {guild.id}: {exc}")
         logger.info("Invite cache loaded.")
 
+    @commands.Cog.listener()
+    async def on_invite_create(self, invite: discord.Invite):
+        if invite.guild is not None:
+            self.invites_cache.setdefault(invite.guild.id, {})[invite.code] = invite
+
+    @commands.Cog.listener()
+    async def on_invite_delete(self, invite: discord.Invite):
+        if invite.guild is None:
+            return
+        cached = self.invites_cache.get(invite.guild.id, {}).pop(invite.code, None)
+        if cached is not None and cached.max_uses and (cached.uses or 0) + 1 >= cached.max_uses:
+            self._exhausted.setdefault(invite.guild.id, deque(maxlen=50)).append((time.monotonic(), cached))
+
     async def setup_database(self):
         """Initialize PostgreSQL database and create tables if needed."""
         try:
@@ -65,37 +103,41 @@ class InviteTracker(AlphaCog):
             self._db_manager._pool = None
         self.db = None
 
-    async def update_invite_count(self, guild_id: int, inviter_id: int, count: int | None = None):
-        """Increment or set the invite count in the database."""
+    async def update_invite_count(
+        self, guild_id: int, inviter_id: int, count: int | None = None, increment: int = 1
+    ) -> int | None:
+        """Increment or set the invite count in the database; returns the new count."""
         if not is_pool_healthy(self.db):
             logger.warning("InviteTracker: Database pool not available")
-            return
+            return None
         try:
             async with acquire_safe(self.db) as conn:
                 if count is None:
-                    # Increment invites by 1 when no specific value is given
-                    await conn.execute(
-                        """
-                        INSERT INTO invite_tracker (guild_id, user_id, invite_count)
-                        VALUES ($1, $2, 1)
-                        ON CONFLICT(guild_id, user_id) DO UPDATE SET invite_count = invite_tracker.invite_count + 1;
-                        """,
-                        guild_id, inviter_id
-                    )
-                else:
-                    # Set invite count manually
-                    await conn.execute(
+                    # Increment invites when no specific value is given
+                    return await conn.fetchval(
                         """
                         INSERT INTO invite_tracker (guild_id, user_id, invite_count)
                         VALUES ($1, $2, $3)
-                        ON CONFLICT(guild_id, user_id) DO UPDATE SET invite_count = $3;
+                        ON CONFLICT(guild_id, user_id) DO UPDATE SET invite_count = invite_tracker.invite_count + $3
+                        RETURNING invite_count;
                         """,
-                        guild_id, inviter_id, count
+                        guild_id, inviter_id, increment
                     )
+                # Set invite count manually
+                return await conn.fetchval(
+                    """
+                    INSERT INTO invite_tracker (guild_id, user_id, invite_count)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT(guild_id, user_id) DO UPDATE SET invite_count = $3
+                    RETURNING invite_count;
+                    """,
+                    guild_id, inviter_id, count
+                )
         except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
             logger.warning(f"Database connection error in update_invite_count: {conn_err}")
         except Exception as e:
             logger.error(f"Database error in update_invite_count: {e}")
+        return None
     
     async def get_invite_leaderboard(self, guild_id: int, limit=10):
         """Fetch top users by invite count."""
@@ -227,28 +269,49 @@ class InviteTracker(AlphaCog):
             return
         await self.bot.wait_until_ready()  # Ensure the bot is ready
 
+        # The first join of a burst owns the batch; later joins just queue up.
+        guild_id = member.guild.id
+        batch = self._pending_joins.get(guild_id)
+        if batch is not None:
+            batch.append(member)
+            return
+        self._pending_joins[guild_id] = [member]
+
         # Brief wait for Discord to update invites
-        await asyncio.sleep(1)
+        await asyncio.sleep(JOIN_BATCH_DELAY)
+        members = self._pending_joins.pop(guild_id, [member])
+        await self._process_joins(member.guild, members)
+
+    def _take_exhausted(self, guild_id: int, count: int) -> list[discord.Invite]:
+        """Recently deleted single-use invites, oldest first, for joins without a match."""
+        recent = self._exhausted.get(guild_id)
+        taken: list[discord.Invite] = []
+        cutoff = time.monotonic() - EXHAUSTED_INVITE_WINDOW
+        while recent and len(taken) < count:
+            deleted_at, invite = recent.popleft()
+            if deleted_at >= cutoff:
+                taken.append(invite)
+        return taken
 
-        guild = member.guild
+    async def _process_joins(self, guild: discord.Guild, members: list[discord.Member]):
+        """Attribute a batch of joins with one invite fetch and announce them."""
         try:
             new_invites = await guild.invites()
         except Exception as e:
             logger.warning(f"⚠️ Could not fetch guild invites: {e}")
             return
-        old_invites = self.invites_cache.get(guild.id, [])
 
-        inviter = None
+        # Find which invites were used (one entry per use), matched to joins in order.
+        # Without a previous snapshot (invites not loaded yet) nothing can be attributed.
+        previous = self.invites_cache.get(guild.id)
+        used = _used_invites(previous, new_invites) if previous is not None else []
+        if len(used) < len(members):
+            used.extend(self._take_exhausted(guild.id, len(members) - len(used)))
+        inviters = [invite.inviter for invite in used[:len(members)]]
+        inviters.extend([None] * (len(members) - len(inviters)))
 
-        # Find which invite was used
-        for old_invite in old_invites:
-            for new_invite in new_invites:
-                if old_invite.code == new_invite.code and old_invite.uses < new_invite.uses:
-                    inviter = new_invite.inviter
-                    break
-        
         # Update cache with new invites
-        self.invites_cache[guild.id] = new_invites
+        self.invites_cache[guild.id] = {invite.code: invite for invite in new_invites}
 
         # Send a message in the channel
         channel_id = self._get_announcement_channel_id(guild.id)
@@ -265,35 +328,32 @@ class InviteTracker(AlphaCog):
             logger.warning("InviteTracker: could not find or access announcement channel.")
             return
 
-        if inviter:
-            await self.update_invite_count(member.guild.id, inviter.id)
-            # Fetch current invite count after update
-            invite_count = 0
-            if is_pool_healthy(self.db):
-                try:
-                    async with acquire_safe(self.db) as conn:
-                        row = await conn.fetchrow("SELECT invite_count FROM invite_tracker WHERE guild_id = $1 AND user_id = $2", member.guild.id, inviter.id)
-                        invite_count = row["invite_count"] if row else 0
-                except Exception as e:
-                    logger.warning(f"⚠️ InviteTracker: DB error while fetching invite_count: {e}")
-                    invite_count = 0
-            message = self._render_template(
-                self._get_template(with_inviter=True, guild_id=member.guild.id),
-                member=member,
-                inviter=inviter,
-                count=invite_count,
-            )
-            await channel.send(message)
-        else:
-            message = self._render_template(
-                self._get_template(with_inviter=False, guild_id=member.guild.id),
-                member=member,
-                inviter=None,
-                count=None,
-            )
+        # One UPDATE ... RETURNING per inviter, however many of the joins they brought in
+        per_inviter = Counter(inviter.id for inviter in inviters if inviter is not None)
+        totals: dict[int, int] = {}
+        for inviter_id, amount in per_inviter.items():
+            total = await self.update_invite_count(guild.id, inviter_id, increment=amount)
+            totals[inviter_id] = (total or 0) - amount
+
+        for member, inviter in zip(members, inviters, strict=True):
+            if inviter:
+                totals[inviter.id] += 1
+                message = self._render_template(
+                    self._get_template(with_inviter=True, guild_id=guild.id),
+                    member=member,
+                    inviter=inviter,
+                    count=max(totals[inviter.id], 0),
+                )
+            else:
+                message = self._render_template(
+                    self._get_template(with_inviter=False, guild_id=guild.id),
+                    member=member,
+                    inviter=None,
+                    count=None,
+                )
             await channel.send(message)
 
-        logger.info(f"InviteTracker: message sent in {getattr(channel, 'name', channel_id)} for {member}") 
+            logger.info(f"InviteTracker: message sent in {getattr(channel, 'name', channel_id)} for {member}")
 
 
 async def setup(bot: commands.Bot):
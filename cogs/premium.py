@@ -376,7 +376,7 @@ class PremiumCog(commands.Cog):
         self.bot = bot
         self.db: asyncpg.Pool | None = None
         from utils.database_helpers import DatabaseManager
-        self._db_manager = DatabaseManager("premium", {"DATABASE_URL": config.DATABASE_URL or ""})
+        self._db_manager = DatabaseManager("premium_cog", {"DATABASE_URL": config.DATABASE_URL or ""})
         self.bot.loop.create_task(self._connect_database())
 
     async def _connect_database(self) -> None:
@@ -394,13 +394,18 @@ class PremiumCog(commands.Cog):
 
     async def _get_gpt_calls_today(self, user_id: int, guild_id: int) -> int:
         """Return how many GPT calls this user has made today in this guild."""
+        from utils.premium_guard import get_gpt_usage_today
+        counted = get_gpt_usage_today(user_id, guild_id)
+        if counted is not None:
+            return counted
         if not self.db:
             return 0
         try:
             from utils.db_helpers import acquire_safe
             async with acquire_safe(self.db) as conn:
                 return await conn.fetchval(
-                    "SELECT call_count FROM gpt_usage WHERE user_id=$1 AND guild_id=$2 AND usage_date=CURRENT_DATE",
+                    "SELECT call_count FROM gpt_usage WHERE user_id=$1 AND guild_id=$2 "
+                    "AND usage_date=(NOW() AT TIME ZONE 'UTC')::date",
                     user_id, guild_id,
                 ) or 0
         except Exception:
@@ -1,7 +1,8 @@
+import asyncio
 import re
 import time as time_module
 from datetime import datetime, timedelta
-from typing import Any, Protocol, cast
+from typing import Any, NamedTuple, Protocol, cast
 
 import asyncpg
 import discord
@@ -20,12 +21,49 @@ from utils.db_helpers import acquire_safe, get_bot_db_pool, is_pool_healthy
 from utils.embed_builder import EmbedBuilder
 from utils.logger import log_database_event, log_guild_action, log_with_guild, logger
 from utils.parsers import format_days_for_display, parse_days_string, parse_time_string
+from utils.reminder_schedule import event_call_at
 from utils.sanitizer import safe_embed_text
 from utils.timezone import BRUSSELS_TZ
 from utils.validators import validate_admin
 
 # All logging timestamps in this module use Brussels time for clarity.
 
+# Due reminders older than this (e.g. after downtime) are rescheduled without sending.
+REMINDER_GRACE = timedelta(minutes=5)
+# Concurrent reminder sends per guild; sends to one channel are always serialized.
+REMINDER_GUILD_CONCURRENCY = 4
+
+DIGEST_TITLES = {
+    "info": "📤 Reminders sent",
+    "warning": "⚠️ Reminder warnings",
+    "error": "❌ Reminder send failures",
+}
+# Embed descriptions are capped at 4096 characters.
+_DIGEST_LIMIT = 4000
+
+
+class ReminderOutcome(NamedTuple):
+    """Result of one reminder send, collected for bulk status writes and log digests."""
+    row: Any
+    level: str
+    line: str
+    sent: bool = False
+    sent_message_id: int | None = None
+    delete: bool = False
+
+
+def _digest_description(lines: list[str]) -> str:
+    """Join digest lines, truncating with a count once the embed limit is reached."""
+    out: list[str] = []
+    size = 0
+    for index, line in enumerate(lines):
+        if size + len(line) + 1 > _DIGEST_LIMIT:
+            out.append(f"… and {len(lines) - index} more")
+            break
+        out.append(line)
+        size += len(line) + 1
+    return "\n".join(out)
+
 
 class ReminderRepoConnection(Protocol):
     async def fetch(self, query: str, *args: Any, timeout: float | None = ...) -> list[asyncpg.Record]: ...
@@ -136,9 +174,28 @@ class ReminderCog(AlphaCog):
                 await conn.execute(
                     "ALTER TABLE reminders ADD COLUMN IF NOT EXISTS image_url TEXT;"
                 )
+                await conn.execute(
+                    "ALTER TABLE reminders ADD COLUMN IF NOT EXISTS next_fire_at TIMESTAMPTZ;"
+                )
+                await conn.execute(
+                    "ALTER TABLE reminders ADD COLUMN IF NOT EXISTS days_mask SMALLINT;"
+                )
                 # Create indexes
                 await conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_time ON reminders(time);")
                 await conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_event_time ON reminders(event_time);")
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_reminders_next_fire_at "
+                    "ON reminders(next_fire_at) WHERE next_fire_at IS NOT NULL;"
+                )
+                # Schedule reminders written before next_fire_at existed
+                unscheduled = await reminder_repo.list_unscheduled(conn)
+                if unscheduled:
+                    await reminder_repo.reschedule(conn, unscheduled)
+                    logger.info(f"🗓️ Scheduled {len(unscheduled)} reminder(s) without next_fire_at")
+                # One-off reminders whose last fire instant has passed never fire again
+                expired = await reminder_repo.delete_expired_one_offs(conn)
+                if expired and expired != "DELETE 0":
+                    logger.info(f"🗑️ Removed expired one-off reminders ({expired})")
         except Exception as setup_e:
             log_database_event("DB_SETUP_ERROR", details=f"Failed to setup reminders table: {setup_e}")
             raise
@@ -963,47 +1020,15 @@ class ReminderCog(AlphaCog):
 
         now = datetime.now(BRUSSELS_TZ).replace(second=0, microsecond=0)
         current_time_str = now.strftime("%H:%M:%S")
-        current_time_hhmm = now.strftime("%H:%M")  # For TIME column comparison
-        current_day = str(now.weekday())
-        current_date = now.date()
-        
-        # Calculate next day for midnight edge case (reminder at 23:xx for next day event at 00:xx)
-        # If reminder is at 23:xx, it's for an event the next day
-        next_day = str((now.weekday() + 1) % 7)  # Wrap around: 7 becomes 0 (Monday)
-        next_date = (now + timedelta(days=1)).date()
 
         try:
             async with acquire_safe(self.db) as conn:
-                # Build day matching: support both numeric ("0", "1", "2") and text ("ma", "di", "woe", etc.)
-                day_abbrevs = {
-                    "0": ["0", "ma", "maandag", "monday"],
-                    "1": ["1", "di", "dinsdag", "tuesday"],
-                    "2": ["2", "wo", "woe", "woensdag", "wednesday"],
-                    "3": ["3", "do", "donderdag", "thursday"],
-                    "4": ["4", "vr", "vrijdag", "friday"],
-                    "5": ["5", "za", "zaterdag", "saturday"],
-                    "6": ["6", "zo", "zondag", "sunday"],
-                }
-                day_abbrevs.get(current_day, [current_day])
-                day_abbrevs.get(next_day, [next_day])
-                
-                # Check if any day variant matches the days array
-                # time and call_time are TIME columns, so we compare them directly
-                # Convert current_time_hhmm to TIME for comparison
-                current_time_obj = datetime.strptime(current_time_hhmm, "%H:%M").time()
-                
-                # Check if current time is 23:xx (for midnight edge case)
-                is_late_night = current_time_obj.hour == 23
-                
-                rows = await reminder_repo.list_active(
-                    conn,
-                    current_time_obj=current_time_obj,
-                    current_date=current_date,
-                    current_day=current_day,
-                    is_late_night=is_late_night,
-                    next_date=next_date,
-                    next_day=next_day,
-                )
+                rows = await reminder_repo.list_due(conn, now)
+                # Advance every due reminder before sending, so a failed or
+                # skipped send never makes the same fire instant due again.
+                # One-off reminders with no fire instant left are deleted
+                # below, whether their last send went out or was skipped.
+                expired_ids = await reminder_repo.reschedule(conn, rows, after=now)
         except TimeoutError as e:
             logger.warning(f"⚠️ Reminder loop: connection reset timed out (transient): {e}")
             return
@@ -1036,189 +1061,10 @@ class ReminderCog(AlphaCog):
                 pass
             return
 
+        if rows:
+            logger.info(f"🔎 Checking reminders at {current_time_str} - found {len(rows)} reminder(s) to process: {[r['id'] for r in rows]}")
         try:
-            if len(rows) > 0:
-                logger.info(f"🔎 Checking reminders at {current_time_str} - found {len(rows)} reminder(s) to process: {[r['id'] for r in rows]}")
-            for row in rows:
-                # Idempotency guard: skip if already sent in this minute
-                last_sent = row.get("last_sent_at")
-                if last_sent is not None:
-                    try:
-                        last_sent_bxl = last_sent.astimezone(BRUSSELS_TZ)
-                    except Exception:
-                        last_sent_bxl = last_sent
-                    if last_sent_bxl.replace(second=0, microsecond=0) == now:
-                        logger.info(f"⏭️ Skip reminder {row['id']} (already sent this minute)")
-                        continue
-
-                channel = self.bot.get_channel(int(row["channel_id"]))
-                if not isinstance(channel, (discord.TextChannel, discord.Thread)):
-                    logger.warning(f"⚠️ Channel {row['channel_id']} not found for reminder {row['id']}.")
-                    await self.send_log_embed(
-                        title="⚠️ Reminder channel not found",
-                        description=(
-                            f"ID: `{row['id']}`\n"
-                            f"Name: **{row['name']}**\n"
-                            f"Channel ID: `{row['channel_id']}`\n"
-                            f"Channel not found or deleted"
-                        ),
-                        level="warning",
-                        guild_id=row["guild_id"],
-                    )
-                    continue
-
-                # Determine if this is the T0 (on-time) send or T-60 (offset) send
-                is_t0_send = False
-                if row.get("event_time"):
-                    event_dt_check = row["event_time"].astimezone(BRUSSELS_TZ)
-                    is_t0_send = (event_dt_check.strftime("%H:%M:%S") == current_time_str)
-
-                # Keep embed title short (Discord limit 256); truncate long names from older reminders
-                name_display = safe_embed_text((row["name"] or "")[:240], 240)
-                embed = EmbedBuilder.success(
-                    title=f"⏰ Reminder: {name_display}",
-                    description=safe_embed_text(row["message"] or "-")
-                )
-                # Show date+time for one-off events; for recurring show only the configured time
-                event_dt = row.get("event_time")
-                if event_dt:
-                    try:
-                        event_dt = event_dt.astimezone(BRUSSELS_TZ)
-                    except Exception:
-                        pass
-                    call_time_obj = row.get("call_time") or event_dt.time()
-                    embed.add_field(name="📅 Date", value=event_dt.strftime("%A %d %B %Y"), inline=False)
-                    embed.add_field(name="⏰ Time", value=call_time_obj.strftime("%H:%M"), inline=False)
-                else:
-                    # Recurring: show only reminder time (no date)
-                    call_time_obj = row.get("call_time") or row.get("time")
-                    if call_time_obj:
-                        try:
-                            time_str = call_time_obj.strftime("%H:%M")
-                        except Exception:
-                            time_str = str(call_time_obj)
-                        embed.add_field(name="⏰ Time", value=time_str, inline=False)
-                # Location
-                if row.get("location") and row["location"] != "-":
-                    embed.add_field(name="📍 Location", value=safe_embed_text(row["location"], 1024), inline=False)
-                # Premium: image/banner if present
-                if row.get("image_url"):
-                    embed.set_image(url=row["image_url"])
-                # Link to original message
-                if row.get("origin_channel_id") and row.get("origin_message_id"):
-                    link = f"https://discord.com/channels/{row['guild_id']}/{row['origin_channel_id']}/{row['origin_message_id']}"
-                    embed.add_field(name="🔗 Original", value=f"[Click here]({link})", inline=False)
-                
-                embed.set_footer(text="🤖 Auto-reminder")
-
-                text_channel = cast(discord.TextChannel, channel)
-                mention_enabled = self._allow_everyone_mentions(row["guild_id"])
-                content = "@everyone" if mention_enabled else None
-
-                # If this is the T0 send, delete the earlier T-60 reminder message
-                if is_t0_send and row.get("sent_message_id"):
-                    try:
-                        prev_msg = await text_channel.fetch_message(int(row["sent_message_id"]))
-                        await prev_msg.delete()
-                        logger.info(f"🗑️ Deleted T-60 reminder message {row['sent_message_id']} (reminder {row['id']})")
-                    except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                        pass  # Already deleted or no permissions — not critical
-
-                try:
-                    sent_msg = await text_channel.send(
-                        content=content,
-                        embed=embed,
-                        allowed_mentions=discord.AllowedMentions(everyone=mention_enabled)
-                    )
-                    logger.info(f"📤 Reminder sent (ID={row['id']}) to channel {row['channel_id']}: {row['name']}")
-                    # Format date/time for log
-                    date_str = event_dt.strftime('%Y-%m-%d') if event_dt else 'N/A'
-                    time_str = call_time_obj.strftime('%H:%M') if call_time_obj else 'N/A'
-
-                    await self.send_log_embed(
-                        title="📤 Reminder sent",
-                        description=(
-                            f"ID: `{row['id']}`\n"
-                            f"Name: **{safe_embed_text(row['name'])}**\n"
-                            f"Channel: <#{row['channel_id']}>\n"
-                            f"Date: {date_str}\n"
-                            f"Time (display): `{time_str}`"
-                        ),
-                        level="info",
-                        guild_id=row["guild_id"],
-                    )
-                    # Update idempotency marker; for T-60 sends also store the message ID
-                    try:
-                        async with acquire_safe(self.db) as update_conn:
-                            await reminder_repo.update_sent_at(
-                                update_conn,
-                                reminder_id=row["id"],
-                                guild_id=row["guild_id"],
-                                last_sent_at=now,
-                                sent_message_id=sent_msg.id if (not is_t0_send and row.get("event_time")) else None,
-                            )
-                    except Exception:
-                        logger.exception("⚠️ Could not update last_sent_at")
-                except discord.Forbidden:
-                    logger.warning(f"⚠️ Reminder {row['id']} could not be sent: no permissions in channel {row['channel_id']}")
-                    await self.send_log_embed(
-                        title="⚠️ Reminder send failed",
-                        description=(
-                            f"ID: `{row['id']}`\n"
-                            f"Name: **{row['name']}**\n"
-                            f"Channel: <#{row['channel_id']}>\n"
-                            f"Error: No permissions to send in this channel"
-                        ),
-                        level="error",
-                        guild_id=row["guild_id"],
-                    )
-                except discord.NotFound:
-                    logger.warning(f"⚠️ Reminder {row['id']} could not be sent: channel {row['channel_id']} not found")
-                    await self.send_log_embed(
-                        title="⚠️ Reminder send failed",
-                        description=(
-                            f"ID: `{row['id']}`\n"
-                            f"Name: **{row['name']}**\n"
-                            f"Channel: <#{row['channel_id']}>\n"
-                            f"Error: Channel not found (possibly deleted)"
-                        ),
-                        level="error",
-                        guild_id=row["guild_id"],
-                    )
-                except Exception as send_error:
-                    logger.exception(f"❌ Reminder {row['id']} could not be sent: {send_error}")
-                    await self.send_log_embed(
-                        title="❌ Reminder send failed",
-                        description=(
-                            f"ID: `{row['id']}`\n"
-                            f"Name: **{row['name']}**\n"
-                            f"Channel: <#{row['channel_id']}>\n"
-                            f"Error: {str(send_error)[:200]}"
-                        ),
-                        level="error",
-                        guild_id=row["guild_id"],
-                    )
-                # Delete one-off reminders from DB after T0 send (not after T-60)
-                if row.get("event_time") and is_t0_send:
-                    try:
-                        async with acquire_safe(self.db) as delete_conn:
-                            await reminder_repo.delete(delete_conn, row["guild_id"], row["id"])
-                        logger.info(f"🗑️ Reminder {row['id']} (one-off) deleted after T0 send.")
-                        await self.send_log_embed(
-                            title="🗑️ Reminder deleted (one-off)",
-                            description=(
-                                f"ID: `{row['id']}`\n"
-                                f"Name: **{row['name']}**\n"
-                                f"Channel: <#{row['channel_id']}>\n"
-                                f"Deleted after T0 at {now.strftime('%Y-%m-%d %H:%M')}"
-                            ),
-                            level="warning",
-                            guild_id=row["guild_id"],
-                        )
-                    except Exception as delete_err:
-                        logger.warning(f"⚠️ Could not delete one-off reminder {row['id']}: {delete_err}")
-                        # Continue - reminder will be cleaned up on next loop iteration
-
+            await self._fan_out(rows, now, expired_ids)
         except Exception as e:
             if isinstance(e, (pg_exceptions.InterfaceError, pg_exceptions.ConnectionDoesNotExistError, ConnectionResetError)):
                 await self._handle_connection_lost(e)
@@ -1232,6 +1078,188 @@ class ReminderCog(AlphaCog):
             except Exception:
                 pass
 
+    async def _fan_out(self, rows: list[Any], now: datetime, expired_ids: list[int] | None = None) -> None:
+        """Send due reminders concurrently, then write status and log digests in bulk.
+
+        Sends to one channel are serialized and each guild is capped at
+        REMINDER_GUILD_CONCURRENCY in-flight sends, so a busy minute spreads
+        over Discord's per-route buckets instead of queueing behind one loop.
+        ``expired_ids`` are one-off reminders without a next fire instant;
+        they are deleted even when their last send was skipped.
+        """
+        expired = set(expired_ids or ())
+        due = []
+        for row in rows:
+            # Fire instants missed while the bot was down are skipped, not replayed
+            if row["next_fire_at"] < now - REMINDER_GRACE:
+                logger.info(f"⏭️ Skip reminder {row['id']} (missed fire at {row['next_fire_at']:%Y-%m-%d %H:%M})")
+                continue
+
+            # Idempotency guard: skip if already sent in this minute
+            last_sent = row.get("last_sent_at")
+            if last_sent is not None:
+                try:
+                    last_sent_bxl = last_sent.astimezone(BRUSSELS_TZ)
+                except Exception:
+                    last_sent_bxl = last_sent
+                if last_sent_bxl.replace(second=0, microsecond=0) == now:
+                    logger.info(f"⏭️ Skip reminder {row['id']} (already sent this minute)")
+                    continue
+            due.append(row)
+        if not due and not expired:
+            return
+
+        guild_limits: dict[int, asyncio.Semaphore] = {}
+        channel_locks: dict[int, asyncio.Lock] = {}
+        for row in due:
+            if row["guild_id"] not in guild_limits:
+                guild_limits[row["guild_id"]] = asyncio.Semaphore(REMINDER_GUILD_CONCURRENCY)
+            if row["channel_id"] not in channel_locks:
+                channel_locks[row["channel_id"]] = asyncio.Lock()
+
+        async def dispatch(row: Any) -> ReminderOutcome:
+            async with guild_limits[row["guild_id"]], channel_locks[row["channel_id"]]:
+                try:
+                    return await self._send_reminder(row)
+                except Exception as e:
+                    logger.exception(f"❌ Reminder {row['id']} failed unexpectedly: {e}")
+                    return ReminderOutcome(row, "error", f"❌ `{row['id']}` **{safe_embed_text(row['name'])}** — {str(e)[:200]}")
+
+        outcomes = await asyncio.gather(*(dispatch(row) for row in due))
+
+        # Bulk status: idempotency markers (+ T-60 message ids) and one-off deletions
+        sent = [(now, o.sent_message_id, o.row["id"]) for o in outcomes if o.sent]
+        t0_ids = {o.row["id"] for o in outcomes if o.delete}
+        delete_ids = sorted(t0_ids | expired)
+        deleted = False
+        try:
+            async with acquire_safe(self.db) as conn:
+                async with conn.transaction():
+                    await reminder_repo.mark_sent_many(conn, sent)
+                    await reminder_repo.delete_many(conn, delete_ids)
+            deleted = True
+        except Exception:
+            logger.exception("⚠️ Could not write reminder send status")
+
+        digests: dict[tuple[int, str], list[str]] = {}
+        for o in outcomes:
+            digests.setdefault((o.row["guild_id"], o.level), []).append(o.line)
+            if o.delete and deleted:
+                logger.info(f"🗑️ Reminder {o.row['id']} (one-off) deleted after T0 send.")
+                digests.setdefault((o.row["guild_id"], "warning"), []).append(
+                    f"🗑️ `{o.row['id']}` **{safe_embed_text(o.row['name'])}** — one-off deleted after T0 at {now:%Y-%m-%d %H:%M}"
+                )
+        for row in rows:
+            if row["id"] in expired and row["id"] not in t0_ids and deleted:
+                logger.info(f"🗑️ Reminder {row['id']} (one-off) expired without a further fire time.")
+                digests.setdefault((row["guild_id"], "warning"), []).append(
+                    f"🗑️ `{row['id']}` **{safe_embed_text(row['name'])}** — one-off expired without a further send"
+                )
+        await asyncio.gather(*(
+            self.send_log_embed(
+                title=DIGEST_TITLES.get(level, "⏰ Reminders"),
+                description=_digest_description(lines),
+                level=level,
+                guild_id=guild_id,
+            )
+            for (guild_id, level), lines in digests.items()
+        ))
+
+    async def _send_reminder(self, row: Any) -> ReminderOutcome:
+        """Send one due reminder and report what happened for the digest."""
+        label = f"`{row['id']}` **{safe_embed_text(row['name'])}**"
+        channel = self.bot.get_channel(int(row["channel_id"]))
+        if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+            logger.warning(f"⚠️ Channel {row['channel_id']} not found for reminder {row['id']}.")
+            return ReminderOutcome(row, "warning", f"⚠️ {label} — channel `{row['channel_id']}` not found or deleted")
+
+        # Determine if this is the T0 (on-time) send or T-60 (offset) send
+        is_t0_send = False
+        if row.get("event_time"):
+            t0_at = event_call_at(row["event_time"], row.get("call_time"))
+            is_t0_send = t0_at is not None and row["next_fire_at"] >= t0_at
+        # One-off reminders are deleted after the T0 send, whether or not it went through
+        delete = bool(row.get("event_time")) and is_t0_send
+
+        # Keep embed title short (Discord limit 256); truncate long names from older reminders
+        name_display = safe_embed_text((row["name"] or "")[:240], 240)
+        embed = EmbedBuilder.success(
+            title=f"⏰ Reminder: {name_display}",
+            description=safe_embed_text(row["message"] or "-")
+        )
+        # Show date+time for one-off events; for recurring show only the configured time
+        event_dt = row.get("event_time")
+        if event_dt:
+            try:
+                event_dt = event_dt.astimezone(BRUSSELS_TZ)
+            except Exception:
+                pass
+            call_time_obj = row.get("call_time") or event_dt.time()
+            embed.add_field(name="📅 Date", value=event_dt.strftime("%A %d %B %Y"), inline=False)
+            embed.add_field(name="⏰ Time", value=call_time_obj.strftime("%H:%M"), inline=False)
+        else:
+            # Recurring: show only reminder time (no date)
+            call_time_obj = row.get("call_time") or row.get("time")
+            if call_time_obj:
+                try:
+                    time_str = call_time_obj.strftime("%H:%M")
+                except Exception:
+                    time_str = str(call_time_obj)
+                embed.add_field(name="⏰ Time", value=time_str, inline=False)
+        # Location
+        if row.get("location") and row["location"] != "-":
+            embed.add_field(name="📍 Location", value=safe_embed_text(row["location"], 1024), inline=False)
+        # Premium: image/banner if present
+        if row.get("image_url"):
+            embed.set_image(url=row["image_url"])
+        # Link to original message
+        if row.get("origin_channel_id") and row.get("origin_message_id"):
+            link = f"https://discord.com/channels/{row['guild_id']}/{row['origin_channel_id']}/{row['origin_message_id']}"
+            embed.add_field(name="🔗 Original", value=f"[Click here]({link})", inline=False)
+
+        embed.set_footer(text="🤖 Auto-reminder")
+
+        text_channel = cast(discord.TextChannel, channel)
+        mention_enabled = self._allow_everyone_mentions(row["guild_id"])
+        content = "@everyone" if mention_enabled else None
+
+        # If this is the T0 send, delete the earlier T-60 reminder message
+        if is_t0_send and row.get("sent_message_id"):
+            try:
+                prev_msg = await text_channel.fetch_message(int(row["sent_message_id"]))
+                await prev_msg.delete()
+                logger.info(f"🗑️ Deleted T-60 reminder message {row['sent_message_id']} (reminder {row['id']})")
+            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+                pass  # Already deleted or no permissions — not critical
+
+        try:
+            sent_msg = await text_channel.send(
+                content=content,
+                embed=embed,
+                allowed_mentions=discord.AllowedMentions(everyone=mention_enabled)
+            )
+        except discord.Forbidden:
+            logger.warning(f"⚠️ Reminder {row['id']} could not be sent: no permissions in channel {row['channel_id']}")
+            return ReminderOutcome(row, "error", f"⚠️ {label} in <#{row['channel_id']}> — no permissions to send", delete=delete)
+        except discord.NotFound:
+            logger.warning(f"⚠️ Reminder {row['id']} could not be sent: channel {row['channel_id']} not found")
+            return ReminderOutcome(row, "error", f"⚠️ {label} in <#{row['channel_id']}> — channel not found (possibly deleted)", delete=delete)
+        except Exception as send_error:
+            logger.exception(f"❌ Reminder {row['id']} could not be sent: {send_error}")
+            return ReminderOutcome(row, "error", f"❌ {label} in <#{row['channel_id']}> — {str(send_error)[:200]}", delete=delete)
+
+        logger.info(f"📤 Reminder sent (ID={row['id']}) to channel {row['channel_id']}: {row['name']}")
+        date_str = event_dt.strftime('%Y-%m-%d') if event_dt else 'N/A'
+        time_str = call_time_obj.strftime('%H:%M') if call_time_obj else 'N/A'
+        return ReminderOutcome(
+            row,
+            "info",
+            f"📤 {label} → <#{row['channel_id']}> · {date_str} `{time_str}`",
+            sent=True,
+            # T-60 sends keep the message id so the T0 send can replace it
+            sent_message_id=sent_msg.id if (not is_t0_send and row.get("event_time")) else None,
+            delete=delete,
+        )
 
 # ---------------------------------------------------------------------------
 # Module-level helpers kept for backwards compatibility with api.py imports.
@@ -6,16 +6,28 @@ Runs a daily background task that deletes analytics records older than 90 days:
 
 90 days is a defensible retention period under Belgian DPA guidance for
 operational analytics data that is not required for the primary service.
+
+Rows are deleted in bounded batches (``RETENTION_BATCH_SIZE``, with
+``RETENTION_BATCH_PAUSE`` between batches) via ``utils.retention``. When
+``audit_logs`` is partitioned by month (migration 028), expired months are
+dropped as whole partitions and only the partially expired month is batch-deleted.
 """
 
+from datetime import UTC, datetime, timedelta
 
 import asyncpg
 from discord.ext import commands
 
 import config
 from utils.background_tasks import BackgroundTask
-from utils.db_helpers import acquire_safe
 from utils.logger import logger
+from utils.retention import (
+    RetentionResult,
+    delete_expired,
+    drop_expired_partitions,
+    ensure_partitions,
+    is_partitioned,
+)
 
 _RETENTION_DAYS = 90
 _INTERVAL_SECONDS = 86400  # 24 hours
@@ -63,18 +75,34 @@ class RetentionCleanupCog(commands.Cog):
 
     async def _run_cleanup(self) -> None:
         """Delete analytics rows older than RETENTION_DAYS from audit and search tables."""
-        async with acquire_safe(self.db) as conn:
-            result = await conn.execute(
-                "DELETE FROM audit_logs WHERE created_at < NOW() - make_interval(days => $1)",
-                _RETENTION_DAYS,
-            )
-            logger.info("RetentionCleanup: %s audit_logs rows deleted (>%dd)", result, _RETENTION_DAYS)
-
-            result = await conn.execute(
-                "DELETE FROM faq_search_logs WHERE created_at < NOW() - make_interval(days => $1)",
-                _RETENTION_DAYS,
-            )
-            logger.info("RetentionCleanup: %s faq_search_logs rows deleted (>%dd)", result, _RETENTION_DAYS)
+        now = datetime.now(UTC)
+        cutoff = now - timedelta(days=_RETENTION_DAYS)
+        batch_size = getattr(config, "RETENTION_BATCH_SIZE", 5000)
+        pause = getattr(config, "RETENTION_BATCH_PAUSE", 0.2)
+
+        dropped: list[str] = []
+        if await is_partitioned(self.db, "audit_logs"):
+            await ensure_partitions(self.db, "audit_logs", now, getattr(config, "AUDIT_LOG_PARTITIONS_AHEAD", 3))
+            dropped = await drop_expired_partitions(self.db, "audit_logs", cutoff)
+
+        for table in ("audit_logs", "faq_search_logs"):
+            result = await delete_expired(self.db, table, cutoff, batch_size=batch_size, pause=pause)
+            if table == "audit_logs":
+                result.partitions_dropped = len(dropped)
+            self._log_result(result)
+
+    @staticmethod
+    def _log_result(result: RetentionResult) -> None:
+        logger.info(
+            "RetentionCleanup: %s: %d rows deleted in %d batches (%.1fs, %.0f rows/s), %d partitions dropped (>%dd)",
+            result.table,
+            result.rows,
+            result.batches,
+            result.elapsed,
+            result.rows_per_second,
+            result.partitions_dropped,
+            _RETENTION_DAYS,
+        )
 
 
 async def setup(bot: commands.Bot) -> None:
@@ -97,7 +97,12 @@ class CustomSlashCommands(commands.Cog):
         
         result = await safe_sync(self.bot, guild=guild, force=force)
         
-        if result.success:
+        if result.unchanged:
+            await ctx.send(
+                f"⏭️ {result.command_count} slash commands unchanged since the last sync, nothing to do.\n"
+                f"💡 Use `!sync --force` to upload them anyway"
+            )
+        elif result.success:
             sync_type = "global" if guild is None else f"guild ({guild.name})"
             await ctx.send(
                 f"✅ Synced {result.command_count} {sync_type} slash commands!"
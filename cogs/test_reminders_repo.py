@@ -13,27 +13,41 @@ class FakeConn:
 
     async def execute(self, query: str, *params):
         if query.strip().lower().startswith("insert into reminders"):
-            name, channel_id, time_obj, days, message, created_by = params
+            name, channel_id, time_obj, days, message, created_by, days_mask, next_fire_at = params
             new_id = len(self.rows) + 1
             self.rows.append({
                 "id": new_id,
                 "name": name,
                 "channel_id": channel_id,
                 "time": time_obj,
+                "call_time": None,
+                "event_time": None,
                 "days": days,
                 "message": message,
-                "created_by": created_by
+                "created_by": created_by,
+                "days_mask": days_mask,
+                "next_fire_at": next_fire_at,
             })
-        elif query.strip().lower().startswith("update reminders"):
-            name, time_obj, days, message, rid, created_by = params
-            for r in self.rows:
-                if r["id"] == rid and r["created_by"] == created_by:
-                    r.update({"name": name, "time": time_obj, "days": days, "message": message})
         elif query.strip().lower().startswith("delete from reminders"):
             rid, created_by = params
             self.rows = [r for r in self.rows if not (r["id"] == rid and r["created_by"] == created_by)]
             self.deleted.append(rid)
 
+    async def fetchrow(self, query: str, *params):
+        if query.strip().lower().startswith("update reminders"):
+            name, time_obj, days, message, rid, created_by = params
+            for r in self.rows:
+                if r["id"] == rid and r["created_by"] == created_by:
+                    r.update({"name": name, "time": time_obj, "days": days, "message": message})
+                    return r
+        return None
+
+    async def executemany(self, query: str, records):
+        for days_mask, next_fire_at, rid in records:
+            for r in self.rows:
+                if r["id"] == rid:
+                    r.update({"days_mask": days_mask, "next_fire_at": next_fire_at})
+
     async def fetch(self, query: str, *params):
         (uid,) = params
         # Test function: return reminders for the user (no hardcoded admin ID)
@@ -81,6 +95,8 @@ class TestRemindersRepo(unittest.TestCase):
             rows = await get_reminders_for_user(self.conn, "u1")
             self.assertEqual(rows[0]["name"], "New")
             self.assertEqual(rows[0]["time"], "09:00")
+            self.assertEqual(rows[0]["days_mask"], 0b100)
+            self.assertEqual(rows[0]["next_fire_at"].strftime("%H:%M"), "09:00")
         asyncio.run(scenario())
 
     def test_delete(self):
@@ -1,7 +1,9 @@
 import asyncio
 import json
 import re
-from datetime import date, datetime, timedelta
+import time
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
 from typing import Any, Literal, cast
 
 import asyncpg
@@ -18,11 +20,40 @@ from gpt.helpers import ask_gpt_vision
 from utils.cog_base import AlphaCog
 from utils.db_helpers import acquire_safe, is_pool_healthy
 from utils.embed_builder import EmbedBuilder
+from utils.image_hash import dhash, hamming
 from utils.logger import log_database_event, log_guild_action, log_with_guild, logger
 from utils.premium_guard import guild_has_premium
 from utils.sanitizer import safe_embed_text, safe_prompt
 from utils.timezone import BRUSSELS_TZ
 
+# Near-duplicate screenshot detection (256-bit dHash, see utils.image_hash)
+DEDUP_MAX_DISTANCE = 10  # differing bits still treated as the same image
+DEDUP_VERDICT_TTL = timedelta(hours=24)  # reuse a user's own verdict within this window
+DEDUP_RETENTION_DAYS = 90
+DEDUP_MAX_PER_GUILD = 5000
+DEDUP_MAX_IMAGE_BYTES = 10 * 1024 * 1024
+# Discord attachment URLs are signed and expire, so the reference URL is refreshed periodically
+REFERENCE_URL_TTL = 6 * 3600
+
+
+@dataclass
+class _Submission:
+    phash: int
+    user_id: int
+    channel_id: int
+    status: str  # verified | rejected | manual_review
+    reason: str
+    payment_date: date | None
+    created_at: datetime
+
+
+def _submission_status(can_verify: bool, needs_manual_review: bool) -> str:
+    if can_verify and not needs_manual_review:
+        return "verified"
+    if not can_verify and not needs_manual_review:
+        return "rejected"
+    return "manual_review"
+
 
 class VerificationCog(AlphaCog):
     """
@@ -36,6 +67,10 @@ class VerificationCog(AlphaCog):
         self.db: asyncpg.Pool | None = None
         from utils.database_helpers import DatabaseManager
         self._db_manager = DatabaseManager("verification", {"DATABASE_URL": getattr(config, "DATABASE_URL", "")})
+        # guild_id -> recent submission hashes (loaded lazily from verification_image_hashes)
+        self._submissions: dict[int, list[_Submission]] = {}
+        # guild_id -> (settings key, url, hash, fetched_at)
+        self._reference_cache: dict[int, tuple[tuple[int, str], str | None, int | None, float]] = {}
 
         # Start async setup without blocking the event loop
         self.bot.loop.create_task(self.setup_db())
@@ -98,8 +133,29 @@ class VerificationCog(AlphaCog):
                 await conn.execute(
                     "ALTER TABLE verification_tickets ADD COLUMN IF NOT EXISTS payment_date DATE;"
                 )
+                await conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS verification_image_hashes (
+                        id SERIAL PRIMARY KEY,
+                        guild_id BIGINT NOT NULL,
+                        user_id BIGINT NOT NULL,
+                        channel_id BIGINT NOT NULL,
+                        phash TEXT NOT NULL,
+                        status TEXT NOT NULL,
+                        reason TEXT,
+                        payment_date DATE,
+                        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                    );
+                    """
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_verification_image_hashes_guild_created ON verification_image_hashes(guild_id, created_at);"
+                )
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_verification_image_hashes_channel ON verification_image_hashes(channel_id);"
+                )
 
-            logger.info("VerificationCog: DB ready (verification_tickets)")
+            logger.info("VerificationCog: DB ready (verification_tickets, verification_image_hashes)")
             log_database_event("DB_READY", details="VerificationCog database fully initialized")
         except Exception as e:
             log_database_event("DB_INIT_ERROR", details=f"VerificationCog setup failed: {e}")
@@ -159,12 +215,24 @@ class VerificationCog(AlphaCog):
         value = self.settings_helper.get_int("verification", "reviewer_role_id", guild_id, fallback=0)
         return int(value) if value else None
 
-    async def _get_reference_image_url(self, guild_id: int) -> str | None:
-        """Fetch a fresh URL for the stored reference image by re-fetching its Discord message."""
+    async def _get_reference_image(self, guild_id: int) -> tuple[str | None, int | None]:
+        """Return (fresh URL, dHash) of the stored reference image.
+
+        The Discord message is re-fetched only when the setting changes or the signed
+        URL is due to expire; the image itself is hashed once per setting value.
+        """
         channel_id = self.settings_helper.get_int("verification", "reference_image_channel_id", guild_id, fallback=0)
         message_id_str = self.settings_helper.get_str("verification", "reference_image_message_id", guild_id, fallback="").strip("\"'")
         if not channel_id or not message_id_str:
-            return None
+            self._reference_cache.pop(guild_id, None)
+            return None, None
+        key = (int(channel_id), message_id_str)
+        cached = self._reference_cache.get(guild_id)
+        if cached and cached[0] != key:
+            cached = None
+        if cached and time.monotonic() - cached[3] < REFERENCE_URL_TTL:
+            return cached[1], cached[2]
+        known_hash = cached[2] if cached else None
         try:
             channel = self.bot.get_channel(channel_id)
             if not channel or not hasattr(channel, "fetch_message"):
@@ -173,10 +241,168 @@ class VerificationCog(AlphaCog):
             msg = await text_channel.fetch_message(int(message_id_str))
             for att in msg.attachments:
                 if att.content_type and att.content_type.startswith("image/"):
-                    return att.url
+                    ref_hash = known_hash if known_hash is not None else await self._hash_attachment(att)
+                    self._reference_cache[guild_id] = (key, att.url, ref_hash, time.monotonic())
+                    return att.url, ref_hash
         except Exception as e:
             logger.warning("VerificationCog: could not fetch reference image: %s", e)
-        return None
+        return None, known_hash
+
+    # ----- Duplicate detection -----
+
+    async def _hash_attachment(self, attachment: discord.Attachment) -> int | None:
+        """dHash of an image attachment, or None if it is too large or cannot be decoded."""
+        if attachment.size and attachment.size > DEDUP_MAX_IMAGE_BYTES:
+            return None
+        try:
+            data = await attachment.read()
+            return await asyncio.to_thread(dhash, data)
+        except Exception as e:
+            logger.debug(f"VerificationCog: could not hash attachment: {e}")
+            return None
+
+    async def _load_submissions(self, guild_id: int) -> list[_Submission]:
+        """Recent submission hashes for a guild; loaded from the DB on first use."""
+        entries = self._submissions.get(guild_id)
+        if entries is not None:
+            return entries
+        if not is_pool_healthy(self.db):
+            return self._submissions.setdefault(guild_id, [])
+        try:
+            async with acquire_safe(self.db) as conn:
+                await conn.execute(
+                    "DELETE FROM verification_image_hashes WHERE guild_id = $1 AND created_at < NOW() - make_interval(days => $2)",
+                    guild_id,
+                    DEDUP_RETENTION_DAYS,
+                )
+                rows = await conn.fetch(
+                    """
+                    SELECT user_id, channel_id, phash, status, reason, payment_date, created_at
+                    FROM verification_image_hashes
+                    WHERE guild_id = $1
+                    ORDER BY created_at DESC
+                    LIMIT $2
+                    """,
+                    guild_id,
+                    DEDUP_MAX_PER_GUILD,
+                )
+        except Exception as e:
+            logger.warning(f"VerificationCog: could not load image hashes: {e}")
+            return []
+        loaded = [
+            _Submission(
+                phash=int(row["phash"], 16),
+                user_id=int(row["user_id"]),
+                channel_id=int(row["channel_id"]),
+                status=row["status"],
+                reason=row["reason"] or "",
+                payment_date=row["payment_date"],
+                created_at=row["created_at"],
+            )
+            for row in reversed(rows)
+        ]
+        return self._submissions.setdefault(guild_id, loaded)
+
+    async def _check_duplicate(
+        self,
+        guild_id: int,
+        user_id: int,
+        phash: int,
+        reference_hash: int | None,
+    ) -> tuple[bool, bool, str, date | None, str] | None:
+        """Answer a near-duplicate screenshot without a vision call.
+
+        Returns (can_verify, needs_manual_review, reason, payment_date, review_note),
+        or None when the image is new (or only matches the user's own stale verdict).
+        """
+        if reference_hash is not None and hamming(phash, reference_hash) <= DEDUP_MAX_DISTANCE:
+            return (
+                False,
+                True,
+                "This looks like the example screenshot, not your own payment confirmation. Manual review required.",
+                None,
+                "Matches the guild's reference image.",
+            )
+
+        own: _Submission | None = None
+        for entry in reversed(await self._load_submissions(guild_id)):
+            if hamming(phash, entry.phash) > DEDUP_MAX_DISTANCE:
+                continue
+            if entry.user_id != user_id:
+                # Shared receipt: never reuse another member's verdict
+                return (
+                    False,
+                    True,
+                    "This screenshot has already been submitted for verification. Manual review required.",
+                    None,
+                    f"Same image as an earlier submission by <@{entry.user_id}> ({entry.user_id}) "
+                    f"on {entry.created_at.strftime('%Y-%m-%d')}, status: {entry.status}.",
+                )
+            if own is None:
+                own = entry
+
+        if own is None or datetime.now(UTC) - own.created_at > DEDUP_VERDICT_TTL:
+            return None
+        if own.status == "verified":
+            return True, False, own.reason or "Matches your previously verified screenshot.", own.payment_date, ""
+        if own.status == "rejected":
+            return (
+                False,
+                True,
+                "This screenshot was already reviewed and rejected. Manual review required.",
+                own.payment_date,
+                f"Same image was rejected earlier: {own.reason or 'no reason given'}",
+            )
+        return False, True, own.reason, own.payment_date, "Same image is already waiting for manual review."
+
+    async def _remember_submission(
+        self,
+        guild_id: int,
+        user_id: int,
+        channel_id: int,
+        phash: int,
+        status: str,
+        reason: str,
+        payment_date: date | None,
+    ) -> None:
+        entries = await self._load_submissions(guild_id)
+        entries.append(
+            _Submission(
+                phash=phash,
+                user_id=user_id,
+                channel_id=channel_id,
+                status=status,
+                reason=reason,
+                payment_date=payment_date,
+                created_at=datetime.now(UTC),
+            )
+        )
+        if len(entries) > DEDUP_MAX_PER_GUILD:
+            del entries[: len(entries) - DEDUP_MAX_PER_GUILD]
+        if not is_pool_healthy(self.db):
+            return
+        try:
+            async with acquire_safe(self.db) as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO verification_image_hashes (guild_id, user_id, channel_id, phash, status, reason, payment_date)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    """,
+                    guild_id,
+                    user_id,
+                    channel_id,
+                    f"{phash:064x}",
+                    status,
+                    reason,
+                    payment_date,
+                )
+        except Exception as e:
+            logger.warning(f"VerificationCog: could not store image hash: {e}")
+
+    def forget_user_submissions(self, user_id: int) -> None:
+        """Drop a user's hashes from memory (GDPR delete; DB rows are purged separately)."""
+        for entries in self._submissions.values():
+            entries[:] = [e for e in entries if e.user_id != user_id]
 
     async def send_log_embed(self, title: str, description: str, level: str, guild_id: int) -> None:
         """Send log embed to the guild's log channel using EmbedBuilder."""
@@ -515,6 +741,25 @@ class VerificationCog(AlphaCog):
             except Exception as e:
                 logger.warning(f"VerificationCog: failed to update ticket resolution: {e}")
 
+        # Later uploads of the same screenshot reuse the final (human or AI) outcome
+        if outcome != "closed":
+            hash_status = "verified" if outcome == "approved" else "rejected"
+            for entry in self._submissions.get(guild_id, []):
+                if entry.channel_id == int(channel.id):
+                    entry.status = hash_status
+                    entry.reason = reason or entry.reason
+            if is_pool_healthy(self.db):
+                try:
+                    async with acquire_safe(self.db) as conn:
+                        await conn.execute(
+                            "UPDATE verification_image_hashes SET status = $1, reason = COALESCE(NULLIF($2, ''), reason) WHERE channel_id = $3",
+                            hash_status,
+                            reason,
+                            int(channel.id),
+                        )
+                except Exception as e:
+                    logger.warning(f"VerificationCog: failed to update image hash status: {e}")
+
         # 3. In-channel closing embed
         if outcome == "approved":
             closing_embed = EmbedBuilder.success(
@@ -590,48 +835,20 @@ class VerificationCog(AlphaCog):
             except Exception as e:
                 logger.debug(f"VerificationCog: could not send close button: {e}")
 
-    # ----- Listener -----
-
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message) -> None:
-        """Handle screenshots uploaded in verification channels."""
-        if message.author.bot:
-            return
-        if not message.guild:
-            return
-        if not message.attachments:
-            return
-
-        guild = message.guild
-        guild_id = guild.id
-        category_id = self._get_category_id(guild_id)
-        if not category_id:
-            return
-
-        if not isinstance(message.channel, discord.TextChannel):
-            return
-        if not message.channel.category or message.channel.category.id != category_id:
-            return
-
-        # Only process the first image attachment
-        attachment = None
-        for att in message.attachments:
-            if att.content_type and att.content_type.startswith("image/"):
-                attachment = att
-                break
-        if not attachment:
-            return
-
-        # Defer basic acknowledgement in-channel
-        processing_embed = EmbedBuilder.status(
-            title="🔍 Verifying your screenshot",
-            description="Please wait a moment while we review your payment confirmation.",
-        )
-        await message.channel.send(embed=processing_embed)
-
+    async def _vision_verdict(
+        self,
+        message: discord.Message,
+        attachment: discord.Attachment,
+        guild_id: int,
+        reference_image_url: str | None,
+    ) -> tuple[bool, bool, str, date | None] | None:
+        """Ask the vision model about the screenshot and apply server-side checks.
+
+        Returns (can_verify, needs_manual_review, reason, payment_date), or None when
+        the vision call failed (the user has been told and the ticket marked as error).
+        """
         # Build verification prompt
         vision_model = self._get_vision_model(guild_id)
-        reference_image_url = await self._get_reference_image_url(guild_id)
         max_payment_age_days = self._get_max_payment_age_days(guild_id)
         today_iso = date.today().isoformat()
         discord_display_name = safe_prompt(message.author.display_name)
@@ -729,7 +946,7 @@ class VerificationCog(AlphaCog):
                 ai_needs_manual_review=None,
                 ai_reason=str(e),
             )
-            return
+            return None
 
         can_verify = False
         needs_manual_review = True
@@ -830,6 +1047,77 @@ class VerificationCog(AlphaCog):
             needs_manual_review = True
             reason = "Could not verify your identity from the screenshot. Please make sure your name or account username is visible. Manual review required."
 
+        return can_verify, needs_manual_review, reason, extracted_payment_date
+
+    # ----- Listener -----
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        """Handle screenshots uploaded in verification channels."""
+        if message.author.bot:
+            return
+        if not message.guild:
+            return
+        if not message.attachments:
+            return
+
+        guild = message.guild
+        guild_id = guild.id
+        category_id = self._get_category_id(guild_id)
+        if not category_id:
+            return
+
+        if not isinstance(message.channel, discord.TextChannel):
+            return
+        if not message.channel.category or message.channel.category.id != category_id:
+            return
+
+        # Only process the first image attachment
+        attachment = None
+        for att in message.attachments:
+            if att.content_type and att.content_type.startswith("image/"):
+                attachment = att
+                break
+        if not attachment:
+            return
+
+        # Defer basic acknowledgement in-channel
+        processing_embed = EmbedBuilder.status(
+            title="🔍 Verifying your screenshot",
+            description="Please wait a moment while we review your payment confirmation.",
+        )
+        await message.channel.send(embed=processing_embed)
+
+        reference_image_url, reference_hash = await self._get_reference_image(guild_id)
+        submission_hash = await self._hash_attachment(attachment)
+        user_id = int(message.author.id)
+        review_note = ""
+        duplicate = None
+        if submission_hash is not None:
+            duplicate = await self._check_duplicate(guild_id, user_id, submission_hash, reference_hash)
+        if duplicate is not None:
+            can_verify, needs_manual_review, reason, extracted_payment_date, review_note = duplicate
+            log_with_guild(
+                f"Verification screenshot matched an earlier image, skipped vision call (user {user_id})",
+                guild_id,
+                "info",
+            )
+        else:
+            verdict = await self._vision_verdict(message, attachment, guild_id, reference_image_url)
+            if verdict is None:
+                return
+            can_verify, needs_manual_review, reason, extracted_payment_date = verdict
+        if submission_hash is not None:
+            await self._remember_submission(
+                guild_id,
+                user_id,
+                int(message.channel.id),
+                submission_hash,
+                _submission_status(can_verify, needs_manual_review),
+                reason,
+                extracted_payment_date,
+            )
+
         # Update DB
         await self._update_verification_ticket(
             channel_id=int(message.channel.id),
@@ -877,6 +1165,7 @@ class VerificationCog(AlphaCog):
                     f"Channel: {channel.mention}\n"
                     f"Started: {datetime.now(BRUSSELS_TZ).strftime('%Y-%m-%d %H:%M UTC')}\n"
                     f"AI reason: {safe_embed_text(reason, 300)}"
+                    + (f"\nDuplicate: {safe_embed_text(review_note, 300)}" if review_note else "")
                 ),
                 level="warning",
                 guild_id=guild_id,
@@ -16,6 +16,15 @@ BOT_TOKEN_ACTIVE = (BOT_TOKEN_TEST if os.getenv("USE_TEST_BOT") == "1" and BOT_T
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Legacy - kept for backwards compatibility
 GROK_API_KEY = os.getenv("GROK_API_KEY")
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "grok").strip().lower()  # "grok" or "openai"
+# LLM HTTP connection pool (kept warm between calls to skip TCP/TLS handshakes)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+# Shared Supabase / Core-API HTTP client pools (utils/http_clients.py)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
 
 ROLE_ID = int(os.getenv("ROLE_ID", "0"))  # Legacy - no longer used in multi-guild setup
 
@@ -70,6 +79,31 @@ DISCORD_LINK_WEBHOOK_SECRET = os.getenv("DISCORD_LINK_WEBHOOK_SECRET")
 CORE_DISCORD_LINK_SESSION_PATH = (os.getenv("CORE_DISCORD_LINK_SESSION_PATH") or "").strip()
 CORE_DISCORD_BOT_PROFILE_PATH = (os.getenv("CORE_DISCORD_BOT_PROFILE_PATH") or "").strip()
 
+# Shared database pool (utils/pool_registry.py): one physical pool per event loop,
+# with per-subsystem concurrency quotas ("settings=6,api=8")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "15"))
+DB_POOL_IDLE_TIMEOUT = float(os.getenv("DB_POOL_IDLE_TIMEOUT", "60"))
+DB_POOL_COMMAND_TIMEOUT = float(os.getenv("DB_POOL_COMMAND_TIMEOUT", "30"))
+DB_POOL_DEFAULT_QUOTA = int(os.getenv("DB_POOL_DEFAULT_QUOTA", "3"))
+DB_POOL_QUOTAS = os.getenv("DB_POOL_QUOTAS", "")
+
+# Apply bot_settings changes from other processes (API, replicas) via Postgres LISTEN/NOTIFY
+SETTINGS_LISTEN_ENABLED = os.getenv("SETTINGS_LISTEN_ENABLED", "1") == "1"
+
+# Slash command sync: max guild syncs in flight at once (startup / reconnect)
+COMMAND_SYNC_CONCURRENCY = int(os.getenv("COMMAND_SYNC_CONCURRENCY", "4"))
+
+# Retention cleanup (cogs/retention_cleanup.py): rows deleted per batch and pause between batches (seconds)
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))
+RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.2"))
+# Monthly audit_logs partitions kept created ahead of the current month (partitioned mode only)
+AUDIT_LOG_PARTITIONS_AHEAD = int(os.getenv("AUDIT_LOG_PARTITIONS_AHEAD", "3"))
+
+# Operational event store (dashboard logs): ring size and optional JSON-lines spill file
+OPERATIONAL_EVENTS_MAX = int(os.getenv("OPERATIONAL_EVENTS_MAX", "5000"))
+OPERATIONAL_EVENTS_LOG_PATH = (os.getenv("OPERATIONAL_EVENTS_LOG_PATH") or "").strip()
+
 # Discord OAuth2 for Web Configuration Interface
 DISCORD_CLIENT_ID = os.getenv("DISCORD_CLIENT_ID")
 DISCORD_CLIENT_SECRET = os.getenv("DISCORD_CLIENT_SECRET")
@@ -83,6 +117,10 @@ MAIN_GUILD_ID = int(os.getenv("MAIN_GUILD_ID", "0"))  # Set to 0 to disable filt
 # Premium tier
 PREMIUM_CHECKOUT_URL = os.getenv("PREMIUM_CHECKOUT_URL", "")
 PREMIUM_CACHE_TTL_SECONDS = int(os.getenv("PREMIUM_CACHE_TTL_SECONDS", "300"))
+PREMIUM_NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("PREMIUM_NEGATIVE_CACHE_TTL_SECONDS", "60"))
+# GPT daily quota counters: flush interval (seconds) and max unflushed calls (over-admission tolerance after a crash)
+GPT_QUOTA_FLUSH_INTERVAL = float(os.getenv("GPT_QUOTA_FLUSH_INTERVAL", "10"))
+GPT_QUOTA_FLUSH_THRESHOLD = int(os.getenv("GPT_QUOTA_FLUSH_THRESHOLD", "50"))
 # Payments token for Core-API billing endpoints (e.g. early-bird validation)
 CORE_API_PAYMENTS_TOKEN = os.getenv("CORE_API_PAYMENTS_TOKEN", "")
 # Early bird settings
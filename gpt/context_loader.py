@@ -10,10 +10,12 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 
-import asyncpg
-
-from utils.db_helpers import PoolT
+from utils.pool_registry import SubsystemPool, get_subsystem_pool
 from utils.sanitizer import safe_prompt
 from utils.supabase_client import _supabase_get, get_user_id_for_discord
 
@@ -22,7 +24,144 @@ logger = logging.getLogger(__name__)
 _REFLECTION_TEXT_MAX_CHARS = 2048
 _REFLECTION_DATE_MAX_CHARS = 128
 
-_app_reflections_pool: PoolT | None = None
+_app_reflections_pool: SubsystemPool | None = None
+
+# Formatted context + Discord -> Supabase identity, per Discord user. Webhooks
+# (new/revoked reflections, account links, user deletion) invalidate entries;
+# the TTL bounds staleness for changes made without a webhook (e.g. toggling
+# bot_sharing_enabled in the App).
+_CONTEXT_CACHE_TTL = 300.0
+_CONTEXT_CACHE_MAX_USERS = 2000
+
+
+@dataclass
+class _CachedUser:
+    supabase_user_id: str | None
+    expires_at: float
+    contexts: dict[int, str] = field(default_factory=dict)  # limit -> context
+
+
+class _ReflectionContextCache:
+    """Bounded TTL/LRU cache keyed by Discord ID.
+
+    Webhooks invalidate from the API thread while the bot loop reads, so all
+    access is under a lock. ``epoch`` increases on every invalidation; a load
+    that started before an invalidation is not stored, so a revoked reflection
+    fetched mid-load can never be served from cache.
+    """
+
+    def __init__(self, ttl: float = _CONTEXT_CACHE_TTL, max_users: int = _CONTEXT_CACHE_MAX_USERS):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries: OrderedDict[str, _CachedUser] = OrderedDict()
+        self._by_supabase_id: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _live(self, discord_id: str) -> _CachedUser | None:
+        entry = self._entries.get(discord_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(discord_id)
+            return None
+        self._entries.move_to_end(discord_id)
+        return entry
+
+    def _drop(self, discord_id: str) -> None:
+        entry = self._entries.pop(discord_id, None)
+        if entry is not None and entry.supabase_user_id:
+            self._by_supabase_id.pop(entry.supabase_user_id, None)
+
+    def get_context(self, discord_id: str, limit: int) -> str | None:
+        with self._lock:
+            entry = self._live(discord_id)
+            context = entry.contexts.get(limit) if entry else None
+            if context is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return context
+
+    def get_identity(self, discord_id: str) -> tuple[bool, str | None]:
+        """Return (known, supabase_user_id); unlinked users are cached as (True, None)."""
+        with self._lock:
+            entry = self._live(discord_id)
+            return (True, entry.supabase_user_id) if entry else (False, None)
+
+    def store(
+        self,
+        discord_id: str,
+        supabase_user_id: str | None,
+        epoch: int,
+        limit: int | None = None,
+        context: str | None = None,
+    ) -> None:
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            entry = self._live(discord_id)
+            if entry is None or entry.supabase_user_id != supabase_user_id:
+                self._drop(discord_id)
+                entry = _CachedUser(supabase_user_id, time.monotonic() + self.ttl)
+                self._entries[discord_id] = entry
+                if supabase_user_id:
+                    self._by_supabase_id[supabase_user_id] = discord_id
+            if limit is not None and context is not None:
+                entry.contexts[limit] = context
+            while len(self._entries) > self.max_users:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, discord_id: int | str | None = None, supabase_user_id: str | None = None) -> None:
+        with self._lock:
+            self.epoch += 1
+            if discord_id is not None:
+                self._drop(str(discord_id))
+            if supabase_user_id:
+                linked = self._by_supabase_id.get(str(supabase_user_id))
+                if linked is not None:
+                    self._drop(linked)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._by_supabase_id.clear()
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "reflection_context_cache_size": len(self._entries),
+                "reflection_context_cache_hits": self.hits,
+                "reflection_context_cache_misses": self.misses,
+            }
+
+
+_context_cache = _ReflectionContextCache()
+
+
+def invalidate_reflection_context(
+    discord_id: int | str | None = None, supabase_user_id: str | None = None
+) -> None:
+    """Drop cached reflection context for a user (by Discord ID and/or Supabase user ID)."""
+    _context_cache.invalidate(discord_id=discord_id, supabase_user_id=supabase_user_id)
+
+
+def get_reflection_context_cache_stats() -> dict[str, int]:
+    return _context_cache.get_stats()
+
+
+async def _resolve_supabase_user_id(discord_id: int | str, epoch: int) -> str | None:
+    """Discord ID -> Supabase user ID, served from the cache when known."""
+    key = str(discord_id)
+    known, user_id = _context_cache.get_identity(key)
+    if known:
+        return user_id
+    user_id = await get_user_id_for_discord(discord_id)
+    _context_cache.store(key, user_id, epoch)
+    return user_id
 
 
 def _sanitize_reflection_field(value: object, max_chars: int = _REFLECTION_TEXT_MAX_CHARS) -> str:
@@ -35,17 +174,17 @@ def _sanitize_reflection_field(value: object, max_chars: int = _REFLECTION_TEXT_
     return safe_prompt(text[:max_chars])
 
 
-async def _get_app_reflections_pool() -> PoolT | None:
-    """Get or create a shared database pool for app_reflections.
+async def _get_app_reflections_pool() -> SubsystemPool | None:
+    """Get the app_reflections handle on the shared database pool.
 
     This is intentionally cached at module level so that every user-self flow
-    (e.g. /growthcheckin) does *not* pay the cost of creating and tearing down
-    a brand-new asyncpg pool for a single query.
+    (e.g. /growthcheckin) reuses warm connections instead of setting up new
+    ones for a single query.
     """
     global _app_reflections_pool
 
     # Reuse existing pool when available
-    if _app_reflections_pool is not None and not _app_reflections_pool._closed:
+    if _app_reflections_pool is not None and not _app_reflections_pool.is_closing():
         return _app_reflections_pool
 
     try:
@@ -55,13 +194,7 @@ async def _get_app_reflections_pool() -> PoolT | None:
             logger.debug("No DATABASE_URL configured for app_reflections")
             return None
 
-        # Create pool with same settings as api.py (but smaller max_size)
-        _app_reflections_pool = await asyncpg.create_pool(
-            config.DATABASE_URL,
-            min_size=1,
-            max_size=5,  # Smaller pool for occasional context loading
-            command_timeout=10.0,
-        )
+        _app_reflections_pool = await get_subsystem_pool("app_reflections")
         return _app_reflections_pool
     except Exception as e:
         logger.debug("Failed to create app_reflections pool: %s", e)
@@ -158,9 +291,16 @@ async def load_user_reflections(
     loaded_count = 0
     if limit <= 0:
         return ""
+    cache_key = str(discord_id)
+    cached = _context_cache.get_context(cache_key, limit)
+    if cached is not None:
+        return cached
+    epoch = _context_cache.epoch
+    user_id: str | None = None
+    complete = True
     try:
         # Supabase: get user_id and check bot_sharing_enabled
-        user_id = await get_user_id_for_discord(discord_id)
+        user_id = await _resolve_supabase_user_id(discord_id, epoch)
         if not user_id:
             logger.debug(
                 "No Supabase profile linked to discord_id=%s - skipping Supabase reflection context",
@@ -243,6 +383,7 @@ async def load_user_reflections(
                     else:
                         logger.debug("No shared reflections found for user_id=%s", user_id)
     except Exception as e:
+        complete = False
         logger.warning(
             "Failed to load Supabase reflection context for discord_id=%s: %s",
             discord_id,
@@ -255,7 +396,7 @@ async def load_user_reflections(
     if loaded_count < limit:
         try:
             if not user_id:
-                user_id = await get_user_id_for_discord(discord_id)
+                user_id = await _resolve_supabase_user_id(discord_id, epoch)
             if user_id:
                 remaining = limit - loaded_count
                 discord_reflection_rows = await _supabase_get(
@@ -298,6 +439,7 @@ async def load_user_reflections(
                             discord_id,
                         )
         except Exception as e:
+            complete = False
             logger.debug("Failed to load Discord check-ins for discord_id=%s: %s", discord_id, e)
 
     # Always try app_reflections (plaintext from App via Core webhook), but
@@ -325,7 +467,14 @@ async def load_user_reflections(
             loaded_count,
         )
 
+    # Partial results (a source failed) are not cached so the next call retries.
+    if complete:
+        _context_cache.store(cache_key, user_id, epoch, limit, context_str or "")
     return context_str or ""
 
 
-__all__ = ["load_user_reflections"]
+__all__ = [
+    "get_reflection_context_cache_stats",
+    "invalidate_reflection_context",
+    "load_user_reflections",
+]
@@ -1,14 +1,17 @@
 # helpers.py
 
 import asyncio
+import hashlib
+import json
 import logging
 import time
 from datetime import UTC, datetime
 
 import discord
+import httpx
 from discord import Embed
 from discord.ext import commands
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 try:
     import config_local as config  # type: ignore
@@ -277,15 +280,94 @@ if _api_key_missing:
     )
     llm_client = None
 else:
+    # Keep-alive pool shared by all LLM calls; sized for concurrent commands
+    # so bursts reuse warm connections instead of opening new TLS sessions.
+    _http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=getattr(config, "LLM_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=getattr(config, "LLM_MAX_KEEPALIVE_CONNECTIONS", 10),
+            keepalive_expiry=getattr(config, "LLM_KEEPALIVE_EXPIRY", 60.0),
+        ),
+        timeout=httpx.Timeout(getattr(config, "LLM_TIMEOUT", 60.0), connect=5.0),
+    )
     if _base_url:
         # Grok uses OpenAI-compatible API at api.x.ai
-        llm_client = AsyncOpenAI(api_key=_api_key, base_url=_base_url)
+        llm_client = AsyncOpenAI(api_key=_api_key, base_url=_base_url, http_client=_http_client)
         logger.info(f"✅ Grok client initialized (model: {_default_model})")
     else:
         # OpenAI
-        llm_client = AsyncOpenAI(api_key=_api_key)
+        llm_client = AsyncOpenAI(api_key=_api_key, http_client=_http_client)
         logger.info(f"✅ OpenAI client initialized (model: {_default_model})")
 
+# In-flight completions by request hash: identical concurrent requests share one call.
+_inflight_completions: dict[str, asyncio.Task] = {}
+_llm_stats = {"requests": 0, "coalesced": 0}
+
+
+async def close_llm_client() -> None:
+    """Close the LLM client's HTTP connection pool. Call during bot shutdown."""
+    if llm_client is not None:
+        await llm_client.close()
+
+
+def get_llm_client_stats() -> dict[str, int]:
+    """Completion calls made and callers served by an identical in-flight call."""
+    return {
+        "llm_requests": _llm_stats["requests"],
+        "llm_coalesced": _llm_stats["coalesced"],
+        "llm_inflight": len(_inflight_completions),
+    }
+
+
+async def _create_completion(chat_kwargs: dict) -> tuple[object, bool]:
+    """Run a chat completion, joining an identical in-flight request if there is one.
+
+    Returns (response, coalesced). The request runs in its own task and is
+    shielded, so one caller being cancelled does not cancel it for the others.
+    """
+    assert llm_client is not None
+    key = hashlib.sha256(json.dumps(chat_kwargs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    task = _inflight_completions.get(key)
+    coalesced = task is not None
+    if task is None:
+        _llm_stats["requests"] += 1
+        task = asyncio.create_task(llm_client.chat.completions.create(**chat_kwargs))
+        _inflight_completions[key] = task
+        task.add_done_callback(lambda _t: _inflight_completions.pop(key, None))
+    else:
+        _llm_stats["coalesced"] += 1
+    return await asyncio.shield(task), coalesced
+
+
+async def _quota_denial(user_id, guild_id: int) -> str | None:
+    """Charge one interaction to the user's daily quota; returns the denial text when exhausted."""
+    try:
+        from utils.premium_guard import check_and_increment_gpt_quota
+        allowed, _count, limit = await check_and_increment_gpt_quota(user_id, guild_id)
+        if not allowed:
+            return (
+                f"You have reached your daily limit of {limit} Grok interactions. "
+                "Upgrade for more: `/premium`"
+            )
+    except Exception as e:
+        logger.warning("GPT quota check failed — failing open: %s", e)
+    return None
+
+
+async def _reflection_context(user_id) -> str:
+    """Load the user's recent reflections as prompt context (non-critical)."""
+    try:
+        from gpt.context_loader import load_user_reflections
+        return await load_user_reflections(user_id, limit=5)
+    except Exception as e:
+        logger.debug(f"Failed to load reflection context: {e}")
+        return ""
+
+
+async def _nothing(value=None):
+    return value
+
+
 def _get_settings_values(default_model: str) -> tuple[str, float | None]:
     if bot_instance is None:
         return default_model, None
@@ -331,22 +413,20 @@ async def ask_gpt(messages, user_id=None, model: str | None = None, guild_id: in
         max_tokens: Hard cap on response length (default: None = API default)
     """
     start = time.perf_counter()
-
-    # Per-user daily GPT quota (only for user-initiated calls with a known user_id and guild_id)
-    if user_id is not None and guild_id is not None and not _is_retry:
-        try:
-            from utils.premium_guard import check_and_increment_gpt_quota
-            allowed, count, limit = await check_and_increment_gpt_quota(user_id, guild_id)
-            if not allowed:
-                return (
-                    f"You have reached your daily limit of {limit} Grok interactions. "
-                    "Upgrade for more: `/premium`"
-                )
-        except Exception as e:
-            logger.warning("GPT quota check failed — failing open: %s", e)
+    client_ready = not _api_key_missing and llm_client is not None
+
+    # Quota (per-user daily, only for user-initiated calls with a known user_id
+    # and guild_id) and reflection context are independent database reads:
+    # run them concurrently instead of one round-trip after the other.
+    quota_denied, reflection_context = await asyncio.gather(
+        _quota_denial(user_id, guild_id) if user_id is not None and guild_id is not None and not _is_retry else _nothing(),
+        _reflection_context(user_id) if client_ready and include_reflections and user_id else _nothing(""),
+    )
+    if quota_denied:
+        return quota_denied
 
     try:
-        if _api_key_missing or llm_client is None:
+        if not client_ready:
             raise RuntimeError(
                 f"{_api_key_name} is missing. Set the key (.env or config_local.py) and restart the bot."
             )
@@ -356,16 +436,6 @@ async def ask_gpt(messages, user_id=None, model: str | None = None, guild_id: in
             messages = [{"role": "user", "content": messages}]
         assert isinstance(messages, list) and all(isinstance(m, dict) for m in messages), "❌ Invalid messages format"
 
-        # Load reflection context if enabled and user_id provided
-        reflection_context = ""
-        if include_reflections and user_id:
-            try:
-                from gpt.context_loader import load_user_reflections
-                reflection_context = await load_user_reflections(user_id, limit=5)
-            except Exception as e:
-                logger.debug(f"Failed to load reflection context: {e}")
-                # Continue without context - non-critical
-
         # Build system prompt with optional reflection context
         system_content = SYSTEM_PROMPT
         if reflection_context:
@@ -384,12 +454,14 @@ async def ask_gpt(messages, user_id=None, model: str | None = None, guild_id: in
         if max_tokens is not None:
             chat_kwargs["max_tokens"] = max_tokens
 
-        response = await llm_client.chat.completions.create(**chat_kwargs)
+        response, coalesced = await _create_completion(chat_kwargs)
         latency = (time.perf_counter() - start) * 1000 if response else 0  # in ms
         tokens = response.usage.total_tokens if response.usage else 0
 
-        # Log success with the actual model used (updates current_model in status logs)
-        log_gpt_success(user_id=user_id, tokens_used=tokens, latency_ms=int(latency), guild_id=guild_id, model=resolved_model)
+        # Log success with the actual model used (updates current_model in status logs);
+        # joined requests did not spend tokens of their own.
+        if not coalesced:
+            log_gpt_success(user_id=user_id, tokens_used=tokens, latency_ms=int(latency), guild_id=guild_id, model=resolved_model)
         return response.choices[0].message.content
 
     except Exception as e:
@@ -494,17 +566,18 @@ async def ask_gpt_vision(
         if temperature is not None:
             chat_kwargs["temperature"] = temperature
 
-        response = await llm_client.chat.completions.create(**chat_kwargs)
+        response, coalesced = await _create_completion(chat_kwargs)
         latency = (time.perf_counter() - start) * 1000 if response else 0  # in ms
         tokens = response.usage.total_tokens if response.usage else 0
 
-        log_gpt_success(
-            user_id=user_id,
-            tokens_used=tokens,
-            latency_ms=int(latency),
-            guild_id=guild_id,
-            model=resolved_model,
-        )
+        if not coalesced:
+            log_gpt_success(
+                user_id=user_id,
+                tokens_used=tokens,
+                latency_ms=int(latency),
+                guild_id=guild_id,
+                model=resolved_model,
+            )
         return response.choices[0].message.content or ""
 
     except Exception as e:
@@ -4,6 +4,8 @@ Performance testing script for Alphapy bot.
 
 Tests database performance, API response times, and memory usage.
 Run with: python performance_test.py
+
+For auto-mod rule evaluation throughput see automod_benchmark.py.
 """
 
 import asyncio
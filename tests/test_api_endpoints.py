@@ -229,6 +229,9 @@ class TestEditReminder:
 
     def test_updates_reminder_and_returns_success(self):
         pool, conn = _mock_pool()
+        conn.fetchrow = AsyncMock(return_value={
+            "id": 5, "time": "09:00", "call_time": None, "days": ["monday", "tuesday"], "event_time": None,
+        })
         app = make_app()
         with (
             patch.object(api_module, "db_pool", pool),
@@ -238,7 +241,13 @@ class TestEditReminder:
             response = client.put("/api/reminders", json=self._valid_payload)
         assert response.status_code == 200
         assert response.json() == {"success": True}
-        conn.execute.assert_awaited_once()
+        conn.fetchrow.assert_awaited_once()
+        assert "UPDATE reminders" in conn.fetchrow.await_args.args[0]
+        # The edited reminder is rescheduled (weekday bitmask + next fire instant)
+        conn.executemany.assert_awaited_once()
+        (days_mask, next_fire_at, reminder_id), = conn.executemany.await_args.args[1]
+        assert (days_mask, reminder_id) == (0b11, 5)
+        assert next_fire_at is not None
 
 
 class TestRemoveReminder:
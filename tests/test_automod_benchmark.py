@@ -0,0 +1,29 @@
+import asyncio
+
+from automod_benchmark import build_rules, check_regression, run_benchmark, synthetic_corpus
+
+
+def test_benchmark_reports_throughput_and_rule_types():
+    corpus = synthetic_corpus(150, users=10, seed=1)
+    rules = build_rules(8, seed=1, include_ai=True)
+    report = asyncio.run(run_benchmark(corpus, rules, allocations=True))
+
+    assert report["pipeline"]["messages"] == 150
+    assert report["pipeline"]["messages_per_sec"] > 0
+    assert set(report["rule_types"]) == {"ai", "content", "regex", "spam"}
+    assert report["rule_types"]["content"]["count"] > 0
+    assert "peak_kib" in report["allocations"]
+
+
+def test_check_regression_against_baseline():
+    report = {
+        "pipeline": {"messages_per_sec": 700.0},
+        "rule_types": {"regex": {"p95_us": 10.0}},
+    }
+    assert check_regression(report, {"pipeline": {"messages_per_sec": 800.0}}, 0.2) == []
+    failures = check_regression(
+        report,
+        {"pipeline": {"messages_per_sec": 1000.0}, "rule_types": {"regex": {"p95_us": 5.0}}},
+        0.2,
+    )
+    assert len(failures) == 2
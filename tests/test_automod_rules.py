@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock
 import discord
 from discord.ext import commands
 
+from utils.aho_corasick import WordAutomaton
 from utils.automod_rules import RuleProcessor, RuleType
 
 
@@ -128,3 +129,67 @@ def test_rule_crud_with_mocked_db(monkeypatch):
         assert conn.execute.await_count >= 4
 
     asyncio.run(run())
+
+
+def test_word_automaton_matches_substring_semantics():
+    words = ["bad", "badger", "dge", "a", "xyz", ""]
+    automaton = WordAutomaton((word, index) for index, word in enumerate(words))
+    for text in ["a badger ran", "nothing", "xyzxyz", ""]:
+        expected = {index for index, word in enumerate(words) if word in text}
+        assert automaton.search(text) == expected
+
+
+def test_compiled_rules_shared_scan():
+    async def run() -> None:
+        processor = RuleProcessor(bot=None)
+        rules = [
+            {
+                "id": 1,
+                "rule_type": RuleType.CONTENT.value,
+                "config": {"content_type": "bad_words", "words": ["Spam", "scam"]},
+            },
+            {
+                "id": 2,
+                "rule_type": RuleType.CONTENT.value,
+                "config": {"content_type": "bad_words", "words": ["egg", "ham"]},
+            },
+            {
+                "id": 3,
+                "rule_type": RuleType.REGEX.value,
+                "config": {"patterns": ["[", r"free\s+nitro"]},
+            },
+            {
+                "id": 4,
+                "rule_type": RuleType.CONTENT.value,
+                "config": {"content_type": "links", "blacklist": ["evil.com"]},
+            },
+        ]
+        processor._rules_cache[7] = rules
+        compiled = processor.get_compiled_rules(7)
+        assert processor.get_compiled_rules(7) is compiled
+
+        msg = cast(discord.Message, DummyMessage("Get FREE nitro at https://Evil.com/x, no SCAM"))
+        scan = processor.scan_message(7, msg)
+
+        words_result = await processor.evaluate_rule(rules[0], msg, {}, scan)
+        assert words_result.triggered is True
+        assert words_result.context["found_words"] == ["scam"]
+        assert (await processor.evaluate_rule(rules[1], msg, {}, scan)).triggered is False
+
+        regex_result = await processor.evaluate_rule(rules[2], msg, {}, scan)
+        assert regex_result.triggered is True
+        assert regex_result.context["pattern"] == r"free\s+nitro"
+
+        link_result = await processor.evaluate_rule(rules[3], msg, {}, scan)
+        assert link_result.triggered is True
+        assert link_result.context["domain"] == "evil.com"
+
+        # Rules outside the compiled set still evaluate correctly.
+        edited = dict(rules[1], config={"content_type": "bad_words", "words": ["nitro"]})
+        assert (await processor.evaluate_rule(edited, msg, {}, scan)).triggered is True
+
+        # Replacing the cached rule list triggers a recompile.
+        processor._rules_cache[7] = rules[:1]
+        assert processor.get_compiled_rules(7) is not compiled
+
+    asyncio.run(run())
@@ -0,0 +1,99 @@
+import asyncio
+from typing import cast
+
+import discord
+
+from utils.automod_rules import RuleProcessor, RuleType
+from utils.automod_spam import GuildSpamTracker
+
+
+class DummyMessage:
+    def __init__(self, content: str):
+        self.content = content
+        self.mentions = []
+
+
+def test_tracker_counts_window_and_bounds_history():
+    tracker = GuildSpamTracker(history_size=4)
+    for ts in (1.0, 2.0, 3.0, 10.0, 11.0):
+        activity = tracker.record(7, ts)
+    assert list(activity.timestamps) == [2.0, 3.0, 10.0, 11.0]
+    assert activity.count_since(5.0) == 2
+    assert activity.count_since(0.0) == 4
+
+
+def test_tracker_evicts_idle_and_lru_users():
+    tracker = GuildSpamTracker(max_users=2, idle_ttl=100.0)
+    tracker.record(1, 0.0)
+    tracker.record(2, 50.0)
+    tracker.record(3, 60.0)  # over capacity: user 1 is least recent
+    assert tracker.get(1) is None
+    assert len(tracker) == 2
+
+    tracker.record(3, 155.0)  # user 2 idle for > 100s
+    assert tracker.get(2) is None
+    assert tracker.evictions == 2
+    assert tracker.approx_bytes() > 0
+
+
+def test_spam_rules_use_tracker_context():
+    async def run() -> None:
+        processor = RuleProcessor(bot=None)
+        tracker = GuildSpamTracker()
+        for ts in (100.0, 150.0, 190.0, 195.0):
+            activity = tracker.record(1, ts)
+        tracker.remember_message(1, "Buy NOW")
+
+        context = {
+            "last_message": activity.last_preview,
+            "last_message_hash": activity.last_hash,
+            "message_timestamps": activity.timestamps,
+            "now": 200.0,
+        }
+        frequency_rule = {
+            "id": 1,
+            "rule_type": RuleType.SPAM.value,
+            "config": {"spam_type": "frequency", "max_messages": 3, "time_window": 60},
+        }
+        result = await processor.evaluate_rule(frequency_rule, cast(discord.Message, DummyMessage("hi")), context)
+        assert result.triggered is True
+        assert result.context["message_count"] == 3
+
+        duplicate_rule = {
+            "id": 2,
+            "rule_type": RuleType.SPAM.value,
+            "config": {"spam_type": "duplicate", "max_duplicates": 3},
+        }
+        dup = await processor.evaluate_rule(duplicate_rule, cast(discord.Message, DummyMessage("buy now")), context)
+        assert dup.triggered is True
+        other = await processor.evaluate_rule(duplicate_rule, cast(discord.Message, DummyMessage("hello")), context)
+        assert other.triggered is False
+
+    asyncio.run(run())
+
+
+def test_duplicate_rule_ignores_messages_outside_recent_window():
+    async def run() -> None:
+        processor = RuleProcessor(bot=None)
+        tracker = GuildSpamTracker()
+        # Active earlier in the session, then one message 10 minutes later
+        for ts in (100.0, 150.0, 200.0, 250.0, 500.0):
+            activity = tracker.record(1, ts)
+        tracker.remember_message(1, "hello again")
+
+        context = {
+            "last_message": activity.last_preview,
+            "last_message_hash": activity.last_hash,
+            "message_timestamps": activity.timestamps,
+            "now": 700.0,
+        }
+        duplicate_rule = {
+            "id": 2,
+            "rule_type": RuleType.SPAM.value,
+            "config": {"spam_type": "duplicate", "max_duplicates": 3},
+        }
+        result = await processor.evaluate_rule(duplicate_rule, cast(discord.Message, DummyMessage("hello again")), context)
+        assert result.triggered is False
+        assert activity.count_since(700.0 - 300.0) == 1
+
+    asyncio.run(run())
@@ -0,0 +1,136 @@
+"""Tests for payload-hash skipping and bounded parallelism in utils.command_sync."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from discord import app_commands
+
+import utils.command_sync as command_sync
+
+
+def make_bot(*names, description="cmd"):
+    client = discord.Client(intents=discord.Intents.none())
+    tree = app_commands.CommandTree(client)
+    for name in names:
+        add_command(tree, name, description)
+    tree.sync = AsyncMock(side_effect=lambda guild=None: [object()] * len(tree.get_commands(guild=guild)))
+    return SimpleNamespace(tree=tree, application_id=42)
+
+
+def add_command(tree, name, description="cmd"):
+    async def callback(interaction: discord.Interaction) -> None:
+        pass
+
+    tree.add_command(app_commands.Command(name=name, description=description, callback=callback))
+
+
+class FakeConn:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed: list[tuple] = []
+
+    async def execute(self, query, *args):
+        self.executed.append(args)
+
+    async def fetch(self, query, *args):
+        return self.rows
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(command_sync, "_sync_cooldowns", {})
+    monkeypatch.setattr(command_sync, "_synced_hashes", {})
+    monkeypatch.setattr(command_sync, "_hashes_loaded", False)
+    monkeypatch.setattr(command_sync, "_initial_global_sync_done", False)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    fake = FakeConn()
+
+    @asynccontextmanager
+    async def fake_acquire(pool, *args, **kwargs):
+        yield fake
+
+    async def fake_pool():
+        return object()
+
+    monkeypatch.setattr(command_sync, "acquire_safe", fake_acquire)
+    monkeypatch.setattr(command_sync, "_ensure_pool", fake_pool)
+    return fake
+
+
+def test_payload_hash_ignores_registration_order():
+    first = command_sync.command_payload(make_bot("alpha", "beta"))
+    second = command_sync.command_payload(make_bot("beta", "alpha"))
+    changed = command_sync.command_payload(make_bot("alpha", "beta", description="new"))
+
+    assert command_sync.payload_hash(first) == command_sync.payload_hash(second)
+    assert command_sync.payload_hash(first) != command_sync.payload_hash(changed)
+
+
+def test_unchanged_payload_skips_sync_even_after_cooldown(conn):
+    bot = make_bot("alpha")
+
+    first = asyncio.run(command_sync.safe_sync(bot))
+    command_sync._sync_cooldowns.clear()
+    second = asyncio.run(command_sync.safe_sync(bot))
+
+    assert first.success and not first.unchanged
+    assert second.success and second.unchanged and second.command_count == 1
+    bot.tree.sync.assert_awaited_once()
+    assert conn.executed[-1][:2] == (42, "global")
+    assert not command_sync.should_sync_global()
+
+
+def test_changed_payload_and_force_sync_again(conn):
+    bot = make_bot("alpha")
+    asyncio.run(command_sync.safe_sync(bot))
+    command_sync._sync_cooldowns.clear()
+
+    add_command(bot.tree, "beta")
+    changed = asyncio.run(command_sync.safe_sync(bot))
+    forced = asyncio.run(command_sync.safe_sync(bot, force=True))
+
+    assert not changed.unchanged and changed.command_count == 2
+    assert not forced.unchanged
+    assert bot.tree.sync.await_count == 3
+
+
+def test_stored_hash_from_previous_process_is_used(conn):
+    bot = make_bot("alpha")
+    digest = command_sync.payload_hash(command_sync.command_payload(bot))
+    conn.rows = [{"scope": "global", "payload_hash": digest}]
+
+    result = asyncio.run(command_sync.safe_sync(bot))
+
+    assert result.unchanged
+    bot.tree.sync.assert_not_awaited()
+
+
+def test_sync_guilds_caps_parallelism(monkeypatch):
+    monkeypatch.setattr(command_sync.config, "COMMAND_SYNC_CONCURRENCY", 2, raising=False)
+    state = {"in_flight": 0, "peak": 0}
+
+    async def fake_safe_sync(bot, guild=None, force=False):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if guild.id == 3:
+            raise RuntimeError("boom")
+        return command_sync.SyncResult(success=True, command_count=0, sync_type="guild")
+
+    monkeypatch.setattr(command_sync, "safe_sync", fake_safe_sync)
+    bot = SimpleNamespace(application_id=None)
+    guilds = [SimpleNamespace(id=i) for i in range(6)]
+
+    results = asyncio.run(command_sync.sync_guilds(bot, guilds))
+
+    assert state["peak"] == 2
+    assert isinstance(results[3], RuntimeError)
+    assert all(isinstance(r, command_sync.SyncResult) for i, r in enumerate(results) if i != 3)
@@ -0,0 +1,75 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+import utils.command_tracker as tracker
+
+
+class _FakePool:
+    def __init__(self, conn) -> None:
+        self.conn = conn
+
+    def is_closing(self) -> bool:
+        return False
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+@pytest.fixture(autouse=True)
+def _reset_tracker(monkeypatch):
+    monkeypatch.setattr(tracker, "_command_queue", tracker.deque(maxlen=3))
+    monkeypatch.setattr(tracker, "MAX_QUEUE_SIZE", 3)
+    monkeypatch.setattr(tracker, "_stats", dict.fromkeys(tracker._stats, 0))
+    monkeypatch.setattr(tracker, "_flush_lock", None)
+    monkeypatch.setattr(tracker, "_flush_task", None)
+    monkeypatch.setattr(tracker, "_oneshot_flush", None)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_and_counts(monkeypatch) -> None:
+    monkeypatch.setattr(tracker, "FLUSH_THRESHOLD", 100)
+    for i in range(5):
+        await tracker.log_command_usage(1, i, f"cmd{i}", "slash")
+
+    assert [entry.user_id for entry in tracker._command_queue] == [2, 3, 4]
+    assert tracker.get_command_tracker_stats()["dropped"] == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_uses_copy_and_requeues_on_failure(monkeypatch) -> None:
+    monkeypatch.setattr(tracker, "FLUSH_THRESHOLD", 100)
+    conn = AsyncMock()
+    monkeypatch.setattr(tracker, "_db_pool", _FakePool(conn))
+
+    await tracker.log_command_usage(None, 7, "ping", "slash")
+    await tracker._flush_command_queue()
+
+    conn.copy_records_to_table.assert_awaited_once()
+    args, kwargs = conn.copy_records_to_table.await_args
+    assert args[0] == "audit_logs"
+    assert kwargs["columns"] == tracker.AUDIT_LOG_COLUMNS
+    assert kwargs["records"][0][:4] == (0, 7, "ping", "slash")
+    assert not tracker._command_queue
+    assert tracker.get_command_tracker_stats()["flushed"] == 1
+
+    conn.copy_records_to_table.side_effect = RuntimeError("boom")
+    await tracker.log_command_usage(1, 8, "help", "text")
+    await tracker._flush_command_queue()
+    assert [entry.user_id for entry in tracker._command_queue] == [8]
+    assert tracker.get_command_tracker_stats()["flush_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_threshold_flushes_are_coalesced(monkeypatch) -> None:
+    monkeypatch.setattr(tracker, "FLUSH_THRESHOLD", 1)
+    flush = AsyncMock()
+    monkeypatch.setattr(tracker, "_flush_command_queue", flush)
+
+    await tracker.log_command_usage(1, 1, "a", "slash")
+    await tracker.log_command_usage(1, 2, "b", "slash")
+    await tracker._oneshot_flush
+
+    assert flush.await_count == 1
@@ -2,13 +2,19 @@
 Tests for CSV export helpers used by exports cog and others.
 """
 
+import asyncio
+import gzip
 import io
+from contextlib import asynccontextmanager
 
 from utils.csv_helpers import (
+    StreamingCsvExport,
     cleanup_temp_file,
     create_csv_buffer,
     create_discord_file_from_buffer,
     create_temp_csv_file,
+    group_export_files,
+    stream_query_to_csv,
 )
 
 
@@ -84,3 +90,93 @@ class TestCreateTempCsvFile:
 
     def test_cleanup_nonexistent_does_not_raise(self):
         cleanup_temp_file("/nonexistent/path/file.csv")
+
+
+class FakeRecord(dict):
+    pass
+
+
+class FakeCursorConn:
+    """Connection whose cursor yields records and records the prefetch size."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.prefetch = None
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        yield
+        self.in_transaction = False
+
+    def cursor(self, query, *args, prefetch=None):
+        assert self.in_transaction
+        self.prefetch = prefetch
+
+        async def gen():
+            for row in self.rows:
+                yield FakeRecord(row)
+
+        return gen()
+
+
+class TestStreamingCsvExport:
+    """Tests for StreamingCsvExport and stream_query_to_csv."""
+
+    def test_small_export_is_single_plain_csv(self):
+        export = StreamingCsvExport("tickets.csv", ["id", "name"])
+        export.write_row([1, "café"])
+        files = export.files()
+        assert [f.filename for f in files] == ["tickets.csv"]
+        assert files[0].fp.read().decode("utf-8").splitlines() == ["id,name", "1,café"]
+        assert export.rows == 1
+
+    def test_large_export_is_split_with_header_per_part(self):
+        export = StreamingCsvExport("big.csv", ["n"], max_part_bytes=100, gzip_threshold=None)
+        for i in range(100):
+            export.write_row([i])
+        files = export.files()
+        assert len(files) > 1
+        assert files[0].filename == "big_part1.csv"
+        rows = []
+        for f in files:
+            data = f.fp.read()
+            assert len(data) <= 100
+            lines = data.decode("utf-8").splitlines()
+            assert lines[0] == "n"
+            rows.extend(lines[1:])
+        assert rows == [str(i) for i in range(100)]
+
+    def test_output_past_threshold_is_gzipped(self):
+        export = StreamingCsvExport("logs.csv", ["text"], gzip_threshold=1000)
+        for i in range(500):
+            export.write_row([f"row {i} " + "x" * 20])
+        files = export.files()
+        assert [f.filename for f in files] == ["logs.csv.gz"]
+        lines = gzip.decompress(files[0].fp.read()).decode("utf-8").splitlines()
+        assert lines[0] == "text"
+        assert len(lines) == 501
+
+    def test_stream_query_uses_cursor_and_transform(self):
+        conn = FakeCursorConn([{"id": 1, "tags": ["a", "b"]}, {"id": 2, "tags": None}])
+        export = StreamingCsvExport("faq.csv", ["id", "tags"])
+
+        asyncio.run(stream_query_to_csv(
+            conn, "SELECT id, tags FROM t", export=export, chunk_size=50,
+            transform=lambda r: [r["id"], ";".join(r["tags"] or [])],
+        ))
+
+        assert conn.prefetch == 50
+        assert export.files()[0].fp.read().decode("utf-8").splitlines() == ["id,tags", "1,a;b", "2,"]
+
+    def test_parts_are_grouped_by_combined_size(self):
+        export = StreamingCsvExport("big.csv", ["n"], max_part_bytes=100, gzip_threshold=None)
+        for i in range(200):
+            export.write_row([i])
+        files = export.files()
+        groups = group_export_files(files, max_message_bytes=100)
+        assert [f for group in groups for f in group] == files
+        for group in groups:
+            assert len(group) == 1 or sum(len(f.fp.getvalue()) for f in group) <= 100
+        assert len(group_export_files(files, max_message_bytes=10**9)[0]) == 10
@@ -2,7 +2,7 @@
 
 from unittest.mock import MagicMock
 
-from cogs.custom_commands import _paginate_list_lines, _resolve_response
+from cogs.custom_commands import CompiledTriggers, _paginate_list_lines, _resolve_response
 
 
 def test_resolve_response_user_name_before_user_mention():
@@ -21,3 +21,54 @@ def test_paginate_list_lines_splits_at_limit():
     assert len(pages) > 1
     assert all(len(p) <= 500 for p in pages)
     assert "\n".join(pages) == "\n".join(lines)
+
+
+def _cmd(cid, trigger_type, value, case_sensitive=False):
+    return {"id": cid, "trigger_type": trigger_type, "trigger_value": value, "case_sensitive": case_sensitive}
+
+
+def _matched_id(triggers, content):
+    cmd = triggers.match(content)
+    return cmd["id"] if cmd else None
+
+
+def test_compiled_triggers_match_each_type():
+    triggers = CompiledTriggers([
+        _cmd(1, "exact", "Hello"),
+        _cmd(2, "starts_with", "!rules"),
+        _cmd(3, "contains", "pizza"),
+        _cmd(4, "regex", r"^ticket-\d+$"),
+        _cmd(5, "exact", "CaseMe", case_sensitive=True),
+    ])
+    assert _matched_id(triggers, "hello") == 1
+    assert _matched_id(triggers, "hello there") is None
+    assert _matched_id(triggers, "!RULES please") == 2
+    assert _matched_id(triggers, "who wants PIZZA tonight") == 3
+    assert _matched_id(triggers, "TICKET-42") == 4
+    assert _matched_id(triggers, "CaseMe") == 5
+    assert _matched_id(triggers, "caseme") is None
+    assert _matched_id(triggers, "nothing here") is None
+
+
+def test_compiled_triggers_first_command_wins():
+    triggers = CompiledTriggers([
+        _cmd(1, "regex", "order"),
+        _cmd(2, "contains", "ord"),
+        _cmd(3, "starts_with", "o"),
+    ])
+    assert _matched_id(triggers, "order now") == 1
+    assert _matched_id(triggers, "ordinal") == 2
+    assert _matched_id(triggers, "oops") == 3
+
+    triggers = CompiledTriggers([
+        _cmd(1, "contains", "abc"),
+        _cmd(2, "starts_with", "ab"),
+    ])
+    assert _matched_id(triggers, "abcd") == 1
+    assert _matched_id(triggers, "abd") == 2
+
+
+def test_compiled_triggers_skip_invalid_regex():
+    triggers = CompiledTriggers([_cmd(1, "regex", "("), _cmd(2, "contains", "x")])
+    assert _matched_id(triggers, "(x") == 2
+    assert CompiledTriggers([]).match("anything") is None
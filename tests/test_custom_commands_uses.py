@@ -0,0 +1,129 @@
+"""Tests for buffered custom-command use counts."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import cogs.custom_commands as cc_module
+from cogs.custom_commands import CompiledTriggers, CustomCommandsCog
+
+
+class FakeConn:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed: list[tuple[str, tuple]] = []
+
+    async def execute(self, query, *args):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.executed.append((query, args))
+
+
+@pytest.fixture
+def cog(monkeypatch):
+    bot = MagicMock()
+    instance = CustomCommandsCog(bot)
+    conn = FakeConn()
+
+    @asynccontextmanager
+    async def fake_acquire(pool, *args, **kwargs):
+        yield conn
+
+    monkeypatch.setattr(cc_module, "acquire_safe", fake_acquire)
+    monkeypatch.setattr(cc_module, "get_bot_db_pool", lambda _bot: object())
+    command = {
+        "id": 7, "name": "hi", "trigger_type": "exact", "trigger_value": "hi",
+        "response": "used {uses}", "case_sensitive": False, "delete_trigger": False,
+        "reply_to_user": False, "uses": 10,
+    }
+    instance._cache[1] = (time.monotonic(), CompiledTriggers([command]))
+    instance.fake_conn = conn
+    instance.command = command
+    return instance
+
+
+def make_message():
+    message = MagicMock()
+    message.author.bot = False
+    message.author.display_name = "Ann"
+    message.author.mention = "<@1>"
+    message.guild.id = 1
+    message.guild.name = "Guild"
+    message.channel.mention = "<#1>"
+    message.content = "hi"
+    message.channel.send = AsyncMock()
+    return message
+
+
+def test_uses_are_counted_in_memory_and_cache_stays_warm(cog):
+    messages = [make_message() for _ in range(3)]
+    for message in messages:
+        asyncio.run(cog.on_message(message))
+
+    sent = [m.channel.send.await_args.args[0] for m in messages]
+    assert sent == ["used 10", "used 11", "used 12"]
+    assert cog._pending_uses == {(1, 7): 3}
+    assert 1 in cog._cache
+    assert cog.fake_conn.executed == []
+
+
+def test_flush_writes_one_batched_update_and_folds_into_cache(cog):
+    cog._pending_uses = {(1, 7): 3, (2, 9): 1}
+
+    asyncio.run(cog._flush_uses())
+
+    assert len(cog.fake_conn.executed) == 1
+    query, args = cog.fake_conn.executed[0]
+    assert "unnest" in query
+    assert args == ([7, 9], [3, 1])
+    assert cog._pending_uses == {}
+    assert cog.command["uses"] == 13
+
+
+def test_cache_reloaded_during_flush_is_not_folded_twice(cog):
+    cog._pending_uses = {(1, 7): 3}
+    reloaded = dict(cog.command, uses=13)  # reload already sees the UPDATE
+
+    async def execute_and_reload(query, *args):
+        cog.fake_conn.executed.append((query, args))
+        cog._cache[1] = (time.monotonic() + 1, CompiledTriggers([reloaded]))
+
+    cog.fake_conn.execute = execute_and_reload
+
+    asyncio.run(cog._flush_uses())
+
+    assert reloaded["uses"] == 13
+    assert cog.command["uses"] == 10
+    assert 1 not in cog._cache  # reloaded mid-flush: next read loads committed counts
+
+
+def test_uses_include_in_flight_deltas(cog):
+    cog._pending_uses = {(1, 7): 3}
+    seen = []
+
+    async def slow_execute(query, *args):
+        message = make_message()
+        await cog.on_message(message)
+        seen.append(message.channel.send.await_args.args[0])
+
+    cog.fake_conn.execute = slow_execute
+
+    asyncio.run(cog._flush_uses())
+
+    assert seen == ["used 13"]
+    assert cog._inflight_uses == {}
+    assert cog._pending_uses == {(1, 7): 1}
+    assert cog.command["uses"] == 13
+
+
+def test_failed_flush_keeps_deltas(cog):
+    cog.fake_conn.fail = True
+    cog._pending_uses = {(1, 7): 2}
+
+    asyncio.run(cog._flush_uses())
+
+    assert cog._pending_uses == {(1, 7): 2}
+    assert cog.command["uses"] == 10
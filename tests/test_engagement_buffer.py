@@ -0,0 +1,124 @@
+"""Tests for the engagement write-behind buffer."""
+
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+
+import pytest
+
+from utils.engagement_buffer import EngagementWriteBuffer
+
+
+class FakeConn:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.executed: list[tuple[str, tuple]] = []
+
+    async def execute(self, query, *args):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.executed.append((query, args))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool:
+    def __init__(self, conn: FakeConn):
+        self.conn = conn
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self.conn
+
+
+def _query(conn: FakeConn, table_fragment: str) -> tuple[str, tuple]:
+    return next((q, a) for q, a in conn.executed if table_fragment in q)
+
+
+@pytest.mark.asyncio
+async def test_coalesces_and_flushes_one_statement_per_table():
+    buf = EngagementWriteBuffer()
+    ts = datetime(2024, 3, 18, 12, 0, tzinfo=UTC)
+    for message_id in (1, 2, 2):
+        buf.index_message(10, message_id, 5, 7, ts, False, False)
+    for _ in range(3):
+        buf.add_reaction(10, 1)
+    for _ in range(4):
+        buf.count_challenge_message(99, 7, increment=True)
+    buf.count_challenge_message(98, 7, increment=False)
+    buf.set_streak(10, 7, date(2024, 3, 17), 1, "alice")
+    buf.set_streak(10, 7, date(2024, 3, 18), 2, "alice")
+    assert buf.pending == 2 + 1 + 2 + 1
+
+    conn = FakeConn()
+    pool = FakePool(conn)
+    written = await buf.flush(pool)
+
+    assert written == 6
+    assert pool.acquired == 1
+    assert len(conn.executed) == 4
+    _, msg_args = _query(conn, "INSERT INTO engagement_weekly_messages")
+    assert msg_args[1] == [1, 2]
+    _, reaction_args = _query(conn, "SET reactions_count")
+    assert reaction_args == ([10], [1], [3])
+    _, count_args = _query(conn, "engagement_participants")
+    assert sorted(zip(*count_args, strict=True)) == [(98, 7, 0), (99, 7, 4)]
+    _, streak_args = _query(conn, "engagement_streaks")
+    assert streak_args[2:4] == ([date(2024, 3, 18)], [2])
+    assert buf.pending == 0
+    assert buf.coalesced == 1 + 2 + 3 + 1
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_restores_and_merges_newer_writes():
+    buf = EngagementWriteBuffer()
+    buf.count_challenge_message(1, 2, increment=True)
+    buf.set_streak(3, 4, date(2024, 3, 17), 1, None)
+
+    assert await buf.flush(FakePool(FakeConn(fail=True))) == 0
+    assert buf.flush_failures == 1
+
+    buf.count_challenge_message(1, 2, increment=True)
+    buf.set_streak(3, 4, date(2024, 3, 18), 2, None)
+    conn = FakeConn()
+    await buf.flush(FakePool(conn))
+
+    _, count_args = _query(conn, "engagement_participants")
+    assert count_args[2] == [2]
+    _, streak_args = _query(conn, "engagement_streaks")
+    assert streak_args[3] == [2]
+
+
+@pytest.mark.asyncio
+async def test_empty_or_poolless_flush_is_noop():
+    buf = EngagementWriteBuffer()
+    pool = FakePool(FakeConn())
+    assert await buf.flush(pool) == 0
+    assert pool.acquired == 0
+    buf.add_reaction(1, 1)
+    assert await buf.flush(None) == 0
+    assert buf.pending == 1
+
+
+def test_bounded_pending_drops_new_keys():
+    buf = EngagementWriteBuffer(max_pending=2)
+    buf.add_reaction(1, 1)
+    buf.add_reaction(1, 2)
+    buf.add_reaction(1, 3)
+    buf.add_reaction(1, 1)  # existing key still coalesces
+    assert buf.pending == 2
+    assert buf.dropped == 1
+
+
+def test_streak_state_cache_is_lru():
+    buf = EngagementWriteBuffer(streak_cache_size=2)
+    buf.remember_streak(1, 1, (date(2024, 3, 18), 1, None))
+    buf.remember_streak(1, 2, (date(2024, 3, 18), 1, None))
+    assert buf.get_streak(1, 1) is not None
+    buf.set_streak(1, 3, date(2024, 3, 18), 1, None)
+    assert buf.get_streak(1, 2) is None
+    assert buf.get_streak(1, 1) == (date(2024, 3, 18), 1, None)
+    assert buf.get_streak(1, 3) == (date(2024, 3, 18), 1, None)
@@ -0,0 +1,104 @@
+"""Tests for single-scan weekly award computation."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import utils.engagement_service as engagement_service
+
+
+class FakeConn:
+    def __init__(self, winners):
+        self.winners = winners
+        self.calls: list[tuple[str, str, tuple]] = []
+
+    async def fetchval(self, query, *args):
+        self.calls.append(("fetchval", query, args))
+        return 42
+
+    async def fetch(self, query, *args):
+        self.calls.append(("fetch", query, args))
+        return self.winners
+
+    async def execute(self, query, *args):
+        self.calls.append(("execute", query, args))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+class FakePool:
+    def __init__(self, conn):
+        self.conn = conn
+        self.acquired = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.acquired += 1
+        yield self.conn
+
+
+CONFIGS = [
+    {"key": "motivator", "label": "📣", "filter": "non_food"},
+    {"key": "foodfluencer", "label": "🥗", "filter": "food"},
+    {"key": "sharpshooter", "label": "📸", "filter": "image"},
+    {"key": "star", "label": "⭐", "filter": "reactions"},
+]
+
+
+@pytest.mark.asyncio
+async def test_all_awards_from_one_query_and_one_upsert(monkeypatch):
+    winners = [
+        {"filter": "non_food", "user_id": 1, "cnt": 30, "message_id": None},
+        {"filter": "image", "user_id": 2, "cnt": 5, "message_id": None},
+        {"filter": "reactions", "user_id": 3, "cnt": 9, "message_id": 777},
+    ]
+    conn = FakeConn(winners)
+    pool = FakePool(conn)
+    badges: list[tuple[int, str]] = []
+
+    async def fake_add_badge(_pool, _guild_id, user_id, key):
+        badges.append((user_id, key))
+
+    monkeypatch.setattr(engagement_service, "add_badge", fake_add_badge)
+    bot = SimpleNamespace(
+        settings=SimpleNamespace(_pool=pool),
+        get_guild=lambda _gid: None,
+        get_channel=lambda _cid: None,
+    )
+
+    await engagement_service.compute_weekly_awards(bot, 123, None, CONFIGS)
+
+    assert pool.acquired == 1
+    kinds = [kind for kind, _, _ in conn.calls]
+    assert kinds == ["fetchval", "fetch", "execute"]
+    scan_sql = conn.calls[1][1]
+    assert scan_sql.count("FROM engagement_weekly_messages") == 1
+    assert "FILTER (WHERE is_food)" in scan_sql
+
+    _, upsert_sql, args = conn.calls[2]
+    assert "ON CONFLICT (week_id, award_key)" in upsert_sql
+    week_id, keys, user_ids, metrics, message_ids = args
+    assert week_id == 42
+    # foodfluencer has no candidate and is skipped
+    assert keys == ["motivator", "sharpshooter", "star"]
+    assert user_ids == [1, 2, 3]
+    assert metrics == [30, 5, 9]
+    assert message_ids == [None, None, 777]
+    assert badges == [(1, "motivator"), (2, "sharpshooter"), (3, "star")]
+
+
+@pytest.mark.asyncio
+async def test_no_candidates_writes_no_results(monkeypatch):
+    conn = FakeConn([])
+    bot = SimpleNamespace(
+        settings=SimpleNamespace(_pool=FakePool(conn)),
+        get_guild=lambda _gid: None,
+        get_channel=lambda _cid: None,
+    )
+
+    await engagement_service.compute_weekly_awards(bot, 123, None, CONFIGS)
+
+    assert [kind for kind, _, _ in conn.calls] == ["fetchval", "fetch"]
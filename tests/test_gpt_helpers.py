@@ -0,0 +1,104 @@
+"""Tests for LLM request coalescing and concurrent prompt preparation in gpt.helpers."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import gpt.helpers as helpers
+
+
+class FakeCompletions:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls: list[dict] = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(
+            usage=SimpleNamespace(total_tokens=7),
+            choices=[SimpleNamespace(message=SimpleNamespace(content="pong"))],
+        )
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    fake = FakeCompletions()
+    monkeypatch.setattr(helpers, "llm_client", SimpleNamespace(chat=SimpleNamespace(completions=fake)))
+    monkeypatch.setattr(helpers, "_api_key_missing", False)
+    monkeypatch.setattr(helpers, "_get_settings_values", lambda default: (default, None))
+    monkeypatch.setattr(helpers, "_inflight_completions", {})
+    successes: list[int | None] = []
+    monkeypatch.setattr(helpers, "log_gpt_success", lambda **kw: successes.append(kw["user_id"]))
+    fake.successes = successes
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_prompts_share_one_call(completions):
+    results = await asyncio.gather(*(helpers.ask_gpt("ping") for _ in range(5)))
+
+    assert results == ["pong"] * 5
+    assert len(completions.calls) == 1
+    assert len(completions.successes) == 1
+    assert helpers._inflight_completions == {}
+
+
+@pytest.mark.asyncio
+async def test_different_prompts_are_not_coalesced(completions):
+    await asyncio.gather(helpers.ask_gpt("ping"), helpers.ask_gpt("pong"))
+
+    assert len(completions.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call(completions):
+    first = asyncio.create_task(helpers.ask_gpt("ping"))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(helpers.ask_gpt("ping"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "pong"
+    assert len(completions.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_quota_and_reflections_load_concurrently(completions, monkeypatch):
+    active = {"now": 0, "max": 0}
+
+    async def slow(result):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return result
+
+    async def fake_quota(user_id, guild_id):
+        return await slow((True, 1, 10))
+
+    async def fake_reflections(user_id, limit=5):
+        return await slow("Recent reflections: calm")
+
+    monkeypatch.setattr("utils.premium_guard.check_and_increment_gpt_quota", fake_quota)
+    monkeypatch.setattr("gpt.context_loader.load_user_reflections", fake_reflections)
+
+    assert await helpers.ask_gpt("ping", user_id=1, guild_id=2, include_reflections=True) == "pong"
+
+    assert active["max"] == 2
+    system_prompt = completions.calls[0]["messages"][0]["content"]
+    assert system_prompt.endswith("Recent reflections: calm")
+
+
+@pytest.mark.asyncio
+async def test_quota_denial_skips_completion(completions, monkeypatch):
+    async def denied(user_id, guild_id):
+        return False, 10, 10
+
+    monkeypatch.setattr("utils.premium_guard.check_and_increment_gpt_quota", denied)
+
+    reply = await helpers.ask_gpt("ping", user_id=1, guild_id=2)
+
+    assert "daily limit of 10" in reply
+    assert completions.calls == []
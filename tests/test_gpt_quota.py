@@ -0,0 +1,138 @@
+"""Tests for the in-memory GPT daily quota counters in utils.premium_guard."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+import utils.premium_guard as premium_guard
+
+
+class FakeConn:
+    def __init__(self, stored=0):
+        self.stored = stored
+        self.reads = 0
+        self.writes: list[tuple] = []
+        self.fail_writes = False
+
+    async def fetchval(self, query, *args):
+        self.reads += 1
+        await asyncio.sleep(0)
+        return self.stored
+
+    async def execute(self, query, *args):
+        if self.fail_writes:
+            raise ConnectionError("db down")
+        self.writes.append(args)
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    fake = FakeConn()
+
+    @asynccontextmanager
+    async def fake_acquire(_pool):
+        yield fake
+
+    monkeypatch.setattr(premium_guard, "acquire_safe", fake_acquire)
+    monkeypatch.setattr(premium_guard, "_ensure_pool", AsyncMock(return_value=object()))
+    monkeypatch.setattr(premium_guard, "get_user_tier", AsyncMock(return_value="free"))
+    monkeypatch.setattr(premium_guard, "_gpt_day", None)
+    monkeypatch.setattr(premium_guard, "_gpt_counts", {})
+    monkeypatch.setattr(premium_guard, "_gpt_pending", {})
+    monkeypatch.setattr(premium_guard, "_gpt_seeding", {})
+    monkeypatch.setattr(premium_guard, "_gpt_flush_lock", None)
+    monkeypatch.setattr(premium_guard, "_gpt_flush_threshold", lambda: 1000)
+    return fake
+
+
+def test_counts_in_memory_after_one_seed_and_denies_at_limit(conn):
+    conn.stored = 3
+
+    async def run():
+        return [await premium_guard.check_and_increment_gpt_quota(1, 2) for _ in range(3)]
+
+    results = asyncio.run(run())
+
+    assert results == [(True, 4, 5), (True, 5, 5), (False, 5, 5)]
+    assert conn.reads == 1
+    assert conn.writes == []
+    assert premium_guard.get_gpt_usage_today(1, 2) == 5
+
+
+def test_concurrent_first_calls_share_one_seed(conn):
+    async def run():
+        return await asyncio.gather(*(premium_guard.check_and_increment_gpt_quota(1, 2) for _ in range(7)))
+
+    results = asyncio.run(run())
+
+    assert conn.reads == 1
+    assert [allowed for allowed, _count, _limit in results].count(True) == 5
+
+
+def test_flush_writes_one_batched_upsert(conn):
+    async def run():
+        await premium_guard.check_and_increment_gpt_quota(1, 2)
+        await premium_guard.check_and_increment_gpt_quota(1, 2)
+        await premium_guard.check_and_increment_gpt_quota(3, 2)
+        await premium_guard.flush_gpt_usage()
+
+    asyncio.run(run())
+
+    assert len(conn.writes) == 1
+    user_ids, guild_ids, _days, deltas = conn.writes[0]
+    assert dict(zip(user_ids, deltas, strict=True)) == {1: 2, 3: 1}
+    assert guild_ids == [2, 2]
+    assert premium_guard._gpt_pending == {}
+
+
+def test_failed_flush_keeps_deltas(conn):
+    async def run():
+        await premium_guard.check_and_increment_gpt_quota(1, 2)
+        conn.fail_writes = True
+        await premium_guard.flush_gpt_usage()
+
+    asyncio.run(run())
+
+    assert sum(premium_guard._gpt_pending.values()) == 1
+
+
+def test_fails_open_and_still_counts_when_db_unavailable(conn, monkeypatch):
+    monkeypatch.setattr(premium_guard, "_ensure_pool", AsyncMock(return_value=None))
+
+    result = asyncio.run(premium_guard.check_and_increment_gpt_quota(1, 2))
+
+    assert result == (True, 0, 5)
+    assert sum(premium_guard._gpt_pending.values()) == 1
+    assert premium_guard.get_gpt_usage_today(1, 2) is None
+
+
+def test_flush_after_erasure_writes_nothing_for_that_user(conn):
+    async def run():
+        await premium_guard.check_and_increment_gpt_quota(1, 2)
+        await premium_guard.check_and_increment_gpt_quota(1, 3)
+        await premium_guard.check_and_increment_gpt_quota(4, 2)
+        await premium_guard.forget_gpt_usage(1)
+        await premium_guard.flush_gpt_usage()
+
+    asyncio.run(run())
+
+    assert len(conn.writes) == 1
+    user_ids, _guild_ids, _days, deltas = conn.writes[0]
+    assert list(user_ids) == [4] and list(deltas) == [1]
+    assert premium_guard.get_gpt_usage_today(1, 2) is None
+    assert premium_guard.get_gpt_usage_today(1, 3) is None
+
+
+def test_seed_in_flight_during_erasure_is_dropped(conn):
+    async def run():
+        call = asyncio.create_task(premium_guard.check_and_increment_gpt_quota(1, 2))
+        await asyncio.sleep(0)
+        await premium_guard.forget_gpt_usage(1)
+        return await call
+
+    allowed, _count, _limit = asyncio.run(run())
+
+    assert allowed
+    assert premium_guard.get_gpt_usage_today(1, 2) is None
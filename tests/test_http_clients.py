@@ -0,0 +1,84 @@
+"""Tests for the shared per-upstream HTTP clients."""
+
+import asyncio
+
+import pytest
+
+import utils.http_clients as http_clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(http_clients, "_clients", {})
+    monkeypatch.setattr(http_clients, "_stats", {})
+
+
+async def _keepalive_server():
+    """Minimal HTTP/1.1 server that keeps connections open; returns (server, url)."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}/"
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_upstream():
+    supabase = http_clients.get_http_client(http_clients.SUPABASE)
+    assert http_clients.get_http_client(http_clients.SUPABASE) is supabase
+    assert http_clients.get_http_client(http_clients.CORE_API) is not supabase
+
+    await http_clients.close_http_clients()
+    assert supabase.is_closed
+    assert http_clients.get_http_client(http_clients.SUPABASE) is not supabase
+    await http_clients.close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_clients_are_per_event_loop():
+    main = http_clients.get_http_client(http_clients.SUPABASE)
+
+    async def use_on_other_loop():
+        client = http_clients.get_http_client(http_clients.SUPABASE)
+        await http_clients.close_http_clients()
+        return client
+
+    # The API thread runs its own loop; it must not share the bot loop's client
+    other = await asyncio.to_thread(asyncio.run, use_on_other_loop())
+    assert other is not main
+    assert other.is_closed
+    assert not main.is_closed
+    assert http_clients.get_http_client(http_clients.SUPABASE) is main
+    await http_clients.close_http_clients()
+    assert main.is_closed
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_reuse_the_connection():
+    server, url = await _keepalive_server()
+    try:
+        client = http_clients.get_http_client(http_clients.SUPABASE)
+        for _ in range(3):
+            response = await client.get(url, timeout=2.0)
+            assert response.text == "ok"
+    finally:
+        await http_clients.close_http_clients()
+        server.close()
+        await server.wait_closed()
+
+    assert http_clients.get_http_client_stats() == {
+        "http_client_requests": 3,
+        "http_client_connections_opened": 1,
+        "http_client_connections_reused": 2,
+    }
+    await http_clients.close_http_clients()
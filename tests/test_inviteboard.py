@@ -0,0 +1,111 @@
+"""Tests for invite-use diffing and batched join handling in InviteTracker."""
+
+import asyncio
+import time
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+import cogs.inviteboard as inviteboard
+from cogs.inviteboard import InviteTracker, _used_invites
+
+
+def invite(code, uses, inviter_id=None, max_uses=0):
+    inviter = (
+        SimpleNamespace(id=inviter_id, mention=f"<@{inviter_id}>", name=f"u{inviter_id}") if inviter_id else None
+    )
+    return SimpleNamespace(code=code, uses=uses, inviter=inviter, max_uses=max_uses, guild=SimpleNamespace(id=1))
+
+
+def test_used_invites_diffs_by_code():
+    old = {"a": invite("a", 3), "b": invite("b", 1)}
+    new = [invite("a", 5, 10), invite("b", 1, 11), invite("c", 1, 12)]
+
+    used = _used_invites(old, new)
+
+    assert [i.code for i in used] == ["a", "a", "c"]
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    bot = MagicMock()
+    bot.wait_until_ready = AsyncMock()
+    cog = InviteTracker.__new__(InviteTracker)
+    cog.bot = bot
+    cog.invites_cache = {}
+    cog._pending_joins = {}
+    cog._exhausted = {}
+    cog._is_enabled = lambda _gid: True
+    cog._get_announcement_channel_id = lambda _gid: 99
+    cog.settings = None
+    cog.increments: list[tuple[int, int]] = []
+
+    async def fake_update(guild_id, inviter_id, count=None, increment=1):
+        cog.increments.append((inviter_id, increment))
+        return 7 + increment
+
+    cog.update_invite_count = fake_update
+    monkeypatch.setattr(inviteboard, "JOIN_BATCH_DELAY", 0.01)
+    return cog
+
+
+def make_guild(invites):
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.send = AsyncMock()
+    guild = MagicMock()
+    guild.id = 1
+    guild.invites = AsyncMock(return_value=invites)
+    guild.get_channel = lambda _cid: channel
+    return guild, channel
+
+
+def make_member(guild, mid):
+    return SimpleNamespace(id=mid, guild=guild, mention=f"<@{mid}>", name=f"m{mid}", display_name=f"m{mid}")
+
+
+def test_burst_of_joins_shares_one_fetch_and_one_update_per_inviter(tracker):
+    tracker.invites_cache[1] = {"a": invite("a", 0, 10)}
+    guild, channel = make_guild([invite("a", 3, 10)])
+    members = [make_member(guild, i) for i in range(3)]
+
+    async def run():
+        await asyncio.gather(*(tracker.on_member_join(m) for m in members))
+
+    asyncio.run(run())
+
+    guild.invites.assert_awaited_once()
+    assert tracker.increments == [(10, 3)]
+    assert channel.send.await_count == 3
+    sent = [call.args[0] for call in channel.send.await_args_list]
+    assert [text.rsplit(" has ", 1)[1] for text in sent] == ["8 invites.", "9 invites.", "10 invites."]
+    assert tracker.invites_cache[1]["a"].uses == 3
+
+
+def test_single_use_invite_deleted_before_fetch_is_attributed(tracker):
+    single_use = invite("s", 0, 20, max_uses=1)
+    tracker.invites_cache[1] = {"s": single_use}
+    asyncio.run(tracker.on_invite_delete(single_use))
+    guild, channel = make_guild([])
+
+    asyncio.run(tracker.on_member_join(make_member(guild, 1)))
+
+    assert tracker.increments == [(20, 1)]
+    assert "s" not in tracker.invites_cache[1]
+
+
+def test_invite_events_keep_index_current(tracker):
+    created = invite("new", 0, 30)
+    asyncio.run(tracker.on_invite_create(created))
+    assert tracker.invites_cache[1]["new"] is created
+
+    asyncio.run(tracker.on_invite_delete(created))
+    assert tracker.invites_cache[1] == {}
+    assert tracker._exhausted == {}
+
+
+def test_stale_exhausted_invites_are_ignored(tracker):
+    tracker._exhausted[1] = deque([(time.monotonic() - 60, invite("old", 0, 40, max_uses=1))])
+    assert tracker._take_exhausted(1, 1) == []
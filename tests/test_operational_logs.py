@@ -0,0 +1,102 @@
+"""Tests for the indexed operational event store."""
+
+import json
+
+import pytest
+
+import utils.operational_logs as operational_logs
+from utils.operational_logs import EventType, OperationalEventStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    fresh = OperationalEventStore(max_events=5)
+    monkeypatch.setattr(operational_logs, "_store", fresh)
+    monkeypatch.setattr(operational_logs, "_push_to_core_ingress", lambda _event: None)
+    return fresh
+
+
+def log(message, guild_id=None, event_type=EventType.BOT_RECONNECT):
+    operational_logs.log_operational_event(event_type, message, guild_id=guild_id)
+
+
+def messages(events):
+    return [e["message"] for e in events]
+
+
+def test_guild_query_includes_global_events_newest_first(store):
+    log("global-1")
+    log("guild-1", guild_id=1)
+    log("other", guild_id=2)
+    log("guild-2", guild_id=1)
+
+    events = operational_logs.get_operational_events(guild_id=1)
+
+    assert messages(events) == ["guild-2", "guild-1", "global-1"]
+    assert isinstance(events[0]["timestamp"], str)
+
+
+def test_type_filter_and_invalid_types(store):
+    log("a", guild_id=1, event_type=EventType.BOT_RECONNECT)
+    log("b", guild_id=1, event_type=EventType.BOT_DISCONNECT)
+
+    assert messages(operational_logs.get_operational_events(event_types=[EventType.BOT_DISCONNECT.value])) == ["b"]
+    assert messages(
+        operational_logs.get_operational_events(guild_id=1, event_types=[EventType.BOT_RECONNECT.value])
+    ) == ["a"]
+    assert operational_logs.get_operational_events(event_types=["not_a_type"]) == []
+
+
+def test_cursor_pages_through_older_events(store):
+    for i in range(5):
+        log(f"e{i}", guild_id=1)
+
+    page, cursor = operational_logs.query_operational_events(guild_id=1, limit=2)
+    assert messages(page) == ["e4", "e3"]
+    page, cursor = operational_logs.query_operational_events(guild_id=1, limit=2, before=cursor)
+    assert messages(page) == ["e2", "e1"]
+    page, cursor = operational_logs.query_operational_events(guild_id=1, limit=2, before=cursor)
+    assert messages(page) == ["e0"]
+    assert cursor is None
+
+
+def test_eviction_keeps_indexes_bounded(store):
+    for i in range(8):
+        log(f"e{i}", guild_id=i % 2)
+
+    assert len(store._events) == 5
+    assert sum(len(ids) for ids in store._by_guild.values()) == 5
+    assert sum(len(ids) for ids in store._by_type.values()) == 5
+    assert messages(operational_logs.get_operational_events(guild_id=1)) == ["e7", "e5", "e3"]
+
+
+def test_returned_events_do_not_alias_the_store(store):
+    log("a")
+    operational_logs.get_operational_events()[0]["details"]["x"] = 1
+
+    assert operational_logs.get_operational_events()[0]["details"] == {}
+
+
+def test_spill_file_survives_restart_and_is_compacted(tmp_path):
+    path = tmp_path / "events.jsonl"
+    first = OperationalEventStore(max_events=3, spill_path=str(path))
+    for i in range(7):
+        first.append(f"2024-01-01T00:00:0{i}+00:00", EventType.BOT_RECONNECT.value, 1, f"e{i}", {})
+    first.close()
+
+    assert len(path.read_text().splitlines()) <= 3 * operational_logs._COMPACT_FACTOR
+
+    second = OperationalEventStore(max_events=3, spill_path=str(path))
+    events, _ = second.query(guild_id=1)
+    assert messages(events) == ["e6", "e5", "e4"]
+    assert second.append("2024-01-01T00:00:09+00:00", EventType.BOT_RECONNECT.value, 1, "e7", {})["id"] == 8
+    second.flush()
+    assert json.loads(path.read_text().splitlines()[-1])["message"] == "e7"
+
+
+def test_stored_details_are_copied_at_write_time(store):
+    details = {"user_id": 1}
+    operational_logs.log_operational_event(EventType.BOT_RECONNECT, "a", details=details)
+    details["user_id"] = 2
+
+    assert operational_logs.get_operational_events()[0]["details"] == {"user_id": 1}
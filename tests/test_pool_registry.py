@@ -0,0 +1,134 @@
+"""Tests for the shared database pool registry."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import utils.pool_registry as pool_registry
+from utils.database_helpers import DatabaseManager
+from utils.db_helpers import acquire_safe, get_bot_db_pool
+
+
+class FakePhysicalPool:
+    def __init__(self):
+        self.closed = False
+        self.active = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            yield object()
+        finally:
+            self.active -= 1
+
+    def is_closing(self):
+        return self.closed
+
+    def get_size(self):
+        return 1
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    pools: list[FakePhysicalPool] = []
+
+    async def fake_create(dsn, name, **kwargs):
+        pools.append(FakePhysicalPool())
+        return pools[-1]
+
+    monkeypatch.setattr(pool_registry, "create_db_pool", fake_create)
+    monkeypatch.setattr(pool_registry, "_registry", pool_registry.PoolRegistry())
+    monkeypatch.setattr(pool_registry.config, "DATABASE_URL", "postgresql://test", raising=False)
+    monkeypatch.setattr(pool_registry.config, "DB_POOL_QUOTAS", "", raising=False)
+    return pools
+
+
+def test_subsystems_share_one_physical_pool_per_loop(created):
+    async def run():
+        settings = await pool_registry.get_subsystem_pool("settings")
+        manager = DatabaseManager("faq", {"DATABASE_URL": "postgresql://test"})
+        faq = await manager.ensure_pool()
+        async with acquire_safe(settings), acquire_safe(faq):
+            pass
+        return settings, faq
+
+    settings, faq = asyncio.run(run())
+    assert len(created) == 1
+    assert settings is not faq
+    assert settings.get_stats()["acquisitions"] == 1
+
+    # A second event loop (the API thread) gets its own physical pool
+    asyncio.run(pool_registry.get_subsystem_pool("api"))
+    assert len(created) == 2
+
+
+def test_quota_bounds_concurrency_and_records_saturation(created):
+    async def run():
+        pool = await pool_registry.get_subsystem_pool("exports", quota=2)
+
+        async def hold():
+            async with pool.acquire():
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(hold() for _ in range(5)))
+        return pool
+
+    pool = asyncio.run(run())
+    stats = pool_registry.get_pool_stats()["exports"]
+
+    assert created[0].peak == 2
+    assert stats["acquisitions"] == 5
+    assert stats["saturated"] >= 3
+    assert stats["in_use"] == 0
+    assert stats["quota"] == 2
+    assert stats["hold_ms_max"] > 0
+    assert pool.get_max_size() == 2
+
+
+def test_closing_a_handle_leaves_the_shared_pool_open(created):
+    async def run():
+        first = await pool_registry.get_subsystem_pool("faq")
+        await first.close()
+        second = await pool_registry.get_subsystem_pool("faq")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.is_closing()
+    assert second is not first and not second.is_closing()
+    assert not created[0].closed
+    with pytest.raises(RuntimeError):
+        asyncio.run(_acquire(first))
+
+
+def test_quota_overrides_from_config(created, monkeypatch):
+    monkeypatch.setattr(pool_registry.config, "DB_POOL_QUOTAS", "faq=7, bad=x", raising=False)
+    assert pool_registry._quota_for("faq") == 7
+    assert pool_registry._quota_for("settings") == pool_registry._DEFAULT_QUOTAS["settings"]
+
+
+def test_cogs_get_their_own_bot_subsystem(created):
+    async def run():
+        settings = await pool_registry.get_subsystem_pool("settings")
+        bot = await pool_registry.get_subsystem_pool("bot")
+        return settings, bot
+
+    settings, bot_pool = asyncio.run(run())
+    bot = SimpleNamespace(settings=SimpleNamespace(_pool=settings, _bot_pool=bot_pool))
+
+    assert get_bot_db_pool(bot) is bot_pool
+    assert bot_pool.quota >= 10
+    assert set(pool_registry.get_pool_stats()) >= {"bot", "settings"}
+
+
+async def _acquire(pool):
+    async with acquire_safe(pool):
+        pass
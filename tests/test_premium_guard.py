@@ -2,6 +2,7 @@
 Tests for Premium guard: message helper and is_premium behaviour.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -10,8 +11,10 @@ from utils.premium_guard import (
     _get_cached,
     _set_cache,
     get_active_premium_guild,
+    get_user_tier,
     invalidate_premium_cache,
     is_premium,
+    prefetch_premium,
     premium_required_message,
 )
 
@@ -140,3 +143,68 @@ class TestGetActivePremiumGuild:
             result = await get_active_premium_guild(111)
         assert result == 98765
         assert isinstance(result, int)
+
+
+class TestStripedCache:
+    """Per-user index, negative TTL and bulk prefetch."""
+
+    def test_negative_results_use_shorter_ttl(self, monkeypatch):
+        monkeypatch.setattr("utils.premium_guard._negative_cache_ttl_seconds", lambda: -1)
+        _set_cache(70, 1, False)
+        _set_cache(70, 2, True)
+        assert _get_cached(70, 1) is None
+        assert _get_cached(70, 2) is True
+        invalidate_premium_cache(70, None)
+
+    def test_user_invalidation_does_not_touch_other_users(self):
+        _set_cache(80, 1, True)
+        _set_cache(80, 2, True)
+        _set_cache(81, 1, True)
+        invalidate_premium_cache(80, None)
+        assert _get_cached(80, 1) is None
+        assert _get_cached(80, 2) is None
+        assert _get_cached(81, 1) is True
+        invalidate_premium_cache(81, None)
+
+    @pytest.mark.asyncio
+    async def test_prefetch_resolves_misses_in_one_query_and_caches_tier(self, monkeypatch):
+        mock_conn = AsyncMock()
+        mock_conn.fetch = AsyncMock(return_value=[{"user_id": 91, "tier": "yearly", "expires_at": None}])
+        mock_cm = AsyncMock()
+        mock_cm.__aenter__.return_value = mock_conn
+        mock_cm.__aexit__.return_value = None
+        monkeypatch.setattr("utils.premium_guard.config.CORE_API_URL", "", raising=False)
+        _set_cache(90, 5, True)
+        with patch("utils.premium_guard._ensure_pool", new_callable=AsyncMock, return_value=AsyncMock()), \
+             patch("utils.premium_guard.acquire_safe", return_value=mock_cm):
+            result = await prefetch_premium([90, 91, 92, 91], 5)
+            assert result == {90: True, 91: True, 92: False}
+            assert mock_conn.fetch.await_count == 1
+            assert mock_conn.fetch.await_args.args[1] == [91, 92]
+            assert await get_user_tier(91, 5) == "yearly"
+            assert await get_user_tier(92, 5) == "free"
+        mock_conn.fetchrow.assert_not_called()
+        for user_id in (90, 91, 92):
+            invalidate_premium_cache(user_id, None)
+
+    @pytest.mark.asyncio
+    async def test_prefetch_caps_concurrent_core_calls(self, monkeypatch):
+        monkeypatch.setattr("utils.premium_guard.config.CORE_API_URL", "https://core.test", raising=False)
+        monkeypatch.setattr("utils.premium_guard.config.ALPHAPY_SERVICE_KEY", "key", raising=False)
+        monkeypatch.setattr("utils.premium_guard._PREFETCH_CORE_CONCURRENCY", 3)
+        active = {"now": 0, "max": 0}
+
+        async def fake_core(user_id, guild_id):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return user_id % 2 == 0
+
+        monkeypatch.setattr("utils.premium_guard._check_core_api", fake_core)
+        user_ids = list(range(200, 220))
+        result = await prefetch_premium(user_ids, 6)
+        assert result == {user_id: user_id % 2 == 0 for user_id in user_ids}
+        assert active["max"] == 3
+        for user_id in user_ids:
+            invalidate_premium_cache(user_id, None)
@@ -0,0 +1,97 @@
+"""Tests for the per-user reflection context cache in gpt.context_loader."""
+
+import asyncio
+
+import pytest
+
+import gpt.context_loader as context_loader
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    """Fake Supabase + app_reflections sources that count round-trips."""
+    state = {"calls": 0, "text": "stay curious", "user_id": "uuid-1"}
+
+    async def fake_user_id(discord_id):
+        state["calls"] += 1
+        return state["user_id"]
+
+    async def fake_get(table, params):
+        state["calls"] += 1
+        if table == "profiles":
+            return [{"bot_sharing_enabled": True}]
+        if table == "reflections_shared":
+            return [{"date": "2024-03-18", "reflection_text": state["text"]}]
+        return []
+
+    async def fake_app(discord_id, limit=5):
+        state["calls"] += 1
+        return "", 0
+
+    monkeypatch.setattr(context_loader, "get_user_id_for_discord", fake_user_id)
+    monkeypatch.setattr(context_loader, "_supabase_get", fake_get)
+    monkeypatch.setattr(context_loader, "_load_app_reflections", fake_app)
+    monkeypatch.setattr(context_loader, "_context_cache", context_loader._ReflectionContextCache())
+    return state
+
+
+def test_repeat_calls_are_served_from_cache(remote):
+    first = asyncio.run(context_loader.load_user_reflections(42))
+    calls = remote["calls"]
+    second = asyncio.run(context_loader.load_user_reflections(42))
+
+    assert "stay curious" in first
+    assert second == first
+    assert remote["calls"] == calls
+    assert context_loader.get_reflection_context_cache_stats()["reflection_context_cache_hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "invalidate",
+    [
+        lambda: context_loader.invalidate_reflection_context(discord_id=42),
+        lambda: context_loader.invalidate_reflection_context(supabase_user_id="uuid-1"),
+    ],
+)
+def test_invalidation_refetches(remote, invalidate):
+    asyncio.run(context_loader.load_user_reflections(42))
+    remote["text"] = "revoked"
+    invalidate()
+
+    assert "revoked" in asyncio.run(context_loader.load_user_reflections(42))
+
+
+def test_load_racing_an_invalidation_is_not_cached(remote, monkeypatch):
+    async def fake_app(discord_id, limit=5):
+        # Revocation arrives while this load is in flight
+        context_loader.invalidate_reflection_context(discord_id=discord_id)
+        return "", 0
+
+    monkeypatch.setattr(context_loader, "_load_app_reflections", fake_app)
+    asyncio.run(context_loader.load_user_reflections(42))
+
+    assert context_loader.get_reflection_context_cache_stats()["reflection_context_cache_size"] == 0
+
+
+def test_failed_source_is_not_cached(remote, monkeypatch):
+    async def failing_get(table, params):
+        raise ConnectionError("supabase down")
+
+    monkeypatch.setattr(context_loader, "_supabase_get", failing_get)
+    asyncio.run(context_loader.load_user_reflections(42))
+
+    assert context_loader._context_cache.get_context("42", 5) is None
+
+
+def test_identity_is_reused_and_size_bounded():
+    cache = context_loader._ReflectionContextCache(max_users=2)
+    epoch = cache.epoch
+    cache.store("1", "a", epoch, 5, "ctx-1")
+    cache.store("2", None, epoch)
+    cache.store("3", "c", epoch, 5, "ctx-3")
+
+    assert cache.get_identity("1") == (False, None)
+    assert cache.get_identity("2") == (True, None)
+    assert cache.get_context("3", 5) == "ctx-3"
+    cache.invalidate(supabase_user_id="c")
+    assert cache.get_identity("3") == (False, None)
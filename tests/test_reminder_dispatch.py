@@ -0,0 +1,191 @@
+"""Tests for the concurrent reminder fan-out in ReminderCog."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+import pytest
+
+import cogs.reminders as reminders_module
+from cogs.reminders import ReminderCog, _digest_description
+from utils.timezone import BRUSSELS_TZ
+
+NOW = datetime(2024, 3, 18, 18, 0, tzinfo=BRUSSELS_TZ)
+
+
+class FakeConn:
+    def __init__(self):
+        self.executed: list[tuple[str, tuple]] = []
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+def make_row(reminder_id, guild_id=1, channel_id=10, **extra):
+    row = {
+        "id": reminder_id, "guild_id": guild_id, "channel_id": channel_id,
+        "name": f"R{reminder_id}", "message": "hi", "location": None,
+        "origin_channel_id": None, "origin_message_id": None, "event_time": None,
+        "days": ["0"], "time": time(18, 0), "call_time": time(19, 0),
+        "last_sent_at": None, "image_url": None, "sent_message_id": None,
+        "next_fire_at": NOW,
+    }
+    row.update(extra)
+    return row
+
+
+def make_channel(delay=0.0, active=None):
+    channel = MagicMock(spec=discord.TextChannel)
+    counter = {"now": 0, "max": 0}
+
+    async def send(**kwargs):
+        counter["now"] += 1
+        counter["max"] = max(counter["max"], counter["now"])
+        if active is not None:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(delay)
+        counter["now"] -= 1
+        if active is not None:
+            active["now"] -= 1
+        return MagicMock(id=999)
+
+    channel.send = send
+    channel.counter = counter
+    return channel
+
+
+@pytest.fixture
+def cog(mock_bot, monkeypatch):
+    def noop_create_task(coro):
+        coro.close()
+        return None
+
+    with patch.object(mock_bot.loop, "create_task", noop_create_task):
+        instance = ReminderCog(mock_bot)
+    instance.send_log_embed = AsyncMock()
+    conn = FakeConn()
+
+    @asynccontextmanager
+    async def fake_acquire(pool, *args, **kwargs):
+        yield conn
+
+    monkeypatch.setattr(reminders_module, "acquire_safe", fake_acquire)
+    instance.fake_conn = conn
+    return instance
+
+
+def test_sends_run_concurrently_across_channels(cog):
+    active = {"now": 0, "max": 0}
+    channels = {cid: make_channel(delay=0.05, active=active) for cid in (10, 11, 12)}
+    cog.bot.get_channel = lambda cid: channels.get(cid)
+    rows = [make_row(i, channel_id=10 + i) for i in range(3)]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    assert active["max"] == 3
+
+
+def test_sends_to_one_channel_are_serialized(cog):
+    channel = make_channel(delay=0.01)
+    cog.bot.get_channel = lambda cid: channel
+    rows = [make_row(i) for i in range(4)]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    assert channel.counter["max"] == 1
+
+
+def test_guild_concurrency_is_capped(cog, monkeypatch):
+    monkeypatch.setattr(reminders_module, "REMINDER_GUILD_CONCURRENCY", 2)
+    active = {"now": 0, "max": 0}
+    channels = {cid: make_channel(delay=0.02, active=active) for cid in range(20, 26)}
+    cog.bot.get_channel = lambda cid: channels.get(cid)
+    rows = [make_row(i, channel_id=20 + i) for i in range(6)]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    assert active["max"] == 2
+
+
+def test_status_written_in_bulk_and_one_digest_per_guild(cog):
+    channel = make_channel()
+    cog.bot.get_channel = lambda cid: channel if cid == 10 else None
+    event = datetime(2024, 3, 18, 18, 0, tzinfo=BRUSSELS_TZ)
+    rows = [
+        make_row(1),
+        make_row(2),
+        make_row(3, event_time=event, time=time(17, 0), call_time=time(18, 0)),  # one-off T0
+        make_row(4, channel_id=99),  # missing channel
+    ]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    queries = [q for q, _ in cog.fake_conn.executed]
+    assert len(queries) == 2
+    assert "UPDATE reminders" in queries[0]
+    ids, _, message_ids = cog.fake_conn.executed[0][1]
+    assert sorted(ids) == [1, 2, 3]
+    assert message_ids == [None, None, None]
+    assert "DELETE FROM reminders" in queries[1]
+    assert cog.fake_conn.executed[1][1] == ([3],)
+
+    levels = sorted(call.kwargs["level"] for call in cog.send_log_embed.await_args_list)
+    assert levels == ["info", "warning"]
+    info = next(c for c in cog.send_log_embed.await_args_list if c.kwargs["level"] == "info")
+    assert info.kwargs["description"].count("📤") == 3
+
+
+def test_t_minus_send_stores_message_id(cog):
+    channel = make_channel()
+    cog.bot.get_channel = lambda cid: channel
+    event = datetime(2024, 3, 18, 19, 0, tzinfo=BRUSSELS_TZ)
+    rows = [make_row(1, event_time=event, time=time(18, 0), call_time=time(19, 0))]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    assert len(cog.fake_conn.executed) == 1
+    assert cog.fake_conn.executed[0][1][2] == [999]
+
+
+def test_stale_and_already_sent_rows_are_skipped(cog):
+    channel = make_channel()
+    cog.bot.get_channel = lambda cid: channel
+    rows = [
+        make_row(1, next_fire_at=datetime(2024, 3, 18, 17, 0, tzinfo=BRUSSELS_TZ)),
+        make_row(2, last_sent_at=NOW),
+    ]
+
+    asyncio.run(cog._fan_out(rows, NOW))
+
+    assert cog.fake_conn.executed == []
+    cog.send_log_embed.assert_not_awaited()
+
+
+def test_skipped_one_off_without_next_fire_is_deleted(cog):
+    channel = make_channel()
+    cog.bot.get_channel = lambda cid: channel
+    event = datetime(2024, 3, 18, 17, 0, tzinfo=BRUSSELS_TZ)
+    rows = [make_row(1, event_time=event, time=time(16, 0), call_time=time(17, 0), next_fire_at=event)]
+
+    asyncio.run(cog._fan_out(rows, NOW, expired_ids=[1]))
+
+    assert len(cog.fake_conn.executed) == 1
+    query, args = cog.fake_conn.executed[0]
+    assert "DELETE FROM reminders" in query
+    assert args == ([1],)
+    warning = cog.send_log_embed.await_args_list[0]
+    assert "expired" in warning.kwargs["description"]
+
+
+def test_digest_description_truncates():
+    lines = ["x" * 100] * 100
+    description = _digest_description(lines)
+    assert len(description) <= 4096
+    assert description.endswith("more")
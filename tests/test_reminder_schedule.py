@@ -0,0 +1,143 @@
+"""Tests for precomputed reminder fire instants and the due-reminder repository helpers."""
+
+import asyncio
+from datetime import datetime, time
+
+from utils import reminder_repository as reminder_repo
+from utils.reminder_schedule import ALL_DAYS_MASK, compute_next_fire, days_to_mask, event_call_at
+from utils.timezone import BRUSSELS_TZ
+
+
+def bxl(*args: int) -> datetime:
+    return datetime(*args, tzinfo=BRUSSELS_TZ)
+
+
+class TestDaysToMask:
+    def test_digits_and_names(self):
+        assert days_to_mask(["0", "woe", "Friday", "zo"]) == 0b1010101
+
+    def test_empty_and_unknown(self):
+        assert days_to_mask([]) == 0
+        assert days_to_mask(None) == 0
+        assert days_to_mask(["someday", "9"]) == 0
+
+    def test_daily_and_plain_string(self):
+        assert days_to_mask(["daily"]) == ALL_DAYS_MASK
+        assert days_to_mask("di") == 0b10
+
+
+class TestRecurring:
+    # 2024-03-18 is a Monday
+    def test_later_today(self):
+        nxt = compute_next_fire(time(18, 0), time(19, 0), days_to_mask(["0"]), None, bxl(2024, 3, 18, 9, 0))
+        assert nxt == bxl(2024, 3, 18, 18, 0)
+
+    def test_strictly_after(self):
+        nxt = compute_next_fire(time(18, 0), time(19, 0), days_to_mask(["0"]), None, bxl(2024, 3, 18, 18, 0))
+        assert nxt == bxl(2024, 3, 25, 18, 0)
+
+    def test_next_listed_day(self):
+        nxt = compute_next_fire("18:00", "19:00", days_to_mask(["wo", "vr"]), None, bxl(2024, 3, 18, 9, 0))
+        assert nxt == bxl(2024, 3, 20, 18, 0)
+
+    def test_crossing_midnight_fires_evening_before(self):
+        # Event Tuesday 00:30, reminder 23:30 -> fires Monday evening
+        nxt = compute_next_fire(time(23, 30), time(0, 30), days_to_mask(["di"]), None, bxl(2024, 3, 18, 9, 0))
+        assert nxt == bxl(2024, 3, 18, 23, 30)
+
+    def test_no_days_never_fires(self):
+        assert compute_next_fire(time(18, 0), time(19, 0), 0, None, bxl(2024, 3, 18, 9, 0)) is None
+
+    def test_across_dst_change(self):
+        # 2024-03-31 is the spring-forward Sunday in Brussels
+        nxt = compute_next_fire(time(18, 0), None, days_to_mask(["zo"]), None, bxl(2024, 3, 30, 18, 0))
+        assert nxt == bxl(2024, 3, 31, 18, 0)
+        assert nxt.utcoffset().total_seconds() == 7200
+
+
+class TestOneOff:
+    def test_offset_then_call_then_done(self):
+        event = bxl(2024, 3, 19, 19, 30)
+        before = bxl(2024, 3, 19, 12, 0)
+        first = compute_next_fire(time(18, 30), time(19, 30), 0, event, before)
+        assert first == bxl(2024, 3, 19, 18, 30)
+        second = compute_next_fire(time(18, 30), time(19, 30), 0, event, first)
+        assert second == event_call_at(event, time(19, 30)) == event
+        assert compute_next_fire(time(18, 30), time(19, 30), 0, event, second) is None
+
+    def test_offset_before_midnight(self):
+        event = bxl(2024, 3, 19, 0, 30)
+        nxt = compute_next_fire(time(23, 30), time(0, 30), 0, event, bxl(2024, 3, 18, 12, 0))
+        assert nxt == bxl(2024, 3, 18, 23, 30)
+
+    def test_without_call_time(self):
+        event = bxl(2024, 3, 19, 19, 30)
+        assert event_call_at(event, None) is None
+        after_offset = bxl(2024, 3, 19, 18, 30)
+        assert compute_next_fire(time(18, 30), None, 0, event, after_offset) is None
+
+
+class FakeConn:
+    def __init__(self, rows=None):
+        self.rows = rows or []
+        self.calls: list[tuple[str, object]] = []
+
+    async def fetch(self, query, *args):
+        self.calls.append((query, args))
+        return self.rows
+
+    async def executemany(self, query, records):
+        self.calls.append((query, list(records)))
+
+
+def test_list_due_is_a_range_scan():
+    async def run():
+        conn = FakeConn()
+        now = bxl(2024, 3, 18, 18, 0)
+        await reminder_repo.list_due(conn, now)
+        query, args = conn.calls[0]
+        assert "next_fire_at <= $1" in query
+        assert "unnest" not in query
+        assert args == (now,)
+
+    asyncio.run(run())
+
+
+def test_reschedule_writes_mask_and_next_fire():
+    async def run():
+        conn = FakeConn()
+        rows = [
+            {"id": 1, "time": time(18, 0), "call_time": time(19, 0), "days": ["ma"], "event_time": None},
+            {"id": 2, "time": time(18, 0), "call_time": time(19, 0), "days": [], "event_time": None},
+        ]
+        await reminder_repo.reschedule(conn, rows, after=bxl(2024, 3, 18, 18, 0))
+        query, records = conn.calls[0]
+        assert "next_fire_at" in query
+        assert records == [(1, bxl(2024, 3, 25, 18, 0), 1), (0, None, 2)]
+
+    asyncio.run(run())
+
+
+def test_reschedule_reports_expired_one_offs():
+    async def run():
+        conn = FakeConn()
+        event = bxl(2024, 3, 18, 19, 0)
+        rows = [
+            {"id": 1, "time": time(18, 0), "call_time": time(19, 0), "days": [], "event_time": event},
+            {"id": 2, "time": time(18, 0), "call_time": time(19, 0), "days": [], "event_time": event},
+            {"id": 3, "time": time(18, 0), "call_time": time(19, 0), "days": [], "event_time": None},
+        ]
+        expired = await reminder_repo.reschedule(conn, rows[1:], after=bxl(2024, 3, 18, 19, 0))
+        assert expired == [2]
+        assert await reminder_repo.reschedule(conn, rows[:1], after=bxl(2024, 3, 18, 18, 0)) == []
+
+    asyncio.run(run())
+
+
+def test_reschedule_skips_empty():
+    async def run():
+        conn = FakeConn()
+        await reminder_repo.reschedule(conn, [])
+        assert conn.calls == []
+
+    asyncio.run(run())
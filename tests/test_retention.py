@@ -0,0 +1,99 @@
+"""Tests for batched retention deletes and monthly partition expiry in utils.retention."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime
+
+import pytest
+
+import utils.retention as retention
+
+
+class FakeConn:
+    def __init__(self, pending=0, partitions=()):
+        self.pending = pending
+        self.partitions = list(partitions)
+        self.executed: list[tuple] = []
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+        if query.lstrip().startswith("DELETE"):
+            deleted = min(self.pending, args[1])
+            self.pending -= deleted
+            return f"DELETE {deleted}"
+        return "OK"
+
+    async def fetch(self, query, *args):
+        return [{"relname": name} for name in self.partitions]
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    fake = FakeConn()
+
+    @asynccontextmanager
+    async def fake_acquire(pool, *args, **kwargs):
+        yield fake
+
+    monkeypatch.setattr(retention, "acquire_safe", fake_acquire)
+    return fake
+
+
+def test_delete_expired_runs_bounded_batches(conn, monkeypatch):
+    conn.pending = 25
+    pauses = []
+
+    async def fake_sleep(seconds):
+        pauses.append(seconds)
+
+    monkeypatch.setattr(retention.asyncio, "sleep", fake_sleep)
+    cutoff = datetime(2026, 7, 18, tzinfo=UTC)
+
+    result = asyncio.run(retention.delete_expired(None, "audit_logs", cutoff, batch_size=10, pause=0.5))
+
+    assert (result.rows, result.batches) == (25, 3)
+    assert pauses == [0.5, 0.5]
+    query, args = conn.executed[0]
+    assert "ORDER BY created_at LIMIT $2" in query and args == (cutoff, 10)
+
+
+def test_delete_expired_stops_on_exact_multiple(conn):
+    conn.pending = 10
+    result = asyncio.run(retention.delete_expired(None, "faq_search_logs", datetime.now(UTC), batch_size=5, pause=0))
+    assert (result.rows, result.batches) == (10, 3)
+    assert result.rows_per_second > 0
+
+
+def test_partition_names_round_trip():
+    assert retention.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert retention.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    name = retention.partition_name("audit_logs", date(2026, 2, 1))
+    assert name == "audit_logs_y2026m02"
+    assert retention.parse_partition_month("audit_logs", name) == date(2026, 2, 1)
+    assert retention.parse_partition_month("audit_logs", "audit_logs_default") is None
+    assert retention.parse_partition_month("audit_logs", "audit_logs_y2026m13") is None
+
+
+def test_only_fully_expired_partitions_are_dropped(conn):
+    conn.partitions = ["audit_logs_y2026m07", "audit_logs_y2026m06", "audit_logs_y2026m05", "audit_logs_default"]
+    cutoff = datetime(2026, 7, 18, tzinfo=UTC)
+
+    dropped = asyncio.run(retention.drop_expired_partitions(None, "audit_logs", cutoff))
+
+    assert dropped == ["audit_logs_y2026m05", "audit_logs_y2026m06"]
+    assert any("lock_timeout" in query for query, _ in conn.executed)
+
+
+def test_ensure_partitions_creates_missing_months(conn):
+    conn.partitions = ["audit_logs_y2026m10", "audit_logs_default"]
+
+    created = asyncio.run(retention.ensure_partitions(None, "audit_logs", datetime(2026, 10, 16, tzinfo=UTC), 2))
+
+    assert created == 2
+    ddl = [query for query, _ in conn.executed]
+    assert "audit_logs_y2026m11 PARTITION OF audit_logs" in ddl[0]
+    assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in ddl[1]
@@ -0,0 +1,136 @@
+"""Tests for cross-process settings propagation (LISTEN/NOTIFY) in SettingsService."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+from utils.settings_service import SETTINGS_CHANNEL, SettingDefinition, SettingsService
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed: list[tuple[str, tuple]] = []
+
+    async def fetch(self, query, *args):
+        guild_id, scope, *key = args
+        return [
+            {"key": k, "value": v}
+            for (g, s, k), v in self.rows.items()
+            if g == guild_id and s == scope and (not key or k == key[0])
+        ]
+
+    async def fetchrow(self, query, *args):
+        return None
+
+    async def execute(self, query, *args):
+        self.executed.append((query, args))
+
+
+class FakePool:
+    def __init__(self, rows):
+        self.conn = FakeConn(rows)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.conn
+
+
+def make_service(rows=None):
+    service = SettingsService(dsn="postgres://test")
+    for key, value_type, default in (("enabled", "bool", False), ("log_channel_id", "channel", 0)):
+        service.register(SettingDefinition("automod", key, key, value_type, default))
+    service._pool = FakePool(rows if rows is not None else {})
+    service.changes = []
+
+    async def record(scope, key, guild_id, value):
+        service.changes.append((scope, key, guild_id, value))
+
+    service.add_global_listener(record)
+    return service
+
+
+def test_remote_key_change_updates_override_and_fires_listeners():
+    rows = {(1, "automod", "enabled"): "true"}
+    service = make_service(rows)
+
+    async def run():
+        assert await service._apply_remote_change(1, "automod", "enabled") == 1
+        # Re-delivery of the same notification is a no-op
+        assert await service._apply_remote_change(1, "automod", "enabled") == 0
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert service.get("automod", "enabled", 1) is True
+    assert service.changes == [("automod", "enabled", 1, True)]
+
+
+def test_remote_scope_rewrite_drops_removed_keys():
+    rows = {(1, "automod", "log_channel_id"): "123"}
+    service = make_service(rows)
+    service._overrides[(1, "automod", "enabled")] = True
+
+    async def run():
+        await service._apply_remote_change(1, "automod", None)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert service.get("automod", "log_channel_id", 1) == 123
+    assert not service.is_overridden("automod", "enabled", 1)
+    assert sorted(service.changes) == [("automod", "enabled", 1, False), ("automod", "log_channel_id", 1, 123)]
+
+
+def test_notifications_from_own_writes_are_ignored():
+    service = make_service()
+    own = json.dumps({"guild_id": 1, "scope": "automod", "key": "enabled", "origin": service._origin})
+
+    async def run():
+        service._on_change_notification(None, 0, SETTINGS_CHANNEL, own)
+        service._on_change_notification(None, 0, SETTINGS_CHANNEL, "not json")
+        return service._remote_queue.qsize()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_remote_changes_are_applied_in_notification_order():
+    rows = {(1, "automod", "log_channel_id"): "111"}
+    service = make_service(rows)
+    reads = []
+
+    async def fetch(query, *args):
+        # The first re-read is slow; unordered tasks would let it land last
+        reads.append(rows[(1, "automod", "log_channel_id")])
+        value = reads[-1]
+        await asyncio.sleep(0.05 if len(reads) == 1 else 0)
+        return [{"key": "log_channel_id", "value": value}]
+
+    service._pool.conn.fetch = fetch
+    notice = json.dumps({"guild_id": 1, "scope": "automod", "key": "log_channel_id", "origin": "api"})
+
+    async def run():
+        service._on_change_notification(None, 0, SETTINGS_CHANNEL, notice)
+        await asyncio.sleep(0.01)
+        rows[(1, "automod", "log_channel_id")] = "222"
+        service._on_change_notification(None, 0, SETTINGS_CHANNEL, notice)
+        await service._remote_queue.join()
+        await service.stop_change_listener()
+
+    asyncio.run(run())
+
+    assert reads == ["111", "222"]
+    assert service.get("automod", "log_channel_id", 1) == 222
+
+
+def test_set_publishes_change():
+    service = make_service()
+
+    async def run():
+        await service.set("automod", "enabled", True, guild_id=1)
+
+    asyncio.run(run())
+
+    query, args = service._pool.conn.executed[-1]
+    assert "pg_notify" in query and args[0] == SETTINGS_CHANNEL
+    assert json.loads(args[1]) == {"guild_id": 1, "scope": "automod", "key": "enabled", "origin": service._origin}
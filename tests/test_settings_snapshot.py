@@ -0,0 +1,75 @@
+"""Tests for per-guild settings snapshots and the bucketed CachedSettingsHelper cache."""
+
+import asyncio
+
+from utils.settings_helpers import CachedSettingsHelper
+from utils.settings_service import SettingDefinition, SettingsService
+
+
+def make_service():
+    service = SettingsService(dsn=None)
+    service.register(SettingDefinition("automod", "enabled", "Toggle", "bool", False))
+    service.register(SettingDefinition("embedwatcher", "announcements_channel_id", "Channel", "channel", 0))
+    service.register(SettingDefinition("embedwatcher", "reminder_offset_minutes", "Offset", "int", 60))
+    return service
+
+
+def test_snapshot_resolves_defaults_and_overrides():
+    service = make_service()
+    asyncio.run(service.set("embedwatcher", "announcements_channel_id", 555, guild_id=1))
+
+    snapshot = service.snapshot(1)
+
+    assert snapshot.guild_id == 1
+    assert snapshot.automod.enabled is False
+    assert snapshot.embedwatcher.announcements_channel_id == 555
+    assert snapshot.embedwatcher.reminder_offset_minutes == 60
+    assert service.snapshot(1) is snapshot
+
+
+def test_change_swaps_only_that_guilds_snapshot():
+    service = make_service()
+    before = service.snapshot(1)
+    other = service.snapshot(2)
+
+    asyncio.run(service.set("automod", "enabled", True, guild_id=1))
+
+    assert before.automod.enabled is False  # held references never change
+    assert service.snapshot(1).automod.enabled is True
+    assert service.snapshot(2) is other
+
+    asyncio.run(service.clear("automod", "enabled", guild_id=1))
+    assert service.snapshot(1).automod.enabled is False
+
+
+def test_register_after_snapshot_rebuilds_shape():
+    service = make_service()
+    service.snapshot(1)
+    service.register(SettingDefinition("gpt", "model", "Model", "str", "grok"))
+
+    assert service.snapshot(1).gpt.model == "grok"
+
+
+def test_helper_invalidates_one_guild_bucket():
+    service = make_service()
+    helper = CachedSettingsHelper(service)
+
+    async def run():
+        assert helper.get_int("embedwatcher", "reminder_offset_minutes", 1, fallback=60) == 60
+        assert helper.get_bool("automod", "enabled", 2) is False
+        await service.set("embedwatcher", "reminder_offset_minutes", 15, guild_id=1)
+        await asyncio.sleep(0)  # let the global listener run
+        return helper.get_int("embedwatcher", "reminder_offset_minutes", 1, fallback=60)
+
+    assert asyncio.run(run()) == 15
+    assert set(helper._cache) == {2, 1}
+    helper.clear_cache(guild_id=2)
+    assert set(helper._cache) == {1}
+
+
+def test_helper_evicts_oldest_guild():
+    helper = CachedSettingsHelper(make_service(), max_cache_size=2)
+    for guild_id in (1, 2, 3):
+        helper.get_bool("automod", "enabled", guild_id)
+
+    assert list(helper._cache) == [2, 3]
@@ -0,0 +1,132 @@
+"""Tests for perceptual-hash duplicate detection of verification screenshots."""
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+
+import pymupdf
+import pytest
+
+import cogs.verification as verification
+from cogs.verification import VerificationCog, _Submission, _submission_status
+from utils.image_hash import dhash, hamming
+
+
+def render(text: str, fmt: str = "png", scale: float = 1.0) -> bytes:
+    """Render a fake receipt to image bytes."""
+    doc = pymupdf.open()
+    page = doc.new_page(width=300, height=400)
+    page.draw_rect(pymupdf.Rect(20, 20, 280, 120), color=(0, 0, 1), fill=(0.8, 0.9, 1))
+    page.insert_text((30, 180), text, fontsize=22)
+    page.draw_rect(pymupdf.Rect(40, 250, 200, 330), color=(0, 0, 0), fill=(0.2, 0.2, 0.2))
+    pix = page.get_pixmap(matrix=pymupdf.Matrix(scale, scale))
+    return pix.tobytes("jpeg" if fmt == "jpeg" else "png")
+
+
+def test_dhash_matches_reencoded_copy_but_not_other_receipt():
+    original = dhash(render("Paid 25.00 EUR"))
+    reencoded = dhash(render("Paid 25.00 EUR", fmt="jpeg", scale=1.5))
+    other = dhash(render("Refund 99.99 USD to Bob"))
+
+    assert original is not None
+    assert hamming(original, reencoded) <= verification.DEDUP_MAX_DISTANCE
+    assert hamming(original, other) > verification.DEDUP_MAX_DISTANCE
+
+
+def test_dhash_rejects_undecodable_data():
+    assert dhash(b"not an image") is None
+
+
+def test_submission_status():
+    assert _submission_status(True, False) == "verified"
+    assert _submission_status(False, False) == "rejected"
+    assert _submission_status(True, True) == "manual_review"
+
+
+@pytest.fixture
+def cog():
+    instance = VerificationCog.__new__(VerificationCog)
+    instance.db = None
+    instance._submissions = {}
+    instance._reference_cache = {}
+    return instance
+
+
+def submission(user_id, status, age=timedelta(minutes=5), phash=0b1011):
+    return _Submission(
+        phash=phash,
+        user_id=user_id,
+        channel_id=100 + user_id,
+        status=status,
+        reason=f"{status} earlier",
+        payment_date=date(2026, 10, 1),
+        created_at=datetime.now(UTC) - age,
+    )
+
+
+def check(cog, user_id=1, phash=0b1011, reference_hash=None):
+    return asyncio.run(cog._check_duplicate(1, user_id, phash, reference_hash))
+
+
+def test_new_image_goes_to_vision(cog):
+    cog._submissions[1] = [submission(1, "verified", phash=(1 << 200) - 1)]
+    assert check(cog) is None
+
+
+def test_reference_image_goes_to_manual_review(cog):
+    can_verify, needs_review, _reason, _date, note = check(cog, reference_hash=0b1111)
+    assert (can_verify, needs_review) == (False, True)
+    assert "reference" in note
+
+
+def test_own_recent_verdicts_are_reused(cog):
+    cog._submissions[1] = [submission(1, "verified")]
+    assert check(cog)[:2] == (True, False)
+
+    cog._submissions[1] = [submission(1, "rejected")]
+    can_verify, needs_review, reason, _date, note = check(cog)
+    assert (can_verify, needs_review) == (False, True)
+    assert "rejected" in reason and "rejected earlier" in note
+
+
+def test_own_stale_verdict_is_not_reused(cog):
+    cog._submissions[1] = [submission(1, "verified", age=timedelta(days=3))]
+    assert check(cog) is None
+
+
+def test_image_shared_by_another_member_needs_review(cog):
+    cog._submissions[1] = [submission(2, "verified"), submission(1, "verified")]
+    can_verify, needs_review, reason, _date, note = check(cog)
+    assert (can_verify, needs_review) == (False, True)
+    assert "<@2>" in note and "<@2>" not in reason
+
+
+def test_remembered_submission_is_found_and_capped(cog, monkeypatch):
+    monkeypatch.setattr(verification, "DEDUP_MAX_PER_GUILD", 2)
+
+    async def run():
+        for user_id in (5, 6, 1):
+            await cog._remember_submission(1, user_id, 10 + user_id, 0b1011, "verified", "ok", None)
+
+    asyncio.run(run())
+
+    assert [e.user_id for e in cog._submissions[1]] == [6, 1]
+    cog.forget_user_submissions(6)
+    assert check(cog)[:2] == (True, False)
+
+
+def test_supabase_gdpr_webhook_forgets_in_memory_hashes(cog, monkeypatch):
+    import gpt.helpers
+    from webhooks.supabase import _forget_in_memory_data
+
+    cog._submissions[1] = [submission(2, "verified"), submission(1, "verified")]
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        bot = type("Bot", (), {"loop": loop, "get_cog": staticmethod(lambda name: cog)})()
+        monkeypatch.setattr(gpt.helpers, "bot_instance", bot)
+        await asyncio.to_thread(_forget_in_memory_data, 2)  # called from the API thread
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+
+    assert [e.user_id for e in cog._submissions[1]] == [1]
@@ -0,0 +1,67 @@
+"""
+Aho-Corasick keyword matching
+
+A small automaton that finds every one of many keywords in a text in a
+single pass. Shared by the automod bad-word rules and custom command
+``contains`` triggers.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+
+class WordAutomaton:
+    """Aho-Corasick automaton matching many lowercase keywords in one pass.
+
+    Each keyword carries a payload; ``search`` returns the payloads of every
+    keyword that occurs as a substring of the text, in O(len(text) + hits).
+    """
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, keywords: Iterable[tuple[str, Any]]):
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[Any]] = [[]]
+        for word, payload in keywords:
+            node = 0
+            for ch in word:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                node = nxt
+            out[node].append(payload)
+
+        # Breadth-first pass: failure links point at the longest proper suffix
+        # that is also a trie path; outputs are merged along those links.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def search(self, text: str) -> set[Any]:
+        """Return payloads of all keywords found in ``text``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[Any] = set(out[0])  # empty keywords match everything
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
@@ -4,14 +4,14 @@ Auto-Moderation Analytics Service
 Provides analytics and metrics for auto-moderation performance and effectiveness.
 """
 
-import csv
-import io
 import logging
 from typing import Any
 
 import asyncpg
+import discord
 from discord.ext import commands
 
+from utils.csv_helpers import EXPORT_MAX_PART_BYTES, StreamingCsvExport, stream_query_to_csv
 from utils.db_helpers import acquire_safe, get_bot_db_pool
 
 log = logging.getLogger(__name__)
@@ -191,19 +191,32 @@ class AutoModAnalytics:
             log.error(f"Error getting guild overview for guild {guild_id}: {e}")
             return {}
     
-    async def export_metrics(self, guild_id: int, days: int = 30, format: str = "csv") -> str:
+    async def export_metrics(
+        self,
+        guild_id: int,
+        days: int = 30,
+        format: str = "csv",
+        max_part_bytes: int = EXPORT_MAX_PART_BYTES,
+    ) -> list[discord.File]:
         """
-        Export rule effectiveness metrics as CSV.
+        Export rule effectiveness metrics as CSV attachment parts (empty list when there are none).
 
-        Returns CSV string with columns:
-        rule_id, triggers, false_positives, false_positive_rate_pct, avg_response_time_s, top_violator_id, top_violator_count
+        Columns: rule_id, triggers, false_positives, false_positive_rate_pct, avg_response_time_s
+
+        Parts are at most ``max_part_bytes`` each; pass ``guild.filesize_limit``
+        for boosted guilds (the default is Discord's unboosted 10 MiB limit).
         """
         pool = self._get_pool()
         if not pool:
-            return ""
+            return []
         try:
+            fieldnames = ["rule_id", "triggers", "false_positives", "false_positive_rate_pct", "avg_response_time_s"]
+            export = StreamingCsvExport(
+                f"automod_metrics_{guild_id}_{days}d.csv", fieldnames, max_part_bytes=max_part_bytes
+            )
             async with acquire_safe(pool) as conn:
-                rows = await conn.fetch(
+                await stream_query_to_csv(
+                    conn,
                     """
                     SELECT
                         l.rule_id,
@@ -225,15 +238,9 @@ class AutoModAnalytics:
                     """,
                     guild_id,
                     days,
+                    export=export,
                 )
-            if not rows:
-                return ""
-            fieldnames = ["rule_id", "triggers", "false_positives", "false_positive_rate_pct", "avg_response_time_s"]
-            buf = io.StringIO()
-            writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-            writer.writerows([dict(r) for r in rows])
-            return buf.getvalue()
+            return export.files() if export.rows else []
         except Exception as e:
             log.error(f"Error exporting metrics for guild {guild_id}: {e}")
-            return ""
+            return []
@@ -13,6 +13,7 @@ import asyncpg
 import discord
 from discord.ext import commands
 
+from utils.csv_helpers import EXPORT_MAX_PART_BYTES, StreamingCsvExport, stream_query_to_csv
 from utils.db_helpers import acquire_safe, get_bot_db_pool
 
 log = logging.getLogger(__name__)
@@ -362,14 +363,30 @@ class AutoModLogger:
         
         return f"[{timestamp}] User {user_id} - {action} (Rule {rule_id})"
         
-    async def export_logs(self, guild_id: int, days: int = 30, format: str = 'csv') -> str:
-        """Export violation logs for a guild as CSV."""
+    async def export_logs(
+        self,
+        guild_id: int,
+        days: int = 30,
+        format: str = 'csv',
+        max_part_bytes: int = EXPORT_MAX_PART_BYTES,
+    ) -> list[discord.File]:
+        """Export violation logs for a guild as CSV attachment parts (empty list when there are none).
+
+        Parts are at most ``max_part_bytes`` each; pass ``guild.filesize_limit``
+        for boosted guilds (the default is Discord's unboosted 10 MiB limit).
+        """
         try:
             pool = self._get_pool()
             if not pool:
-                return ""
+                return []
+            fieldnames = ["id", "guild_id", "user_id", "channel_id", "rule_id",
+                          "action_taken", "appeal_status", "timestamp"]
+            export = StreamingCsvExport(
+                f"automod_logs_{guild_id}_{days}d.csv", fieldnames, max_part_bytes=max_part_bytes
+            )
             async with acquire_safe(pool) as conn:
-                rows = await conn.fetch(
+                await stream_query_to_csv(
+                    conn,
                     """
                     SELECT id, guild_id, user_id, channel_id, rule_id,
                            action_taken, appeal_status, timestamp
@@ -380,18 +397,9 @@ class AutoModLogger:
                     """,
                     guild_id,
                     days,
+                    export=export,
                 )
-            if not rows:
-                return ""
-            import csv
-            import io
-            fieldnames = ["id", "guild_id", "user_id", "channel_id", "rule_id",
-                          "action_taken", "appeal_status", "timestamp"]
-            buf = io.StringIO()
-            writer = csv.DictWriter(buf, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-            writer.writerows([dict(r) for r in rows])
-            return buf.getvalue()
+            return export.files() if export.rows else []
         except Exception as e:
             log.error(f"Error exporting logs for guild {guild_id}: {e}")
-            return ""
+            return []
@@ -4,10 +4,12 @@ Auto-Moderation Rule Processing Engine
 Handles rule evaluation, configuration, and execution logic for the auto-mod system.
 """
 
+import asyncio
 import json
 import logging
 import re
 import time
+from bisect import bisect_right
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -15,6 +17,9 @@ from typing import Any
 import discord
 from discord.ext import commands
 
+from utils.aho_corasick import WordAutomaton
+from utils.automod_ai import AIModerator
+from utils.automod_spam import RECENT_WINDOW, content_hash
 from utils.db_helpers import acquire_safe, get_bot_db_pool
 
 log = logging.getLogger(__name__)
@@ -46,6 +51,114 @@ class RuleResult:
     context: dict[str, Any]
 
 
+_URL_PATTERN = re.compile(r'https?://[^\s]+', re.IGNORECASE)
+_DOMAIN_PATTERN = re.compile(r'https?://([^/]+)')
+
+
+class CompiledRuleSet:
+    """Precompiled form of a guild's active rules.
+
+    Built once per rules refresh: rules are split into cheap and AI tiers,
+    regex patterns are compiled and every ``bad_words`` list is merged into
+    one ``WordAutomaton``. Compiled entries
+    are keyed by rule object identity, so the set keeps a reference to the
+    source list it was built from.
+    """
+
+    __slots__ = ("source", "cheap_rules", "ai_rules", "patterns", "words", "automaton")
+
+    def __init__(self, rules: list[dict]):
+        self.source = rules
+        self.cheap_rules = [r for r in rules if r.get('rule_type') != RuleType.AI.value]
+        self.ai_rules = [r for r in rules if r.get('rule_type') == RuleType.AI.value]
+        self.patterns: dict[int, list[tuple[str, re.Pattern[str]]]] = {}
+        self.words: dict[int, list[str]] = {}
+        keywords: list[tuple[str, tuple[int, int]]] = []
+
+        for rule in rules:
+            config = rule.get('config')
+            if not isinstance(config, dict):
+                continue
+            rule_type = rule.get('rule_type')
+            if rule_type == RuleType.REGEX.value:
+                compiled: list[tuple[str, re.Pattern[str]]] = []
+                for pattern_str in config.get('patterns', []):
+                    try:
+                        compiled.append((pattern_str, re.compile(pattern_str, re.IGNORECASE)))
+                    except (re.error, TypeError) as e:
+                        log.warning(f"Invalid regex pattern '{pattern_str}': {e}")
+                self.patterns[id(rule)] = compiled
+            elif rule_type == RuleType.CONTENT.value and config.get('content_type', 'bad_words') == 'bad_words':
+                words = [str(word) for word in config.get('words', [])]
+                self.words[id(rule)] = words
+                keywords.extend((word.lower(), (id(rule), index)) for index, word in enumerate(words))
+
+        self.automaton = WordAutomaton(keywords) if keywords else None
+
+    def scan(self, message: discord.Message) -> "MessageScan":
+        """Create the shared per-message feature view for this rule set."""
+        return MessageScan(self, message)
+
+
+class MessageScan:
+    """Per-message features extracted once and shared by every rule.
+
+    URLs, mention count and bad-word hits are computed lazily on first use,
+    so a guild without link rules never runs the URL regex.
+    """
+
+    __slots__ = ("ruleset", "content", "content_lower", "_urls", "_mention_count", "_word_hits")
+
+    def __init__(self, ruleset: CompiledRuleSet, message: discord.Message):
+        self.ruleset = ruleset
+        self.content: str = message.content or ''
+        self.content_lower = self.content.lower()
+        self._urls: list[tuple[str, str | None]] | None = None
+        self._mention_count = len(message.mentions or [])
+        self._word_hits: dict[int, list[int]] | None = None
+
+    @property
+    def urls(self) -> list[tuple[str, str | None]]:
+        """(url, lowercase domain) pairs found in the message."""
+        if self._urls is None:
+            urls = []
+            for url in _URL_PATTERN.findall(self.content):
+                domain = _DOMAIN_PATTERN.search(url.lower())
+                urls.append((url, domain.group(1) if domain else None))
+            self._urls = urls
+        return self._urls
+
+    @property
+    def mention_count(self) -> int:
+        return self._mention_count
+
+    def patterns(self, rule: dict) -> list[tuple[str, re.Pattern[str]]]:
+        """Compiled (source, pattern) pairs of a regex rule."""
+        compiled = self.ruleset.patterns.get(id(rule))
+        if compiled is None:
+            # Rule is not part of this set (e.g. edited copy); compile it alone.
+            compiled = CompiledRuleSet([rule]).patterns.get(id(rule), [])
+        return compiled
+
+    def found_words(self, rule: dict) -> list[str]:
+        """Bad words of ``rule`` present in the message, in configured order."""
+        words = self.ruleset.words.get(id(rule))
+        if words is None:
+            single = CompiledRuleSet([rule])
+            words = single.words.get(id(rule), [])
+            hits = single.automaton.search(self.content_lower) if single.automaton else set()
+            return [words[index] for _, index in sorted(hits)]
+        if not words:
+            return []
+        if self._word_hits is None:
+            hits: dict[int, list[int]] = {}
+            automaton = self.ruleset.automaton
+            for rule_key, index in (automaton.search(self.content_lower) if automaton else ()):
+                hits.setdefault(rule_key, []).append(index)
+            self._word_hits = hits
+        return [words[index] for index in sorted(self._word_hits.get(id(rule), ()))]
+
+
 class RuleProcessor:
     """Processes and evaluates auto-mod rules."""
     
@@ -56,6 +169,8 @@ class RuleProcessor:
         self._cache_ttl = 300  # 5 minutes
         self._cache_updated: dict[int, float] = {}
         self._list_cache_updated: dict[int, float] = {}
+        self._compiled_rules: dict[int, CompiledRuleSet] = {}  # guild_id -> compiled form of _rules_cache
+        self.ai_moderator = AIModerator()
         self._cache_hits = 0
         self._cache_misses = 0
 
@@ -87,6 +202,7 @@ class RuleProcessor:
                 
             # Organize by guild
             self._rules_cache.clear()
+            self._compiled_rules.clear()
             self._list_rules_cache.clear()
             self._list_cache_updated.clear()
             for rule in rules:
@@ -114,6 +230,31 @@ class RuleProcessor:
             self._cache_hits += 1
 
         return self._rules_cache.get(guild_id, [])
+
+    def get_compiled_rules(self, guild_id: int) -> CompiledRuleSet:
+        """Return the compiled rule set matching the cached active rules.
+
+        Recompiles when the cached rule list was replaced or dropped outside
+        ``_refresh_guild_rules`` (e.g. direct cache invalidation).
+        """
+        rules = self._rules_cache.get(guild_id, [])
+        compiled = self._compiled_rules.get(guild_id)
+        if compiled is None or compiled.source is not rules:
+            compiled = CompiledRuleSet(rules)
+            self._compiled_rules[guild_id] = compiled
+        return compiled
+
+    def scan_message(self, guild_id: int, message: discord.Message) -> MessageScan:
+        """Extract message features once for evaluation against all guild rules."""
+        return self.get_compiled_rules(guild_id).scan(message)
+
+    def _invalidate_guild(self, guild_id: int) -> None:
+        """Drop every cached view of a guild's rules so reads refresh immediately."""
+        self._rules_cache.pop(guild_id, None)
+        self._compiled_rules.pop(guild_id, None)
+        self._cache_updated.pop(guild_id, None)
+        self._list_rules_cache.pop(guild_id, None)
+        self._list_cache_updated.pop(guild_id, None)
         
     async def _refresh_guild_rules(self, guild_id: int):
         """Refresh rules for a specific guild."""
@@ -154,22 +295,35 @@ class RuleProcessor:
                 processed_rules.append(rule_dict)
             
             self._rules_cache[guild_id] = processed_rules
+            self._compiled_rules[guild_id] = CompiledRuleSet(processed_rules)
             
         except Exception as e:
             log.error(f"Error refreshing rules for guild {guild_id}: {e}")
             
-    async def evaluate_rule(self, rule: dict, message: discord.Message, user_context: dict[str, Any]) -> RuleResult:
-        """Evaluate a single rule against a message."""
+    async def evaluate_rule(
+        self,
+        rule: dict,
+        message: discord.Message,
+        user_context: dict[str, Any],
+        scan: MessageScan | None = None,
+    ) -> RuleResult:
+        """Evaluate a single rule against a message.
+
+        Pass the ``scan`` from ``scan_message`` when evaluating many rules for
+        the same message; without it the rule is compiled on the fly.
+        """
         rule_type = rule['rule_type']
-        rule.get('config', {})
         
         try:
+            if scan is None:
+                scan = CompiledRuleSet([rule]).scan(message)
+
             if rule_type == RuleType.SPAM.value:
                 return await self._evaluate_spam_rule(rule, message, user_context)
             elif rule_type == RuleType.CONTENT.value:
-                return await self._evaluate_content_rule(rule, message)
+                return await self._evaluate_content_rule(rule, message, scan)
             elif rule_type == RuleType.REGEX.value:
-                return await self._evaluate_regex_rule(rule, message)
+                return await self._evaluate_regex_rule(rule, message, scan)
             elif rule_type == RuleType.AI.value:
                 return await self._evaluate_ai_rule(rule, message, user_context)
             else:
@@ -190,28 +344,34 @@ class RuleProcessor:
             max_messages = config.get('max_messages', 5)
             time_window = config.get('time_window', 60)  # seconds
             
-            len(user_context.get('message_timestamps', []))
-            recent_messages = [
-                ts for ts in user_context.get('message_timestamps', [])
-                if time.time() - ts < time_window
-            ]
+            # Timestamps are in arrival order: bisect instead of filtering
+            timestamps = user_context.get('message_timestamps', [])
+            now = user_context.get('now') or time.time()
+            recent_count = len(timestamps) - bisect_right(timestamps, now - time_window)
             
-            if len(recent_messages) >= max_messages:
+            if recent_count >= max_messages:
                 return RuleResult(
                     True,
-                    min(1.0, len(recent_messages) / max_messages),
-                    f"Too many messages ({len(recent_messages)} in {time_window}s)",
-                    {'message_count': len(recent_messages), 'time_window': time_window}
+                    min(1.0, recent_count / max_messages),
+                    f"Too many messages ({recent_count} in {time_window}s)",
+                    {'message_count': recent_count, 'time_window': time_window}
                 )
                 
         elif spam_type == 'duplicate':
-            # Check for duplicate messages
+            # Check for duplicate messages (hash of the previous message when tracked)
             last_message = user_context.get('last_message', '')
-            if message.content.lower() == last_message.lower():
+            last_hash = user_context.get('last_message_hash')
+            if last_hash is not None:
+                is_duplicate = content_hash(message.content) == last_hash
+            else:
+                is_duplicate = message.content.lower() == last_message.lower()
+            if is_duplicate:
                 max_duplicates = config.get('max_duplicates', 3)
                 
-                # Count recent messages (approximate duplicate detection)
-                recent_messages = len(user_context.get('message_timestamps', []))
+                # Count messages in the recent window (approximate duplicate detection)
+                timestamps = user_context.get('message_timestamps', [])
+                now = user_context.get('now') or time.time()
+                recent_messages = len(timestamps) - bisect_right(timestamps, now - RECENT_WINDOW)
                 
                 # If we have enough recent messages, consider it duplicate spam
                 if recent_messages >= max_duplicates:
@@ -241,16 +401,14 @@ class RuleProcessor:
                     
         return RuleResult(False, 0.0, "No spam detected", {})
         
-    async def _evaluate_content_rule(self, rule: dict, message: discord.Message) -> RuleResult:
+    async def _evaluate_content_rule(self, rule: dict, message: discord.Message, scan: MessageScan) -> RuleResult:
         """Evaluate content-based rules."""
         config = rule.get('config', {})
         content_type = config.get('content_type', 'bad_words')
-        content_lower = message.content.lower()
         
         if content_type == 'bad_words':
-            # Check for bad words
-            bad_words = config.get('words', [])
-            found_words = [word for word in bad_words if word.lower() in content_lower]
+            # Check for bad words (single automaton pass shared by all rules)
+            found_words = scan.found_words(rule)
             
             if found_words:
                 return RuleResult(
@@ -266,17 +424,13 @@ class RuleProcessor:
             whitelist = config.get('whitelist', [])
             blacklist = config.get('blacklist', [])
             
-            # Simple URL detection
-            url_pattern = r'https?://[^\s]+'
-            urls = re.findall(url_pattern, message.content, re.IGNORECASE)
+            # URLs are extracted once per message
+            urls = scan.urls
             
             if urls and not allow_links:
                 # Check against whitelist/blacklist
-                for url in urls:
-                    domain = re.search(r'https?://([^/]+)', url.lower())
+                for url, domain in urls:
                     if domain:
-                        domain = domain.group(1)
-                        
                         # If whitelist exists, only allow whitelisted domains
                         if whitelist:
                             if not any(allowed in domain for allowed in whitelist):
@@ -307,7 +461,7 @@ class RuleProcessor:
         elif content_type == 'mentions':
             # Check for mention spam
             max_mentions = config.get('max_mentions', 5)
-            mention_count = len(message.mentions)
+            mention_count = scan.mention_count
             
             if mention_count > max_mentions:
                 return RuleResult(
@@ -319,106 +473,79 @@ class RuleProcessor:
                 
         return RuleResult(False, 0.0, "No content violation", {})
         
-    async def _evaluate_regex_rule(self, rule: dict, message: discord.Message) -> RuleResult:
+    async def _evaluate_regex_rule(self, rule: dict, message: discord.Message, scan: MessageScan) -> RuleResult:
         """Evaluate regex-based rules."""
-        config = rule.get('config', {})
-        patterns = config.get('patterns', [])
-        
-        for pattern_str in patterns:
-            try:
-                pattern = re.compile(pattern_str, re.IGNORECASE)
-                matches = pattern.findall(message.content)
-                
-                if matches:
-                    return RuleResult(
-                        True,
-                        min(1.0, len(matches) / 3),
-                        f"Regex pattern matched: {pattern_str}",
-                        {'pattern': pattern_str, 'matches': matches}
-                    )
-                    
-            except re.error as e:
-                log.warning(f"Invalid regex pattern '{pattern_str}': {e}")
+        for pattern_str, pattern in scan.patterns(rule):
+            matches = pattern.findall(scan.content)
+            
+            if matches:
+                return RuleResult(
+                    True,
+                    min(1.0, len(matches) / 3),
+                    f"Regex pattern matched: {pattern_str}",
+                    {'pattern': pattern_str, 'matches': matches}
+                )
                 
         return RuleResult(False, 0.0, "No regex matches", {})
         
     async def _evaluate_ai_rule(self, rule: dict, message: discord.Message, user_context: dict[str, Any]) -> RuleResult:
         """Evaluate AI-powered rules using Grok (premium feature)."""
-        try:
-            from gpt.helpers import ask_gpt
-            
-            config = rule.get('config', {})
-            policy = config.get('policy', 'Detect toxic, harmful, or inappropriate content')
-            threshold = config.get('threshold', 0.7)
-            
-            # Build AI prompt for content analysis
-            analysis_prompt = f"""Analyze the following message for moderation purposes.
-
-Policy: {policy}
-
-Message content: \"{message.content}\"
-
-Respond with a JSON object containing:
-- "violates": true/false
-- "confidence": 0.0-1.0 (how confident you are)
-- "reason": brief explanation
-- "category": type of violation (e.g., "toxicity", "spam", "harassment", "none")
-
-Be conservative - only flag clear violations."""
-            
-            messages = [
-                {"role": "system", "content": "You are a content moderation assistant. Analyze messages objectively and respond only with valid JSON."},
-                {"role": "user", "content": analysis_prompt}
-            ]
-            
-            # Call Grok (without reflections for privacy)
-            response = await ask_gpt(
-                messages,
-                user_id=message.author.id,
-                model="grok-beta",
-                guild_id=message.guild.id if message.guild else None,
-                include_reflections=False
-            )
-            
-            if not response:
-                log.warning("AI moderation: empty response from Grok")
-                return RuleResult(False, 0.0, "AI analysis unavailable", {})
-            
-            # Parse JSON response
-            import json
-            try:
-                # Extract JSON from response (handle markdown code blocks)
-                response_text = response.strip()
-                if response_text.startswith('```'):
-                    # Remove markdown code block markers
-                    lines = response_text.split('\n')
-                    response_text = '\n'.join(lines[1:-1]) if len(lines) > 2 else response_text
-                    response_text = response_text.replace('```json', '').replace('```', '').strip()
-                
-                analysis = json.loads(response_text)
-                violates = analysis.get('violates', False)
-                confidence = float(analysis.get('confidence', 0.0))
-                reason = analysis.get('reason', 'AI flagged content')
-                category = analysis.get('category', 'unknown')
-                
-                if violates and confidence >= threshold:
-                    return RuleResult(
-                        True,
-                        confidence,
-                        f"AI detected {category}: {reason}",
-                        {'category': category, 'ai_reason': reason, 'confidence': confidence}
-                    )
-                else:
-                    return RuleResult(False, confidence, f"AI analysis: {reason}", {'category': category})
-                    
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                log.error(f"AI moderation: failed to parse response: {e}")
-                return RuleResult(False, 0.0, "AI analysis parse error", {'error': str(e)})
-                
-        except Exception as e:
-            log.error(f"AI moderation error: {e}")
+        config = rule.get('config', {})
+        policy = config.get('policy', 'Detect toxic, harmful, or inappropriate content')
+        threshold = config.get('threshold', 0.7)
+
+        verdict = await self.ai_moderator.analyze(
+            message.content,
+            policy,
+            guild_id=message.guild.id if message.guild else None,
+        )
+        if verdict is None:
             # Fail open - don't block on AI errors
-            return RuleResult(False, 0.0, f"AI error: {str(e)}", {'error': str(e)})
+            return RuleResult(False, 0.0, "AI analysis unavailable", {})
+
+        if verdict.violates and verdict.confidence >= threshold:
+            return RuleResult(
+                True,
+                verdict.confidence,
+                f"AI detected {verdict.category}: {verdict.reason}",
+                {'category': verdict.category, 'ai_reason': verdict.reason, 'confidence': verdict.confidence}
+            )
+        return RuleResult(False, verdict.confidence, f"AI analysis: {verdict.reason}", {'category': verdict.category})
+
+    async def find_violation(
+        self,
+        rules: list[dict],
+        message: discord.Message,
+        user_context: dict[str, Any],
+        scan: MessageScan | None = None,
+    ) -> tuple[dict, RuleResult] | None:
+        """Return the first triggered rule and its result, if any.
+
+        Cheap rules (spam, content, regex) run first in priority order; AI
+        rules only run when none of them triggered, and then concurrently.
+        """
+        if scan is None:
+            scan = CompiledRuleSet(rules).scan(message)
+        if scan.ruleset.source is rules:
+            cheap_rules, ai_rules = scan.ruleset.cheap_rules, scan.ruleset.ai_rules
+        else:
+            cheap_rules = [r for r in rules if r.get('rule_type') != RuleType.AI.value]
+            ai_rules = [r for r in rules if r.get('rule_type') == RuleType.AI.value]
+
+        for rule in cheap_rules:
+            result = await self.evaluate_rule(rule, message, user_context, scan)
+            if result.triggered:
+                return rule, result
+
+        if not ai_rules:
+            return None
+        results = await asyncio.gather(
+            *(self.evaluate_rule(rule, message, user_context, scan) for rule in ai_rules)
+        )
+        for rule, result in zip(ai_rules, results, strict=True):
+            if result.triggered:
+                return rule, result
+        return None
         
     async def create_rule(self, guild_id: int, rule_type: str, name: str, config: dict, 
                          action_type: str, action_config: dict, created_by: int, is_premium: bool = False) -> int:
@@ -444,10 +571,7 @@ Be conservative - only flag clear violations."""
                 """, guild_id, rule_type, name, json.dumps(config), action_id, created_by, is_premium)
                 
                 # Clear cache for this guild so reads refresh immediately.
-                self._rules_cache.pop(guild_id, None)
-                self._cache_updated.pop(guild_id, None)
-                self._list_rules_cache.pop(guild_id, None)
-                self._list_cache_updated.pop(guild_id, None)
+                self._invalidate_guild(guild_id)
                     
                 return rule_id
                 
@@ -562,10 +686,7 @@ Be conservative - only flag clear violations."""
                         guild_id,
                     )
 
-            self._rules_cache.pop(guild_id, None)
-            self._cache_updated.pop(guild_id, None)
-            self._list_rules_cache.pop(guild_id, None)
-            self._list_cache_updated.pop(guild_id, None)
+            self._invalidate_guild(guild_id)
             return True
         except Exception as e:
             log.error(f"Error deleting auto-mod rule {rule_id} for guild {guild_id}: {e}")
@@ -637,10 +758,7 @@ Be conservative - only flag clear violations."""
                         guild_id,
                     )
 
-            self._rules_cache.pop(guild_id, None)
-            self._cache_updated.pop(guild_id, None)
-            self._list_rules_cache.pop(guild_id, None)
-            self._list_cache_updated.pop(guild_id, None)
+            self._invalidate_guild(guild_id)
             return True
         except Exception as e:
             log.error(f"Error updating auto-mod rule {rule_id} for guild {guild_id}: {e}")
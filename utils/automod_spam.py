@@ -0,0 +1,119 @@
+"""
+Auto-Moderation Spam Tracker
+
+Bounded per-guild activity tracking for spam rules: recent message timestamps
+live in fixed-size ring buffers, duplicate detection keeps only a hash of the
+last message, and idle users are evicted so memory stays flat during raids.
+"""
+
+import sys
+from bisect import bisect_right
+from collections import OrderedDict, deque
+
+# Timestamps kept per user. Frequency rules with a larger ``max_messages``
+# saturate at this count, which still triggers them.
+HISTORY_SIZE = 64
+# Users tracked per guild before the least recently active one is dropped.
+MAX_USERS_PER_GUILD = 5000
+# Users silent for this long are evicted.
+IDLE_TTL = 600.0
+# Window that ``spam_count`` and duplicate detection count messages over.
+RECENT_WINDOW = 300.0
+
+
+def content_hash(content: str) -> int:
+    """Case-insensitive hash used for duplicate-message detection."""
+    return hash(content.lower())
+
+
+class UserActivity:
+    """Recent activity of one user in one guild."""
+
+    __slots__ = ("timestamps", "last_hash", "last_preview", "last_seen")
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self.timestamps: deque[float] = deque(maxlen=history_size)
+        self.last_hash: int | None = None
+        self.last_preview = ""
+        self.last_seen = 0.0
+
+    def count_since(self, cutoff: float) -> int:
+        """Number of tracked messages sent after ``cutoff``.
+
+        Timestamps are appended in order, so this is a bisect over a bounded
+        buffer rather than a scan of the user's history.
+        """
+        return len(self.timestamps) - bisect_right(self.timestamps, cutoff)
+
+
+class GuildSpamTracker:
+    """Per-guild LRU of ``UserActivity`` with size bound and idle eviction."""
+
+    __slots__ = ("_users", "max_users", "idle_ttl", "history_size", "evictions")
+
+    def __init__(
+        self,
+        max_users: int = MAX_USERS_PER_GUILD,
+        idle_ttl: float = IDLE_TTL,
+        history_size: int = HISTORY_SIZE,
+    ):
+        self._users: OrderedDict[int, UserActivity] = OrderedDict()
+        self.max_users = max_users
+        self.idle_ttl = idle_ttl
+        self.history_size = history_size
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def get(self, user_id: int) -> UserActivity | None:
+        return self._users.get(user_id)
+
+    def record(self, user_id: int, timestamp: float) -> UserActivity:
+        """Record a message timestamp and return the user's activity."""
+        activity = self._users.get(user_id)
+        if activity is None:
+            activity = UserActivity(self.history_size)
+            self._users[user_id] = activity
+        else:
+            self._users.move_to_end(user_id)
+        activity.timestamps.append(timestamp)
+        activity.last_seen = timestamp
+        self.evict(timestamp)
+        return activity
+
+    def remember_message(self, user_id: int, content: str) -> None:
+        """Store the hash of the user's latest message for duplicate checks."""
+        activity = self._users.get(user_id)
+        if activity is not None:
+            activity.last_hash = content_hash(content)
+            activity.last_preview = content[:50]
+
+    def evict(self, now: float) -> int:
+        """Drop idle users and enforce the size bound; returns evicted count.
+
+        Entries are ordered by last activity, so only the head is inspected.
+        """
+        users = self._users
+        evicted = 0
+        cutoff = now - self.idle_ttl
+        while users:
+            oldest = next(iter(users.values()))
+            if len(users) <= self.max_users and oldest.last_seen >= cutoff:
+                break
+            users.popitem(last=False)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+
+    def approx_bytes(self) -> int:
+        """Rough memory footprint of tracked state."""
+        total = sys.getsizeof(self._users)
+        for activity in self._users.values():
+            total += (
+                sys.getsizeof(activity)
+                + sys.getsizeof(activity.timestamps)
+                + 24 * len(activity.timestamps)  # float objects
+                + sys.getsizeof(activity.last_preview)
+            )
+        return total
@@ -9,15 +9,27 @@ Features:
 - Automatic guild-only command detection
 - Safe sync with error handling
 - Rate limit protection
+- Payload hashing: a sync is skipped when the canonical command payload matches
+  the last successful sync (persisted in ``command_sync_state``), so restarts and
+  reconnects only call Discord for scopes whose commands actually changed
+- Bounded parallelism for multi-guild syncs (``COMMAND_SYNC_CONCURRENCY``)
 """
 
+import asyncio
+import hashlib
+import json
 import time
+from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import Any
 
 import discord
 from discord.ext import commands
 
+import config
+from utils.db_helpers import acquire_safe
 from utils.logger import logger
+from utils.pool_registry import SubsystemPool, get_subsystem_pool
 
 # Cooldown tracking: {key: last_sync_timestamp}
 # Keys: "global" for global syncs, guild.id for per-guild syncs
@@ -33,6 +45,13 @@ MAX_SYNC_COOLDOWNS = 500
 # Track if we've done initial global sync
 _initial_global_sync_done = False
 
+# Payload hash of the last successful sync, same keys as _sync_cooldowns
+_synced_hashes: dict[str, str] = {}
+_hashes_loaded = False
+_pool: SubsystemPool | None = None
+
+DEFAULT_SYNC_CONCURRENCY = 4
+
 
 @dataclass
 class SyncResult:
@@ -42,6 +61,7 @@ class SyncResult:
     error: str | None = None
     cooldown_remaining: float | None = None
     sync_type: str = "unknown"  # "global" or "guild"
+    unchanged: bool = False  # skipped: payload matches the last successful sync
 
 
 def _get_cooldown_key(guild: discord.Guild | None) -> str:
@@ -83,6 +103,96 @@ def _update_cooldown(guild: discord.Guild | None) -> None:
     _sync_cooldowns[key] = time.time()
 
 
+def command_payload(bot: commands.Bot, guild: discord.Guild | None = None) -> list[dict[str, Any]]:
+    """The payload ``bot.tree.sync(guild=guild)`` would upload, in a stable order."""
+    tree = bot.tree
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda item: (item.get("type", 1), item.get("name", "")))
+    return payload
+
+
+def payload_hash(payload: list[dict[str, Any]]) -> str:
+    """Canonical SHA-256 of a command payload (key order and whitespace independent)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+async def _ensure_pool() -> SubsystemPool | None:
+    global _pool
+    if _pool is not None and not _pool.is_closing():
+        return _pool
+    if not (getattr(config, "DATABASE_URL", None) or ""):
+        return None
+    try:
+        _pool = await get_subsystem_pool("command_sync")
+        return _pool
+    except Exception as e:
+        logger.warning(f"Command sync: could not open DB pool: {e}")
+        return None
+
+
+async def _load_synced_hashes(bot: commands.Bot) -> None:
+    """Load the hashes of previous successful syncs for this application (once per process)."""
+    global _hashes_loaded
+    if _hashes_loaded or bot.application_id is None:
+        return
+    _hashes_loaded = True
+    pool = await _ensure_pool()
+    if pool is None:
+        return
+    try:
+        async with acquire_safe(pool) as conn:
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS command_sync_state (
+                    application_id BIGINT NOT NULL,
+                    scope TEXT NOT NULL,
+                    payload_hash TEXT NOT NULL,
+                    command_count INTEGER NOT NULL,
+                    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                    PRIMARY KEY (application_id, scope)
+                )
+                """
+            )
+            rows = await conn.fetch(
+                "SELECT scope, payload_hash FROM command_sync_state WHERE application_id = $1",
+                int(bot.application_id),
+            )
+    except Exception as e:
+        logger.warning(f"Command sync: could not load sync state: {e}")
+        return
+    for row in rows:
+        _synced_hashes.setdefault(row["scope"], row["payload_hash"])
+    logger.debug(f"Command sync: loaded {len(rows)} stored payload hashes")
+
+
+async def _remember_sync(bot: commands.Bot, key: str, digest: str, command_count: int) -> None:
+    _synced_hashes[key] = digest
+    if bot.application_id is None:
+        return
+    pool = await _ensure_pool()
+    if pool is None:
+        return
+    try:
+        async with acquire_safe(pool) as conn:
+            await conn.execute(
+                """
+                INSERT INTO command_sync_state (application_id, scope, payload_hash, command_count, synced_at)
+                VALUES ($1, $2, $3, $4, NOW())
+                ON CONFLICT (application_id, scope) DO UPDATE
+                SET payload_hash = EXCLUDED.payload_hash,
+                    command_count = EXCLUDED.command_count,
+                    synced_at = EXCLUDED.synced_at
+                """,
+                int(bot.application_id),
+                key,
+                digest,
+                command_count,
+            )
+    except Exception as e:
+        logger.warning(f"Command sync: could not store sync state for {key}: {e}")
+
+
 def detect_guild_only_commands(bot: commands.Bot) -> bool:
     """
     Detect if the command tree contains any guild-only commands.
@@ -120,14 +230,36 @@ async def safe_sync(
     Args:
         bot: Bot instance
         guild: Optional guild for per-guild sync. None for global sync.
-        force: If True, bypass cooldown check
+        force: If True, bypass the cooldown and unchanged-payload checks
         
     Returns:
         SyncResult with sync status and details
     """
+    global _initial_global_sync_done
     sync_type = "guild" if guild else "global"
     start_time = time.time()
-    
+    key = _get_cooldown_key(guild)
+
+    # Skip when the commands are exactly what Discord already has
+    digest: str | None = None
+    try:
+        payload = command_payload(bot, guild)
+        digest = payload_hash(payload)
+    except Exception as e:
+        logger.warning(f"Could not hash {sync_type} command payload, syncing anyway: {e}")
+    if digest is not None and not force:
+        await _load_synced_hashes(bot)
+        if _synced_hashes.get(key) == digest:
+            logger.debug(f"⏭️ {sync_type.capitalize()} sync skipped for {key}: commands unchanged")
+            if guild is None:
+                _initial_global_sync_done = True
+            return SyncResult(
+                success=True,
+                command_count=len(payload),
+                sync_type=sync_type,
+                unchanged=True
+            )
+
     # Check cooldown
     cooldown_remaining = _check_cooldown(guild, force)
     if cooldown_remaining is not None:
@@ -153,8 +285,9 @@ async def safe_sync(
             elapsed = time.time() - start_time
             logger.info(f"✅ Global sync completed: {command_count} commands synced in {elapsed:.2f}s")
             _update_cooldown(None)
-            global _initial_global_sync_done
             _initial_global_sync_done = True
+            if digest is not None:
+                await _remember_sync(bot, key, digest, command_count)
             return SyncResult(
                 success=True,
                 command_count=command_count,
@@ -171,6 +304,8 @@ async def safe_sync(
             elapsed = time.time() - start_time
             logger.info(f"✅ Guild sync completed for {guild.name}: {command_count} commands synced in {elapsed:.2f}s")
             _update_cooldown(guild)
+            if digest is not None:
+                await _remember_sync(bot, key, digest, command_count)
             return SyncResult(
                 success=True,
                 command_count=command_count,
@@ -187,7 +322,6 @@ async def safe_sync(
             if retry_after:
                 error_msg = f"Rate limited. Retry after {retry_after:.1f}s"
                 # Update cooldown to retry_after time
-                key = _get_cooldown_key(guild)
                 _sync_cooldowns[key] = time.time() - (GUILD_COOLDOWN if guild else GLOBAL_COOLDOWN) + retry_after
         
         logger.error(f"❌ {sync_type.capitalize()} sync failed after {elapsed:.2f}s: {error_msg}")
@@ -210,6 +344,28 @@ async def safe_sync(
         )
 
 
+async def sync_guilds(
+    bot: commands.Bot,
+    guilds: Iterable[discord.Guild],
+    force: bool = False
+) -> list[SyncResult | BaseException]:
+    """
+    Run safe_sync for many guilds with at most COMMAND_SYNC_CONCURRENCY in flight,
+    so startup and reconnects don't burst into rate limits.
+
+    Returns one result (or exception) per guild, in input order.
+    """
+    limit = max(1, int(getattr(config, "COMMAND_SYNC_CONCURRENCY", DEFAULT_SYNC_CONCURRENCY)))
+    semaphore = asyncio.Semaphore(limit)
+    await _load_synced_hashes(bot)
+
+    async def _sync_one(guild: discord.Guild) -> SyncResult:
+        async with semaphore:
+            return await safe_sync(bot, guild=guild, force=force)
+
+    return await asyncio.gather(*(_sync_one(guild) for guild in guilds), return_exceptions=True)
+
+
 def should_sync_global() -> bool:
     """
     Check if global sync should be performed.
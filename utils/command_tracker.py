@@ -8,9 +8,11 @@ across all Discord bot commands (slash and text commands).
 import asyncio
 import functools
 import logging
-from collections.abc import Callable
-from dataclasses import dataclass
-from typing import Any
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
 import asyncpg
 import discord
@@ -23,31 +25,53 @@ logger = logging.getLogger("bot")
 _db_pool: asyncpg.Pool | None = None
 
 # In-memory queue for batching command usage logs
-@dataclass
-class CommandUsageEntry:
-    """Entry in the command usage queue."""
+class CommandUsageEntry(NamedTuple):
+    """Entry in the command usage queue (field order matches ``AUDIT_LOG_COLUMNS``)."""
     guild_id: int
     user_id: int
     command_name: str
     command_type: str
     success: bool
     error_message: str | None
+    created_at: datetime
+
+
+AUDIT_LOG_COLUMNS = (
+    "guild_id", "user_id", "command_name", "command_type", "success", "error_message", "created_at",
+)
 
-_command_queue: list[CommandUsageEntry] = []
 MAX_QUEUE_SIZE = 10000
 FLUSH_THRESHOLD = 1000
 FLUSH_INTERVAL = 30  # seconds
+
+# Bounded ring queue: appending to a full deque drops the oldest entry in O(1).
+_command_queue: deque[CommandUsageEntry] = deque(maxlen=MAX_QUEUE_SIZE)
 _flush_task: asyncio.Task | None = None
+_flush_event: asyncio.Event | None = None  # Wakes the flusher early when the threshold is hit
+_flush_lock: asyncio.Lock | None = None  # Single writer; created lazily on the running loop
+_oneshot_flush: asyncio.Task | None = None  # Threshold flush when no periodic flusher runs
+
+_stats: dict[str, float] = {
+    "dropped": 0,
+    "flushed": 0,
+    "flushes": 0,
+    "flush_failures": 0,
+    "last_flush_ms": 0.0,
+    "max_flush_ms": 0.0,
+}
 
 # Export _db_pool for checking if it's already initialized
-__all__ = ['set_db_pool', 'log_command_usage', 'track_command', '_db_pool', 'start_flush_task', 'stop_flush_task']
+__all__ = [
+    'set_db_pool', 'log_command_usage', 'track_command', '_db_pool', 'start_flush_task', 'stop_flush_task',
+    'get_command_tracker_stats',
+]
 
 
 def set_db_pool(pool: asyncpg.Pool) -> None:
     """Set the database pool for command tracking."""
     global _db_pool
     # Close existing pool if any
-    if _db_pool and not _db_pool.is_closing():
+    if _db_pool and _db_pool is not pool and not _db_pool.is_closing():
         try:
             import asyncio
             loop = asyncio.get_event_loop()
@@ -62,6 +86,34 @@ def set_db_pool(pool: asyncpg.Pool) -> None:
     logger.info("✅ Command tracker: Database pool set")
 
 
+def get_command_tracker_stats() -> dict[str, float]:
+    """Queue depth, dropped entries and flush latency for monitoring."""
+    return {"queue_size": len(_command_queue), **_stats}
+
+
+def _get_flush_event() -> asyncio.Event:
+    global _flush_event
+    if _flush_event is None:
+        _flush_event = asyncio.Event()
+    return _flush_event
+
+
+def _get_flush_lock() -> asyncio.Lock:
+    global _flush_lock
+    if _flush_lock is None:
+        _flush_lock = asyncio.Lock()
+    return _flush_lock
+
+
+def _request_flush() -> None:
+    """Coalesce threshold-triggered flushes into the single flusher."""
+    global _oneshot_flush
+    if _flush_task is not None and not _flush_task.done():
+        _get_flush_event().set()
+    elif _oneshot_flush is None or _oneshot_flush.done():
+        _oneshot_flush = asyncio.create_task(_flush_command_queue())
+
+
 async def log_command_usage(
     guild_id: int | None,
     user_id: int,
@@ -84,32 +136,43 @@ async def log_command_usage(
     # Use 0 for guild_id if None (DMs)
     effective_guild_id = guild_id if guild_id is not None else 0
     
-    # Add to queue (thread-safe append)
-    global _command_queue
     if len(_command_queue) >= MAX_QUEUE_SIZE:
-        # Queue full - drop oldest entry (FIFO)
-        _command_queue.pop(0)
-        logger.warning(f"Command tracker queue full ({MAX_QUEUE_SIZE}), dropping oldest entry")
+        # Queue full - the deque drops the oldest entry (FIFO)
+        _stats["dropped"] += 1
+        if _stats["dropped"] % 1000 == 1:
+            logger.warning(f"Command tracker queue full ({MAX_QUEUE_SIZE}), dropping oldest entries")
     
-    entry = CommandUsageEntry(
-        guild_id=effective_guild_id,
-        user_id=user_id,
-        command_name=command_name,
-        command_type=command_type,
-        success=success,
-        error_message=error_message
-    )
-    _command_queue.append(entry)
+    _command_queue.append(CommandUsageEntry(
+        effective_guild_id,
+        user_id,
+        command_name,
+        command_type,
+        success,
+        error_message,
+        datetime.now(UTC),
+    ))
     
     # Trigger flush if threshold reached
     if len(_command_queue) >= FLUSH_THRESHOLD:
-        asyncio.create_task(_flush_command_queue())
+        _request_flush()
+
+
+def _requeue(entries: list[CommandUsageEntry]) -> None:
+    """Put unflushed entries back at the front, dropping the oldest if there is no room."""
+    room = MAX_QUEUE_SIZE - len(_command_queue)
+    if room < len(entries):
+        _stats["dropped"] += len(entries) - max(room, 0)
+        entries = entries[len(entries) - max(room, 0):]
+    _command_queue.extendleft(reversed(entries))
+
+
+async def _write_entries(conn: Any, entries: Iterable[CommandUsageEntry]) -> None:
+    """Bulk-load entries into audit_logs with COPY."""
+    await conn.copy_records_to_table("audit_logs", records=entries, columns=AUDIT_LOG_COLUMNS)
 
 
 async def _flush_command_queue() -> None:
-    """Flush command usage queue to database in batches."""
-    global _command_queue
-    
+    """Flush command usage queue to database in one COPY batch."""
     if not _command_queue:
         return
     
@@ -121,61 +184,57 @@ async def _flush_command_queue() -> None:
         logger.debug("Command tracking: Database pool is closing, skipping flush")
         return
     
-    # Copy queue and clear it
-    queue_copy = _command_queue.copy()
-    queue_size = len(queue_copy)
-    _command_queue.clear()
-    
-    if queue_size == 0:
-        return
-    
-    try:
-        async with _db_pool.acquire() as conn:
-            # Use execute_many for batch insert
-            await conn.executemany(
-                """
-                INSERT INTO audit_logs (guild_id, user_id, command_name, command_type, success, error_message)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                """,
-                [
-                    (
-                        entry.guild_id,
-                        entry.user_id,
-                        entry.command_name,
-                        entry.command_type,
-                        entry.success,
-                        entry.error_message
-                    )
-                    for entry in queue_copy
-                ]
-            )
-        logger.debug(f"Command tracker: Flushed {queue_size} entries to database")
-    except pg_exceptions.UndefinedTableError:
-        logger.warning("Command tracking: audit_logs table does not exist yet. Queue will be retried on next flush.")
-        # Re-add entries to queue for retry
-        _command_queue.extend(queue_copy)
-    except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
-        logger.debug(f"Command tracking: Database connection unavailable (pool closing?): {conn_err.__class__.__name__}")
-        # Re-add entries to queue for retry
-        _command_queue.extend(queue_copy)
-    except Exception as e:
-        logger.warning(f"Command tracking flush failed (non-critical): {e}", exc_info=True)
-        # Re-add entries to queue for retry (but limit to prevent infinite growth)
-        if len(_command_queue) < MAX_QUEUE_SIZE:
-            _command_queue.extend(queue_copy)
+    async with _get_flush_lock():
+        # Drain the queue (no await between copy and clear)
+        queue_copy = list(_command_queue)
+        _command_queue.clear()
+        queue_size = len(queue_copy)
+        
+        if queue_size == 0:
+            return
+        
+        start = time.perf_counter()
+        try:
+            async with _db_pool.acquire() as conn:
+                await _write_entries(conn, queue_copy)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _stats["flushed"] += queue_size
+            _stats["flushes"] += 1
+            _stats["last_flush_ms"] = round(elapsed_ms, 2)
+            _stats["max_flush_ms"] = round(max(_stats["max_flush_ms"], elapsed_ms), 2)
+            logger.debug(f"Command tracker: Flushed {queue_size} entries to database in {elapsed_ms:.1f}ms")
+        except pg_exceptions.UndefinedTableError:
+            _stats["flush_failures"] += 1
+            logger.warning("Command tracking: audit_logs table does not exist yet. Queue will be retried on next flush.")
+            # Re-add entries to queue for retry
+            _requeue(queue_copy)
+        except (pg_exceptions.ConnectionDoesNotExistError, pg_exceptions.InterfaceError, ConnectionResetError) as conn_err:
+            _stats["flush_failures"] += 1
+            logger.debug(f"Command tracking: Database connection unavailable (pool closing?): {conn_err.__class__.__name__}")
+            # Re-add entries to queue for retry
+            _requeue(queue_copy)
+        except Exception as e:
+            _stats["flush_failures"] += 1
+            logger.warning(f"Command tracking flush failed (non-critical): {e}", exc_info=True)
+            # Re-add entries to queue for retry (bounded by the ring size)
+            _requeue(queue_copy)
 
 
 async def _periodic_flush_loop() -> None:
-    """Background task that periodically flushes the command queue."""
-    global _command_queue
+    """Single flusher: runs every FLUSH_INTERVAL or as soon as the threshold is hit."""
+    event = _get_flush_event()
     
     while True:
         try:
-            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await asyncio.wait_for(event.wait(), timeout=FLUSH_INTERVAL)
+            except TimeoutError:
+                pass
+            event.clear()
             
             queue_size = len(_command_queue)
             if queue_size > 0:
-                logger.debug(f"Command tracker: Periodic flush triggered, queue size: {queue_size}")
+                logger.debug(f"Command tracker: Flush triggered, queue size: {queue_size}")
                 await _flush_command_queue()
                 logger.debug(f"Command tracker: Queue size after flush: {len(_command_queue)}")
         except asyncio.CancelledError:
@@ -185,7 +244,7 @@ async def _periodic_flush_loop() -> None:
             logger.info(f"Command tracker: Final flush complete, remaining queue size: {len(_command_queue)}")
             raise
         except Exception as e:
-            logger.error(f"Command tracker: Error in periodic flush loop: {e}", exc_info=True)
+            logger.error(f"Command tracker: Error in flush loop: {e}", exc_info=True)
             await asyncio.sleep(FLUSH_INTERVAL)  # Wait before retrying
 
 
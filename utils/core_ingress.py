@@ -6,9 +6,8 @@ import logging
 from collections import deque
 from typing import Any
 
-import httpx
-
 import config
+from utils.http_clients import CORE_API, get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -55,18 +54,19 @@ async def post_telemetry(payload: dict[str, Any] | list[dict[str, Any]]) -> bool
         body = {"snapshots": [payload]}
 
     try:
-        async with httpx.AsyncClient(timeout=CORE_INGRESS_TIMEOUT, follow_redirects=True) as client:
-            response = await client.post(url, json=body, headers=headers)
-            if response.is_success:
-                logger.debug("Core ingress telemetry POST succeeded")
-                return True
-            logger.warning(
-                "Core ingress telemetry failed: status=%s body=%s%s",
-                response.status_code,
-                response.text[:500],
-                _ingress_error_suffix(response.status_code, response.text),
-            )
-            return False
+        response = await get_http_client(CORE_API).post(
+            url, json=body, headers=headers, timeout=CORE_INGRESS_TIMEOUT, follow_redirects=True
+        )
+        if response.is_success:
+            logger.debug("Core ingress telemetry POST succeeded")
+            return True
+        logger.warning(
+            "Core ingress telemetry failed: status=%s body=%s%s",
+            response.status_code,
+            response.text[:500],
+            _ingress_error_suffix(response.status_code, response.text),
+        )
+        return False
     except Exception as exc:
         logger.debug("Core ingress telemetry error: %s", exc)
         return False
@@ -105,21 +105,22 @@ async def flush_operational_events_queue() -> None:
     body = {"events": events}
 
     try:
-        async with httpx.AsyncClient(timeout=CORE_INGRESS_TIMEOUT, follow_redirects=True) as client:
-            response = await client.post(url, json=body, headers=headers)
-            if response.is_success:
-                logger.debug("Core ingress operational-events POST succeeded (count=%d)", len(events))
-            else:
-                logger.warning(
-                    "Core ingress operational-events failed: status=%s body=%s%s",
-                    response.status_code,
-                    response.text[:500],
-                    _ingress_error_suffix(response.status_code, response.text),
-                )
-                # Re-queue on failure (up to max size)
-                for e in events:
-                    if len(_operational_events_queue) < MAX_OPERATIONAL_EVENTS_QUEUE:
-                        _operational_events_queue.append(e)
+        response = await get_http_client(CORE_API).post(
+            url, json=body, headers=headers, timeout=CORE_INGRESS_TIMEOUT, follow_redirects=True
+        )
+        if response.is_success:
+            logger.debug("Core ingress operational-events POST succeeded (count=%d)", len(events))
+        else:
+            logger.warning(
+                "Core ingress operational-events failed: status=%s body=%s%s",
+                response.status_code,
+                response.text[:500],
+                _ingress_error_suffix(response.status_code, response.text),
+            )
+            # Re-queue on failure (up to max size)
+            for e in events:
+                if len(_operational_events_queue) < MAX_OPERATIONAL_EVENTS_QUEUE:
+                    _operational_events_queue.append(e)
     except Exception as exc:
         logger.debug("Core ingress operational-events error: %s", exc)
         for e in events:
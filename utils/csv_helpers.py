@@ -2,12 +2,25 @@
 CSV export utilities for consistent file generation and Discord file handling.
 """
 import csv
+import gzip
 import io
 import os
+from collections.abc import Callable, Iterable, Sequence
 from typing import Any
 
 import discord
 
+# Rows fetched per server-side cursor round-trip
+EXPORT_CHUNK_SIZE = 1000
+# Output larger than this is gzip-compressed (.csv.gz)
+EXPORT_GZIP_THRESHOLD = 1024 * 1024
+# Discord's attachment limit for unboosted guilds; callers pass guild.filesize_limit
+EXPORT_MAX_PART_BYTES = discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+# Headroom for data still buffered inside the gzip compressor
+_GZIP_SLACK = 64 * 1024
+# Discord accepts at most this many attachments per message
+MAX_FILES_PER_MESSAGE = 10
+
 
 def create_csv_buffer(rows: list[dict[str, Any]], fieldnames: list[str] | None = None) -> io.StringIO:
     """Create a CSV buffer from database rows."""
@@ -49,4 +62,157 @@ def cleanup_temp_file(filename: str) -> None:
         if os.path.exists(filename):
             os.remove(filename)
     except Exception:
-        pass  # Ignore cleanup errors
\ No newline at end of file
+        pass  # Ignore cleanup errors
+
+
+class StreamingCsvExport:
+    """CSV writer that encodes rows straight into size-limited byte buffers.
+
+    Each row is encoded once into the current part. When a part would exceed
+    ``max_part_bytes`` a new part (with its own header) is started, so every
+    part is a standalone CSV within Discord's attachment limit. Once the output
+    passes ``gzip_threshold`` it is gzip-compressed from then on.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        fieldnames: Sequence[str],
+        *,
+        max_part_bytes: int = EXPORT_MAX_PART_BYTES,
+        gzip_threshold: int | None = EXPORT_GZIP_THRESHOLD,
+    ):
+        self.filename = filename
+        self.max_part_bytes = max_part_bytes
+        self.gzip_threshold = gzip_threshold
+        self.rows = 0
+        self.compressed = False
+        self._parts: list[io.BytesIO] = []
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line)
+        self._header = self._encode(fieldnames)
+        self._buf: io.BytesIO | None = None
+        self._gz: gzip.GzipFile | None = None
+        self._part_rows = 0
+        self._new_part()
+
+    def _encode(self, values: Iterable[Any]) -> bytes:
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow(values)
+        return self._line.getvalue().encode("utf-8")
+
+    def _write(self, data: bytes) -> None:
+        (self._gz or self._buf).write(data)
+
+    def _finish_part(self) -> None:
+        if self._buf is None:
+            return
+        if self._gz is not None:
+            self._gz.close()
+        self._buf.seek(0)
+        self._parts.append(self._buf)
+        self._buf = None
+        self._gz = None
+
+    def _new_part(self) -> None:
+        self._finish_part()
+        self._buf = io.BytesIO()
+        if self.compressed:
+            self._gz = gzip.GzipFile(fileobj=self._buf, mode="wb")
+        self._part_rows = 0
+        self._write(self._header)
+
+    def _start_compressing(self) -> None:
+        raw = self._buf.getvalue()
+        self.compressed = True
+        self._buf = io.BytesIO()
+        self._gz = gzip.GzipFile(fileobj=self._buf, mode="wb")
+        self._gz.write(raw)
+
+    def write_row(self, values: Iterable[Any]) -> None:
+        line = self._encode(values)
+        if not self.compressed and self.gzip_threshold is not None:
+            if self._buf.tell() + len(line) > self.gzip_threshold:
+                self._start_compressing()
+        slack = _GZIP_SLACK if self.compressed else 0
+        if self._part_rows and self._buf.tell() + len(line) + slack > self.max_part_bytes:
+            self._new_part()
+        self._write(line)
+        self._part_rows += 1
+        self.rows += 1
+
+    def files(self) -> list[discord.File]:
+        """Finish writing and return the parts as Discord files."""
+        self._finish_part()
+        stem = self.filename[:-4] if self.filename.endswith(".csv") else self.filename
+        suffix = ".csv.gz" if self.compressed else ".csv"
+        if len(self._parts) == 1:
+            return [discord.File(self._parts[0], filename=f"{stem}{suffix}")]
+        return [
+            discord.File(part, filename=f"{stem}_part{idx}{suffix}")
+            for idx, part in enumerate(self._parts, 1)
+        ]
+
+
+async def stream_query_to_csv(
+    conn: Any,
+    query: str,
+    *args: Any,
+    export: StreamingCsvExport,
+    transform: Callable[[Any], Iterable[Any]] | None = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> StreamingCsvExport:
+    """Stream a query through a server-side cursor into ``export``.
+
+    Rows are written in SELECT column order unless ``transform`` maps a record
+    to the output values.
+    """
+    async with conn.transaction():
+        async for record in conn.cursor(query, *args, prefetch=chunk_size):
+            export.write_row(transform(record) if transform else record.values())
+    return export
+
+
+def _file_size(file: discord.File) -> int:
+    fp = file.fp
+    if isinstance(fp, io.BytesIO):
+        return fp.getbuffer().nbytes
+    position = fp.tell()
+    size = fp.seek(0, io.SEEK_END)
+    fp.seek(position)
+    return size
+
+
+def group_export_files(files: list[discord.File], max_message_bytes: int) -> list[list[discord.File]]:
+    """Group parts into messages whose combined size stays within ``max_message_bytes``.
+
+    Discord applies the upload limit to the whole request, not per attachment,
+    so parts are packed by size (and at most MAX_FILES_PER_MESSAGE each). A part
+    larger than the limit on its own is sent alone.
+    """
+    groups: list[list[discord.File]] = []
+    current: list[discord.File] = []
+    current_bytes = 0
+    for file in files:
+        size = _file_size(file)
+        if current and (current_bytes + size > max_message_bytes or len(current) >= MAX_FILES_PER_MESSAGE):
+            groups.append(current)
+            current, current_bytes = [], 0
+        current.append(file)
+        current_bytes += size
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def send_export_files(interaction: discord.Interaction, content: str, files: list[discord.File]) -> None:
+    """Send export parts as ephemeral follow-ups, each request within the guild's upload limit."""
+    guild = interaction.guild
+    max_message_bytes = guild.filesize_limit if guild is not None else EXPORT_MAX_PART_BYTES
+    for index, group in enumerate(group_export_files(files, max_message_bytes)):
+        await interaction.followup.send(
+            content=content if index == 0 else None,
+            files=group,
+            ephemeral=True,
+        )
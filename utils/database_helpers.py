@@ -6,27 +6,26 @@ from contextlib import asynccontextmanager
 
 import asyncpg
 
-from .db_helpers import acquire_safe, create_db_pool, is_pool_healthy
+from .db_helpers import acquire_safe, is_pool_healthy
+from .pool_registry import SubsystemPool, get_subsystem_pool
 
 
 class DatabaseManager:
-    """Helper class for managing database connections and common operations."""
+    """Helper class for managing database connections and common operations.
+
+    Each manager is a named subsystem of the shared pool registry rather than
+    a pool of its own; ``pool_name`` selects its concurrency quota.
+    """
 
     def __init__(self, pool_name: str, config_dict: dict):
         self.pool_name = pool_name
         self.config = config_dict
-        self._pool: asyncpg.Pool | None = None
+        self._pool: SubsystemPool | None = None
 
-    async def ensure_pool(self) -> asyncpg.Pool:
+    async def ensure_pool(self) -> SubsystemPool:
         """Ensure database pool is available, create if needed."""
         if not is_pool_healthy(self._pool):
-            self._pool = await create_db_pool(
-                self.config.get('DATABASE_URL', ''),
-                name=self.pool_name,
-                min_size=1,
-                max_size=5,
-                command_timeout=10.0
-            )
+            self._pool = await get_subsystem_pool(self.pool_name)
         assert self._pool is not None
         return self._pool
 
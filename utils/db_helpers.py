@@ -6,6 +6,7 @@ across the codebase. Provides safe connection acquisition with automatic error
 handling and reconnection logic.
 """
 
+import asyncio
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 from typing import Any, TypeVar
@@ -201,9 +202,10 @@ def get_bot_db_pool(bot) -> PoolT | None:
         Optional[PoolT]: The database pool if available, None otherwise
     """
     settings_service = getattr(bot, "settings", None)
-    if settings_service and hasattr(settings_service, "_pool"):
-        return settings_service._pool
-    return None
+    if settings_service is None:
+        return None
+    # The "bot" subsystem handle; falls back to the settings pool before it exists
+    return getattr(settings_service, "_bot_pool", None) or getattr(settings_service, "_pool", None)
 
 
 async def close_all_pools() -> None:
@@ -220,8 +222,18 @@ async def close_all_pools() -> None:
     
     logger.info(f"🔌 Closing {len(_registered_pools)} registered database pools...")
     
+    try:
+        current_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        current_loop = None
+
     closed_count = 0
     for pool in _registered_pools:
+        # A pool bound to another thread's loop (the API's shared pool) is closed by that loop
+        pool_loop = getattr(pool, "_loop", None)
+        if pool_loop is not None and current_loop is not None and pool_loop is not current_loop:
+            logger.debug("Skipping pool bound to another event loop")
+            continue
         try:
             if not pool.is_closing():
                 await pool.close()
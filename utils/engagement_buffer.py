@@ -0,0 +1,298 @@
+"""
+Engagement Write Buffer
+
+Write-behind buffer for the per-message engagement writes: weekly message
+indexing, reaction increments, challenge message counts and streak days.
+Writes are coalesced by (guild, message) / (challenge, user) / (guild, user)
+key in memory and flushed as one multi-row statement per table, instead of a
+pooled round-trip per message.
+
+The engagement cog flushes every FLUSH_INTERVAL seconds and on unload;
+service functions that read these tables flush first so they never see
+stale counts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any
+
+from utils.logger import logger
+
+# Seconds between periodic flushes (engagement cog loop).
+FLUSH_INTERVAL = 5.0
+# Pending keys that trigger an early flush.
+FLUSH_THRESHOLD = 2000
+# Pending keys kept while the database is unavailable; beyond this new
+# writes are dropped rather than growing memory without bound.
+MAX_PENDING = 50_000
+# Known streak states kept so same-day messages skip the streak lookup.
+STREAK_CACHE_SIZE = 20_000
+
+StreakState = tuple[date | None, int, str | None]  # (last_day, current_days, base_nickname)
+
+
+class EngagementWriteBuffer:
+    """Coalescing write-behind buffer for engagement counters."""
+
+    def __init__(self, max_pending: int = MAX_PENDING, streak_cache_size: int = STREAK_CACHE_SIZE):
+        # (guild_id, message_id) -> (channel_id, user_id, created_at, has_image, is_food)
+        self._messages: dict[tuple[int, int], tuple[int, int, datetime, bool, bool]] = {}
+        # (guild_id, message_id) -> reactions to add
+        self._reactions: dict[tuple[int, int], int] = {}
+        # (challenge_id, user_id) -> messages to add (0 = join only, random-draw mode)
+        self._challenge_counts: dict[tuple[int, int], int] = {}
+        # (guild_id, user_id) -> streak state to write
+        self._streaks: dict[tuple[int, int], StreakState] = {}
+        # (guild_id, user_id) -> last known streak state (written or pending)
+        self._streak_state: OrderedDict[tuple[int, int], StreakState] = OrderedDict()
+        self.max_pending = max_pending
+        self.streak_cache_size = streak_cache_size
+        self._lock: asyncio.Lock | None = None  # created lazily on the running loop
+        self.coalesced = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.rows_written = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._messages) + len(self._reactions) + len(self._challenge_counts) + len(self._streaks)
+
+    def should_flush(self) -> bool:
+        return self.pending >= FLUSH_THRESHOLD
+
+    def get_stats(self) -> dict[str, int]:
+        return {
+            "engagement_buffer_pending": self.pending,
+            "engagement_buffer_coalesced": self.coalesced,
+            "engagement_buffer_dropped": self.dropped,
+            "engagement_buffer_flushes": self.flushes,
+            "engagement_buffer_flush_failures": self.flush_failures,
+            "engagement_buffer_rows_written": self.rows_written,
+            "engagement_streak_cache_size": len(self._streak_state),
+        }
+
+    def _full(self, key: tuple[int, int], pending: dict) -> bool:
+        if key in pending or self.pending < self.max_pending:
+            return False
+        self.dropped += 1
+        return True
+
+    # -- recording ----------------------------------------------------------
+
+    def index_message(
+        self,
+        guild_id: int,
+        message_id: int,
+        channel_id: int,
+        user_id: int,
+        created_at: datetime,
+        has_image: bool,
+        is_food: bool,
+    ) -> None:
+        """Queue a message for the weekly awards index (first write wins)."""
+        key = (guild_id, message_id)
+        if self._full(key, self._messages):
+            return
+        if key in self._messages:
+            self.coalesced += 1
+            return
+        self._messages[key] = (channel_id, user_id, created_at, has_image, is_food)
+
+    def add_reaction(self, guild_id: int, message_id: int) -> None:
+        """Queue a +1 on a weekly-indexed message's reaction count."""
+        key = (guild_id, message_id)
+        if self._full(key, self._reactions):
+            return
+        if key in self._reactions:
+            self.coalesced += 1
+        self._reactions[key] = self._reactions.get(key, 0) + 1
+
+    def count_challenge_message(self, challenge_id: int, user_id: int, increment: bool) -> None:
+        """Queue a challenge participant message (``increment=False`` only records participation)."""
+        key = (challenge_id, user_id)
+        if self._full(key, self._challenge_counts):
+            return
+        if key in self._challenge_counts:
+            self.coalesced += 1
+        self._challenge_counts[key] = self._challenge_counts.get(key, 0) + (1 if increment else 0)
+
+    def get_streak(self, guild_id: int, user_id: int) -> StreakState | None:
+        """Last known streak state, or None if it must be read from the database."""
+        key = (guild_id, user_id)
+        state = self._streak_state.get(key)
+        if state is not None:
+            self._streak_state.move_to_end(key)
+        return state
+
+    def remember_streak(self, guild_id: int, user_id: int, state: StreakState) -> None:
+        """Cache a streak state read from the database."""
+        key = (guild_id, user_id)
+        self._streak_state[key] = state
+        self._streak_state.move_to_end(key)
+        while len(self._streak_state) > self.streak_cache_size:
+            self._streak_state.popitem(last=False)
+
+    def set_streak(
+        self, guild_id: int, user_id: int, last_day: date, current_days: int, base_nickname: str | None
+    ) -> None:
+        """Queue a streak write; the latest state per user wins."""
+        key = (guild_id, user_id)
+        state = (last_day, current_days, base_nickname)
+        self.remember_streak(guild_id, user_id, state)
+        if self._full(key, self._streaks):
+            return
+        if key in self._streaks:
+            self.coalesced += 1
+        self._streaks[key] = state
+
+    # -- flushing -----------------------------------------------------------
+
+    async def flush(self, pool: Any) -> int:
+        """Write all pending entries in one transaction; returns rows written.
+
+        On failure the entries are merged back (newer pending writes win) and
+        retried on the next flush.
+        """
+        if pool is None or not self.pending:
+            return 0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            messages, self._messages = self._messages, {}
+            reactions, self._reactions = self._reactions, {}
+            counts, self._challenge_counts = self._challenge_counts, {}
+            streaks, self._streaks = self._streaks, {}
+            if not (messages or reactions or counts or streaks):
+                return 0
+            try:
+                async with pool.acquire() as conn:
+                    async with conn.transaction():
+                        await _write_messages(conn, messages)
+                        await _write_reactions(conn, reactions)
+                        await _write_challenge_counts(conn, counts)
+                        await _write_streaks(conn, streaks)
+            except Exception as exc:
+                self.flush_failures += 1
+                logger.warning(f"[engagement] buffer flush error: {exc}")
+                self._restore(messages, reactions, counts, streaks)
+                return 0
+            written = len(messages) + len(reactions) + len(counts) + len(streaks)
+            self.flushes += 1
+            self.rows_written += written
+            return written
+
+    def _restore(
+        self,
+        messages: dict[tuple[int, int], tuple[int, int, datetime, bool, bool]],
+        reactions: dict[tuple[int, int], int],
+        counts: dict[tuple[int, int], int],
+        streaks: dict[tuple[int, int], StreakState],
+    ) -> None:
+        for key, row in messages.items():
+            self._messages.setdefault(key, row)
+        for key, n in reactions.items():
+            self._reactions[key] = self._reactions.get(key, 0) + n
+        for key, n in counts.items():
+            self._challenge_counts[key] = self._challenge_counts.get(key, 0) + n
+        for key, state in streaks.items():
+            self._streaks.setdefault(key, state)
+        overflow = self.pending - self.max_pending
+        if overflow > 0:
+            # Oldest index rows go first; counters and streaks are cheaper to keep.
+            for key in list(self._messages)[:overflow]:
+                del self._messages[key]
+            self.dropped += overflow
+
+
+async def _write_messages(conn: Any, messages: dict) -> None:
+    if not messages:
+        return
+    keys = list(messages)
+    rows = [messages[k] for k in keys]
+    await conn.execute(
+        """
+        INSERT INTO engagement_weekly_messages
+            (guild_id, message_id, channel_id, user_id, created_at, has_image, is_food)
+        SELECT * FROM unnest(
+            $1::bigint[], $2::bigint[], $3::bigint[], $4::bigint[],
+            $5::timestamptz[], $6::boolean[], $7::boolean[]
+        )
+        ON CONFLICT (guild_id, message_id) DO NOTHING
+        """,
+        [k[0] for k in keys],
+        [k[1] for k in keys],
+        [r[0] for r in rows],
+        [r[1] for r in rows],
+        [r[2] for r in rows],
+        [r[3] for r in rows],
+        [r[4] for r in rows],
+    )
+
+
+async def _write_reactions(conn: Any, reactions: dict[tuple[int, int], int]) -> None:
+    if not reactions:
+        return
+    await conn.execute(
+        """
+        UPDATE engagement_weekly_messages AS m
+        SET reactions_count = m.reactions_count + v.n
+        FROM unnest($1::bigint[], $2::bigint[], $3::int[]) AS v(guild_id, message_id, n)
+        WHERE m.guild_id = v.guild_id AND m.message_id = v.message_id
+        """,
+        [k[0] for k in reactions],
+        [k[1] for k in reactions],
+        list(reactions.values()),
+    )
+
+
+async def _write_challenge_counts(conn: Any, counts: dict[tuple[int, int], int]) -> None:
+    if not counts:
+        return
+    # The EXISTS guard skips challenges deleted since the message was counted,
+    # so one cancelled challenge cannot fail the whole batch on the FK.
+    await conn.execute(
+        """
+        INSERT INTO engagement_participants(challenge_id, user_id, message_count)
+        SELECT v.challenge_id, v.user_id, v.n
+        FROM unnest($1::bigint[], $2::bigint[], $3::int[]) AS v(challenge_id, user_id, n)
+        WHERE EXISTS (SELECT 1 FROM engagement_challenges c WHERE c.id = v.challenge_id)
+        ON CONFLICT (challenge_id, user_id)
+        DO UPDATE SET message_count = engagement_participants.message_count + EXCLUDED.message_count
+        """,
+        [k[0] for k in counts],
+        [k[1] for k in counts],
+        list(counts.values()),
+    )
+
+
+async def _write_streaks(conn: Any, streaks: dict[tuple[int, int], StreakState]) -> None:
+    if not streaks:
+        return
+    keys = list(streaks)
+    states = [streaks[k] for k in keys]
+    await conn.execute(
+        """
+        INSERT INTO engagement_streaks(guild_id, user_id, last_day, current_days, base_nickname)
+        SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::date[], $4::int[], $5::text[])
+        ON CONFLICT (guild_id, user_id) DO UPDATE SET
+            last_day       = EXCLUDED.last_day,
+            current_days   = EXCLUDED.current_days,
+            base_nickname  = CASE
+                WHEN EXCLUDED.base_nickname IS NOT NULL THEN EXCLUDED.base_nickname
+                ELSE engagement_streaks.base_nickname
+            END
+        """,
+        [k[0] for k in keys],
+        [k[1] for k in keys],
+        [s[0] for s in states],
+        [s[1] for s in states],
+        [s[2] for s in states],
+    )
+
+
+# Shared by the engagement cog (writes) and engagement_service (flush before reads).
+engagement_buffer = EngagementWriteBuffer()
@@ -24,6 +24,7 @@ import asyncpg
 import discord
 
 from utils.embed_builder import EmbedBuilder
+from utils.engagement_buffer import engagement_buffer
 from utils.logger import logger
 
 # ---------------------------------------------------------------------------
@@ -90,38 +91,6 @@ async def get_streak(
         return None
 
 
-async def set_streak(
-    pool: asyncpg.Pool,
-    guild_id: int,
-    user_id: int,
-    last_day: date,
-    current_days: int,
-    base_nickname: str | None = None,
-) -> None:
-    try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO engagement_streaks(guild_id, user_id, last_day, current_days, base_nickname)
-                VALUES($1, $2, $3, $4, $5)
-                ON CONFLICT (guild_id, user_id) DO UPDATE SET
-                    last_day       = EXCLUDED.last_day,
-                    current_days   = EXCLUDED.current_days,
-                    base_nickname  = CASE
-                        WHEN EXCLUDED.base_nickname IS NOT NULL THEN EXCLUDED.base_nickname
-                        ELSE engagement_streaks.base_nickname
-                    END
-                """,
-                guild_id,
-                user_id,
-                last_day,
-                current_days,
-                base_nickname,
-            )
-    except Exception as exc:
-        logger.warning(f"[engagement] set_streak error: {exc}")
-
-
 async def ensure_streak_nickname(
     member: discord.Member,
     stored_base: str | None,
@@ -361,6 +330,7 @@ async def challenge_get_top(
         rt = _active_challenges.get(challenge_id, {})
         counts: dict[int, int] = rt.get("message_counts", {})
         return sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+    await engagement_buffer.flush(pool)  # buffered message counts first
     try:
         async with pool.acquire() as conn:
             rows = await conn.fetch(
@@ -385,6 +355,7 @@ async def challenge_get_participants_count(
     if pool is None:
         rt = _active_challenges.get(challenge_id, {})
         return len(rt.get("message_counts", {}))
+    await engagement_buffer.flush(pool)  # buffered message counts first
     try:
         async with pool.acquire() as conn:
             val = await conn.fetchval(
@@ -402,6 +373,7 @@ async def challenge_update_participant_count(
 ) -> None:
     if pool is None:
         return
+    await engagement_buffer.flush(pool)  # buffered message counts first
     try:
         async with pool.acquire() as conn:
             await conn.execute(
@@ -424,6 +396,7 @@ async def challenge_remove_participant(
 ) -> None:
     if pool is None:
         return
+    await engagement_buffer.flush(pool)  # buffered message counts first
     try:
         async with pool.acquire() as conn:
             await conn.execute(
@@ -446,6 +419,7 @@ async def challenge_end(
             return None
         winner_id = max(counts, key=counts.__getitem__)
         return winner_id, counts[winner_id]
+    await engagement_buffer.flush(pool)  # buffered message counts first
     try:
         async with pool.acquire() as conn:
             if mode == "leaderboard":
@@ -793,59 +767,42 @@ async def finalize_and_announce_challenge(
 
 
 # ---------------------------------------------------------------------------
-# Weekly messages indexing
+# Weekly Awards computation
 # ---------------------------------------------------------------------------
 
 
-async def weekly_index_message(
-    pool: asyncpg.Pool,
-    guild_id: int,
-    message_id: int,
-    channel_id: int,
-    user_id: int,
-    created_at_ts: int,
-    has_image: bool,
-    is_food: bool,
-) -> None:
-    try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO engagement_weekly_messages
-                    (guild_id, message_id, channel_id, user_id, created_at, has_image, is_food)
-                VALUES($1, $2, $3, $4, TO_TIMESTAMP($5), $6, $7)
-                ON CONFLICT (guild_id, message_id) DO NOTHING
-                """,
-                guild_id,
-                message_id,
-                channel_id,
-                user_id,
-                created_at_ts,
-                has_image,
-                is_food,
-            )
-    except Exception as exc:
-        logger.warning(f"[engagement] weekly_index_message error: {exc}")
-
-
-async def weekly_increment_reaction(
-    pool: asyncpg.Pool, guild_id: int, message_id: int
-) -> None:
-    try:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE engagement_weekly_messages SET reactions_count = reactions_count + 1 "
-                "WHERE guild_id=$1 AND message_id=$2",
-                guild_id,
-                message_id,
-            )
-    except Exception as exc:
-        logger.warning(f"[engagement] weekly_increment_reaction error: {exc}")
-
-
-# ---------------------------------------------------------------------------
-# Weekly Awards computation
-# ---------------------------------------------------------------------------
+_WEEKLY_FILTERS = ("non_food", "food", "image", "reactions")
+
+# One scan of the guild's week: the CTE is referenced more than once, so
+# Postgres materializes it, and every award filter is aggregated from it
+# with FILTER clauses. Returns at most one winner row per filter.
+_WEEKLY_WINNERS_SQL = """
+    WITH week AS (
+        SELECT user_id, message_id, is_food, has_image, reactions_count
+        FROM engagement_weekly_messages
+        WHERE guild_id=$1 AND created_at >= $2 AND created_at < $3
+    ),
+    per_user AS (
+        SELECT user_id,
+               COUNT(*) FILTER (WHERE NOT is_food) AS non_food,
+               COUNT(*) FILTER (WHERE is_food)     AS food,
+               COUNT(*) FILTER (WHERE has_image)   AS image
+        FROM week
+        GROUP BY user_id
+    )
+    SELECT DISTINCT ON (filter) filter, user_id, cnt, message_id
+    FROM (
+        SELECT 'non_food' AS filter, user_id, non_food AS cnt, NULL::bigint AS message_id
+        FROM per_user WHERE non_food > 0
+        UNION ALL
+        SELECT 'food', user_id, food, NULL FROM per_user WHERE food > 0
+        UNION ALL
+        SELECT 'image', user_id, image, NULL FROM per_user WHERE image > 0
+        UNION ALL
+        SELECT 'reactions', user_id, reactions_count, message_id FROM week WHERE has_image
+    ) candidates
+    ORDER BY filter, cnt DESC NULLS LAST, user_id ASC
+"""
 
 
 async def compute_weekly_awards(
@@ -870,6 +827,7 @@ async def compute_weekly_awards(
     if pool is None:
         logger.warning("[engagement] compute_weekly_awards: no DB pool")
         return
+    await engagement_buffer.flush(pool)  # buffered message index / reactions first
 
     now = datetime.now(UTC)
     weekday = now.weekday()  # Monday = 0
@@ -880,135 +838,63 @@ async def compute_weekly_awards(
     week_start = week_end - timedelta(days=7)
 
     try:
-        # Upsert the week record
+        # Week record, all award winners and their results in one round-trip
+        results: list[dict[str, Any]] = []
         async with pool.acquire() as conn:
-            existing = await conn.fetchrow(
-                "SELECT id FROM engagement_weekly_awards "
-                "WHERE guild_id=$1 AND week_start=$2 AND week_end=$3",
-                guild_id,
-                week_start.date(),
-                week_end.date(),
-            )
-            if existing:
-                week_id = int(existing["id"])
-            else:
-                row = await conn.fetchrow(
-                    "INSERT INTO engagement_weekly_awards(guild_id, week_start, week_end) "
-                    "VALUES($1, $2, $3) RETURNING id",
+            async with conn.transaction():
+                week_id = await conn.fetchval(
+                    """
+                    INSERT INTO engagement_weekly_awards(guild_id, week_start, week_end)
+                    VALUES($1, $2, $3)
+                    ON CONFLICT (guild_id, week_start, week_end)
+                    DO UPDATE SET guild_id = EXCLUDED.guild_id
+                    RETURNING id
+                    """,
                     guild_id,
                     week_start.date(),
                     week_end.date(),
                 )
-                week_id = int(row["id"]) if row else None
-        if week_id is None:
-            logger.error("[engagement] compute_weekly_awards: could not create week record")
-            return
-
-        results: list[dict[str, Any]] = []
-        for cfg in award_configs:
-            award_key: str = cfg["key"]
-            filt: str = cfg.get("filter", "non_food")
-
-            async with pool.acquire() as conn:
-                if filt == "reactions":
-                    row = await conn.fetchrow(
-                        """
-                        SELECT user_id, message_id, reactions_count AS cnt
-                        FROM engagement_weekly_messages
-                        WHERE guild_id=$1 AND created_at >= $2 AND created_at < $3
-                            AND has_image = TRUE
-                        ORDER BY reactions_count DESC NULLS LAST
-                        LIMIT 1
-                        """,
-                        guild_id,
-                        week_start,
-                        week_end,
-                    )
-                elif filt == "food":
-                    row = await conn.fetchrow(
-                        """
-                        SELECT user_id, COUNT(*) AS cnt
-                        FROM engagement_weekly_messages
-                        WHERE guild_id=$1 AND created_at >= $2 AND created_at < $3
-                            AND is_food = TRUE
-                        GROUP BY user_id ORDER BY cnt DESC, user_id ASC LIMIT 1
-                        """,
-                        guild_id,
-                        week_start,
-                        week_end,
-                    )
-                elif filt == "image":
-                    row = await conn.fetchrow(
-                        """
-                        SELECT user_id, COUNT(*) AS cnt
-                        FROM engagement_weekly_messages
-                        WHERE guild_id=$1 AND created_at >= $2 AND created_at < $3
-                            AND has_image = TRUE
-                        GROUP BY user_id ORDER BY cnt DESC, user_id ASC LIMIT 1
-                        """,
-                        guild_id,
-                        week_start,
-                        week_end,
-                    )
-                else:  # non_food (default)
-                    row = await conn.fetchrow(
+                if week_id is None:
+                    logger.error("[engagement] compute_weekly_awards: could not create week record")
+                    return
+
+                winners = {
+                    row["filter"]: row
+                    for row in await conn.fetch(_WEEKLY_WINNERS_SQL, guild_id, week_start, week_end)
+                }
+                # Later configs with the same key win, as with sequential updates
+                by_key: dict[str, dict[str, Any]] = {}
+                for cfg in award_configs:
+                    filt = cfg.get("filter", "non_food")
+                    row = winners.get(filt if filt in _WEEKLY_FILTERS else "non_food")
+                    if not row:
+                        continue
+                    message_id = int(row["message_id"]) if filt == "reactions" and row["message_id"] else None
+                    by_key[cfg["key"]] = {
+                        **cfg,
+                        "user_id": int(row["user_id"]),
+                        "metric": int(row["cnt"]),
+                        "message_id": message_id,
+                    }
+                results = list(by_key.values())
+
+                if results:
+                    await conn.execute(
                         """
-                        SELECT user_id, COUNT(*) AS cnt
-                        FROM engagement_weekly_messages
-                        WHERE guild_id=$1 AND created_at >= $2 AND created_at < $3
-                            AND is_food = FALSE
-                        GROUP BY user_id ORDER BY cnt DESC, user_id ASC LIMIT 1
+                        INSERT INTO engagement_weekly_results
+                            (week_id, award_key, user_id, metric, message_id)
+                        SELECT $1, * FROM unnest($2::text[], $3::bigint[], $4::int[], $5::bigint[])
+                        ON CONFLICT (week_id, award_key) DO UPDATE SET
+                            user_id = EXCLUDED.user_id,
+                            metric = EXCLUDED.metric,
+                            message_id = EXCLUDED.message_id
                         """,
-                        guild_id,
-                        week_start,
-                        week_end,
-                    )
-
-            if not row:
-                continue
-
-            user_id = int(row["user_id"])
-            metric = int(row["cnt"])
-            message_id: int | None = None
-            if filt == "reactions" and row["message_id"]:
-                message_id = int(row["message_id"])
-
-            # Upsert result
-            async with pool.acquire() as conn:
-                existing_r = await conn.fetchrow(
-                    "SELECT id FROM engagement_weekly_results WHERE week_id=$1 AND award_key=$2",
-                    week_id,
-                    award_key,
-                )
-                if existing_r:
-                    await conn.execute(
-                        "UPDATE engagement_weekly_results "
-                        "SET user_id=$3, metric=$4, message_id=$5 "
-                        "WHERE week_id=$1 AND award_key=$2",
-                        week_id,
-                        award_key,
-                        user_id,
-                        metric,
-                        message_id,
+                        int(week_id),
+                        [str(entry["key"]) for entry in results],
+                        [entry["user_id"] for entry in results],
+                        [entry["metric"] for entry in results],
+                        [entry["message_id"] for entry in results],
                     )
-                else:
-                    await conn.execute(
-                        "INSERT INTO engagement_weekly_results"
-                        "(week_id, award_key, user_id, metric, message_id) "
-                        "VALUES($1, $2, $3, $4, $5)",
-                        week_id,
-                        award_key,
-                        user_id,
-                        metric,
-                        message_id,
-                    )
-
-            results.append({
-                **cfg,
-                "user_id": user_id,
-                "metric": metric,
-                "message_id": message_id,
-            })
 
         # Assign roles + badges
         guild: discord.Guild | None = bot.get_guild(guild_id)
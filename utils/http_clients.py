@@ -0,0 +1,95 @@
+"""
+Shared HTTP clients
+
+One long-lived ``httpx.AsyncClient`` per upstream (Supabase REST, Core-API),
+so calls reuse warm keep-alive connections instead of paying a TCP + TLS
+handshake per request. Timeouts are passed per call; pool limits come from
+config (``HTTP_MAX_CONNECTIONS``, ``HTTP_MAX_KEEPALIVE_CONNECTIONS``,
+``HTTP_KEEPALIVE_EXPIRY``). HTTP/2 is used when the ``h2`` package is
+installed.
+
+An ``AsyncClient`` is bound to the event loop that first used it, and the bot
+loop and the API thread's loop both call these upstreams, so clients are kept
+per ``(upstream, loop)`` like the database pools in ``utils.pool_registry``.
+``close_http_clients()`` closes the running loop's clients: the bot calls it in
+shutdown Phase 4 and the API lifespan on exit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Any
+
+import httpx
+
+import config
+
+SUPABASE = "supabase"
+CORE_API = "core_api"
+
+DEFAULT_TIMEOUT = 10.0
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_clients: dict[tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+# upstream -> {"requests": n, "connections_opened": n}
+_stats: dict[str, dict[str, int]] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(getattr(config, "HTTP_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=int(getattr(config, "HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)),
+        keepalive_expiry=float(getattr(config, "HTTP_KEEPALIVE_EXPIRY", 60.0)),
+    )
+
+
+def _counting_hook(upstream: str):
+    stats = _stats.setdefault(upstream, {"requests": 0, "connections_opened": 0})
+
+    async def trace(event: str, _info: dict[str, Any]) -> None:
+        if event == "connection.connect_tcp.complete":
+            stats["connections_opened"] += 1
+
+    async def on_request(request: httpx.Request) -> None:
+        stats["requests"] += 1
+        request.extensions["trace"] = trace
+
+    return on_request
+
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    """Return the running loop's shared client for ``upstream``, creating it on first use."""
+    key = (upstream, asyncio.get_running_loop())
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=_limits(),
+            http2=_HTTP2_AVAILABLE,
+            event_hooks={"request": [_counting_hook(upstream)]},
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close the running loop's shared clients. Call when that loop shuts down."""
+    loop = asyncio.get_running_loop()
+    keys = [key for key in _clients if key[1] is loop]
+    clients = [_clients.pop(key) for key in keys]
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+
+
+def get_http_client_stats() -> dict[str, int]:
+    """Requests sent, connections opened and requests served on a reused connection."""
+    requests = sum(s["requests"] for s in _stats.values())
+    opened = sum(s["connections_opened"] for s in _stats.values())
+    return {
+        "http_client_requests": requests,
+        "http_client_connections_opened": opened,
+        "http_client_connections_reused": max(0, requests - opened),
+    }
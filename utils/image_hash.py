@@ -0,0 +1,57 @@
+"""
+Perceptual image hashing
+
+Difference hash (dHash) over a grayscale, area-averaged grid, decoded with
+PyMuPDF (already a dependency for Drive PDF parsing). Re-encoded, rescaled or
+slightly recompressed copies of an image land within a few bits of each other,
+so ``hamming(a, b)`` gives a cheap near-duplicate test.
+"""
+
+from __future__ import annotations
+
+import pymupdf
+
+HASH_SIZE = 16  # 16x16 comparisons -> 256-bit hash
+_MAX_SIDE = 512  # shrink larger images (by powers of two) before averaging
+
+
+def dhash(data: bytes, hash_size: int = HASH_SIZE) -> int | None:
+    """Return the dHash of an encoded image (PNG, JPEG, ...), or None if it cannot be decoded."""
+    try:
+        pix = pymupdf.Pixmap(data)
+        if pix.alpha:
+            pix = pymupdf.Pixmap(pix, 0)
+        if pix.n != 1:
+            pix = pymupdf.Pixmap(pymupdf.csGRAY, pix)
+        shrink = 0
+        while max(pix.width, pix.height) >> shrink > _MAX_SIDE:
+            shrink += 1
+        if shrink:
+            pix.shrink(shrink)
+    except Exception:
+        return None
+
+    width, height = pix.width, pix.height
+    cols, rows = hash_size + 1, hash_size
+    if width < cols or height < rows:
+        return None
+    samples, stride = pix.samples, pix.stride
+
+    bits = 0
+    for r in range(rows):
+        y0 = r * height // rows
+        y1 = (r + 1) * height // rows
+        means = []
+        for c in range(cols):
+            x0 = c * width // cols
+            x1 = (c + 1) * width // cols
+            total = sum(sum(samples[y * stride + x0 : y * stride + x1]) for y in range(y0, y1))
+            means.append(total / ((y1 - y0) * (x1 - x0)))
+        for c in range(hash_size):
+            bits = (bits << 1) | (means[c] < means[c + 1])
+    return bits
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
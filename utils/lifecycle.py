@@ -173,12 +173,14 @@ class StartupManager:
         """Phase 4: Sync command tree."""
         logger.info("🔄 Phase 4: Command Sync...")
         
-        from utils.command_sync import detect_guild_only_commands, safe_sync, should_sync_global
+        from utils.command_sync import detect_guild_only_commands, safe_sync, should_sync_global, sync_guilds
         
         # Sync global commands once (if needed)
         if should_sync_global():
             global_result = await safe_sync(self.bot, guild=None, force=False)
-            if global_result.success:
+            if global_result.unchanged:
+                logger.info(f"  ⏭️ Global commands unchanged ({global_result.command_count}), sync skipped")
+            elif global_result.success:
                 logger.info(f"  ✅ Global commands synced: {global_result.command_count} commands")
             else:
                 logger.warning(f"  ⚠️ Global sync skipped: {global_result.error}")
@@ -189,11 +191,11 @@ class StartupManager:
         has_guild_only = detect_guild_only_commands(self.bot)
         if has_guild_only:
             logger.info("  🔄 Syncing guild-only commands for existing guilds...")
-            # Run guild syncs in parallel for faster startup
-            sync_tasks = [safe_sync(self.bot, guild=guild, force=False) for guild in self.bot.guilds]
-            results = await asyncio.gather(*sync_tasks, return_exceptions=True)
+            # Run guild syncs in parallel (bounded) for faster startup; unchanged guilds are skipped
+            results = await sync_guilds(self.bot, self.bot.guilds, force=False)
             
             synced_count = 0
+            unchanged_count = 0
             skipped_count = 0
             for i, result in enumerate(results):
                 guild = self.bot.guilds[i]
@@ -208,7 +210,9 @@ class StartupManager:
                     )
                 elif isinstance(result, SyncResult):
                     # Type narrowing: result is SyncResult here
-                    if result.success:
+                    if result.unchanged:
+                        unchanged_count += 1
+                    elif result.success:
                         synced_count += 1
                         log_operational_event(
                             EventType.GUILD_SYNC,
@@ -237,7 +241,7 @@ class StartupManager:
                     # Unexpected type
                     logger.warning(f"  ⚠️ Unexpected result type for {guild.name}: {type(result)}")
                     skipped_count += 1
-            logger.info(f"  ✅ Guild syncs completed: {synced_count} synced, {skipped_count} skipped")
+            logger.info(f"  ✅ Guild syncs completed: {synced_count} synced, {unchanged_count} unchanged, {skipped_count} skipped")
         else:
             logger.debug("  ℹ️ No guild-only commands detected")
         
@@ -253,20 +257,14 @@ class StartupManager:
         # Initialize command tracker with database pool in bot's event loop
         try:
             from utils.command_tracker import _db_pool, set_db_pool, start_flush_task
-            from utils.db_helpers import create_db_pool
+            from utils.pool_registry import get_subsystem_pool
             
             # Only create new pool if we don't have one or it's closing
             if _db_pool is None or _db_pool.is_closing():
                 database_url = getattr(config, "DATABASE_URL", None)
                 if not database_url:
                     raise RuntimeError("DATABASE_URL is not set in config")
-                command_tracker_pool = await create_db_pool(
-                    database_url,
-                    name="command_tracker",
-                    min_size=1,
-                    max_size=5,
-                    command_timeout=10.0
-                )
+                command_tracker_pool = await get_subsystem_pool("command_tracker")
                 set_db_pool(command_tracker_pool)
                 logger.info("  ✅ Command tracker: Database pool initialized")
             else:
@@ -288,6 +286,14 @@ class StartupManager:
         except Exception as e:
             logger.warning(f"  ⚠️ Failed to start Grok retry task: {e}")
         
+        # Start GPT quota counter flush task
+        try:
+            from utils.premium_guard import start_gpt_quota_flush_task
+            start_gpt_quota_flush_task()
+            logger.info("  ✅ GPT quota flush task started")
+        except Exception as e:
+            logger.warning(f"  ⚠️ Failed to start GPT quota flush task: {e}")
+        
         # Start sync cooldowns cleanup task
         try:
             from utils.background_tasks import BackgroundTask
@@ -373,13 +379,15 @@ class StartupManager:
         logger.info("🔄 Reconnect phase: Resyncing commands...")
         logger.info("  😄 haha bot dropped the call, morgen lachen we er weer mee")
         
-        from utils.command_sync import detect_guild_only_commands, safe_sync
+        from utils.command_sync import detect_guild_only_commands, safe_sync, sync_guilds
         
         # After a disconnect, commands may not be available until synced
         # Sync global commands first (if needed and not on cooldown)
         logger.info("  🔄 Checking if global commands need resync...")
         global_result = await safe_sync(bot, guild=None, force=False)
-        if global_result.success:
+        if global_result.unchanged:
+            logger.info(f"  ⏭️ Global commands unchanged ({global_result.command_count}), resync skipped")
+        elif global_result.success:
             logger.info(f"  ✅ Global commands resynced: {global_result.command_count} commands")
         elif global_result.cooldown_remaining:
             logger.debug(f"  ⏸️ Global sync on cooldown (wait {global_result.cooldown_remaining:.0f}s)")
@@ -388,12 +396,12 @@ class StartupManager:
         
         # Sync guild-only commands for all guilds (if we have them)
         synced_count = 0
+        unchanged_count = 0
         skipped_count = 0
         has_guild_only = detect_guild_only_commands(bot)
         if has_guild_only:
             logger.info(f"  🔄 Resyncing guild-only commands for {len(bot.guilds)} guilds...")
-            sync_tasks = [safe_sync(bot, guild=guild, force=False) for guild in bot.guilds]
-            results = await asyncio.gather(*sync_tasks, return_exceptions=True)
+            results = await sync_guilds(bot, bot.guilds, force=False)
 
             for i, result in enumerate(results):
                 guild = bot.guilds[i]
@@ -408,7 +416,9 @@ class StartupManager:
                     )
                 elif isinstance(result, SyncResult):
                     # Type narrowing: result is SyncResult here
-                    if result.success:
+                    if result.unchanged:
+                        unchanged_count += 1
+                    elif result.success:
                         synced_count += 1
                         log_operational_event(
                             EventType.GUILD_SYNC,
@@ -438,7 +448,7 @@ class StartupManager:
                     logger.warning(f"  ⚠️ Unexpected result type for {guild.name}: {type(result)}")
                     skipped_count += 1
 
-            logger.info(f"  ✅ Guild syncs completed: {synced_count} synced, {skipped_count} skipped")
+            logger.info(f"  ✅ Guild syncs completed: {synced_count} synced, {unchanged_count} unchanged, {skipped_count} skipped")
         else:
             logger.debug("  ℹ️ No guild-only commands detected")
 
@@ -448,7 +458,7 @@ class StartupManager:
             EventType.BOT_RECONNECT,
             "Reconnect phase complete: commands synced",
             guild_id=None,
-            details={"synced": synced_count, "skipped": skipped_count},
+            details={"synced": synced_count, "unchanged": unchanged_count, "skipped": skipped_count},
         )
 
 
@@ -505,6 +515,14 @@ class ShutdownManager:
         except Exception as e:
             logger.debug(f"  ⚠️ Error cancelling Grok retry task: {e}")
         
+        # Stop GPT quota flush task (final flush needs the premium pool, closed in Phase 3)
+        try:
+            from utils.premium_guard import stop_gpt_quota_flush_task
+            await stop_gpt_quota_flush_task()
+            logger.info("  ✅ GPT quota counters flushed")
+        except Exception as e:
+            logger.debug(f"  ⚠️ Error flushing GPT quota counters: {e}")
+        
         # Stop sync cooldowns cleanup task
         try:
             cleanup_task = getattr(self.bot, '_sync_cooldown_cleanup_task', None)
@@ -539,9 +557,13 @@ class ShutdownManager:
         """Phase 3: Close all database pools."""
         logger.info("🔌 Phase 3: Closing database pools...")
         
-        # Close SettingsService pool
+        # Close SettingsService pool (and its change-listener connection)
         try:
             settings = getattr(self.bot, "settings", None)
+            if settings and hasattr(settings, "stop_change_listener"):
+                await settings.stop_change_listener()
+            if settings and getattr(settings, "_bot_pool", None):
+                await settings._bot_pool.close()
             if settings and hasattr(settings, "_pool") and settings._pool:
                 await settings._pool.close()
                 logger.info("  ✅ SettingsService pool closed")
@@ -570,12 +592,27 @@ class ShutdownManager:
         """Phase 4: Final cleanup."""
         logger.info("🧹 Phase 4: Final cleanup...")
 
-        # Close shared HTTP client (premium guard Core-API calls)
+        # Close shared HTTP clients (Supabase REST, Core-API)
+        try:
+            from utils.http_clients import close_http_clients
+            await close_http_clients()
+            logger.info("  ✅ Shared HTTP clients closed")
+        except Exception as e:
+            logger.debug(f"  ⚠️ Error closing shared HTTP clients: {e}")
+
+        # Close the LLM client's keep-alive connection pool
+        try:
+            from gpt.helpers import close_llm_client
+            await close_llm_client()
+            logger.info("  ✅ LLM HTTP client closed")
+        except Exception as e:
+            logger.debug(f"  ⚠️ Error closing LLM HTTP client: {e}")
+
+        # Write queued operational events to the spill file
         try:
-            from utils.premium_guard import close_http_client
-            await close_http_client()
-            logger.info("  ✅ Premium guard HTTP client closed")
+            from utils.operational_logs import close_operational_event_log
+            close_operational_event_log()
         except Exception as e:
-            logger.debug(f"  ⚠️ Error closing premium guard HTTP client: {e}")
+            logger.debug(f"  ⚠️ Error closing operational event log: {e}")
 
         logger.info("✅ Phase 4 complete: Final cleanup done")
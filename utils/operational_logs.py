@@ -1,13 +1,32 @@
-"""In-memory buffer for operational events (reconnect, disconnect, etc.) exposed via API."""
+"""In-memory store for operational events (reconnect, disconnect, etc.) exposed via API.
 
+Events are copied when written and kept in a bounded ring with secondary
+indexes by guild and event type, so dashboard polls only walk the events they
+can return. When ``OPERATIONAL_EVENTS_LOG_PATH`` is set, events are also
+appended to a local JSON-lines file and reloaded on startup; a background
+thread owns the file, so writers never wait on disk I/O.
+"""
+
+import heapq
+import json
+import logging
+import os
+import queue
+import threading
 from collections import deque
+from collections.abc import Iterable, Iterator
 from datetime import UTC, datetime
 from enum import StrEnum
 from typing import Any
 
-MAX_OPERATIONAL_EVENTS = 100
+import config
+
+logger = logging.getLogger(__name__)
 
-_operational_events: deque[dict[str, Any]] = deque(maxlen=MAX_OPERATIONAL_EVENTS)
+MAX_OPERATIONAL_EVENTS = 5000
+# The spill file is compacted to the newest MAX_OPERATIONAL_EVENTS lines once
+# it holds this many times as many.
+_COMPACT_FACTOR = 2
 
 
 def _normalize_event_type_and_details(event_type: str, details: dict[str, Any]) -> tuple[str, dict[str, Any]]:
@@ -26,7 +45,7 @@ def _push_to_core_ingress(event: dict[str, Any]) -> None:
         from utils.core_ingress import enqueue_operational_event
 
         serialized = {
-            "timestamp": event["timestamp"].isoformat() if hasattr(event["timestamp"], "isoformat") else event["timestamp"],
+            "timestamp": event["timestamp"],
             "event_type": event["event_type"],
             "guild_id": event.get("guild_id"),
             "message": event["message"],
@@ -48,6 +67,230 @@ class EventType(StrEnum):
     COG_ERROR = "COG_ERROR"
 
 
+class _SpillWriter:
+    """Appends serialized events to the spill file from a daemon thread.
+
+    The thread keeps one append handle open and remembers the newest
+    ``keep`` lines, so compaction rewrites the file from its own copy
+    without touching the store or its lock.
+    """
+
+    def __init__(self, path: str, keep: int, recent: Iterable[str] = (), lines: int = 0):
+        self.path = path
+        self.keep = keep
+        self._recent: deque[str] = deque(recent, maxlen=keep)
+        self._lines = lines
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._fh: Any = None
+        self._thread = threading.Thread(target=self._run, name="operational-events-spill", daemon=True)
+        self._thread.start()
+
+    def put(self, line: str) -> None:
+        self._queue.put(line)
+
+    def flush(self) -> None:
+        """Block until every queued line has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            line = self._queue.get()
+            try:
+                if line is None:
+                    if self._fh is not None:
+                        self._fh.close()
+                        self._fh = None
+                    return
+                self._write(line)
+            except OSError as exc:
+                logger.debug("Could not append operational event to %s: %s", self.path, exc)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, line: str) -> None:
+        self._recent.append(line)
+        if self._lines >= self.keep * _COMPACT_FACTOR:
+            self._compact()  # the rewrite already includes ``line``
+            return
+        if self._fh is None:
+            self._fh = open(self.path, "a", encoding="utf-8")  # noqa: SIM115 - held open by the writer thread
+        self._fh.write(line)
+        self._fh.flush()
+        self._lines += 1
+
+    def _compact(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.writelines(self._recent)
+        os.replace(tmp_path, self.path)
+        self._lines = len(self._recent)
+
+
+class OperationalEventStore:
+    """Bounded ring of serialized events with per-guild and per-type indexes.
+
+    Every event gets an increasing ``id``; indexes hold ids in insertion order,
+    so eviction pops the oldest id from each and lookups walk newest first.
+    ``before`` (an event id) pages backwards through older events. Access is
+    locked because the API thread reads while the bot thread writes.
+    """
+
+    def __init__(self, max_events: int = MAX_OPERATIONAL_EVENTS, spill_path: str | None = None):
+        self.max_events = max_events
+        self.spill_path = spill_path or None
+        self._events: dict[int, dict[str, Any]] = {}
+        self._order: deque[int] = deque()
+        self._by_guild: dict[int | None, deque[int]] = {}
+        self._by_type: dict[str, deque[int]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._writer: _SpillWriter | None = None
+
+    # -- writing ------------------------------------------------------------
+
+    def _insert(self, event: dict[str, Any]) -> None:
+        event_id = event["id"]
+        self._events[event_id] = event
+        self._order.append(event_id)
+        self._by_guild.setdefault(event.get("guild_id"), deque()).append(event_id)
+        self._by_type.setdefault(event["event_type"], deque()).append(event_id)
+        self._next_id = max(self._next_id, event_id + 1)
+        while len(self._order) > self.max_events:
+            self._evict(self._order.popleft())
+
+    def _evict(self, event_id: int) -> None:
+        event = self._events.pop(event_id)
+        for index, key in ((self._by_guild, event.get("guild_id")), (self._by_type, event["event_type"])):
+            ids = index[key]
+            ids.popleft()
+            if not ids:
+                del index[key]
+
+    def append(self, timestamp: str, event_type: str, guild_id: int | None, message: str, details: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            self._load()
+            event = {
+                "id": self._next_id,
+                "timestamp": timestamp,
+                "event_type": event_type,
+                "guild_id": guild_id,
+                "message": message,
+                # Copy so later changes to the caller's dict do not reach the store
+                "details": dict(details),
+            }
+            self._insert(event)
+            if self._writer is not None:
+                self._writer.put(json.dumps(event, default=str) + "\n")
+            return event
+
+    # -- spill file ---------------------------------------------------------
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.spill_path:
+            return
+        lines: deque[str] = deque()
+        if os.path.exists(self.spill_path):
+            try:
+                with open(self.spill_path, encoding="utf-8") as fh:
+                    lines = deque(fh, maxlen=self.max_events * _COMPACT_FACTOR)
+            except OSError as exc:
+                logger.warning("Could not read operational events file %s: %s", self.spill_path, exc)
+        recent = []
+        for line in lines:
+            try:
+                event = json.loads(line)
+                if event["id"] >= self._next_id:
+                    self._insert(event)
+                    recent.append(line if line.endswith("\n") else line + "\n")
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._writer = _SpillWriter(self.spill_path, self.max_events, recent[-self.max_events:], len(lines))
+
+    def flush(self) -> None:
+        """Wait until queued events have reached the spill file."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Flush and close the spill file (shutdown)."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+            self._loaded = False
+        if writer is not None:
+            writer.close()
+
+    # -- reading ------------------------------------------------------------
+
+    def _newest_first(self, streams: Iterable[deque[int]], before: int | None) -> Iterator[int]:
+        iterators = []
+        for ids in streams:
+            it = reversed(ids)
+            if before is not None:
+                it = (event_id for event_id in it if event_id < before)
+            iterators.append(it)
+        if len(iterators) == 1:
+            return iterators[0]
+        return heapq.merge(*iterators, reverse=True)
+
+    def query(
+        self,
+        guild_id: int | None = None,
+        limit: int = 50,
+        event_types: list[str] | None = None,
+        before: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Return (events newest first, cursor for the next page or None)."""
+        with self._lock:
+            self._load()
+            types = set(event_types) if event_types else None
+            if guild_id is not None:
+                # Guild events plus global events, filtered by type while walking
+                streams = [self._by_guild.get(guild_id, ()), self._by_guild.get(None, ())]
+            elif types is not None:
+                streams = [self._by_type.get(t, ()) for t in types]
+                types = None
+            else:
+                streams = [self._order]
+            result: list[dict[str, Any]] = []
+            for event_id in self._newest_first(streams, before):
+                event = self._events[event_id]
+                if types is not None and event["event_type"] not in types:
+                    continue
+                if len(result) == limit:
+                    return result, result[-1]["id"]
+                result.append(event)
+            return result, None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+            self._order.clear()
+            self._by_guild.clear()
+            self._by_type.clear()
+
+
+_store = OperationalEventStore(
+    max_events=int(getattr(config, "OPERATIONAL_EVENTS_MAX", MAX_OPERATIONAL_EVENTS)),
+    spill_path=getattr(config, "OPERATIONAL_EVENTS_LOG_PATH", "") or None,
+)
+
+
+def close_operational_event_log() -> None:
+    """Flush pending events to the spill file and close it. Call during shutdown."""
+    _store.close()
+
+
 def log_operational_event(
     event_type: EventType | str,
     message: str,
@@ -70,14 +313,13 @@ def log_operational_event(
         details or {},
     )
 
-    event = {
-        "timestamp": datetime.now(UTC),
-        "event_type": normalized_event_type,
-        "guild_id": guild_id,
-        "message": message,
-        "details": normalized_details,
-    }
-    _operational_events.appendleft(event)
+    event = _store.append(
+        datetime.now(UTC).isoformat(),
+        normalized_event_type,
+        guild_id,
+        message,
+        normalized_details,
+    )
     _push_to_core_ingress(event)
 
 
@@ -85,44 +327,37 @@ def get_operational_events(
     guild_id: int | None = None,
     limit: int = 50,
     event_types: list[str] | None = None,
+    before: int | None = None,
 ) -> list[dict[str, Any]]:
     """
-    Get operational events from the buffer, optionally filtered.
+    Get operational events from the store, optionally filtered.
 
     Events are included if:
     - guild_id is None (global event), OR
     - event's guild_id matches the requested guild_id.
 
-    Returns events sorted newest first, limited to `limit`.
+    Returns events sorted newest first, limited to `limit`; `before` (an event
+    id) returns the page of events older than it.
     """
+    return query_operational_events(guild_id, limit, event_types, before)[0]
+
+
+def query_operational_events(
+    guild_id: int | None = None,
+    limit: int = 50,
+    event_types: list[str] | None = None,
+    before: int | None = None,
+) -> tuple[list[dict[str, Any]], int | None]:
+    """Like ``get_operational_events`` but also returns the cursor for the next page."""
     # Validate event_types against known EventType values to prevent abuse
     valid_event_types = {e.value for e in EventType}
     if event_types:
         event_types = [t for t in event_types if t in valid_event_types]
         # If user requested types but all were invalid, return no events
         if not event_types:
-            return []
-    
-    filtered: list[dict[str, Any]] = []
-    for event in _operational_events:
-        if event_types and event["event_type"] not in event_types:
-            continue
-        ev_guild = event.get("guild_id")
-        if ev_guild is not None and guild_id is not None and ev_guild != guild_id:
-            continue
-        # Include global events (ev_guild is None) for any guild request
-        filtered.append(event)
-        if len(filtered) >= limit:
-            break
-
-    # Serialize for JSON (datetime -> ISO string)
-    result: list[dict[str, Any]] = []
-    for e in filtered:
-        result.append({
-            "timestamp": e["timestamp"].isoformat(),
-            "event_type": e["event_type"],
-            "guild_id": e.get("guild_id"),
-            "message": e["message"],
-            "details": e.get("details") or {},
-        })
-    return result
+            return [], None
+    if limit <= 0:
+        return [], None
+    events, next_cursor = _store.query(guild_id, limit, event_types, before)
+    # Events are stored JSON-ready; copy so callers cannot mutate the store
+    return [dict(e, details=dict(e["details"] or {})) for e in events], next_cursor
@@ -0,0 +1,269 @@
+"""
+Shared database pool registry
+
+Subsystems (settings, command tracker, premium guard, each cog's
+DatabaseManager, the API) used to open their own asyncpg pools, and every one
+kept idle connections open against Postgres ``max_connections``. The registry
+keeps one physical pool per event loop (the bot loop and the API thread's
+loop), created through ``create_db_pool``, and hands each subsystem a
+``SubsystemPool``: a pool-like handle whose ``acquire()`` is limited by a
+per-subsystem concurrency quota. Wait time, hold time and saturation are
+recorded per subsystem.
+
+Config:
+- ``DB_POOL_MAX_SIZE`` / ``DB_POOL_MIN_SIZE``: physical pool size per event loop.
+- ``DB_POOL_IDLE_TIMEOUT``: seconds before an idle physical connection is closed.
+- ``DB_POOL_COMMAND_TIMEOUT``: default statement timeout in seconds.
+- ``DB_POOL_DEFAULT_QUOTA`` / ``DB_POOL_QUOTAS`` (``"settings=6,api=8"``):
+  concurrent connections a subsystem may hold on each loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import asyncpg
+from asyncpg import exceptions as pg_exceptions
+
+import config
+from utils.db_helpers import create_db_pool
+from utils.logger import logger
+
+_DEFAULT_QUOTA = 3
+# Subsystems with known heavier or lighter traffic; everything else gets the default
+_DEFAULT_QUOTAS: dict[str, int] = {
+    # Cogs' shared handle (get_bot_db_pool): most bot traffic, the old dedicated pool had max_size=10
+    "bot": 10,
+    "settings": 6,
+    "api": 8,
+    "command_tracker": 2,
+    "premium": 3,
+    "app_reflections": 2,
+}
+
+
+def _parse_quotas(raw: str) -> dict[str, int]:
+    quotas: dict[str, int] = {}
+    for part in (raw or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            quotas[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid DB_POOL_QUOTAS entry: %r", part)
+    return quotas
+
+
+def _quota_for(name: str) -> int:
+    overrides = _parse_quotas(getattr(config, "DB_POOL_QUOTAS", ""))
+    if name in overrides:
+        return overrides[name]
+    return _DEFAULT_QUOTAS.get(name, int(getattr(config, "DB_POOL_DEFAULT_QUOTA", _DEFAULT_QUOTA)))
+
+
+class SubsystemPool:
+    """
+    Logical sub-pool: a concurrency quota on top of the shared physical pool.
+
+    Supports the subset of the ``asyncpg.Pool`` API the codebase uses
+    (``acquire()``, ``is_closing()``, ``close()``, ``get_size()``), so it can be
+    passed to ``acquire_safe`` and stored wherever a pool was stored before.
+    The quota applies per event loop. ``close()`` only retires this handle;
+    physical connections are closed by ``close_all_pools()``.
+    """
+
+    def __init__(self, registry: PoolRegistry, name: str, quota: int):
+        self.name = name
+        self.quota = quota
+        self._registry = registry
+        self._closed = False
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self._stats: dict[str, float] = {
+            "acquisitions": 0,
+            "saturated": 0,
+            "in_use": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "hold_ms_total": 0.0,
+            "hold_ms_max": 0.0,
+        }
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.quota))
+        return semaphore
+
+    @asynccontextmanager
+    async def acquire(self, *, timeout: float | None = None) -> AsyncGenerator[Any, None]:
+        if self.is_closing():
+            raise pg_exceptions.InterfaceError(f"pool '{self.name}' is closing")
+        semaphore = self._semaphore(asyncio.get_running_loop())
+        saturated = semaphore.locked()
+        start = time.perf_counter()
+        async with semaphore:
+            pool = await self._registry.physical_pool()
+            async with pool.acquire(timeout=timeout) as conn:
+                acquired = time.perf_counter()
+                self._record_acquire((acquired - start) * 1000, saturated)
+                try:
+                    yield conn
+                finally:
+                    self._record_release((time.perf_counter() - acquired) * 1000)
+
+    def _record_acquire(self, wait_ms: float, saturated: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["acquisitions"] += 1
+            stats["in_use"] += 1
+            stats["saturated"] += int(saturated)
+            stats["wait_ms_total"] += wait_ms
+            stats["wait_ms_max"] = max(stats["wait_ms_max"], wait_ms)
+
+    def _record_release(self, hold_ms: float) -> None:
+        with self._lock:
+            stats = self._stats
+            stats["in_use"] -= 1
+            stats["hold_ms_total"] += hold_ms
+            stats["hold_ms_max"] = max(stats["hold_ms_max"], hold_ms)
+
+    def is_closing(self) -> bool:
+        return self._closed or self._registry.is_closing()
+
+    async def close(self) -> None:
+        self._closed = True
+        self._registry.forget(self)
+
+    def get_size(self) -> int:
+        return self._registry.get_size()
+
+    def get_max_size(self) -> int:
+        return self.quota
+
+    def get_stats(self) -> dict[str, float]:
+        """Counters plus derived averages and saturation (share of acquisitions that had to wait for quota)."""
+        with self._lock:
+            stats = dict(self._stats)
+        acquisitions = stats["acquisitions"] or 1
+        stats["quota"] = self.quota
+        stats["wait_ms_avg"] = round(stats["wait_ms_total"] / acquisitions, 2)
+        stats["hold_ms_avg"] = round(stats["hold_ms_total"] / acquisitions, 2)
+        stats["saturation"] = round(stats["saturated"] / acquisitions, 4)
+        for key in ("wait_ms_total", "wait_ms_max", "hold_ms_total", "hold_ms_max"):
+            stats[key] = round(stats[key], 2)
+        return stats
+
+
+class PoolRegistry:
+    """One physical pool per event loop, shared by named subsystem pools."""
+
+    def __init__(self) -> None:
+        self._physical: dict[asyncio.AbstractEventLoop, asyncpg.Pool] = {}
+        self._creating: dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        self._subsystems: dict[str, SubsystemPool] = {}
+        self._retired_stats: dict[str, SubsystemPool] = {}
+        self._lock = threading.Lock()
+
+    def subsystem(self, name: str, quota: int | None = None) -> SubsystemPool:
+        """Return the live handle for ``name``, creating it if needed (does not connect)."""
+        with self._lock:
+            handle = self._subsystems.get(name)
+            if handle is None or handle._closed:
+                handle = SubsystemPool(self, name, quota or _quota_for(name))
+                self._subsystems[name] = handle
+                self._retired_stats.pop(name, None)
+            return handle
+
+    def forget(self, handle: SubsystemPool) -> None:
+        with self._lock:
+            if self._subsystems.get(handle.name) is handle:
+                del self._subsystems[handle.name]
+                # Keep the counters visible until the subsystem comes back
+                self._retired_stats[handle.name] = handle
+
+    async def physical_pool(self) -> asyncpg.Pool:
+        """Return the shared pool for the running loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        pool = self._physical.get(loop)
+        if pool is not None and not pool.is_closing():
+            return pool
+        with self._lock:
+            creating = self._creating.setdefault(loop, asyncio.Lock())
+        async with creating:
+            pool = self._physical.get(loop)
+            if pool is not None and not pool.is_closing():
+                return pool
+            dsn = getattr(config, "DATABASE_URL", None) or ""
+            if not dsn:
+                raise RuntimeError("DATABASE_URL is not set in config")
+            pool = await create_db_pool(
+                dsn,
+                name=f"shared:{threading.current_thread().name}",
+                min_size=int(getattr(config, "DB_POOL_MIN_SIZE", 1)),
+                max_size=int(getattr(config, "DB_POOL_MAX_SIZE", 15)),
+                command_timeout=float(getattr(config, "DB_POOL_COMMAND_TIMEOUT", 30.0)),
+                max_inactive_connection_lifetime=float(getattr(config, "DB_POOL_IDLE_TIMEOUT", 60.0)),
+                server_settings={"application_name": "alphapy_bot"},
+            )
+            self._physical[loop] = pool
+            return pool
+
+    def is_closing(self) -> bool:
+        """True when the running loop's physical pool exists and is closing."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        pool = self._physical.get(loop)
+        return pool is not None and pool.is_closing()
+
+    def get_size(self) -> int:
+        try:
+            pool = self._physical.get(asyncio.get_running_loop())
+        except RuntimeError:
+            pool = None
+        return pool.get_size() if pool is not None else 0
+
+    async def close_loop_pool(self) -> None:
+        """Close the running loop's physical pool (e.g. when the API thread shuts down)."""
+        loop = asyncio.get_running_loop()
+        pool = self._physical.pop(loop, None)
+        self._creating.pop(loop, None)
+        if pool is not None and not pool.is_closing():
+            await pool.close()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            handles = {**self._retired_stats, **self._subsystems}
+        return {name: handle.get_stats() for name, handle in sorted(handles.items())}
+
+
+_registry = PoolRegistry()
+
+
+async def get_subsystem_pool(name: str, quota: int | None = None) -> SubsystemPool:
+    """
+    Return the pool handle for a subsystem, making sure the shared pool for the
+    running loop exists (so connection errors surface here, as with create_db_pool).
+    """
+    handle = _registry.subsystem(name, quota)
+    await _registry.physical_pool()
+    return handle
+
+
+async def close_loop_pool() -> None:
+    """Close the shared physical pool of the running event loop."""
+    await _registry.close_loop_pool()
+
+
+def get_pool_stats() -> dict[str, dict[str, float]]:
+    """Per-subsystem acquisitions, wait/hold times (ms) and saturation."""
+    return _registry.stats()
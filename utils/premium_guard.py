@@ -2,42 +2,124 @@
 Premium tier guard: check if a user has premium in a guild.
 
 Uses Core-API /premium/verify when configured, with local premium_subs table
-as fallback. In-memory cache with TTL to reduce load.
+as fallback. In-memory cache with TTL to reduce load: positive results live for
+PREMIUM_CACHE_TTL_SECONDS, negative results for the shorter
+PREMIUM_NEGATIVE_CACHE_TTL_SECONDS. prefetch_premium() warms the cache for many
+users at once.
 Fail closed: on error returns False.
 """
 
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
+from collections.abc import Hashable, Iterable
+from datetime import UTC, date, datetime
 from typing import Any
 
-import asyncpg
-import httpx
-
 try:
     import config_local as config  # type: ignore
 except ImportError:
     import config  # type: ignore
 
-from utils.db_helpers import acquire_safe, create_db_pool
+from utils.db_helpers import acquire_safe
+from utils.http_clients import CORE_API, get_http_client
 from utils.logger import logger
+from utils.pool_registry import SubsystemPool, get_subsystem_pool
 
 CORE_VERIFY_TIMEOUT = 5.0
 _DEFAULT_CACHE_TTL = 300  # seconds
+_DEFAULT_NEGATIVE_CACHE_TTL = 60  # seconds
+_CACHE_STRIPES = 16
+# Core /premium/verify calls in flight at once during prefetch_premium
+_PREFETCH_CORE_CONCURRENCY = 8
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries", "by_owner")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # key -> (value, expires_at)
+        self.entries: dict[Hashable, tuple[Any, float]] = {}
+        # owner -> keys, so one user's entries can be dropped without a scan
+        self.by_owner: dict[int, set[Hashable]] = {}
 
-# (user_id, guild_id) -> (is_premium: bool, expires_at: float)
-# Lock protects _cache across bot thread (is_premium/_set_cache) and webhook thread (invalidate_premium_cache).
-# Also used to serialise _stats_* counter increments (avoids a separate lock).
-_cache: dict[tuple[int, int], tuple[bool, float]] = {}
-_guild_cache: dict[int, tuple[bool, float]] = {}
-_cache_lock = threading.Lock()
-_pool: asyncpg.Pool | None = None
 
-# Persistent HTTP client — reused across all Core-API calls to avoid per-call TCP handshakes.
-_http_client: httpx.AsyncClient | None = None
+class _StripedCache:
+    """
+    TTL cache split into independently locked stripes, chosen by owner id.
+
+    Reads take no lock: a dict lookup and expiry check are safe under the GIL.
+    Writes and invalidation lock only the owner's stripe, so the webhook thread
+    invalidating one user never blocks lookups for others.
+    """
 
-# Optional counters for observability (incremented in is_premium)
+    def __init__(self, stripes: int = _CACHE_STRIPES) -> None:
+        self._stripes = [_Stripe() for _ in range(stripes)]
+
+    def _stripe(self, owner: int) -> _Stripe:
+        return self._stripes[hash(owner) % len(self._stripes)]
+
+    def get(self, owner: int, key: Hashable) -> Any | None:
+        stripe = self._stripe(owner)
+        item = stripe.entries.get(key)
+        if item is None:
+            return None
+        if time.monotonic() > item[1]:
+            with stripe.lock:
+                if stripe.entries.get(key) is item:
+                    self._remove(stripe, owner, key)
+            return None
+        return item[0]
+
+    def set(self, owner: int, key: Hashable, value: Any, ttl: float) -> None:
+        stripe = self._stripe(owner)
+        with stripe.lock:
+            stripe.entries[key] = (value, time.monotonic() + ttl)
+            stripe.by_owner.setdefault(owner, set()).add(key)
+
+    def pop(self, owner: int, key: Hashable) -> None:
+        stripe = self._stripe(owner)
+        with stripe.lock:
+            self._remove(stripe, owner, key)
+
+    def pop_owner(self, owner: int) -> None:
+        stripe = self._stripe(owner)
+        with stripe.lock:
+            for key in stripe.by_owner.pop(owner, ()):
+                stripe.entries.pop(key, None)
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.by_owner.clear()
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    @staticmethod
+    def _remove(stripe: _Stripe, owner: int, key: Hashable) -> None:
+        stripe.entries.pop(key, None)
+        keys = stripe.by_owner.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del stripe.by_owner[owner]
+
+
+# (user_id, guild_id) -> (is_premium, local status dict or None), owned by user_id.
+# The status dict (premium/tier/expires_at) is only present once the local
+# premium_subs row was read, so get_premium_status() can be served from cache.
+_cache = _StripedCache()
+# guild_id -> has any active subscription, owned by guild_id
+_guild_cache = _StripedCache()
+_pool: SubsystemPool | None = None
+
+# Optional counters for observability. Incremented without a lock, so they are
+# approximate when the API thread and bot thread check at the same time.
 _stats_total = 0
 _stats_cache_hits = 0
 _stats_core_api = 0
@@ -47,22 +129,6 @@ _stats_guild_cache_hits = 0
 _stats_guild_cache_misses = 0
 
 
-def _get_http_client() -> httpx.AsyncClient:
-    """Return the shared AsyncClient, creating it on first call."""
-    global _http_client
-    if _http_client is None or _http_client.is_closed:
-        _http_client = httpx.AsyncClient(timeout=CORE_VERIFY_TIMEOUT)
-    return _http_client
-
-
-async def close_http_client() -> None:
-    """Close the shared HTTP client. Call during bot shutdown."""
-    global _http_client
-    if _http_client is not None and not _http_client.is_closed:
-        await _http_client.aclose()
-        _http_client = None
-
-
 def premium_required_message(feature_name: str) -> str:
     """Return a short Mockingbird-style message when a non-premium user hits a gated feature."""
     return (
@@ -74,47 +140,41 @@ def _cache_ttl_seconds() -> int:
     return int(getattr(config, "PREMIUM_CACHE_TTL_SECONDS", _DEFAULT_CACHE_TTL))
 
 
+def _negative_cache_ttl_seconds() -> int:
+    return int(getattr(config, "PREMIUM_NEGATIVE_CACHE_TTL_SECONDS", _DEFAULT_NEGATIVE_CACHE_TTL))
+
+
+def _ttl_for(is_premium: bool) -> int:
+    return _cache_ttl_seconds() if is_premium else _negative_cache_ttl_seconds()
+
+
 def _get_cached(user_id: int, guild_id: int) -> bool | None:
-    key = (user_id, guild_id)
-    with _cache_lock:
-        if key not in _cache:
-            return None
-        is_premium, expires_at = _cache[key]
-        if time.monotonic() > expires_at:
-            del _cache[key]
-            return None
-        return is_premium
+    entry = _cache.get(user_id, (user_id, guild_id))
+    return None if entry is None else entry[0]
+
 
+def _get_cached_status(user_id: int, guild_id: int) -> dict[str, Any] | None:
+    entry = _cache.get(user_id, (user_id, guild_id))
+    return None if entry is None or entry[1] is None else dict(entry[1])
 
-def _set_cache(user_id: int, guild_id: int, is_premium: bool) -> None:
-    ttl = _cache_ttl_seconds()
-    with _cache_lock:
-        _cache[(user_id, guild_id)] = (is_premium, time.monotonic() + ttl)
+
+def _set_cache(
+    user_id: int, guild_id: int, is_premium: bool, status: dict[str, Any] | None = None
+) -> None:
+    _cache.set(user_id, (user_id, guild_id), (is_premium, status), _ttl_for(is_premium))
 
 
 def _get_cached_guild(guild_id: int) -> bool | None:
-    with _cache_lock:
-        if guild_id not in _guild_cache:
-            return None
-        is_premium, expires_at = _guild_cache[guild_id]
-        if time.monotonic() > expires_at:
-            del _guild_cache[guild_id]
-            return None
-        return is_premium
+    return _guild_cache.get(guild_id, guild_id)
 
 
 def _set_guild_cache(guild_id: int, is_premium: bool) -> None:
-    ttl = _cache_ttl_seconds()
-    with _cache_lock:
-        _guild_cache[guild_id] = (is_premium, time.monotonic() + ttl)
+    _guild_cache.set(guild_id, guild_id, is_premium, _ttl_for(is_premium))
 
 
 def _clear_cache_for_user(user_id: int) -> None:
     """Remove all cache entries for this user (e.g. after transfer)."""
-    with _cache_lock:
-        keys_to_del = [k for k in _cache if k[0] == user_id]
-        for k in keys_to_del:
-            del _cache[k]
+    _cache.pop_owner(user_id)
 
 
 def invalidate_premium_cache(user_id: int, guild_id: int | None = None) -> None:
@@ -127,23 +187,20 @@ def invalidate_premium_cache(user_id: int, guild_id: int | None = None) -> None:
     Thread-safe: safe to call from webhook thread while bot thread uses cache.
     """
     if guild_id is not None:
-        with _cache_lock:
-            _cache.pop((user_id, guild_id), None)
-            _guild_cache.pop(guild_id, None)
+        _cache.pop(user_id, (user_id, guild_id))
+        _guild_cache.pop(guild_id, guild_id)
     else:
         _clear_cache_for_user(user_id)
-        with _cache_lock:
-            _guild_cache.clear()
+        _guild_cache.clear()
 
 
 def get_premium_cache_size() -> int:
     """Return the number of entries in the premium in-memory cache (for status/health display)."""
-    with _cache_lock:
-        return len(_cache) + len(_guild_cache)
+    return len(_cache) + len(_guild_cache)
 
 
-async def _ensure_pool() -> asyncpg.Pool | None:
-    """Create premium pool on first use (uses db_helpers, so registered for cleanup)."""
+async def _ensure_pool() -> SubsystemPool | None:
+    """Return the premium guard's handle on the shared pool, opening it on first use."""
     global _pool
     if _pool is not None and not _pool.is_closing():
         return _pool
@@ -151,13 +208,7 @@ async def _ensure_pool() -> asyncpg.Pool | None:
     if not dsn:
         return None
     try:
-        _pool = await create_db_pool(
-            dsn,
-            name="premium",
-            min_size=1,
-            max_size=5,
-            command_timeout=10.0,
-        )
+        _pool = await get_subsystem_pool("premium")
         logger.info("Premium guard: DB pool ready")
         return _pool
     except Exception as e:
@@ -175,8 +226,8 @@ async def _check_core_api(user_id: int, guild_id: int) -> bool | None:
     headers = {"X-API-Key": key, "Content-Type": "application/json"}
     payload = {"user_id": user_id, "guild_id": guild_id}
     try:
-        client = _get_http_client()
-        response = await client.post(endpoint, json=payload, headers=headers)
+        client = get_http_client(CORE_API)
+        response = await client.post(endpoint, json=payload, headers=headers, timeout=CORE_VERIFY_TIMEOUT)
         if not response.is_success:
             logger.debug(
                 "Premium verify API non-2xx: status=%s body=%s",
@@ -220,9 +271,8 @@ async def _check_local_db(user_id: int, guild_id: int) -> bool:
 
 def get_premium_guard_stats() -> dict[str, Any]:
     """Return current premium guard counters for observability (same process only)."""
-    with _cache_lock:
-        cache_size = len(_cache)
-        guild_cache_size = len(_guild_cache)
+    cache_size = len(_cache)
+    guild_cache_size = len(_guild_cache)
     return {
         "premium_checks_total": _stats_total,
         "premium_checks_core_api": _stats_core_api,
@@ -245,27 +295,23 @@ async def is_premium(user_id: int, guild_id: int) -> bool:
     local premium_subs table. Fail closed: on any error returns False.
     """
     global _stats_total, _stats_cache_hits, _stats_core_api, _stats_local
-    with _cache_lock:
-        _stats_total += 1
+    _stats_total += 1
     if guild_id is None or guild_id == 0:
         return False
     cached = _get_cached(user_id, guild_id)
     if cached is not None:
-        with _cache_lock:
-            _stats_cache_hits += 1
+        _stats_cache_hits += 1
         return cached
 
     # Try Core-API first when configured
     core_result = await _check_core_api(user_id, guild_id)
     if core_result is not None:
-        with _cache_lock:
-            _stats_core_api += 1
+        _stats_core_api += 1
         _set_cache(user_id, guild_id, core_result)
         return core_result
 
     # Fallback to local DB
-    with _cache_lock:
-        _stats_local += 1
+    _stats_local += 1
     result = await _check_local_db(user_id, guild_id)
     _set_cache(user_id, guild_id, result)
     return result
@@ -281,6 +327,9 @@ async def get_premium_status(user_id: int, guild_id: int) -> dict[str, Any]:
     result: dict[str, Any] = {"premium": False, "tier": None, "expires_at": None}
     if guild_id is None or guild_id == 0:
         return result
+    cached = _get_cached_status(user_id, guild_id)
+    if cached is not None:
+        return cached
     pool = await _ensure_pool()
     if pool is None:
         result["premium"] = await is_premium(user_id, guild_id)  # use cache/core path
@@ -303,14 +352,101 @@ async def get_premium_status(user_id: int, guild_id: int) -> dict[str, Any]:
             result["premium"] = True
             result["tier"] = row.get("tier")
             result["expires_at"] = row.get("expires_at")
-            _set_cache(user_id, guild_id, True)
-        else:
-            _set_cache(user_id, guild_id, False)
+        _set_cache(user_id, guild_id, result["premium"], dict(result))
     except Exception as e:
         logger.warning("Premium guard: get_premium_status failed: %s", e)
     return result
 
 
+async def _fetch_local_statuses(user_ids: list[int], guild_id: int) -> dict[int, dict[str, Any]] | None:
+    """Active premium_subs rows for many users in one query; None when the DB is unavailable."""
+    pool = await _ensure_pool()
+    if pool is None:
+        return None
+    try:
+        async with acquire_safe(pool) as conn:
+            rows = await conn.fetch(
+                """
+                SELECT DISTINCT ON (user_id) user_id, tier, expires_at FROM premium_subs
+                WHERE user_id = ANY($1::bigint[]) AND guild_id = $2
+                  AND status = 'active'
+                  AND (expires_at IS NULL OR expires_at > NOW())
+                ORDER BY user_id, created_at DESC
+                """,
+                user_ids,
+                guild_id,
+            )
+    except Exception as e:
+        logger.warning("Premium guard: prefetch query failed: %s", e)
+        return None
+    return {
+        int(row["user_id"]): {"premium": True, "tier": row.get("tier"), "expires_at": row.get("expires_at")}
+        for row in rows
+    }
+
+
+async def prefetch_premium(user_ids: Iterable[int], guild_id: int) -> dict[int, bool]:
+    """
+    Resolve premium for many users in one guild and warm the cache.
+
+    Cached users are answered from memory. The rest go to Core-API (it has no
+    batch endpoint) over the shared client, at most _PREFETCH_CORE_CONCURRENCY
+    calls at a time, and whatever Core cannot answer is resolved with a single
+    premium_subs query, which also caches the tier for get_user_tier(). Fail
+    closed like is_premium().
+    """
+    global _stats_core_api, _stats_local, _stats_cache_hits, _stats_total
+    user_ids = list(dict.fromkeys(user_ids))
+    if guild_id is None or guild_id == 0:
+        return dict.fromkeys(user_ids, False)
+
+    result: dict[int, bool] = {}
+    missing: list[int] = []
+    for user_id in user_ids:
+        _stats_total += 1
+        cached = _get_cached(user_id, guild_id)
+        if cached is None:
+            missing.append(user_id)
+        else:
+            _stats_cache_hits += 1
+            result[user_id] = cached
+    if not missing:
+        return result
+
+    if getattr(config, "CORE_API_URL", None) and getattr(config, "ALPHAPY_SERVICE_KEY", None):
+        limit = asyncio.Semaphore(_PREFETCH_CORE_CONCURRENCY)
+
+        async def check(user_id: int) -> bool | None:
+            async with limit:
+                return await _check_core_api(user_id, guild_id)
+
+        answers = await asyncio.gather(*(check(user_id) for user_id in missing))
+        unresolved = []
+        for user_id, answer in zip(missing, answers, strict=True):
+            if answer is None:
+                unresolved.append(user_id)
+                continue
+            _stats_core_api += 1
+            _set_cache(user_id, guild_id, answer)
+            result[user_id] = answer
+        missing = unresolved
+    if not missing:
+        return result
+
+    _stats_local += len(missing)
+    statuses = await _fetch_local_statuses(missing, guild_id)
+    for user_id in missing:
+        status = (statuses or {}).get(user_id)
+        if status is not None:
+            _set_cache(user_id, guild_id, True, status)
+        elif statuses is not None:
+            _set_cache(user_id, guild_id, False, {"premium": False, "tier": None, "expires_at": None})
+        else:
+            _set_cache(user_id, guild_id, False)
+        result[user_id] = status is not None
+    return result
+
+
 async def get_active_premium_guild(user_id: int) -> int | None:
     """
     Return the guild_id where this user has an active premium subscription (local DB only).
@@ -352,11 +488,9 @@ async def guild_has_premium(guild_id: int) -> bool:
     global _stats_guild_cache_hits, _stats_guild_cache_misses
     cached = _get_cached_guild(guild_id)
     if cached is not None:
-        with _cache_lock:
-            _stats_guild_cache_hits += 1
+        _stats_guild_cache_hits += 1
         return cached
-    with _cache_lock:
-        _stats_guild_cache_misses += 1
+    _stats_guild_cache_misses += 1
 
     pool = await _ensure_pool()
     if pool is None:
@@ -459,6 +593,122 @@ async def user_has_tier(user_id: int, guild_id: int, min_tier: str) -> bool:
 # ---------------------------------------------------------------------------
 # GPT daily quota
 # ---------------------------------------------------------------------------
+#
+# Daily counts live in memory so the quota check never waits on the database:
+# each (user, guild) is seeded from gpt_usage on its first call of the day and
+# then checked and incremented on the event loop with no await in between.
+# Increments are written back as one batched UPSERT every
+# GPT_QUOTA_FLUSH_INTERVAL seconds, as soon as GPT_QUOTA_FLUSH_THRESHOLD
+# calls are unflushed, and at shutdown.
+#
+# Correctness across restarts: a clean shutdown flushes everything, so the
+# next process seeds the exact count. After a crash, at most
+# GPT_QUOTA_FLUSH_THRESHOLD calls (or one interval's worth) are lost, which is
+# the configured tolerance for over-admission. The counters assume a single
+# bot process; a second process would only see this one's calls after a
+# flush. Days roll over at midnight UTC.
+
+_DEFAULT_GPT_QUOTA_FLUSH_INTERVAL = 10.0  # seconds
+_DEFAULT_GPT_QUOTA_FLUSH_THRESHOLD = 50  # unflushed calls
+
+_gpt_day: date | None = None
+# (user_id, guild_id) -> calls today, including unflushed ones
+_gpt_counts: dict[tuple[int, int], int] = {}
+# (usage_date, user_id, guild_id) -> calls not yet written to gpt_usage
+_gpt_pending: dict[tuple[date, int, int], int] = {}
+_gpt_seeding: dict[tuple[int, int], asyncio.Future[bool]] = {}
+_gpt_flush_task: asyncio.Task | None = None
+_gpt_flush_event: asyncio.Event | None = None
+_gpt_flush_lock: asyncio.Lock | None = None
+_gpt_oneshot_flush: asyncio.Task | None = None
+
+
+def _gpt_flush_interval() -> float:
+    return float(getattr(config, "GPT_QUOTA_FLUSH_INTERVAL", _DEFAULT_GPT_QUOTA_FLUSH_INTERVAL))
+
+
+def _gpt_flush_threshold() -> int:
+    return int(getattr(config, "GPT_QUOTA_FLUSH_THRESHOLD", _DEFAULT_GPT_QUOTA_FLUSH_THRESHOLD))
+
+
+def _utc_today() -> date:
+    return datetime.now(UTC).date()
+
+
+def _get_gpt_flush_lock() -> asyncio.Lock:
+    global _gpt_flush_lock
+    if _gpt_flush_lock is None:
+        _gpt_flush_lock = asyncio.Lock()
+    return _gpt_flush_lock
+
+
+def _roll_gpt_day(today: date) -> None:
+    """Drop yesterday's counters; their unflushed deltas stay in _gpt_pending."""
+    global _gpt_day
+    if _gpt_day != today:
+        _gpt_counts.clear()
+        _gpt_day = today
+
+
+def _record_gpt_call(today: date, key: tuple[int, int]) -> None:
+    pending_key = (today, *key)
+    _gpt_pending[pending_key] = _gpt_pending.get(pending_key, 0) + 1
+    if sum(_gpt_pending.values()) >= _gpt_flush_threshold():
+        _request_gpt_flush()
+
+
+def _request_gpt_flush() -> None:
+    """Wake the flusher early, or run a one-off flush when it is not running."""
+    global _gpt_oneshot_flush
+    if _gpt_flush_task is not None and not _gpt_flush_task.done():
+        if _gpt_flush_event is not None:
+            _gpt_flush_event.set()
+    elif _gpt_oneshot_flush is None or _gpt_oneshot_flush.done():
+        _gpt_oneshot_flush = asyncio.create_task(flush_gpt_usage())
+
+
+async def _load_gpt_count(key: tuple[int, int], today: date) -> bool:
+    """Seed today's count for key from gpt_usage. Returns False when the DB is unavailable."""
+    pool = await _ensure_pool()
+    if pool is None:
+        return False
+    # Unflushed calls from a fail-open period must not be read while a flush
+    # is writing them, or they would be counted twice.
+    lock = _get_gpt_flush_lock() if (today, *key) in _gpt_pending else None
+    if lock is not None:
+        await lock.acquire()
+    try:
+        async with acquire_safe(pool) as conn:
+            stored = await conn.fetchval(
+                """
+                SELECT call_count FROM gpt_usage
+                WHERE user_id = $1 AND guild_id = $2 AND usage_date = $3
+                """,
+                key[0],
+                key[1],
+                today,
+            )
+    except Exception as e:
+        logger.warning("GPT quota: could not load usage for user %s: %s", key[0], e)
+        return False
+    finally:
+        if lock is not None:
+            lock.release()
+    # A seed dropped by forget_gpt_usage() must not bring the count back
+    if _gpt_day == today and key not in _gpt_counts and _gpt_seeding.get(key) is asyncio.current_task():
+        _gpt_counts[key] = (stored or 0) + _gpt_pending.get((today, *key), 0)
+    return True
+
+
+async def _seed_gpt_count(key: tuple[int, int], today: date) -> bool:
+    """Seed once per key; concurrent first calls share the same lookup."""
+    future = _gpt_seeding.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_load_gpt_count(key, today))
+        _gpt_seeding[key] = future
+        future.add_done_callback(lambda f: _gpt_seeding.pop(key) if _gpt_seeding.get(key) is f else None)
+    return await asyncio.shield(future)
+
 
 async def check_and_increment_gpt_quota(
     user_id: int, guild_id: int
@@ -471,47 +721,127 @@ async def check_and_increment_gpt_quota(
     - allowed=False → quota exceeded; count is the current value; limit is the cap.
     - limit=None    → unlimited tier (always allowed).
 
-    Fails open on DB error: returns (True, 0, limit) so a DB outage never blocks users.
+    Served from the in-memory daily counters; only the first call per
+    (user, guild) per day reads gpt_usage. Fails open when that read fails:
+    returns (True, 0, limit) so a DB outage never blocks users (the call is
+    still counted and flushed later).
     """
     from utils.premium_tiers import GPT_DAILY_LIMIT
     tier = await get_user_tier(user_id, guild_id)
     limit = GPT_DAILY_LIMIT.get(tier)
 
     if limit is None:
-        return True, 0, None  # Unlimited tier — skip DB entirely
+        return True, 0, None  # Unlimited tier — skip counting entirely
 
-    pool = await _ensure_pool()
-    if pool is None:
-        logger.warning("GPT quota: DB pool unavailable — failing open for user %s", user_id)
-        return True, 0, limit
-
-    try:
-        async with acquire_safe(pool) as conn:
-            row = await conn.fetchrow(
-                """
-                INSERT INTO gpt_usage (user_id, guild_id, usage_date, call_count)
-                VALUES ($1, $2, CURRENT_DATE, 1)
-                ON CONFLICT (user_id, guild_id, usage_date)
-                DO UPDATE SET call_count = gpt_usage.call_count + 1
-                RETURNING call_count
-                """,
-                user_id,
-                guild_id,
-            )
-            count = row["call_count"] if row else 1
-        if count > limit:
-            # Decrement back — we over-incremented past the cap
+    today = _utc_today()
+    _roll_gpt_day(today)
+    key = (user_id, guild_id)
+    if key not in _gpt_counts:
+        if not await _seed_gpt_count(key, today) or key not in _gpt_counts:
+            logger.warning("GPT quota: usage unavailable — failing open for user %s", user_id)
+            _record_gpt_call(today, key)
+            return True, 0, limit
+
+    # No await between the check and the increment: atomic on the event loop
+    count = _gpt_counts[key]
+    if count >= limit:
+        return False, count, limit
+    _gpt_counts[key] = count + 1
+    _record_gpt_call(today, key)
+    return True, count + 1, limit
+
+
+def get_gpt_usage_today(user_id: int, guild_id: int) -> int | None:
+    """Today's in-memory call count (including unflushed calls), or None if not loaded yet."""
+    if _gpt_day != _utc_today():
+        return None
+    return _gpt_counts.get((user_id, guild_id))
+
+
+async def flush_gpt_usage() -> None:
+    """Write unflushed GPT call counts to gpt_usage in one batched UPSERT."""
+    if not _gpt_pending:
+        return
+    async with _get_gpt_flush_lock():
+        batch = dict(_gpt_pending)
+        _gpt_pending.clear()
+        if not batch:
+            return
+        pool = await _ensure_pool()
+        try:
+            if pool is None:
+                raise RuntimeError("database unavailable")
+            days, user_ids, guild_ids = zip(*batch, strict=True)
             async with acquire_safe(pool) as conn:
                 await conn.execute(
                     """
-                    UPDATE gpt_usage SET call_count = call_count - 1
-                    WHERE user_id = $1 AND guild_id = $2 AND usage_date = CURRENT_DATE
+                    INSERT INTO gpt_usage (user_id, guild_id, usage_date, call_count)
+                    SELECT * FROM unnest($1::bigint[], $2::bigint[], $3::date[], $4::int[])
+                    ON CONFLICT (user_id, guild_id, usage_date)
+                    DO UPDATE SET call_count = gpt_usage.call_count + EXCLUDED.call_count
                     """,
-                    user_id,
-                    guild_id,
+                    list(user_ids),
+                    list(guild_ids),
+                    list(days),
+                    list(batch.values()),
                 )
-            return False, count - 1, limit
-        return True, count, limit
-    except Exception as e:
-        logger.warning("GPT quota: DB check failed for user %s — failing open: %s", user_id, e)
-        return True, 0, limit
+        except Exception as e:
+            logger.warning("GPT quota: flush of %d counters failed, will retry: %s", len(batch), e)
+            for pending_key, delta in batch.items():
+                _gpt_pending[pending_key] = _gpt_pending.get(pending_key, 0) + delta
+
+
+async def forget_gpt_usage(user_id: int) -> None:
+    """
+    Drop a user's in-memory GPT counters and unflushed calls (GDPR erasure).
+
+    Holds the flush lock, so a flush already writing this user's calls finishes
+    first and no later flush writes them back after gpt_usage is purged.
+    """
+    async with _get_gpt_flush_lock():
+        for pending_key in [k for k in _gpt_pending if k[1] == user_id]:
+            del _gpt_pending[pending_key]
+        for key in [k for k in _gpt_counts if k[0] == user_id]:
+            del _gpt_counts[key]
+        for key in [k for k in _gpt_seeding if k[0] == user_id]:
+            del _gpt_seeding[key]
+
+
+async def _gpt_flush_loop() -> None:
+    """Single flusher: runs every GPT_QUOTA_FLUSH_INTERVAL or when the threshold is hit."""
+    global _gpt_flush_event
+    _gpt_flush_event = asyncio.Event()
+    while True:
+        try:
+            try:
+                await asyncio.wait_for(_gpt_flush_event.wait(), timeout=_gpt_flush_interval())
+            except TimeoutError:
+                pass
+            _gpt_flush_event.clear()
+            await flush_gpt_usage()
+        except asyncio.CancelledError:
+            await flush_gpt_usage()
+            raise
+        except Exception as e:
+            logger.error("GPT quota: error in flush loop: %s", e, exc_info=True)
+            await asyncio.sleep(_gpt_flush_interval())
+
+
+def start_gpt_quota_flush_task() -> None:
+    """Start the periodic GPT usage flush task."""
+    global _gpt_flush_task
+    if _gpt_flush_task is None or _gpt_flush_task.done():
+        _gpt_flush_task = asyncio.create_task(_gpt_flush_loop())
+
+
+async def stop_gpt_quota_flush_task() -> None:
+    """Stop the flush task and write any remaining counts. Call before pools close."""
+    global _gpt_flush_task
+    task, _gpt_flush_task = _gpt_flush_task, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await asyncio.wait_for(task, timeout=5.0)
+        except (TimeoutError, asyncio.CancelledError):
+            pass
+    await flush_gpt_usage()
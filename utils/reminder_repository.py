@@ -6,11 +6,14 @@ acquire a connection via acquire_safe() and pass it in — this module
 owns only the queries, not the pool or error handling.
 """
 
-from datetime import date, time
+from datetime import datetime, time
 from typing import Any, cast
 
 import asyncpg
 
+from utils.reminder_schedule import compute_next_fire, days_to_mask
+from utils.timezone import BRUSSELS_TZ
+
 
 async def create(
     conn: Any,
@@ -29,17 +32,22 @@ async def create(
     location: str | None = None,
 ) -> int:
     """Insert a new reminder and return its id."""
+    days_mask = days_to_mask(days)
+    next_fire_at = compute_next_fire(
+        reminder_time, call_time, days_mask, event_time, datetime.now(BRUSSELS_TZ)
+    )
     created_id = await conn.fetchval(
         """
         INSERT INTO reminders
             (guild_id, name, channel_id, time, call_time, days, message,
-             created_by, origin_channel_id, origin_message_id, event_time, image_url, location)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+             created_by, origin_channel_id, origin_message_id, event_time, image_url, location,
+             days_mask, next_fire_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
         RETURNING id
         """,
         guild_id, name, channel_id, reminder_time, call_time, days or [],
         message, created_by, origin_channel_id, origin_message_id,
-        event_time, image_url, location,
+        event_time, image_url, location, days_mask, next_fire_at,
     )
     return cast(int, created_id)
 
@@ -127,108 +135,64 @@ async def list_for_user(
     )
 
 
-async def list_active(
+async def list_due(
     conn: Any,
-    current_time_obj: time,
-    current_date: date,
-    current_day: str,
-    is_late_night: bool,
-    next_date: date,
-    next_day: str,
+    now: datetime,
 ) -> list[asyncpg.Record]:
     """
-    Fetch reminders that should fire at the current minute.
+    Fetch reminders whose next fire instant has been reached.
 
-    Parameters: $1/$4=current_time_obj, $2=current_date, $3=current_day,
-    $5=is_late_night, $6=next_date, $7=next_day.
-
-    Three cases:
-    - One-off T-60: time col = reminder time, matched by event date
-    - One-off T0:   call_time col = event time
-    - Recurring:    time col matches weekday (including midnight edge case)
+    Range scan on the partial ``next_fire_at`` index; the dispatcher
+    reschedules every returned row so each fire instant is handled once.
     """
     return await conn.fetch(
         """
         SELECT id, guild_id, channel_id, name, message, location,
-               origin_channel_id, origin_message_id, event_time, days, call_time,
-               last_sent_at, image_url, sent_message_id
+               origin_channel_id, origin_message_id, event_time, days, time, call_time,
+               last_sent_at, image_url, sent_message_id, days_mask, next_fire_at
         FROM reminders
-        WHERE (
-            -- One-off at T-60: time col = reminder time, matches event date
-            (
-                event_time IS NOT NULL
-                AND time::time = $1::time
-                AND (
-                    ((event_time AT TIME ZONE 'Europe/Brussels') - INTERVAL '60 minutes')::date = $2
-                    OR
-                    ($5 = true AND (event_time AT TIME ZONE 'Europe/Brussels')::date = $6)
-                )
-            )
-            OR
-            -- One-off at T0: call_time col = event time
-            (
-                event_time IS NOT NULL
-                AND call_time::time = $4::time
-                AND (event_time AT TIME ZONE 'Europe/Brussels')::date = $2
-            )
-            OR
-            -- Recurring: time col matches current weekday+time
-            (
-                event_time IS NULL
-                AND time::time = $1::time
-                AND (
-                    (
-                        $3 = ANY(days)
-                        OR EXISTS (
-                            SELECT 1 FROM unnest(days) AS day_val
-                            WHERE day_val::text IN ('ma', 'maandag', 'monday', 'di', 'dinsdag', 'tuesday',
-                                                    'wo', 'woe', 'woensdag', 'wednesday', 'do', 'donderdag', 'thursday',
-                                                    'vr', 'vrijdag', 'friday', 'za', 'zaterdag', 'saturday',
-                                                    'zo', 'zondag', 'sunday')
-                            AND (
-                                ($3 = '0' AND day_val::text IN ('ma', 'maandag', 'monday'))
-                                OR ($3 = '1' AND day_val::text IN ('di', 'dinsdag', 'tuesday'))
-                                OR ($3 = '2' AND day_val::text IN ('wo', 'woe', 'woensdag', 'wednesday'))
-                                OR ($3 = '3' AND day_val::text IN ('do', 'donderdag', 'thursday'))
-                                OR ($3 = '4' AND day_val::text IN ('vr', 'vrijdag', 'friday'))
-                                OR ($3 = '5' AND day_val::text IN ('za', 'zaterdag', 'saturday'))
-                                OR ($3 = '6' AND day_val::text IN ('zo', 'zondag', 'sunday'))
-                            )
-                        )
-                    )
-                    OR
-                    -- Midnight edge case: reminder at 23:xx, check next day
-                    (
-                        $5 = true
-                        AND (
-                            $7 = ANY(days)
-                            OR EXISTS (
-                                SELECT 1 FROM unnest(days) AS day_val
-                                WHERE day_val::text IN ('ma', 'maandag', 'monday', 'di', 'dinsdag', 'tuesday',
-                                                        'wo', 'woe', 'woensdag', 'wednesday', 'do', 'donderdag', 'thursday',
-                                                        'vr', 'vrijdag', 'friday', 'za', 'zaterdag', 'saturday',
-                                                        'zo', 'zondag', 'sunday')
-                                AND (
-                                    ($7 = '0' AND day_val::text IN ('ma', 'maandag', 'monday'))
-                                    OR ($7 = '1' AND day_val::text IN ('di', 'dinsdag', 'tuesday'))
-                                    OR ($7 = '2' AND day_val::text IN ('wo', 'woe', 'woensdag', 'wednesday'))
-                                    OR ($7 = '3' AND day_val::text IN ('do', 'donderdag', 'thursday'))
-                                    OR ($7 = '4' AND day_val::text IN ('vr', 'vrijdag', 'friday'))
-                                    OR ($7 = '5' AND day_val::text IN ('za', 'zaterdag', 'saturday'))
-                                    OR ($7 = '6' AND day_val::text IN ('zo', 'zondag', 'sunday'))
-                                )
-                            )
-                        )
-                    )
-                )
-            )
-        )
+        WHERE next_fire_at <= $1
+        ORDER BY next_fire_at
         """,
-        current_time_obj, current_date, current_day, current_time_obj,
-        is_late_night, next_date, next_day,
+        now,
+    )
+
+
+async def list_unscheduled(conn: Any) -> list[asyncpg.Record]:
+    """Fetch reminders written before next_fire_at existed (days_mask not yet set)."""
+    return await conn.fetch(
+        "SELECT id, time, call_time, days, event_time FROM reminders WHERE days_mask IS NULL"
     )
 
 
+async def reschedule(
+    conn: Any,
+    rows: list[Any],
+    after: datetime | None = None,
+) -> list[int]:
+    """Recompute days_mask and next_fire_at for rows (id, time, call_time, days, event_time).
+
+    Returns the ids of one-off reminders that have no fire instant left, so
+    the caller can delete them instead of leaving rows that never fire.
+    """
+    if not rows:
+        return []
+    after = after or datetime.now(BRUSSELS_TZ)
+    records = []
+    expired_ids = []
+    for row in rows:
+        days_mask = days_to_mask(row["days"])
+        next_fire_at = compute_next_fire(row["time"], row["call_time"], days_mask, row["event_time"], after)
+        records.append((days_mask, next_fire_at, row["id"]))
+        if next_fire_at is None and row["event_time"] is not None:
+            expired_ids.append(row["id"])
+    await conn.executemany(
+        "UPDATE reminders SET days_mask = $1, next_fire_at = $2 WHERE id = $3",
+        records,
+    )
+    return expired_ids
+
+
 async def update_sent_at(
     conn: Any,
     reminder_id: int,
@@ -249,6 +213,45 @@ async def update_sent_at(
         )
 
 
+async def mark_sent_many(
+    conn: Any,
+    records: list[tuple[Any, int | None, int]],
+) -> None:
+    """Set the idempotency marker for many sent reminders in one statement.
+
+    ``records`` are (last_sent_at, sent_message_id, reminder_id); a None
+    message id keeps the stored one.
+    """
+    if not records:
+        return
+    sent_at, message_ids, reminder_ids = zip(*records, strict=True)
+    await conn.execute(
+        """
+        UPDATE reminders AS r
+        SET last_sent_at = v.last_sent_at,
+            sent_message_id = COALESCE(v.sent_message_id, r.sent_message_id)
+        FROM unnest($1::int[], $2::timestamptz[], $3::bigint[])
+            AS v(id, last_sent_at, sent_message_id)
+        WHERE r.id = v.id
+        """,
+        list(reminder_ids), list(sent_at), list(message_ids),
+    )
+
+
+async def delete_many(conn: Any, reminder_ids: list[int]) -> None:
+    """Delete many reminders by id in one statement (one-off reminders after T0)."""
+    if not reminder_ids:
+        return
+    await conn.execute("DELETE FROM reminders WHERE id = ANY($1::int[])", reminder_ids)
+
+
+async def delete_expired_one_offs(conn: Any) -> str:
+    """Delete scheduled one-off reminders that have no fire instant left."""
+    return await conn.execute(
+        "DELETE FROM reminders WHERE event_time IS NOT NULL AND days_mask IS NOT NULL AND next_fire_at IS NULL"
+    )
+
+
 async def update_fields(
     conn: Any,
     reminder_id: int,
@@ -260,27 +263,31 @@ async def update_fields(
     message: str | None,
     channel_id: int | None = None,
 ) -> None:
-    """Update editable reminder fields (from edit modal)."""
+    """Update editable reminder fields (from edit modal) and reschedule the reminder."""
     if channel_id is not None:
-        await conn.execute(
+        row = await conn.fetchrow(
             """
             UPDATE reminders
             SET name = $1, time = $2, call_time = $3, days = $4, message = $5, channel_id = $6
             WHERE id = $7 AND guild_id = $8
+            RETURNING id, time, call_time, days, event_time
             """,
             name, reminder_time, call_time, days or [], message, channel_id,
             reminder_id, guild_id,
         )
     else:
-        await conn.execute(
+        row = await conn.fetchrow(
             """
             UPDATE reminders
             SET name = $1, time = $2, call_time = $3, days = $4, message = $5
             WHERE id = $6 AND guild_id = $7
+            RETURNING id, time, call_time, days, event_time
             """,
             name, reminder_time, call_time, days or [], message,
             reminder_id, guild_id,
         )
+    if row is not None:
+        await reschedule(conn, [row])
 
 
 async def autocomplete_all(
@@ -342,13 +349,15 @@ async def create_for_api(conn: Any, data: dict[str, Any]) -> None:
         days_list = [days]
     else:
         days_list = list(days)
+    days_mask = days_to_mask(days_list)
+    next_fire_at = compute_next_fire(data["time"], None, days_mask, None, datetime.now(BRUSSELS_TZ))
     await conn.execute(
         """
-        INSERT INTO reminders (name, channel_id, time, days, message, created_by)
-        VALUES ($1, $2, $3, $4, $5, $6)
+        INSERT INTO reminders (name, channel_id, time, days, message, created_by, days_mask, next_fire_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
         """,
         data["name"], str(data["channel_id"]), data["time"],
-        days_list, data["message"], data["created_by"],
+        days_list, data["message"], data["created_by"], days_mask, next_fire_at,
     )
 
 
@@ -361,12 +370,15 @@ async def update_for_api(conn: Any, data: dict[str, Any]) -> None:
         days_list = [days]
     else:
         days_list = list(days)
-    await conn.execute(
+    row = await conn.fetchrow(
         """
         UPDATE reminders
         SET name = $1, time = $2, days = $3, message = $4
         WHERE id = $5 AND created_by = $6
+        RETURNING id, time, call_time, days, event_time
         """,
         data["name"], data["time"], days_list, data["message"],
         data["id"], data["created_by"],
     )
+    if row is not None:
+        await reschedule(conn, [row])
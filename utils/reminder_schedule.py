@@ -0,0 +1,120 @@
+"""
+Reminder Schedule
+
+Pure helpers that turn a reminder's stored fields into its next fire instant.
+Writers store the result in ``reminders.next_fire_at`` so the dispatcher can
+fetch due reminders with an indexed range scan instead of matching times and
+day names for every row each minute.
+
+Times are interpreted in Brussels local time, matching how reminders are
+entered. Day names are normalised to a weekday bitmask (bit 0 = Monday).
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from utils.parsers import DAY_MAP
+from utils.timezone import BRUSSELS_TZ
+
+ALL_DAYS_MASK = 0b1111111
+
+
+def days_to_mask(days: Any) -> int:
+    """Normalise stored day values (digits or nl/en names) to a weekday bitmask.
+
+    Unknown values are ignored, so an empty or unparseable list yields 0.
+    """
+    if not days:
+        return 0
+    if isinstance(days, str):
+        days = [days]
+    mask = 0
+    for value in days:
+        token = str(value).strip().lower()
+        if token == "daily":
+            return ALL_DAYS_MASK
+        digit = DAY_MAP.get(token, token)
+        if len(digit) == 1 and "0" <= digit <= "6":
+            mask |= 1 << int(digit)
+    return mask
+
+
+def _as_time(value: Any) -> time | None:
+    """Accept TIME values from the database or "HH:MM[:SS]" strings from the API."""
+    if value is None or isinstance(value, time):
+        return value
+    text = str(value).strip()
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _local(day: Any, at: time) -> datetime:
+    return datetime.combine(day, at.replace(tzinfo=None), tzinfo=BRUSSELS_TZ)
+
+
+def event_call_at(event_time: datetime, call_time: Any) -> datetime | None:
+    """Instant of the on-time (T0) send of a one-off reminder, if it has one."""
+    call = _as_time(call_time)
+    if call is None:
+        return None
+    return _local(event_time.astimezone(BRUSSELS_TZ).date(), call)
+
+
+def _one_off_fire_times(reminder_time: time | None, call_time: Any, event_time: datetime) -> list[datetime]:
+    event_local = event_time.astimezone(BRUSSELS_TZ)
+    fire_times = []
+    if reminder_time is not None:
+        # The offset send falls on the event date unless the offset crosses
+        # midnight (event at 00:30, reminder at 23:30 the evening before).
+        offset_at = _local(event_local.date(), reminder_time)
+        if offset_at > event_local:
+            offset_at -= timedelta(days=1)
+        fire_times.append(offset_at)
+    call_at = event_call_at(event_time, call_time)
+    if call_at is not None:
+        fire_times.append(call_at)
+    return sorted(fire_times)
+
+
+def compute_next_fire(
+    reminder_time: Any,
+    call_time: Any,
+    days_mask: int,
+    event_time: datetime | None,
+    after: datetime,
+) -> datetime | None:
+    """Return the first fire instant strictly after ``after``, or None if it never fires again.
+
+    One-off reminders (``event_time`` set) fire at their offset time and at
+    ``call_time`` on the event date. Recurring reminders fire at
+    ``reminder_time`` on every weekday in ``days_mask``; when the reminder
+    time is later than the call time the event is just past midnight, so the
+    reminder fires the evening before each listed day.
+    """
+    remind_at = _as_time(reminder_time)
+    if event_time is not None:
+        for fire_at in _one_off_fire_times(remind_at, call_time, event_time):
+            if fire_at > after:
+                return fire_at
+        return None
+
+    if remind_at is None or not days_mask:
+        return None
+    call_at = _as_time(call_time)
+    day_shift = 1 if call_at is not None and remind_at > call_at else 0
+
+    after_local = after.astimezone(BRUSSELS_TZ)
+    # Eight candidate days cover a full week plus today's already-passed slot.
+    for offset in range(8):
+        fire_day = after_local.date() + timedelta(days=offset)
+        event_weekday = (fire_day.weekday() + day_shift) % 7
+        if not days_mask & (1 << event_weekday):
+            continue
+        fire_at = _local(fire_day, remind_at)
+        if fire_at > after:
+            return fire_at
+    return None
@@ -0,0 +1,194 @@
+"""
+Retention Utilities
+
+Bounded, index-friendly expiry of analytics rows.
+
+- ``delete_expired`` removes rows older than a fixed cutoff in batches of primary
+  keys picked through the ``created_at`` index. Every batch is its own short
+  transaction on a freshly acquired connection, with a pause in between, so
+  locks stay small and autovacuum/replication keep up instead of one huge DELETE
+  stalling the whole database.
+- For a month-partitioned ``audit_logs`` (migration 028) whole months are
+  expired with a DROP TABLE of the partition (``drop_expired_partitions``), and
+  upcoming months are created ahead of time (``ensure_partitions``) so new rows
+  never land in the default partition.
+
+Table and column names are interpolated into SQL and must come from code, never
+from user input.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import Any
+
+from asyncpg import exceptions as pg_exceptions
+
+from utils.db_helpers import acquire_safe
+from utils.logger import logger
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of one retention pass over a table."""
+    table: str
+    rows: int = 0
+    batches: int = 0
+    partitions_dropped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _row_count(status: str) -> int:
+    """Row count from a command status string such as ``"DELETE 500"``."""
+    try:
+        return int(status.rsplit(" ", 1)[-1])
+    except (AttributeError, ValueError):
+        return 0
+
+
+async def delete_expired(
+    pool: Any,
+    table: str,
+    cutoff: datetime,
+    *,
+    batch_size: int,
+    pause: float,
+    column: str = "created_at",
+    key: str = "id",
+) -> RetentionResult:
+    """
+    Delete rows with ``column < cutoff`` in batches of at most ``batch_size``.
+
+    Args:
+        pool: asyncpg pool; a connection is acquired per batch
+        table: Table to clean up
+        cutoff: Fixed cutoff timestamp (computed once, so the loop terminates)
+        batch_size: Maximum rows per DELETE
+        pause: Seconds to sleep between batches
+        column: Timestamp column (should be indexed)
+        key: Primary key column used to address the batch
+
+    Returns:
+        RetentionResult with rows deleted, batch count and elapsed time
+    """
+    # The outer range predicate lets a partitioned table prune to the expired months.
+    query = f"""
+        DELETE FROM {table}
+        WHERE {column} < $1 AND {key} IN (
+            SELECT {key} FROM {table} WHERE {column} < $1 ORDER BY {column} LIMIT $2
+        )
+    """
+    result = RetentionResult(table)
+    started = time.perf_counter()
+    while True:
+        async with acquire_safe(pool) as conn:
+            deleted = _row_count(await conn.execute(query, cutoff, batch_size))
+        result.rows += deleted
+        result.batches += 1
+        if deleted < batch_size:
+            break
+        await asyncio.sleep(pause)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+# --- Monthly range partitions ---------------------------------------------
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding ``month`` (e.g. ``audit_logs_y2026m10``)."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_month(table: str, name: str) -> date | None:
+    """Inverse of ``partition_name``; None for the default or foreign partitions."""
+    match = re.fullmatch(rf"{re.escape(table)}_y(\d{{4}})m(\d{{2}})", name)
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+async def is_partitioned(pool: Any, table: str) -> bool:
+    """True when ``table`` is a partitioned (parent) table."""
+    async with acquire_safe(pool) as conn:
+        return bool(await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1))",
+            table,
+        ))
+
+
+async def ensure_partitions(pool: Any, table: str, now: datetime, months_ahead: int) -> int:
+    """Create monthly partitions from the current month through ``months_ahead``; returns how many were new."""
+    current = date(now.year, now.month, 1)
+    async with acquire_safe(pool) as conn:
+        existing = {
+            row["relname"] for row in await conn.fetch(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass($1)",
+                table,
+            )
+        }
+        created = 0
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(table, month)
+            if name in existing:
+                continue
+            try:
+                await conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                    f"TO ('{add_months(month, 1).isoformat()} 00:00:00+00')"
+                )
+                created += 1
+            except pg_exceptions.PostgresError as exc:
+                # e.g. the default partition already holds rows for that month
+                logger.warning("Retention: could not create partition %s: %s", name, exc)
+    return created
+
+
+async def drop_expired_partitions(pool: Any, table: str, cutoff: datetime, lock_timeout: str = "5s") -> list[str]:
+    """
+    Drop monthly partitions whose whole range lies before ``cutoff``.
+
+    Each drop runs with a short ``lock_timeout`` so it never queues behind a long
+    reader (and blocks everything queued after it); a skipped month is retried on
+    the next run.
+    """
+    async with acquire_safe(pool) as conn:
+        rows = await conn.fetch(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass($1)",
+            table,
+        )
+    expired = []
+    for row in rows:
+        month = parse_partition_month(table, row["relname"])
+        if month is None:
+            continue
+        end = add_months(month, 1)
+        if datetime(end.year, end.month, end.day, tzinfo=UTC) <= cutoff:
+            expired.append((month, row["relname"]))
+
+    dropped = []
+    for _month, name in sorted(expired):
+        try:
+            async with acquire_safe(pool) as conn:
+                async with conn.transaction():
+                    await conn.execute(f"SET LOCAL lock_timeout = '{lock_timeout}'")
+                    await conn.execute(f"DROP TABLE IF EXISTS {name}")
+            dropped.append(name)
+        except pg_exceptions.LockNotAvailableError:
+            logger.warning("Retention: partition %s busy, drop deferred to the next run", name)
+    return dropped
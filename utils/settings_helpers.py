@@ -7,23 +7,28 @@ coercion and caching.
 """
 
 import json
-from collections import OrderedDict
 from typing import Any
 
 from utils.db_helpers import acquire_transactional
 from utils.logger import logger
-from utils.settings_service import SettingsService
+from utils.settings_service import SettingsService, publish_setting_change
+
+_MISSING = object()
 
 
 class CachedSettingsHelper:
     """
-    Wrapper around SettingsService that provides type-safe getters with LRU caching.
+    Wrapper around SettingsService that provides type-safe getters with caching.
 
     Note: SettingsService.get() is already a pure in-memory dict lookup (all settings
-    are bulk-loaded at startup). This class adds type coercion and a second LRU layer
-    mainly to avoid re-coercing frequently accessed values. The cache has no TTL —
-    entries are valid until explicitly invalidated via invalidate_cache() or until
-    evicted by size pressure.
+    are bulk-loaded at startup). This class adds type coercion and a second cache
+    layer mainly to avoid re-coercing frequently accessed values. Coerced values are
+    kept in one bucket per guild, so invalidation after a change drops a single
+    bucket instead of scanning every entry. The cache has no TTL — entries are valid
+    until invalidated or until their guild's bucket is evicted by size pressure.
+
+    Hot paths that read several settings per message can use
+    ``SettingsService.snapshot(guild_id)`` instead.
     """
     
     def __init__(self, settings: SettingsService, max_cache_size: int = 500):
@@ -32,30 +37,43 @@ class CachedSettingsHelper:
 
         Args:
             settings: The SettingsService instance to wrap
-            max_cache_size: Maximum number of entries in cache (default: 500)
+            max_cache_size: Maximum number of guilds with cached values (default: 500)
         """
         self._settings = settings
-        self._cache: OrderedDict[tuple[str, str, int], Any] = OrderedDict()
+        # guild_id -> {(scope, key, type): coerced value}; dict order doubles as LRU order
+        self._cache: dict[int, dict[tuple[str, str, type], Any]] = {}
         self._cache_enabled = True
         self._max_cache_size = max_cache_size
 
-        # Auto-invalidate this helper's LRU cache whenever any setting changes so
+        # Auto-invalidate the guild's bucket whenever any of its settings changes so
         # cogs always read the current value without needing an explicit TTL.
         async def _on_setting_changed(scope: str, key: str, guild_id: int, value: Any) -> None:
-            self._cache.pop(self._get_cache_key(scope, key, guild_id), None)
+            self._cache.pop(guild_id, None)
 
         settings.add_global_listener(_on_setting_changed)
-    
-    def _get_cache_key(self, scope: str, key: str, guild_id: int) -> tuple[str, str, int]:
-        """Generate cache key from scope, key, and guild_id."""
-        return (scope, key, guild_id)
-    
-    def _evict_if_needed(self) -> None:
-        """Evict oldest entry if cache exceeds max size."""
-        if len(self._cache) >= self._max_cache_size:
-            # Remove oldest (first) entry
-            evicted_key = self._cache.popitem(last=False)
-            logger.debug(f"Settings cache eviction: size={len(self._cache)}/{self._max_cache_size}, evicted={evicted_key[0]}")
+
+    def _cached(self, scope: str, key: str, guild_id: int, kind: type) -> Any:
+        """Return the cached coerced value, or _MISSING."""
+        if not self._cache_enabled:
+            return _MISSING
+        bucket = self._cache.get(guild_id)
+        if bucket is None:
+            return _MISSING
+        return bucket.get((scope, key, kind), _MISSING)
+
+    def _store(self, scope: str, key: str, guild_id: int, kind: type, value: Any) -> None:
+        if not self._cache_enabled:
+            return
+        bucket = self._cache.pop(guild_id, None)
+        if bucket is None:
+            bucket = {}
+            if len(self._cache) >= self._max_cache_size:
+                # Evict the least recently filled guild
+                evicted = next(iter(self._cache))
+                del self._cache[evicted]
+                logger.debug(f"Settings cache eviction: guild={evicted}, guilds={len(self._cache)}/{self._max_cache_size}")
+        self._cache[guild_id] = bucket  # re-insert as most recent
+        bucket[(scope, key, kind)] = value
     
     def clear_cache(self, scope: str | None = None, key: str | None = None, guild_id: int | None = None) -> None:
         """
@@ -66,20 +84,19 @@ class CachedSettingsHelper:
             key: Optional key to filter by
             guild_id: Optional guild_id to filter by
         """
-        if scope is None and key is None and guild_id is None:
-            self._cache.clear()
+        if scope is None and key is None:
+            if guild_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(guild_id, None)
             return
-        
-        keys_to_remove = []
-        for cache_key in self._cache.keys():
-            cache_scope, cache_key_name, cache_guild_id = cache_key
-            if (scope is None or cache_scope == scope) and \
-               (key is None or cache_key_name == key) and \
-               (guild_id is None or cache_guild_id == guild_id):
-                keys_to_remove.append(cache_key)
-        
-        for key_to_remove in keys_to_remove:
-            del self._cache[key_to_remove]
+
+        buckets = [self._cache.get(guild_id, {})] if guild_id is not None else list(self._cache.values())
+        for bucket in buckets:
+            for cache_key in [
+                k for k in bucket if (scope is None or k[0] == scope) and (key is None or k[1] == key)
+            ]:
+                del bucket[cache_key]
     
     def get_int(self, scope: str, key: str, guild_id: int, fallback: int = 0) -> int:
         """
@@ -94,30 +111,18 @@ class CachedSettingsHelper:
         Returns:
             int: The setting value as an integer
         """
-        cache_key = self._get_cache_key(scope, key, guild_id)
-        
-        if self._cache_enabled and cache_key in self._cache:
-            # Move to end (most recently used)
-            self._cache.move_to_end(cache_key)
-            cached_value = self._cache[cache_key]
-            if isinstance(cached_value, int):
-                return cached_value
+        cached = self._cached(scope, key, guild_id, int)
+        if cached is not _MISSING:
+            return cached
         
         try:
             value = self._settings.get(scope, key, guild_id, fallback)
             coerced = int(value) if value else fallback
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = coerced
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return coerced
         except (ValueError, TypeError) as e:
             logger.warning(f"Failed to coerce setting {scope}.{key} to int: {e}")
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = fallback
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return fallback
+            coerced = fallback
+        self._store(scope, key, guild_id, int, coerced)
+        return coerced
     
     def get_bool(self, scope: str, key: str, guild_id: int, fallback: bool = False) -> bool:
         """
@@ -132,14 +137,9 @@ class CachedSettingsHelper:
         Returns:
             bool: The setting value as a boolean
         """
-        cache_key = self._get_cache_key(scope, key, guild_id)
-        
-        if self._cache_enabled and cache_key in self._cache:
-            # Move to end (most recently used)
-            self._cache.move_to_end(cache_key)
-            cached_value = self._cache[cache_key]
-            if isinstance(cached_value, bool):
-                return cached_value
+        cached = self._cached(scope, key, guild_id, bool)
+        if cached is not _MISSING:
+            return cached
         
         try:
             value = self._settings.get(scope, key, guild_id, fallback)
@@ -149,19 +149,11 @@ class CachedSettingsHelper:
                 coerced = value.lower() in ("true", "1", "yes", "on")
             else:
                 coerced = bool(value) if value else fallback
-            
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = coerced
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return coerced
         except Exception as e:
             logger.warning(f"Failed to coerce setting {scope}.{key} to bool: {e}")
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = fallback
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return fallback
+            coerced = fallback
+        self._store(scope, key, guild_id, bool, coerced)
+        return coerced
     
     def get_str(self, scope: str, key: str, guild_id: int, fallback: str = "") -> str:
         """
@@ -176,30 +168,18 @@ class CachedSettingsHelper:
         Returns:
             str: The setting value as a string
         """
-        cache_key = self._get_cache_key(scope, key, guild_id)
-        
-        if self._cache_enabled and cache_key in self._cache:
-            # Move to end (most recently used)
-            self._cache.move_to_end(cache_key)
-            cached_value = self._cache[cache_key]
-            if isinstance(cached_value, str):
-                return cached_value
+        cached = self._cached(scope, key, guild_id, str)
+        if cached is not _MISSING:
+            return cached
         
         try:
             value = self._settings.get(scope, key, guild_id, fallback)
             coerced = str(value) if value else fallback
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = coerced
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return coerced
         except Exception as e:
             logger.warning(f"Failed to coerce setting {scope}.{key} to str: {e}")
-            if self._cache_enabled:
-                self._evict_if_needed()  # Before adding new entry
-                self._cache[cache_key] = fallback
-                self._cache.move_to_end(cache_key)  # Mark as recently used
-            return fallback
+            coerced = fallback
+        self._store(scope, key, guild_id, str, coerced)
+        return coerced
     
     async def set_bulk(
         self,
@@ -260,6 +240,14 @@ class CachedSettingsHelper:
                     """,
                     rows,
                 )
+                # One notification per scope (delivered on commit)
+                keys_by_scope: dict[str, list[str]] = {}
+                for scope, key in coerced:
+                    keys_by_scope.setdefault(scope, []).append(key)
+                for scope, keys in keys_by_scope.items():
+                    await publish_setting_change(
+                        conn, guild_id, scope, keys[0] if len(keys) == 1 else None, service._origin
+                    )
         except Exception as e:
             logger.error(f"set_bulk: transaction failed: {e}")
             raise
@@ -278,5 +266,4 @@ class CachedSettingsHelper:
             key: Settings key
             guild_id: Guild ID
         """
-        cache_key = self._get_cache_key(scope, key, guild_id)
-        self._cache.pop(cache_key, None)
+        self.clear_cache(scope, key, guild_id)
@@ -1,19 +1,38 @@
 import asyncio
 import json
+import uuid
+from collections import namedtuple
 from collections.abc import Callable, Coroutine, Iterable
+from contextlib import suppress
 from dataclasses import dataclass
 from typing import Any
 
 import asyncpg
 from asyncpg import exceptions as pg_exceptions
 
+import config
 from utils.logger import log_database_event
 from utils.operational_logs import EventType, log_operational_event
+from utils.pool_registry import SubsystemPool, get_subsystem_pool
 
 SettingListener = Callable[[Any], Coroutine[Any, Any, None]]
 # Global listener receives (scope, key, guild_id, new_value) for every setting change.
 GlobalSettingListener = Callable[[str, str, int, Any], Coroutine[Any, Any, None]]
 
+# Postgres NOTIFY channel for bot_settings changes. Payload: {"guild_id", "scope", "key", "origin"};
+# key is null when a whole scope was rewritten. Values are not sent: receivers re-read the rows.
+SETTINGS_CHANNEL = "bot_settings_changed"
+_LISTEN_HEALTH_INTERVAL = 30.0
+_LISTEN_MAX_BACKOFF = 60.0
+
+
+async def publish_setting_change(
+    conn: Any, guild_id: int, scope: str, key: str | None = None, origin: str = "api"
+) -> None:
+    """Announce a bot_settings change to other processes (delivered on commit when inside a transaction)."""
+    payload = json.dumps({"guild_id": guild_id, "scope": scope, "key": key, "origin": origin})
+    await conn.execute("SELECT pg_notify($1, $2)", SETTINGS_CHANNEL, payload)
+
 
 def _unwrap_quoted_scalar_str(value: str) -> str:
     """Strip redundant quote layers from settings loaded as JSON strings (e.g. '\"123\"')."""
@@ -36,24 +55,43 @@ class SettingDefinition:
     choices: Iterable[Any] | None = None
 
 
+# A guild snapshot is a namedtuple of per-scope namedtuples: snapshot.automod.enabled
+SettingsSnapshot = Any
+
+
 class SettingsService:
     """Runtime settings registry backed by PostgreSQL overrides."""
 
     def __init__(self, dsn: str | None):
         self._dsn = dsn
-        self._pool: asyncpg.Pool | None = None
+        self._pool: SubsystemPool | None = None
+        # Handed to cogs via get_bot_db_pool; separate quota and stats from settings I/O
+        self._bot_pool: SubsystemPool | None = None
         self._definitions: dict[tuple[str, str], SettingDefinition] = {}
         self._overrides: dict[tuple[int, str, str], Any] = {}
         self._raw_overrides: dict[tuple[int, str, str], Any] = {}  # in-memory raw (e.g. fyi) when pool unavailable
         self._listeners: dict[tuple[str, str], list[SettingListener]] = {}
         self._global_listeners: list[GlobalSettingListener] = []
         self._ready = False
+        # Cross-process propagation (LISTEN on SETTINGS_CHANNEL over a dedicated connection)
+        self._origin = uuid.uuid4().hex
+        self._listen_task: asyncio.Task | None = None
+        self._listen_conn: asyncpg.Connection | None = None
+        # Remote changes are applied one at a time, in notification order, so an
+        # older re-read can never overwrite a newer one. None means "resync all".
+        self._remote_queue: asyncio.Queue[tuple[int, str, str | None] | None] = asyncio.Queue()
+        self._remote_worker: asyncio.Task | None = None
+        # guild_id -> immutable snapshot of every registered setting (built on first read)
+        self._snapshots: dict[int, SettingsSnapshot] = {}
+        self._snapshot_types: tuple[type, dict[str, tuple[type, tuple[str, ...]]]] | None = None
 
     def register(self, definition: SettingDefinition) -> None:
         key = (definition.scope, definition.key)
         if key in self._definitions:
             raise ValueError(f"Setting '{definition.scope}.{definition.key}' already registered")
         self._definitions[key] = definition
+        self._snapshot_types = None
+        self._snapshots.clear()
 
     async def setup(self) -> None:
         if self._ready or not self._dsn:
@@ -62,6 +100,8 @@ class SettingsService:
 
         await self._init_pool_with_retry()
         self._ready = True
+        if getattr(config, "SETTINGS_LISTEN_ENABLED", True):
+            self.start_change_listener()
 
     async def _init_pool_with_retry(self, attempts: int = 5, base_delay: float = 1.5) -> None:
         """Initialize database pool with retry logic."""
@@ -89,20 +129,8 @@ class SettingsService:
         if not self._dsn:
             return
 
-        # Create pool with better connection settings for Railway
-        pool = await asyncpg.create_pool(
-            self._dsn,
-            min_size=1,          # Minimum connections in pool
-            max_size=10,         # Maximum connections in pool
-            max_queries=50000,   # Maximum queries per connection
-            max_inactive_connection_lifetime=300.0,  # 5 minutes
-            command_timeout=60.0,  # 60 second timeout
-            init=None,
-            setup=None,
-            server_settings={
-                'application_name': 'alphapy_bot_settings'
-            }
-        )
+        # Settings share the process-wide pool (see utils.pool_registry)
+        pool = await get_subsystem_pool("settings")
 
         async with pool.acquire() as conn:
             # Test connection
@@ -171,8 +199,10 @@ class SettingsService:
                 loaded_count += 1
 
             log_database_event("SETTINGS_LOADED", details=f"Loaded {loaded_count} settings from database")
+        self._snapshots.clear()
 
         self._pool = pool
+        self._bot_pool = await get_subsystem_pool("bot")
         log_database_event("POOL_CREATED", details="Pool created with min_size=1, max_size=10")
 
     def get(self, scope: str, key: str, guild_id: int = 0, fallback: Any | None = None) -> Any:
@@ -188,6 +218,41 @@ class SettingsService:
 
         return definition.default
 
+    def snapshot(self, guild_id: int = 0) -> SettingsSnapshot:
+        """
+        Immutable view of every registered setting for a guild, defaults resolved.
+
+        ``settings.snapshot(guild_id).automod.enabled`` costs one dict lookup plus two
+        attribute reads. A change replaces the guild's snapshot wholesale, so a
+        reference held across awaits stays internally consistent. Unlike ``get``
+        there is no per-call fallback: unset settings read as their registered default.
+        """
+        snapshot = self._snapshots.get(guild_id)
+        if snapshot is None:
+            snapshot = self._snapshots[guild_id] = self._build_snapshot(guild_id)
+        return snapshot
+
+    def _build_snapshot(self, guild_id: int) -> SettingsSnapshot:
+        if self._snapshot_types is None:
+            keys_by_scope: dict[str, list[str]] = {}
+            for scope, key in self._definitions:
+                keys_by_scope.setdefault(scope, []).append(key)
+            scope_types = {
+                scope: (namedtuple(f"{scope.title()}Settings", sorted(keys), rename=True), tuple(sorted(keys)))
+                for scope, keys in keys_by_scope.items()
+            }
+            snapshot_type = namedtuple("SettingsSnapshot", ["guild_id", *sorted(scope_types)], rename=True)
+            self._snapshot_types = (snapshot_type, scope_types)
+        snapshot_type, scope_types = self._snapshot_types
+        overrides = self._overrides
+        scopes = []
+        for scope in snapshot_type._fields[1:]:
+            scope_type, keys = scope_types[scope]
+            scopes.append(scope_type._make(
+                overrides.get((guild_id, scope, key), self._definitions[(scope, key)].default) for key in keys
+            ))
+        return snapshot_type(guild_id, *scopes)
+
     def is_overridden(self, scope: str, key: str, guild_id: int = 0) -> bool:
         return (guild_id, scope, key) in self._overrides
 
@@ -261,6 +326,7 @@ class SettingsService:
                     updated_by,
                     change_type,
                 )
+                await publish_setting_change(conn, guild_id, scope, key, self._origin)
         except (pg_exceptions.PostgresError, ConnectionError, OSError) as e:
             log_database_event("CONNECTION_LOST", guild_id=guild_id, details=f"During set operation: {e}")
             # Try to reconnect and retry once
@@ -282,6 +348,7 @@ class SettingsService:
                         definition.value_type,
                         updated_by,
                     )
+                    await publish_setting_change(conn, guild_id, scope, key, self._origin)
                 log_database_event("RECONNECT_SUCCESS", guild_id=guild_id, details="Successfully reconnected and saved setting")
             except Exception as retry_error:
                 log_database_event("RECONNECT_FAILED", guild_id=guild_id, details=f"Failed to reconnect: {retry_error}")
@@ -405,6 +472,7 @@ class SettingsService:
                             definition.value_type if definition else None,
                             updated_by,
                     )
+                    await publish_setting_change(conn, guild_id, scope, key, self._origin)
             except (pg_exceptions.PostgresError, ConnectionError, OSError) as e:
                 log_database_event("CONNECTION_LOST", guild_id=guild_id, details=f"During clear operation: {e}")
                 # Try to reconnect and retry once
@@ -417,6 +485,7 @@ class SettingsService:
                             scope,
                             key,
                         )
+                        await publish_setting_change(conn, guild_id, scope, key, self._origin)
                     log_database_event("RECONNECT_SUCCESS", guild_id=guild_id, details="Successfully reconnected and cleared setting")
                 except Exception as retry_error:
                     log_database_event("RECONNECT_FAILED", guild_id=guild_id, details=f"Failed to reconnect: {retry_error}")
@@ -449,7 +518,156 @@ class SettingsService:
         """Register a listener that fires on every setting change with (scope, key, guild_id, value)."""
         self._global_listeners.append(listener)
 
+    # ----- Cross-process propagation -----
+
+    def start_change_listener(self) -> None:
+        """Start applying bot_settings changes made by other processes (API, replicas)."""
+        if self._dsn and (self._listen_task is None or self._listen_task.done()):
+            self._listen_task = asyncio.create_task(self._listen_loop())
+
+    async def stop_change_listener(self) -> None:
+        for task in (self._listen_task, self._remote_worker):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._listen_task = self._remote_worker = None
+        await self._close_listen_conn()
+
+    async def _close_listen_conn(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is not None and not conn.is_closed():
+            with suppress(Exception):
+                await conn.close(timeout=5)
+
+    async def _listen_loop(self) -> None:
+        """Hold a LISTEN connection, reconnecting with backoff; resync after a gap."""
+        connected_before = False
+        delay = 1.0
+        while True:
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(
+                    self._dsn, server_settings={"application_name": "alphapy_settings_listener"}
+                )
+                self._listen_conn = conn
+                conn.add_termination_listener(lambda _conn, lost=lost: lost.set())
+                await conn.add_listener(SETTINGS_CHANNEL, self._on_change_notification)
+                log_database_event("SETTINGS_LISTEN", details=f"Listening on {SETTINGS_CHANNEL}")
+                if connected_before:
+                    # Notifications sent while disconnected are gone; diff against the table once
+                    self._enqueue_remote_change(None)
+                connected_before = True
+                delay = 1.0
+                while not lost.is_set():
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(lost.wait(), timeout=_LISTEN_HEALTH_INTERVAL)
+                    if not lost.is_set():
+                        # Detects half-open connections that never report termination
+                        await asyncio.wait_for(conn.fetchval("SELECT 1"), timeout=10)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log_database_event("SETTINGS_LISTEN_ERROR", details=f"{e}; retrying in {delay:.0f}s")
+            await self._close_listen_conn()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _LISTEN_MAX_BACKOFF)
+
+    def _on_change_notification(self, _conn: Any, _pid: int, _channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            if data.get("origin") == self._origin:
+                return  # our own write, already applied
+            guild_id, scope, key = int(data["guild_id"]), str(data["scope"]), data.get("key")
+        except (ValueError, KeyError, TypeError):
+            log_database_event("SETTINGS_NOTIFY_INVALID", details=payload[:200])
+            return
+        self._enqueue_remote_change((guild_id, scope, key))
+
+    def _enqueue_remote_change(self, change: tuple[int, str, str | None] | None) -> None:
+        self._remote_queue.put_nowait(change)
+        if self._remote_worker is None or self._remote_worker.done():
+            self._remote_worker = asyncio.create_task(self._apply_remote_changes())
+
+    async def _apply_remote_changes(self) -> None:
+        """Single consumer of the remote change queue."""
+        while True:
+            change = await self._remote_queue.get()
+            try:
+                if change is None:
+                    await self._resync_all()
+                else:
+                    await self._apply_remote_change(*change)
+            except Exception as e:
+                log_database_event("SETTINGS_SYNC_FAILED", details=f"change={change} error={e}")
+            finally:
+                self._remote_queue.task_done()
+
+    async def _apply_remote_change(self, guild_id: int, scope: str, key: str | None) -> int:
+        """Re-read the changed rows and update overrides in place; returns the number of changed settings."""
+        if not self._pool:
+            return 0
+        try:
+            async with self._pool.acquire() as conn:
+                if key is None:
+                    rows = await conn.fetch(
+                        "SELECT key, value FROM bot_settings WHERE guild_id = $1 AND scope = $2",
+                        guild_id, scope,
+                    )
+                else:
+                    rows = await conn.fetch(
+                        "SELECT key, value FROM bot_settings WHERE guild_id = $1 AND scope = $2 AND key = $3",
+                        guild_id, scope, key,
+                    )
+        except Exception as e:
+            log_database_event("SETTINGS_SYNC_FAILED", guild_id=guild_id, details=f"scope={scope} key={key} error={e}")
+            return 0
+        stored = {(guild_id, scope, row["key"]): row["value"] for row in rows}
+        if key is None:
+            affected = {c for c in self._overrides if c[0] == guild_id and c[1] == scope} | set(stored)
+        else:
+            affected = {(guild_id, scope, key)}
+        return await self._apply_stored(stored, affected)
+
+    async def _resync_all(self) -> int:
+        if not self._pool:
+            return 0
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch("SELECT guild_id, scope, key, value FROM bot_settings")
+        stored = {(row["guild_id"], row["scope"], row["key"]): row["value"] for row in rows}
+        changed = await self._apply_stored(stored, set(self._overrides) | set(stored))
+        log_database_event("SETTINGS_RESYNCED", details=f"{changed} settings changed while disconnected")
+        return changed
+
+    async def _apply_stored(self, stored: dict[tuple[int, str, str], Any], affected: Iterable[tuple[int, str, str]]) -> int:
+        changed = 0
+        for composite in affected:
+            guild_id, scope, key = composite
+            definition = self._definitions.get((scope, key))
+            if not definition:
+                continue
+            if composite in stored:
+                try:
+                    value = self._decode_value(stored[composite], definition)
+                except (TypeError, ValueError) as e:
+                    log_database_event("SETTINGS_SYNC_FAILED", guild_id=guild_id, details=f"{scope}.{key}: {e}")
+                    continue
+                if composite in self._overrides and self._overrides[composite] == value:
+                    continue
+                self._overrides[composite] = value
+            elif composite in self._overrides:
+                del self._overrides[composite]
+                value = self.get(scope, key, guild_id)
+            else:
+                continue
+            changed += 1
+            await self._notify(scope, key, guild_id, value)
+        return changed
+
     async def _notify(self, scope: str, key: str, guild_id: int, value: Any) -> None:
+        # Every override change goes through here: swap in a fresh snapshot for that guild only
+        if guild_id in self._snapshots:
+            self._snapshots[guild_id] = self._build_snapshot(guild_id)
         per_key = self._listeners.get((scope, key))
         if per_key:
             for listener in per_key:
@@ -8,11 +8,13 @@ from typing import Any
 import httpx
 
 import config
+from utils.http_clients import SUPABASE, get_http_client
 
 logger = logging.getLogger(__name__)
 
 SUPABASE_URL = (config.SUPABASE_URL or "").rstrip("/")
 SUPABASE_SERVICE_ROLE_KEY = config.SUPABASE_SERVICE_ROLE_KEY
+SUPABASE_TIMEOUT = 10.0
 
 
 class SupabaseConfigurationError(RuntimeError):
@@ -56,8 +58,8 @@ async def _supabase_get(
     """Fetch rows from a Supabase table using the service role."""
     _require_config()
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(url, headers=_headers(), params=params)
+    client = get_http_client(SUPABASE)
+    response = await client.get(url, headers=_headers(), params=params, timeout=SUPABASE_TIMEOUT)
 
     try:
         response.raise_for_status()
@@ -124,12 +126,13 @@ async def _supabase_post(
     
     # Use ONLY table name in URL (no schema prefix) when using Content-Profile header
     url = f"{SUPABASE_URL}/rest/v1/{table_name}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.post(
-            url,
-            json=rows,
-            headers=_headers(prefer, schema=schema, method="POST"),
-        )
+    client = get_http_client(SUPABASE)
+    response = await client.post(
+        url,
+        json=rows,
+        headers=_headers(prefer, schema=schema, method="POST"),
+        timeout=SUPABASE_TIMEOUT,
+    )
 
     try:
         response.raise_for_status()
@@ -161,12 +164,13 @@ async def _supabase_delete(table: str, filters: dict[str, str]) -> None:
     """
     _require_config()
     url = f"{SUPABASE_URL}/rest/v1/{table}"
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.delete(
-            url,
-            headers=_headers(method="DELETE"),
-            params=filters,
-        )
+    client = get_http_client(SUPABASE)
+    response = await client.delete(
+        url,
+        headers=_headers(method="DELETE"),
+        params=filters,
+        timeout=SUPABASE_TIMEOUT,
+    )
     try:
         response.raise_for_status()
     except httpx.HTTPStatusError as exc:
@@ -12,6 +12,7 @@ import logging
 import asyncpg
 from fastapi import APIRouter, HTTPException, Request, status
 
+from gpt.context_loader import invalidate_reflection_context
 from utils.dashboard_webhooks import forward_reflection
 from webhooks.common import get_app_reflections_secret, validate_webhook_signature
 
@@ -111,6 +112,7 @@ async def handle_app_reflection_webhook(request: Request) -> dict[str, str]:
             detail="Failed to store reflection.",
         ) from e
 
+    invalidate_reflection_context(discord_id=user_id)
     logger.info(
         "App reflection webhook: user_id=%s, reflection_id=%s",
         user_id,
@@ -12,6 +12,7 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request, status
 
+from gpt.context_loader import invalidate_reflection_context
 from utils.innersync_identity import upsert_discord_link
 from utils.logger import logger
 from webhooks.common import get_discord_link_webhook_secret, validate_webhook_signature
@@ -112,6 +113,9 @@ async def handle_discord_link_webhook(request: Request) -> dict[str, str]:
         link_source=link_source,
     )
 
+    # Identity mapping changed: drop cached context for both sides of the link
+    invalidate_reflection_context(discord_id=discord_user_id, supabase_user_id=str(iu_raw))
+
     if status_str == "conflict":
         logger.info(
             "discord-link webhook conflict: discord=%s innersync=%s detail=%s",
@@ -9,6 +9,7 @@ import logging
 
 from fastapi import APIRouter, HTTPException, Request, status
 
+from gpt.context_loader import invalidate_reflection_context
 from webhooks.common import get_reflections_webhook_secret, validate_webhook_signature
 
 logger = logging.getLogger(__name__)
@@ -69,6 +70,10 @@ async def handle_reflection_webhook(request: Request) -> dict[str, str]:
         date,
     )
 
+    if user_id:
+        # Any reflection change makes the user's cached Grok context stale
+        invalidate_reflection_context(supabase_user_id=str(user_id))
+
     if event_type == "reflection.created" and user_id and reflection_id:
         # Optional: Create reminder suggestion or log for analytics
         # For now, just log the event
@@ -10,6 +10,7 @@ import logging
 import asyncpg
 from fastapi import APIRouter, HTTPException, Request, status
 
+from gpt.context_loader import invalidate_reflection_context
 from utils.dashboard_webhooks import forward_revoke_reflection
 from webhooks.common import get_app_reflections_secret, validate_webhook_signature
 
@@ -97,6 +98,9 @@ async def handle_revoke_reflection_webhook(request: Request) -> dict:
             detail="Failed to revoke reflection.",
         ) from e
 
+    # Never serve the revoked reflection from the Grok context cache
+    invalidate_reflection_context(discord_id=user_id)
+
     # result is like "DELETE 1" or "DELETE 0"
     count = 0
     if result and result.split()[-1].isdigit():
@@ -1,12 +1,16 @@
+import asyncio
 import json
 import logging
+from concurrent.futures import Future
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request, status
 
 import config
+from gpt.context_loader import invalidate_reflection_context
 from utils.dashboard_webhooks import forward_supabase_auth
 from utils.db_helpers import acquire_safe
+from utils.premium_guard import forget_gpt_usage
 from utils.supabase_client import SupabaseConfigurationError, upsert_profile
 from webhooks.common import validate_webhook_signature
 
@@ -34,6 +38,25 @@ def _extract_discord_id(payload: dict[str, Any]) -> int | None:
     return None
 
 
+def _forget_in_memory_data(discord_id: int) -> Future | None:
+    """
+    Drop a user's in-memory verification hashes and GPT quota counters on the
+    bot loop (GDPR erasure).
+
+    Returns the future for the GPT counters, which the caller awaits before the
+    purge so a quota flush cannot re-create gpt_usage rows.
+    """
+    from gpt.helpers import bot_instance
+
+    if bot_instance is None:
+        return None
+    # The webhook runs on the API thread; this state belongs to the bot loop
+    verification = bot_instance.get_cog("VerificationCog")
+    if verification is not None:
+        bot_instance.loop.call_soon_threadsafe(verification.forget_user_submissions, discord_id)
+    return asyncio.run_coroutine_threadsafe(forget_gpt_usage(discord_id), bot_instance.loop)
+
+
 async def _purge_railway_data(pool, discord_id: int, supabase_user_id: str) -> None:
     """Delete all personal data for a user from Railway PostgreSQL (GDPR erasure)."""
     tables_to_delete = [
@@ -48,6 +71,7 @@ async def _purge_railway_data(pool, discord_id: int, supabase_user_id: str) -> N
         ("automod_logs", "user_id"),
         ("automod_user_history", "user_id"),
         ("app_reflections", "user_id"),
+        ("verification_image_hashes", "user_id"),  # screenshot hashes for duplicate detection
     ]
     tables_to_anonymize = [
         ("reminders", "created_by"),
@@ -169,6 +193,7 @@ async def supabase_auth_webhook(request: Request) -> dict[str, str]:
 
     if event_type in {"USER_DELETED", "USER_DESTROYED"} and user_id:
         discord_id = _extract_discord_id(payload)
+        invalidate_reflection_context(discord_id=discord_id, supabase_user_id=user_id)
         if discord_id is None:
             logger.warning(
                 "GDPR erasure requested for supabase_user_id=%s but no Discord ID found "
@@ -177,6 +202,16 @@ async def supabase_auth_webhook(request: Request) -> dict[str, str]:
                 user_id,
             )
         else:
+            forgotten = _forget_in_memory_data(discord_id)
+            if forgotten is not None:
+                try:
+                    await asyncio.wait_for(asyncio.wrap_future(forgotten), timeout=5.0)
+                except Exception as exc:
+                    logger.warning(
+                        "GDPR erasure for discord_id=%s: could not drop GPT counters: %s",
+                        discord_id,
+                        exc,
+                    )
             pool = getattr(request.app.state, "db_pool", None)
             if pool is None:
                 logger.error(